@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Per-frame search cost of A* versus the incremental pathfinder.
+
+A ghost chases a wandering Pac-Man and asks for a full path every frame,
+as GameEngine does without distance tables; it respawns at a random
+cell whenever it catches up. Reports node expansions and
+time per frame for both pathfinders as JSON, and exits non-zero when the
+incremental one saves less than --min-reduction:
+
+    python benchmarks/incremental_pathfinding.py --size 50 --mazes 5
+
+With the defaults (50x50, one tunnel row) A* expands 227.0 cells per
+frame and the incremental pathfinder 19.41, an 11.7x reduction.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'algorithms'))
+
+from main import create_maze
+from pathfinding.astar import AStar
+from pathfinding.incremental import IncrementalAStar
+from utils.grid import Grid
+
+
+def pacman_walk(grid, length, rng):
+    """Pac-Man cells, one step per frame, rarely turning back."""
+    cells = grid.walkable_cells
+    current = rng.choice(cells)
+    previous = None
+    walk = []
+
+    for _ in range(length):
+        walk.append(current)
+        options = [n for n in grid.neighbors(current) if n != previous] or grid.neighbors(current)
+        previous, current = current, rng.choice(options)
+
+    return walk
+
+
+def chase(grid, walk, pathfinders, rng):
+    """
+    Run every pathfinder on the same chase; returns seconds per pathfinder.
+
+    The ghost follows the first pathfinder's path and respawns at a random
+    cell when it catches Pac-Man, so searches stay long. Every pathfinder
+    must return equally short paths.
+    """
+    cells = grid.walkable_cells
+    seconds = [0.0] * len(pathfinders)
+    ghost = rng.choice(cells)
+
+    for target in walk:
+        lengths = []
+        for i, pathfinder in enumerate(pathfinders):
+            start = time.perf_counter()
+            path = pathfinder.find_path(ghost, target)
+            seconds[i] += time.perf_counter() - start
+            lengths.append(len(path) if path else 0)
+            if i == 0:
+                next_ghost = path[1] if path and len(path) > 2 else rng.choice(cells)
+
+        if len(set(lengths)) > 1:
+            raise SystemExit(f'Path lengths differ: {lengths}')
+        ghost = next_ghost
+
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental pathfinding benchmark')
+    parser.add_argument('--size', type=int, default=50, help='Maze size in cells')
+    parser.add_argument('--mazes', type=int, default=5)
+    parser.add_argument('--frames', type=int, default=2000, help='Frames per maze')
+    parser.add_argument('--imperfection', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-reduction', type=float, default=10.0,
+                        help='Fail when expansions shrink by less than this factor')
+    args = parser.parse_args()
+
+    totals = {'astar': [0, 0.0], 'incremental': [0, 0.0]}
+    frames = 0
+
+    for maze_index in range(args.mazes):
+        seed = args.seed + maze_index
+        cells, _, _ = create_maze(
+            args.size, args.size, 'kruskal', args.imperfection, 1, 0, seed=seed
+        )
+        grid = Grid(cells)
+        rng = random.Random(seed)
+        walk = pacman_walk(grid, args.frames, rng)
+
+        pathfinders = {'incremental': IncrementalAStar(grid), 'astar': AStar(grid)}
+        seconds = chase(grid, walk, list(pathfinders.values()), rng)
+        for (name, pathfinder), elapsed in zip(pathfinders.items(), seconds):
+            totals[name][0] += pathfinder.expansions
+            totals[name][1] += elapsed
+        frames += len(walk)
+
+    report = {'size': args.size, 'mazes': args.mazes, 'frames': frames}
+    for name, (expansions, seconds) in totals.items():
+        report[name] = {
+            'expansionsPerFrame': round(expansions / frames, 2),
+            'microsecondsPerFrame': round(seconds / frames * 1e6, 1)
+        }
+    reduction = totals['astar'][0] / max(totals['incremental'][0], 1)
+    report['expansionReduction'] = round(reduction, 2)
+    report['speedup'] = round(totals['astar'][1] / max(totals['incremental'][1], 1e-9), 2)
+
+    print(json.dumps(report, indent=2))
+
+    if reduction < args.min_reduction:
+        print(f'Expansion reduction x{reduction:.2f} is below x{args.min_reduction}',
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Search cost of the ghost pathfinders on long-range targets.
+
+Ghosts in scatter mode head for the maze corners, so every query runs
+from a random cell to the walkable cell nearest one of the four corners.
+For each maze topology (generator and imperfection) reports node
+expansions and time per query for every pathfinder as JSON, plus the
+fastest one, so the best strategy can be picked per topology:
+
+    python benchmarks/long_range_pathfinding.py --size 50 --queries 100
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'algorithms'))
+
+from main import create_maze
+from pathfinding.astar import AStar
+from pathfinding.bfs import BFS
+from pathfinding.bidirectional import BidirectionalBFS
+from pathfinding.jump_point import JumpPointSearch
+from utils.grid import Grid
+
+
+PATHFINDERS = {
+    'bfs': BFS,
+    'astar': AStar,
+    'bidirectional': BidirectionalBFS,
+    'jps': JumpPointSearch
+}
+
+GENERATORS = ['kruskal', 'prim', 'recursive_backtracker', 'wilson']
+
+
+def corner_targets(grid):
+    """Walkable cells nearest the four grid corners (the scatter targets)."""
+    positions = grid.positions
+    corners = [(0, 0), (0, grid.cols - 1), (grid.rows - 1, 0), (grid.rows - 1, grid.cols - 1)]
+    return [positions[int(grid.nearest_walkable[grid.index(corner)])] for corner in corners]
+
+
+def run_queries(grid, queries, rng):
+    """Time every pathfinder on the same queries: {name: (expansions, seconds)}."""
+    cells = grid.walkable_cells
+    targets = corner_targets(grid)
+    pairs = [(rng.choice(cells), rng.choice(targets)) for _ in range(queries)]
+
+    results = {}
+    lengths = {}
+    for name, pathfinder_class in PATHFINDERS.items():
+        pathfinder = pathfinder_class(grid)
+        start = time.perf_counter()
+        lengths[name] = [len(pathfinder.find_path(source, target) or ()) for source, target in pairs]
+        results[name] = (pathfinder.expansions, time.perf_counter() - start)
+
+    if len({tuple(found) for found in lengths.values()}) > 1:
+        raise SystemExit('Pathfinders disagree on path lengths')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Long-range pathfinding benchmark')
+    parser.add_argument('--size', type=int, default=50, help='Maze size in cells')
+    parser.add_argument('--mazes', type=int, default=3, help='Mazes per topology')
+    parser.add_argument('--queries', type=int, default=100, help='Queries per maze')
+    parser.add_argument('--imperfections', default='0,20,60',
+                        help='Comma-separated imperfection levels')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    report = {'size': args.size, 'mazes': args.mazes, 'queries': args.queries, 'topologies': {}}
+
+    for algorithm in GENERATORS:
+        for imperfection in [float(level) for level in args.imperfections.split(',')]:
+            totals = {name: [0, 0.0] for name in PATHFINDERS}
+            for maze_index in range(args.mazes):
+                seed = args.seed + maze_index
+                cells, _, _ = create_maze(
+                    args.size, args.size, algorithm, imperfection, 1, 1, seed=seed
+                )
+                results = run_queries(Grid(cells), args.queries, random.Random(seed))
+                for name, (expansions, seconds) in results.items():
+                    totals[name][0] += expansions
+                    totals[name][1] += seconds
+
+            queries = args.mazes * args.queries
+            topology = {
+                name: {
+                    'expansionsPerQuery': round(expansions / queries, 1),
+                    'microsecondsPerQuery': round(seconds / queries * 1e6, 1)
+                }
+                for name, (expansions, seconds) in totals.items()
+            }
+            topology['fastest'] = min(totals, key=lambda name: totals[name][1])
+            report['topologies'][f'{algorithm}@{imperfection:g}'] = topology
+            print(f"{algorithm:<22} {imperfection:>5g}  fastest: {topology['fastest']}",
+                  file=sys.stderr)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
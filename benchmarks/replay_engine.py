@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Frames per second of GameEngine versus FastGameEngine.
+
+Replays wandering Pac-Man trajectories against all four ghosts (fresh
+ghosts per run, as sweeps do) on both engines, with and without frame
+dicts, and checks that every result is identical. Both engines share one
+DistanceOracle that is warmed up first, so the timings compare the
+engines rather than table building. Ghosts start at random cells and
+most runs end in an early catch, as in real sweeps. Reports JSON and exits non-zero
+when the fast engine is less than --min-speedup times faster without
+frames:
+
+    python benchmarks/replay_engine.py --size 50 --runs 50
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'algorithms'))
+
+from main import create_maze
+from pathfinding.distance_oracle import DistanceOracle
+from simulation.fast_engine import FastGameEngine
+from simulation.game_engine import GameEngine
+from utils.grid import Grid
+
+
+DIRECTIONS = {(-1, 0): 'UP', (1, 0): 'DOWN', (0, -1): 'LEFT', (0, 1): 'RIGHT'}
+
+
+def pacman_trajectory(grid, length, rng):
+    """Pac-Man moves one step per frame, rarely turning back, with directions."""
+    current = rng.choice(grid.walkable_cells)
+    previous = None
+    moves = []
+
+    for i in range(length):
+        options = [n for n in grid.neighbors(current) if n != previous] or grid.neighbors(current)
+        following = rng.choice(options)
+        step = (following[0] - current[0], following[1] - current[1])
+        moves.append({
+            'position': {'y': current[0], 'x': current[1]},
+            'direction': DIRECTIONS.get(step),
+            'timestamp': i * 50
+        })
+        previous, current = current, following
+
+    return moves
+
+
+def ghost_configs(grid, rng):
+    """All four ghosts at random cells, alternating table-backed algorithms."""
+    return [
+        {'type': ghost_type, 'algorithm': algorithm, 'startPos': list(rng.choice(grid.walkable_cells))}
+        for ghost_type, algorithm in [
+            ('blinky', 'astar'), ('pinky', 'bfs'), ('inky', 'astar'), ('clyde', 'bfs')
+        ]
+    ]
+
+
+def replay(engine, runs, include_frames):
+    """(results, seconds) of simulate_with over every run."""
+    start = time.perf_counter()
+    results = [engine.simulate_with(trajectory, configs, include_frames) for trajectory, configs in runs]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay engine benchmark')
+    parser.add_argument('--size', type=int, default=50, help='Maze size in cells')
+    parser.add_argument('--runs', type=int, default=50, help='Trajectories per maze')
+    parser.add_argument('--frames', type=int, default=2000, help='Moves per trajectory')
+    parser.add_argument('--mazes', type=int, default=3)
+    parser.add_argument('--imperfection', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-speedup', type=float, default=3.0,
+                        help='Fail when the fast engine is less than this much faster')
+    args = parser.parse_args()
+
+    seconds = {(name, frames): 0.0 for name in ('game', 'fast') for frames in (False, True)}
+    total_frames = 0
+
+    for maze_index in range(args.mazes):
+        seed = args.seed + maze_index
+        cells, _, _ = create_maze(
+            args.size, args.size, 'kruskal', args.imperfection, 1, 0, seed=seed
+        )
+        grid = Grid(cells)
+        rng = random.Random(seed)
+        runs = [
+            (pacman_trajectory(grid, args.frames, rng), ghost_configs(grid, rng))
+            for _ in range(args.runs)
+        ]
+
+        oracle = DistanceOracle(grid, max_targets=len(grid.walkable_cells))
+        engines = {
+            'game': GameEngine(grid, [], oracle=oracle),
+            'fast': FastGameEngine(grid, [], oracle=oracle)
+        }
+        # Warm the oracle with every target either engine asks for
+        expected, _ = replay(engines['game'], runs, True)
+        replay(engines['fast'], runs, False)
+        total_frames += sum(result['totalFrames'] for result in expected)
+
+        for include_frames in (False, True):
+            for name, engine in engines.items():
+                results, elapsed = replay(engine, runs, include_frames)
+                seconds[name, include_frames] += elapsed
+                if results != [
+                    result if include_frames
+                    else {k: v for k, v in result.items() if k != 'frames'}
+                    for result in expected
+                ]:
+                    raise SystemExit(f'{name} engine results differ')
+
+    report = {'size': args.size, 'mazes': args.mazes, 'runs': args.runs, 'frames': total_frames}
+    for include_frames, label in ((False, 'summary'), (True, 'withFrames')):
+        report[label] = {
+            name: {'framesPerSecond': round(total_frames / seconds[name, include_frames])}
+            for name in ('game', 'fast')
+        }
+        report[label]['speedup'] = round(
+            seconds['game', include_frames] / seconds['fast', include_frames], 2
+        )
+
+    print(json.dumps(report, indent=2))
+
+    speedup = report['summary']['speedup']
+    if speedup < args.min_speedup:
+        print(f'Speedup x{speedup:.2f} is below x{args.min_speedup}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for maze generation, conversion and pellet placement.
+
+Times every benchmark across maze sizes and records its peak traced
+memory, then writes the results as JSON. Given a baseline file from an
+earlier commit, it exits non-zero on regressions:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --baseline before.json --max-slowdown 1.3
+
+Sizes are in cells per side (a size N maze has a (2N+1)x(2N+1) grid).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'algorithms'))
+
+import numpy as np
+
+from main import make_symmetric
+from maze.generators import (
+    KruskalGenerator,
+    PrimGenerator,
+    RecursiveBacktrackerGenerator,
+    WilsonGenerator
+)
+from maze.generators.base import MAX_DIMENSION
+from maze.imperfecteur import MazeImperfecteur
+from maze.pellets import (
+    RandomPelletPlacer,
+    StrategicPelletPlacer,
+    ClassicPelletPlacer
+)
+from utils.grid_cache import get_cache
+from utils.maze_converter import internal_to_grid
+
+
+DEFAULT_SIZES = [10, 25, 50, 100, 250, 500, MAX_DIMENSION]
+
+
+def perfect_maze(size):
+    """Kruskal maze of size x size cells: (maze, remaining_walls)."""
+    return KruskalGenerator().generate(size, size)
+
+
+def maze_grid(size):
+    """Imperfect maze of size x size cells, as a grid."""
+    maze, remaining_walls = perfect_maze(size)
+    maze, tunnel_rows, tunnel_cols = MazeImperfecteur().make_imperfect(
+        maze, remaining_walls, 0.2, size, size, 1, 0
+    )
+    return internal_to_grid(maze, size, size, tunnel_rows, tunnel_cols)
+
+
+def generator_benchmark(generator_class):
+    def setup(size):
+        generator = generator_class()
+        return lambda: generator.generate(size, size)
+    return setup
+
+
+def imperfecteur_benchmark(size):
+    maze, remaining_walls = perfect_maze(size)
+
+    def run():
+        # make_imperfect edits the maze in place; a fresh copy keeps runs equal
+        MazeImperfecteur().make_imperfect(
+            [row[:] for row in maze], remaining_walls, 0.2, size, size, 1, 1
+        )
+    return run
+
+
+def internal_to_grid_benchmark(size):
+    maze, _ = perfect_maze(size)
+    return lambda: internal_to_grid(maze, size, size, {0}, {0})
+
+
+def make_symmetric_benchmark(size):
+    grid = maze_grid(size)
+    return lambda: make_symmetric([row[:] for row in grid])
+
+
+def placer_benchmark(placer_class):
+    def setup(size):
+        grid = maze_grid(size)
+        placer = placer_class()
+        return lambda: placer.place_pellets(grid)
+    return setup
+
+
+# name -> setup(size) returning the zero-argument callable to measure
+BENCHMARKS = {
+    'kruskal': generator_benchmark(KruskalGenerator),
+    'prim': generator_benchmark(PrimGenerator),
+    'recursive_backtracker': generator_benchmark(RecursiveBacktrackerGenerator),
+    'wilson': generator_benchmark(WilsonGenerator),
+    'imperfecteur': imperfecteur_benchmark,
+    'internal_to_grid': internal_to_grid_benchmark,
+    'make_symmetric': make_symmetric_benchmark,
+    'random_placer': placer_benchmark(RandomPelletPlacer),
+    'strategic_placer': placer_benchmark(StrategicPelletPlacer),
+    'classic_placer': placer_benchmark(ClassicPelletPlacer)
+}
+
+
+def measure(setup, size, repeat, seed):
+    """
+    Best wall time over `repeat` runs plus peak traced memory of one run.
+
+    Every run starts from the same seed and a cold grid cache, so each
+    measures the full analysis rather than a cache hit.
+    """
+    random.seed(seed)
+    run = setup(size)
+
+    def cold_run():
+        random.seed(seed)
+        get_cache().clear()
+        run()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cold_run()
+        times.append(time.perf_counter() - start)
+
+    # Separate run: tracing slows everything down
+    tracemalloc.start()
+    try:
+        cold_run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': min(times), 'peakBytes': peak}
+
+
+def run_suite(names, sizes, repeat, seed, log=None):
+    """Measure every benchmark at every size: {name: {size: measurement}}."""
+    results = {}
+    for name in names:
+        results[name] = {}
+        for size in sizes:
+            result = measure(BENCHMARKS[name], size, repeat, seed)
+            results[name][str(size)] = result
+            if log:
+                log(f"{name:<22} {size:>5}  {result['seconds'] * 1000:10.2f} ms"
+                    f"  {result['peakBytes'] / 1024:12.1f} KiB")
+    return results
+
+
+def find_regressions(results, baseline, max_slowdown, max_memory_growth, min_seconds):
+    """
+    Compare against a baseline report.
+
+    Timings shorter than min_seconds in both runs are ignored as noise.
+
+    Returns:
+        list: Human-readable regression descriptions
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            before = baseline.get(name, {}).get(size)
+            if before is None:
+                continue
+
+            if max(result['seconds'], before['seconds']) >= min_seconds:
+                ratio = result['seconds'] / max(before['seconds'], 1e-9)
+                if ratio > max_slowdown:
+                    regressions.append(
+                        f"{name} @ {size}: {before['seconds']:.4f}s -> "
+                        f"{result['seconds']:.4f}s (x{ratio:.2f})"
+                    )
+
+            growth = result['peakBytes'] / max(before['peakBytes'], 1)
+            if growth > max_memory_growth:
+                regressions.append(
+                    f"{name} @ {size}: peak {before['peakBytes']} -> "
+                    f"{result['peakBytes']} bytes (x{growth:.2f})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maze algorithm benchmark suite')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated maze sizes in cells per side')
+    parser.add_argument('--only', default=None,
+                        help=f"Comma-separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per measurement')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help='Write the JSON report here')
+    parser.add_argument('--baseline', default=None, help='JSON report to compare against')
+    parser.add_argument('--max-slowdown', type=float, default=1.25,
+                        help='Fail when time grows by more than this factor')
+    parser.add_argument('--max-memory-growth', type=float, default=1.25,
+                        help='Fail when peak memory grows by more than this factor')
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='Ignore time regressions below this duration')
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = run_suite(
+        names, sizes, args.repeat, args.seed,
+        log=lambda line: print(line, file=sys.stderr)
+    )
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+
+        regressions = find_regressions(
+            results, baseline, args.max_slowdown, args.max_memory_growth, args.min_seconds
+        )
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Frames per second of headless self-play games.
+
+Plays each Pac-Man AI against all four ghosts on classic-pellet mazes
+and reports frames per second per AI. Each AI gets one engine per maze
+that plays a warm-up game first, so the timings measure steady-state
+frames (distance tables built) as in a bulk generation run. The
+defaults finish in well under a minute:
+
+    python benchmarks/self_play.py --mazes 2 --games 5 --frames 5000
+
+The search AI spends up to --budget-ms per move, so its frame rate is
+set by the budget and it only runs when asked for; the report adds the
+depth reached and nodes per second, to size budgets:
+
+    python benchmarks/self_play.py --agents search --budget-ms 5 --frames 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'algorithms'))
+
+from main import create_maze
+from maze.pellets import ClassicPelletPlacer
+from simulation.self_play import PACMAN_CLASSES, SelfPlayEngine
+from utils.grid import Grid
+
+
+def ghost_configs(grid, rng):
+    """All four ghosts at random cells, alternating table-backed algorithms."""
+    return [
+        {'type': ghost_type, 'algorithm': algorithm, 'startPos': list(rng.choice(grid.walkable_cells))}
+        for ghost_type, algorithm in [
+            ('blinky', 'astar'), ('pinky', 'bfs'), ('inky', 'astar'), ('clyde', 'bfs')
+        ]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Self-play benchmark')
+    parser.add_argument('--size', type=int, default=14, help='Maze size in cells')
+    parser.add_argument('--games', type=int, default=2, help='Timed games per AI and maze')
+    parser.add_argument('--frames', type=int, default=2000, help='Frames per game')
+    parser.add_argument('--mazes', type=int, default=1)
+    parser.add_argument('--imperfection', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--agents', default=','.join(a for a in PACMAN_CLASSES if a != 'search'),
+                        help='Comma-separated Pac-Man AIs (search runs only when listed)')
+    parser.add_argument('--budget-ms', type=float, default=10,
+                        help='Search time per move (search AI)')
+    args = parser.parse_args()
+
+    agents = args.agents.split(',')
+    seconds = {agent: 0.0 for agent in agents}
+    frames = {agent: 0 for agent in agents}
+    searches = {}
+
+    for maze_index in range(args.mazes):
+        seed = args.seed + maze_index
+        cells, _, _ = create_maze(
+            args.size, args.size, 'kruskal', args.imperfection, 1, 0, seed=seed
+        )
+        grid = Grid(ClassicPelletPlacer().place_pellets(cells))
+        configs = ghost_configs(grid, random.Random(seed))
+
+        for agent in agents:
+            # Whole games: catches send the ghosts home, pellets stay eaten
+            options = {'budget_ms': args.budget_ms} if agent == 'search' else None
+            engine = SelfPlayEngine(grid, configs, agent, seed=seed, stop_policy='none',
+                                    pacman_options=options)
+            engine.play(args.frames)
+
+            start = time.perf_counter()
+            for result in engine.play_many(args.games, args.frames):
+                frames[agent] += result['totalFrames']
+                if 'search' in result:
+                    searches.setdefault(agent, []).append(result['search'])
+            seconds[agent] += time.perf_counter() - start
+
+    report = {
+        'size': args.size,
+        'mazes': args.mazes,
+        'games': args.games,
+        'agents': {
+            agent: {
+                'frames': frames[agent],
+                'framesPerSecond': round(frames[agent] / seconds[agent])
+            }
+            for agent in agents
+        }
+    }
+    for agent, reports in searches.items():
+        moves = sum(r['moves'] for r in reports)
+        nodes = sum(r['nodes'] for r in reports)
+        search_seconds = sum(r['seconds'] for r in reports)
+        report['agents'][agent]['search'] = {
+            'budgetMs': args.budget_ms,
+            'nodesPerSecond': round(nodes / search_seconds) if search_seconds else 0,
+            'meanDepth': round(sum(r['meanDepth'] * r['moves'] for r in reports) / moves, 2) if moves else 0,
+            'minDepth': min(r['minDepth'] for r in reports),
+            'maxDepth': max(r['maxDepth'] for r in reports)
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
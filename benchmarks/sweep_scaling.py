@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the multi-process simulation sweep runner.
+
+Runs the same sweep with an increasing number of worker processes and
+reports wall time, speedup and parallel efficiency as JSON:
+
+    python benchmarks/sweep_scaling.py --size 25 --workers 1,2,4,8,16
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'algorithms'))
+
+from maze.generators import KruskalGenerator
+from maze.imperfecteur import MazeImperfecteur
+from utils.grid import Grid
+from utils.maze_converter import internal_to_grid
+from simulation.sweep import run_sweep
+
+
+def build_maze(size, seed):
+    """Imperfect Kruskal maze of size x size cells, as a grid."""
+    random.seed(seed)
+    maze, remaining_walls = KruskalGenerator().generate(size, size)
+    maze, tunnel_rows, tunnel_cols = MazeImperfecteur().make_imperfect(
+        maze, remaining_walls, 0.3, size, size, 0, 0
+    )
+    return internal_to_grid(maze, size, size, tunnel_rows, tunnel_cols)
+
+
+def random_walk(grid, length, rng):
+    """Pac-Man trajectory wandering the maze without stepping back when possible."""
+    cells = grid.walkable_cells
+    current = rng.choice(cells)
+    previous = None
+    moves = []
+
+    for step in range(length):
+        moves.append({'position': {'x': current[1], 'y': current[0]}, 'timestamp': step * 100})
+        options = [n for n in grid.neighbors(current) if n != previous] or grid.neighbors(current)
+        if not options:
+            break
+        previous, current = current, rng.choice(options)
+
+    return moves
+
+
+def ghost_config_sets(grid, count, rng):
+    """Config sets of all four ghosts at random start cells."""
+    cells = grid.walkable_cells
+    return [
+        [
+            {'type': ghost_type, 'algorithm': 'astar', 'startPos': list(rng.choice(cells))}
+            for ghost_type in ('blinky', 'pinky', 'inky', 'clyde')
+        ]
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulation sweep scaling benchmark')
+    parser.add_argument('--size', type=int, default=25, help='Maze size in cells')
+    parser.add_argument('--trajectories', type=int, default=8)
+    parser.add_argument('--configs', type=int, default=16)
+    parser.add_argument('--length', type=int, default=1000, help='Moves per trajectory')
+    parser.add_argument('--workers', default='1,2,4,8,16',
+                        help='Comma-separated worker counts to measure')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    grid = Grid(build_maze(args.size, args.seed))
+    rng = random.Random(args.seed)
+    trajectories = [random_walk(grid, args.length, rng) for _ in range(args.trajectories)]
+    config_sets = ghost_config_sets(grid, args.configs, rng)
+
+    report = {
+        'size': args.size,
+        'jobs': len(trajectories) * len(config_sets),
+        'cpuCount': os.cpu_count(),
+        'runs': []
+    }
+    baseline = None
+    reference = None
+
+    for workers in [int(w) for w in args.workers.split(',')]:
+        start = time.perf_counter()
+        results = run_sweep(grid, trajectories, config_sets, workers=workers, seed=args.seed)
+        elapsed = time.perf_counter() - start
+
+        # Every worker count must produce the same results
+        if reference is None:
+            reference = results
+        elif results != reference:
+            raise SystemExit(f'Results differ with {workers} workers')
+
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        report['runs'].append({
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'speedup': round(speedup, 2),
+            'efficiency': round(speedup / workers, 2)
+        })
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
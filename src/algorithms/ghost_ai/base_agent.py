@@ -8,7 +8,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pathfinding.astar import AStar
-from utils.distance import manhattan_distance
+from pathfinding.bfs import BFS
+from pathfinding.bidirectional import BidirectionalBFS
+from pathfinding.incremental import IncrementalAStar
+from pathfinding.jump_point import JumpPointSearch
+from pathfinding.distance_oracle import DistanceOracle
+from utils.grid import as_grid
 
 
 class GhostAgent(ABC):
@@ -17,30 +22,42 @@ class GhostAgent(ABC):
     Implements the Strategy pattern for different ghost behaviors.
     """
     
-    def __init__(self, ghost_id, grid, algorithm='astar'):
+    def __init__(self, ghost_id, grid, algorithm='astar', oracle=None):
         """
         Initialize ghost agent.
         
         Args:
             ghost_id: Unique identifier for this ghost
-            grid: 2D maze grid (0=walkable)
-            algorithm: Pathfinding algorithm to use ('astar' or 'bfs')
+            grid: Grid or 2D maze grid (1=wall)
+            algorithm: Pathfinding algorithm to use ('astar', 'bfs',
+                'incremental', 'bidirectional' or 'jps')
+            oracle: DistanceOracle for this grid, shared between ghosts;
+                a private one is built when omitted
         """
         self.ghost_id = ghost_id
-        self.grid = grid
+        self.grid = as_grid(grid)
         self.algorithm = algorithm
+        self.oracle = oracle if oracle is not None else DistanceOracle(self.grid)
         
-        # Initialize pathfinder
+        # Initialize pathfinder (next moves come from the oracle's tables,
+        # except for the searches picked per maze topology: incremental,
+        # bidirectional and jump point, which search on every move)
         if algorithm == 'astar':
-            self.pathfinder = AStar(grid)
+            self.pathfinder = AStar(self.grid, self.oracle)
+        elif algorithm == 'incremental':
+            self.pathfinder = IncrementalAStar(self.grid)
+        elif algorithm == 'bidirectional':
+            self.pathfinder = BidirectionalBFS(self.grid)
+        elif algorithm == 'jps':
+            self.pathfinder = JumpPointSearch(self.grid)
         else:
-            from ..pathfinding.bfs import BFS
-            self.pathfinder = BFS(grid)
+            self.pathfinder = BFS(self.grid, self.oracle)
         
         # State
         self.position = None
         self.mode = 'chase'  # 'chase', 'scatter', 'frightened'
-    
+        self.scatter_target = None  # Home corner, set by each ghost
+
     @abstractmethod
     def get_target(self, pacman_pos, pacman_dir=None, other_ghosts=None):
         """
@@ -56,6 +73,32 @@ class GhostAgent(ABC):
         """
         pass
     
+    def plan_targets(self, pacman_rows, pacman_cols, dir_rows, dir_cols):
+        """
+        Precompute targets for a whole trajectory with NumPy.
+        
+        Args:
+            pacman_rows, pacman_cols: Pac-Man cell per frame (int arrays)
+            dir_rows, dir_cols: Pac-Man direction step per frame, (0, 0)
+                when there is none (see targets.pacman_arrays)
+        
+        Returns:
+            list: Per-frame plan read by planned_target, or None when the
+                targets depend on state only known while simulating
+        """
+        return None
+    
+    def planned_target(self, plan, frame, pacman_pos, other_ghosts=None):
+        """
+        Target for a frame from a plan made by plan_targets.
+        
+        Returns:
+            tuple: Target position (row, col), equal to get_target's
+        """
+        if self.mode == 'scatter':
+            return self.scatter_target
+        return plan[frame]
+    
     def get_next_move(self, pacman_pos, pacman_dir=None, other_ghosts=None):
         """
         Determine the next move for this ghost.
@@ -74,13 +117,20 @@ class GhostAgent(ABC):
         # Get target based on ghost behavior
         target = self.get_target(pacman_pos, pacman_dir, other_ghosts)
         
-        if target is None:
+        return self.move_towards(target)
+    
+    def move_towards(self, target):
+        """
+        Next move towards a target from the ghost's current position.
+        
+        Returns:
+            tuple: Next position (row, col) or None
+        """
+        if self.position is None or target is None:
             return None
         
         # Use pathfinding to determine next move
-        next_pos = self.pathfinder.find_next_move(self.position, target)
-        
-        return next_pos
+        return self.pathfinder.find_next_move(self.position, target)
     
     def set_position(self, position):
         """Set ghost's current position. If position is in a wall, find nearest valid position."""
@@ -101,15 +151,17 @@ class GhostAgent(ABC):
     
     def _is_position_valid(self, pos):
         """Check if position is walkable."""
-        row, col = pos
-        if 0 <= row < len(self.grid) and 0 <= col < len(self.grid[0]):
-            return self.grid[row][col] == 0
-        return False
+        return self.grid.is_walkable(pos)
     
     def _find_nearest_walkable(self, pos):
-        """Find nearest walkable cell using BFS."""
+        """Find nearest walkable cell (table lookup, BFS outside the grid)."""
         from collections import deque
         
+        idx = self.grid.index(pos)
+        if idx >= 0:
+            nearest = int(self.grid.nearest_walkable[idx])
+            return self.grid.positions[nearest] if nearest >= 0 else None
+        
         row, col = pos
         visited = set()
         queue = deque([(row, col, 0)])  # (row, col, distance)
@@ -125,19 +177,25 @@ class GhostAgent(ABC):
             # Explore neighbors
             for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
                 nr, nc = r + dr, c + dc
-                if (nr, nc) not in visited and 0 <= nr < len(self.grid) and 0 <= nc < len(self.grid[0]):
+                if (nr, nc) not in visited and 0 <= nr < self.grid.rows and 0 <= nc < self.grid.cols:
                     visited.add((nr, nc))
                     queue.append((nr, nc, dist + 1))
         
         return None
     
+    def _snap_target(self, target, fallback):
+        """Nearest walkable cell to an in-grid target (table lookup), or fallback."""
+        idx = self.grid.index(target)
+        nearest = int(self.grid.nearest_walkable[idx]) if idx >= 0 else -1
+        return self.grid.positions[nearest] if nearest >= 0 else fallback
+    
     def set_mode(self, mode):
         """Set ghost's behavior mode."""
         self.mode = mode
     
     def distance_to(self, target):
-        """Calculate Manhattan distance to target."""
+        """Calculate Manhattan distance to target (shortened through tunnels)."""
         if self.position is None or target is None:
             return float('inf')
-        return manhattan_distance(self.position, target)
+        return self.grid.distance_bound(self.position, target)
 
@@ -1,6 +1,7 @@
 """Blinky (Red Ghost) - The Chaser."""
 
 from .base_agent import GhostAgent
+from .targets import as_cells
 
 
 class BlinkyAgent(GhostAgent):
@@ -15,10 +16,10 @@ class BlinkyAgent(GhostAgent):
     In scatter mode: Targets top-right corner
     """
     
-    def __init__(self, grid, algorithm='astar'):
+    def __init__(self, grid, algorithm='astar', oracle=None):
         """Initialize Blinky agent."""
-        super().__init__('blinky', grid, algorithm)
-        self.scatter_target = (0, len(grid[0]) - 1) if grid and grid[0] else (0, 0)
+        super().__init__('blinky', grid, algorithm, oracle)
+        self.scatter_target = (0, self.grid.cols - 1) if self.grid.cols else (0, 0)
     
     def get_target(self, pacman_pos, pacman_dir=None, other_ghosts=None):
         """
@@ -40,4 +41,8 @@ class BlinkyAgent(GhostAgent):
         
         # Chase mode: target Pacman directly
         return pacman_pos
+    
+    def plan_targets(self, pacman_rows, pacman_cols, dir_rows, dir_cols):
+        """Chase targets for a whole trajectory: Pac-Man's cells."""
+        return as_cells(pacman_rows, pacman_cols)
 
@@ -1,6 +1,7 @@
 """Clyde (Orange Ghost) - The Random/Scared."""
 
 from .base_agent import GhostAgent
+from .targets import as_cells
 
 
 class ClydeAgent(GhostAgent):
@@ -16,7 +17,7 @@ class ClydeAgent(GhostAgent):
     In scatter mode: Targets bottom-left corner
     """
     
-    def __init__(self, grid, algorithm='astar', retreat_distance=8):
+    def __init__(self, grid, algorithm='astar', retreat_distance=8, oracle=None):
         """
         Initialize Clyde agent.
         
@@ -24,11 +25,12 @@ class ClydeAgent(GhostAgent):
             grid: Maze grid
             algorithm: Pathfinding algorithm
             retreat_distance: Distance threshold to switch from chase to retreat
+            oracle: Shared DistanceOracle for this grid
         """
-        super().__init__('clyde', grid, algorithm)
+        super().__init__('clyde', grid, algorithm, oracle)
         self.retreat_distance = retreat_distance
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if grid else 0
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
         self.scatter_target = (self.rows - 1, 0)
     
     def get_target(self, pacman_pos, pacman_dir=None, other_ghosts=None):
@@ -61,4 +63,22 @@ class ClydeAgent(GhostAgent):
         else:
             # If close, retreat to scatter corner
             return self.scatter_target
+    
+    def plan_targets(self, pacman_rows, pacman_cols, dir_rows, dir_cols):
+        """
+        Pac-Man's cells for a whole trajectory.
+        
+        Whether Clyde chases or retreats depends on his own position, so
+        planned_target decides per frame.
+        """
+        return as_cells(pacman_rows, pacman_cols)
+    
+    def planned_target(self, plan, frame, pacman_pos, other_ghosts=None):
+        """Target for a frame: Pac-Man when far away, else the scatter corner."""
+        if self.mode == 'scatter':
+            return self.scatter_target
+        
+        if self.distance_to(plan[frame]) > self.retreat_distance:
+            return plan[frame]
+        return self.scatter_target
 
@@ -1,6 +1,7 @@
 """Inky (Cyan Ghost) - The Flanker."""
 
 from .base_agent import GhostAgent
+from .targets import DIRECTION_VECTORS, as_cells, cells_ahead
 
 
 class InkyAgent(GhostAgent):
@@ -16,11 +17,11 @@ class InkyAgent(GhostAgent):
     In scatter mode: Targets bottom-right corner
     """
     
-    def __init__(self, grid, algorithm='astar'):
+    def __init__(self, grid, algorithm='astar', oracle=None):
         """Initialize Inky agent."""
-        super().__init__('inky', grid, algorithm)
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if grid else 0
+        super().__init__('inky', grid, algorithm, oracle)
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
         self.scatter_target = (self.rows - 1, self.cols - 1)
     
     def get_target(self, pacman_pos, pacman_dir=None, other_ghosts=None):
@@ -53,6 +54,30 @@ class InkyAgent(GhostAgent):
         # Calculate point 2 tiles ahead of Pacman
         intermediate = self._get_position_ahead(pacman_pos, pacman_dir, 2)
         
+        return self._flank_target(intermediate, blinky_pos, pacman_pos)
+    
+    def plan_targets(self, pacman_rows, pacman_cols, dir_rows, dir_cols):
+        """
+        Points 2 tiles ahead of Pac-Man for a whole trajectory.
+        
+        The rest of the target depends on where Blinky is, which is only
+        known while simulating; planned_target finishes it per frame.
+        """
+        return as_cells(*cells_ahead(self.grid, pacman_rows, pacman_cols, dir_rows, dir_cols, 2))
+    
+    def planned_target(self, plan, frame, pacman_pos, other_ghosts=None):
+        """Target for a frame from the precomputed look-ahead points."""
+        if self.mode == 'scatter':
+            return self.scatter_target
+        
+        blinky_pos = other_ghosts.get('blinky') if other_ghosts else None
+        if blinky_pos is None:
+            return pacman_pos
+        
+        return self._flank_target(plan[frame], blinky_pos, pacman_pos)
+    
+    def _flank_target(self, intermediate, blinky_pos, pacman_pos):
+        """Double the Blinky -> intermediate vector; snap walls to walkable cells."""
         # Calculate vector from Blinky to intermediate point
         vector = (
             intermediate[0] - blinky_pos[0],
@@ -71,7 +96,7 @@ class InkyAgent(GhostAgent):
         
         # If target is a wall, find nearest walkable cell
         if not self._is_walkable(target):
-            target = self._find_nearest_walkable(target, pacman_pos)
+            target = self._snap_target(target, pacman_pos)
         
         return target
     
@@ -82,17 +107,10 @@ class InkyAgent(GhostAgent):
         
         row, col = pos
         
-        direction_vectors = {
-            'UP': (-1, 0),
-            'DOWN': (1, 0),
-            'LEFT': (0, -1),
-            'RIGHT': (0, 1)
-        }
-        
-        if direction not in direction_vectors:
+        if direction not in DIRECTION_VECTORS:
             return pos
         
-        dr, dc = direction_vectors[direction]
+        dr, dc = DIRECTION_VECTORS[direction]
         new_row = max(0, min(row + dr * distance, self.rows - 1))
         new_col = max(0, min(col + dc * distance, self.cols - 1))
         
@@ -100,18 +118,5 @@ class InkyAgent(GhostAgent):
     
     def _is_walkable(self, pos):
         """Check if position is walkable."""
-        row, col = pos
-        return (0 <= row < self.rows and 
-                0 <= col < self.cols and 
-                self.grid[row][col] == 0)
-    
-    def _find_nearest_walkable(self, target, fallback):
-        """Find nearest walkable cell to target."""
-        for radius in range(1, 10):
-            for dr in range(-radius, radius + 1):
-                for dc in range(-radius, radius + 1):
-                    pos = (target[0] + dr, target[1] + dc)
-                    if self._is_walkable(pos):
-                        return pos
-        return fallback
+        return self.grid.is_walkable(pos)
 
@@ -1,6 +1,9 @@
 """Pinky (Pink Ghost) - The Ambusher."""
 
+import numpy as np
+
 from .base_agent import GhostAgent
+from .targets import DIRECTION_VECTORS, as_cells, cells_ahead, snap_to_walkable
 
 
 class PinkyAgent(GhostAgent):
@@ -15,7 +18,7 @@ class PinkyAgent(GhostAgent):
     In scatter mode: Targets top-left corner
     """
     
-    def __init__(self, grid, algorithm='astar', prediction_distance=4):
+    def __init__(self, grid, algorithm='astar', prediction_distance=4, oracle=None):
         """
         Initialize Pinky agent.
         
@@ -23,13 +26,14 @@ class PinkyAgent(GhostAgent):
             grid: Maze grid
             algorithm: Pathfinding algorithm
             prediction_distance: How many tiles ahead to target
+            oracle: Shared DistanceOracle for this grid
         """
-        super().__init__('pinky', grid, algorithm)
+        super().__init__('pinky', grid, algorithm, oracle)
         self.prediction_distance = prediction_distance
         self.scatter_target = (0, 0)
         
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if grid else 0
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
     
     def get_target(self, pacman_pos, pacman_dir=None, other_ghosts=None):
         """
@@ -56,17 +60,10 @@ class PinkyAgent(GhostAgent):
         # Calculate position ahead of Pacman
         row, col = pacman_pos
         
-        direction_vectors = {
-            'UP': (-1, 0),
-            'DOWN': (1, 0),
-            'LEFT': (0, -1),
-            'RIGHT': (0, 1)
-        }
-        
-        if pacman_dir not in direction_vectors:
+        if pacman_dir not in DIRECTION_VECTORS:
             return pacman_pos
         
-        dr, dc = direction_vectors[pacman_dir]
+        dr, dc = DIRECTION_VECTORS[pacman_dir]
         target_row = row + (dr * self.prediction_distance)
         target_col = col + (dc * self.prediction_distance)
         
@@ -77,26 +74,28 @@ class PinkyAgent(GhostAgent):
         # If target is a wall, find nearest walkable cell
         target = (target_row, target_col)
         if not self._is_walkable(target):
-            target = self._find_nearest_walkable(target, pacman_pos)
+            target = self._snap_target(target, pacman_pos)
         
         return target
     
+    def plan_targets(self, pacman_rows, pacman_cols, dir_rows, dir_cols):
+        """Chase targets for a whole trajectory (vectorised get_target)."""
+        ahead_rows, ahead_cols = cells_ahead(
+            self.grid, pacman_rows, pacman_cols, dir_rows, dir_cols,
+            self.prediction_distance
+        )
+        
+        # Without a direction Pinky targets Pac-Man as is
+        moving = (dir_rows != 0) | (dir_cols != 0)
+        target_rows, target_cols = snap_to_walkable(
+            self.grid, ahead_rows, ahead_cols, pacman_rows, pacman_cols
+        )
+        return as_cells(
+            np.where(moving, target_rows, pacman_rows),
+            np.where(moving, target_cols, pacman_cols)
+        )
+    
     def _is_walkable(self, pos):
         """Check if position is walkable."""
-        row, col = pos
-        return (0 <= row < self.rows and 
-                0 <= col < self.cols and 
-                self.grid[row][col] == 0)
-    
-    def _find_nearest_walkable(self, target, fallback):
-        """Find nearest walkable cell to target, or return fallback."""
-        # Search in expanding radius
-        for radius in range(1, 10):
-            for dr in range(-radius, radius + 1):
-                for dc in range(-radius, radius + 1):
-                    pos = (target[0] + dr, target[1] + dc)
-                    if self._is_walkable(pos):
-                        return pos
-        
-        return fallback
+        return self.grid.is_walkable(pos)
 
@@ -0,0 +1,62 @@
+"""Vectorised ghost target computation over whole trajectories."""
+
+import numpy as np
+
+
+# Row/column step of each Pac-Man direction
+DIRECTION_VECTORS = {
+    'UP': (-1, 0),
+    'DOWN': (1, 0),
+    'LEFT': (0, -1),
+    'RIGHT': (0, 1)
+}
+
+
+def pacman_arrays(positions, directions):
+    """
+    Pac-Man positions and direction steps of a trajectory as int arrays.
+
+    Args:
+        positions: (row, col) per frame
+        directions: Direction name per frame; None or unknown names step (0, 0)
+
+    Returns:
+        tuple: (rows, cols, dir_rows, dir_cols) arrays, one entry per frame
+    """
+    cells = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+    steps = np.array(
+        [DIRECTION_VECTORS.get(direction, (0, 0)) for direction in directions],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    return cells[:, 0], cells[:, 1], steps[:, 0], steps[:, 1]
+
+
+def cells_ahead(grid, rows, cols, dir_rows, dir_cols, distance):
+    """
+    Cells `distance` tiles ahead, clamped to the grid.
+
+    Frames without a direction keep their (unclamped) cell, as the
+    per-frame look-ahead does.
+    """
+    moving = (dir_rows != 0) | (dir_cols != 0)
+    ahead_rows = np.clip(rows + dir_rows * distance, 0, grid.rows - 1)
+    ahead_cols = np.clip(cols + dir_cols * distance, 0, grid.cols - 1)
+    return np.where(moving, ahead_rows, rows), np.where(moving, ahead_cols, cols)
+
+
+def snap_to_walkable(grid, rows, cols, fallback_rows, fallback_cols):
+    """
+    Nearest walkable cell of in-grid cells (walkable cells stay put),
+    from the grid's nearest_walkable table; fallback where there is none.
+    """
+    nearest = grid.nearest_walkable[rows * grid.cols + cols]
+    found = nearest >= 0
+    return (
+        np.where(found, nearest // grid.cols, fallback_rows),
+        np.where(found, nearest % grid.cols, fallback_cols)
+    )
+
+
+def as_cells(rows, cols):
+    """(row, col) tuples of plain ints, one per frame."""
+    return list(zip(rows.tolist(), cols.tolist()))
@@ -8,6 +8,7 @@ import sys
 import os
 import json
 import argparse
+import time
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -25,7 +26,19 @@ from maze.pellets import (
     ClassicPelletPlacer
 )
 from utils.maze_converter import internal_to_grid
+from utils.rng import make_rng, normalize_seed
+from utils.maze_catalog import catalog_key, get_catalog
+from simulation.fast_engine import FastGameEngine
 from simulation.game_engine import GameEngine
+from simulation.self_play import PACMAN_CLASSES, SelfPlayEngine
+from simulation.sweep import run_sweep
+from simulation.frame_codec import encode_frames
+from simulation.trajectory_file import (
+    EXTENSION as TRAJECTORY_EXTENSION,
+    is_trajectory_file,
+    open_trajectory,
+    write_trajectory
+)
 
 
 def make_symmetric(grid):
@@ -53,89 +66,218 @@ def make_symmetric(grid):
     return grid
 
 
-def generate_maze(args):
-    """Generate a maze based on command arguments."""
-    width = args.width
-    height = args.height
-    algorithm = args.algorithm.lower()
-    imperfection = args.imperfection
-    tunnels_h = args.tunnels_h
-    tunnels_v = args.tunnels_v
-    symmetric = getattr(args, 'symmetric', False)
+def create_maze(width, height, algorithm='kruskal', imperfection=0,
+                tunnels_h=1, tunnels_v=0, symmetric=False, seed=None):
+    """
+    Run the generation pipeline in memory.
+    
+    Generator -> MazeImperfecteur -> internal_to_grid -> optional
+    make_symmetric. Generator and imperfecteur draw from one stream, so a
+    seed reproduces the whole maze.
     
+    Returns:
+        tuple: (grid, tunnel_rows, tunnel_cols)
+    """
     # Select generator
     generators = {
-        'kruskal': KruskalGenerator(),
-        'prim': PrimGenerator(),
-        'recursive_backtracker': RecursiveBacktrackerGenerator(),
-        'wilson': WilsonGenerator()
+        'kruskal': KruskalGenerator,
+        'prim': PrimGenerator,
+        'recursive_backtracker': RecursiveBacktrackerGenerator,
+        'wilson': WilsonGenerator
     }
     
     if algorithm not in generators:
-        return {'error': f'Unknown algorithm: {algorithm}'}
+        raise ValueError(f'Unknown algorithm: {algorithm}')
+    
+    rng = make_rng(seed)
+    
+    # Generate maze
+    maze, remaining_walls = generators[algorithm](seed=rng).generate(width, height)
+    
+    # Make imperfect if requested
+    imperfecteur = MazeImperfecteur(seed=rng)
+    maze, tunnel_rows, tunnel_cols = imperfecteur.make_imperfect(
+        maze, remaining_walls, imperfection, width, height, tunnels_h, tunnels_v
+    )
+    
+    # Convert to grid format
+    grid = internal_to_grid(maze, width, height, tunnel_rows, tunnel_cols)
+    
+    # Make symmetric if requested
+    if symmetric:
+        grid = make_symmetric(grid)
+    
+    return grid, tunnel_rows, tunnel_cols
+
+
+def create_placer(algorithm, args, seed=None):
+    """
+    Build a pellet placer from the pellet options in args.
+    
+    Raises:
+        ValueError: For an unknown algorithm
+    """
+    placers = {
+        'random': lambda: RandomPelletPlacer(density=args.density, seed=seed),
+        'strategic': lambda: StrategicPelletPlacer(
+            corridor_density=args.corridor_density,
+            junction_density=args.junction_density,
+            seed=seed
+        ),
+        'classic': lambda: ClassicPelletPlacer(seed=seed)
+    }
+    
+    if algorithm not in placers:
+        raise ValueError(f'Unknown pellet algorithm: {algorithm}')
+    
+    return placers[algorithm]()
+
+
+def maze_result(args, grid, tunnel_rows, tunnel_cols):
+    """Response of the generate and build commands."""
+    return {
+        'success': True,
+        'grid': grid,
+        'width': args.width,
+        'height': args.height,
+        'algorithm': args.algorithm.lower(),
+        'imperfection': args.imperfection,
+        'tunnels': {
+            'horizontal': list(tunnel_rows),
+            'vertical': list(tunnel_cols)
+        },
+        'symmetric': getattr(args, 'symmetric', False),
+        'seed': getattr(args, 'seed', None)
+    }
+
+
+def generate_maze(args, rng=None):
+    """
+    Generate a maze based on command arguments.
     
+    Args:
+        args: Parsed arguments
+        rng: Optional random.Random to draw from instead of args.seed
+    """
     try:
-        # Generate maze
-        generator = generators[algorithm]
-        maze, remaining_walls = generator.generate(width, height)
-        
-        # Make imperfect if requested
-        imperfecteur = MazeImperfecteur()
-        maze, tunnel_rows, tunnel_cols = imperfecteur.make_imperfect(
-            maze, remaining_walls, imperfection, width, height, tunnels_h, tunnels_v
+        grid, tunnel_rows, tunnel_cols = create_maze(
+            args.width, args.height, args.algorithm.lower(), args.imperfection,
+            args.tunnels_h, args.tunnels_v, getattr(args, 'symmetric', False),
+            seed=rng if rng is not None else normalize_seed(getattr(args, 'seed', None))
         )
         
-        # Convert to grid format
-        grid = internal_to_grid(maze, width, height, tunnel_rows, tunnel_cols)
-        
-        # Make symmetric if requested
-        if symmetric:
-            grid = make_symmetric(grid)
-        
-        return {
-            'success': True,
-            'grid': grid,
-            'width': width,
-            'height': height,
-            'algorithm': algorithm,
-            'imperfection': imperfection,
-            'tunnels': {
-                'horizontal': list(tunnel_rows),
-                'vertical': list(tunnel_cols)
-            },
-            'symmetric': symmetric
-        }
+        return maze_result(args, grid, tunnel_rows, tunnel_cols)
     except Exception as e:
         return {'error': str(e)}
 
 
+def build_maze(args):
+    """
+    Generate a maze and place its pellets in one call.
+    
+    Same as 'generate' followed by 'pellets', without sending the grid
+    back and forth between processes. With a seed, generation and
+    placement share one stream, so the final grid is reproducible and
+    is served from the maze catalogue on repeated requests.
+    """
+    pellet_algorithm = getattr(args, 'pellets', None)
+    pellet_algorithm = pellet_algorithm.lower() if pellet_algorithm else None
+    
+    try:
+        # Keyed and seeded by the same value ('42' is seed 42)
+        seed = normalize_seed(getattr(args, 'seed', None))
+        key = catalog_key(
+            args.width, args.height, args.algorithm, args.imperfection,
+            args.tunnels_h, args.tunnels_v, getattr(args, 'symmetric', False),
+            seed, pellet_algorithm,
+            getattr(args, 'density', None), getattr(args, 'corridor_density', None),
+            getattr(args, 'junction_density', None)
+        )
+    except (TypeError, ValueError, AttributeError) as e:
+        return {'error': str(e)}
+    
+    catalog = get_catalog()
+    cached = catalog.get(key) if key else None
+    if cached is not None:
+        result = maze_result(args, *cached)
+        result['pelletAlgorithm'] = pellet_algorithm
+        result['cached'] = True
+        return result
+    
+    rng = make_rng(seed)
+    result = generate_maze(args, rng)
+    if 'error' in result:
+        return result
+    
+    if pellet_algorithm:
+        try:
+            placer = create_placer(pellet_algorithm, args, rng)
+            result['grid'] = placer.place_pellets(result['grid'])
+        except Exception as e:
+            return {'error': str(e)}
+    
+    if key:
+        tunnels = result['tunnels']
+        catalog.put(key, result['grid'], tunnels['horizontal'], tunnels['vertical'])
+    
+    result['pelletAlgorithm'] = pellet_algorithm
+    result['cached'] = False
+    return result
+
+
+def catalog_stats(args):
+    """Hit/miss counters of this process's maze catalogue."""
+    return {'success': True, 'catalog': get_catalog().stats()}
+
+
+def load_json_input(args, path, argument):
+    """
+    Load JSON from a file, or from stdin for '-'.
+    
+    Raises:
+        ValueError: '-' in worker mode, where stdin carries the requests
+    """
+    if path in (None, '-'):
+        stdin = getattr(args, 'stdin', sys.stdin)
+        if stdin is None:
+            raise ValueError(f'{argument} cannot be read from stdin in worker mode; '
+                             'pass the data inline in the request params')
+        return json.load(stdin)
+    
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_grid(args):
+    """
+    Load a grid from the command arguments.
+    
+    Accepts an inline grid (worker mode), a JSON string or a JSON file
+    ('-' for stdin, outside worker mode) containing either a bare grid or
+    an object with a 'grid' key. Prefer a file or stdin: large grids exceed argv limits.
+    """
+    grid = getattr(args, 'grid', None)
+    if grid is not None:
+        return grid
+    
+    if getattr(args, 'grid_file', None):
+        data = load_json_input(args, args.grid_file, '--grid-file')
+    else:
+        data = json.loads(args.grid_json)
+    
+    if isinstance(data, dict):
+        return data['grid']
+    return data
+
+
 def place_pellets(args):
     """Place pellets on a maze grid."""
-    # Load grid from stdin or file
-    if args.grid_file:
-        with open(args.grid_file, 'r') as f:
-            data = json.load(f)
-            grid = data['grid']
-    else:
-        grid = json.loads(args.grid_json)
+    grid = load_grid(args)
     
     algorithm = args.algorithm.lower()
     
-    # Select pellet placer
-    placers = {
-        'random': RandomPelletPlacer(density=args.density),
-        'strategic': StrategicPelletPlacer(
-            corridor_density=args.corridor_density,
-            junction_density=args.junction_density
-        ),
-        'classic': ClassicPelletPlacer()
-    }
-    
-    if algorithm not in placers:
-        return {'error': f'Unknown pellet algorithm: {algorithm}'}
-    
     try:
-        placer = placers[algorithm]
+        placer = create_placer(algorithm, args, getattr(args, 'seed', None))
         result_grid = placer.place_pellets(grid)
         
         return {
@@ -147,85 +289,544 @@ def place_pellets(args):
         return {'error': str(e)}
 
 
-def simulate_game(args):
-    """Simulate a game with ghosts."""
-    # Load data
-    with open(args.trajectory_file, 'r') as f:
-        trajectory_data = json.load(f)
+def load_simulation(args):
+    """
+    Load the inputs of a simulate command.
+    
+    Returns:
+        tuple: (grid, trajectory, ghost_configs)
+    """
+    # Worker mode passes the trajectory inline
+    trajectory = getattr(args, 'trajectory', None)
+    if trajectory is None and is_trajectory_file(args.trajectory_file):
+        # Columnar file: mapped, and read by the engines without move dicts
+        trajectory = open_trajectory(args.trajectory_file)
+    elif trajectory is None:
+        with open(args.trajectory_file, 'r') as f:
+            trajectory_data = json.load(f)
+        trajectory = trajectory_data.get('moves', [])
+    
+    grid = load_grid(args)
     
-    trajectory = trajectory_data.get('moves', [])
+    ghost_configs = args.ghost_configs
+    if isinstance(ghost_configs, str):
+        ghost_configs = json.loads(ghost_configs)
     
-    with open(args.grid_file, 'r') as f:
-        grid_data = json.load(f)
-        grid = grid_data['grid']
+    return grid, trajectory, ghost_configs
+
+
+def close_trajectory(trajectory):
+    """
+    Release a trajectory from load_simulation.
+    
+    Mapped .ptrj files hold a mapping and a file descriptor until closed,
+    which a long-lived worker must not leave to the garbage collector.
+    """
+    close = getattr(trajectory, 'close', None)
+    if close is not None:
+        close()
+
+
+def pack_trajectory(args):
+    """
+    Convert a JSON trajectory (document or bare moves list) to a .ptrj file.
     
-    ghost_configs = json.loads(args.ghost_configs)
+    The output defaults to the input path with the .ptrj extension.
+    """
+    try:
+        with open(args.trajectory_file, 'r') as f:
+            data = json.load(f)
+        moves = data.get('moves', []) if isinstance(data, dict) else data
+        
+        output = args.output or os.path.splitext(args.trajectory_file)[0] + TRAJECTORY_EXTENSION
+        write_trajectory(output, moves)
+        
+        return {
+            'success': True,
+            'path': output,
+            'moves': len(moves),
+            'bytes': os.path.getsize(output)
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def simulate_game(args):
+    """Simulate a game with ghosts."""
+    grid, trajectory, ghost_configs = load_simulation(args)
     
     try:
-        engine = GameEngine(grid, ghost_configs)
+        engine = FastGameEngine(
+            grid, ghost_configs,
+            profile=getattr(args, 'profile', False),
+            stop_policy=getattr(args, 'stop_policy', None)
+        )
         results = engine.simulate(trajectory)
         
+        if getattr(args, 'compact_frames', False):
+            results['compactFrames'] = encode_frames(results.pop('frames'))
+        
         return {
             'success': True,
             **results
         }
     except Exception as e:
         return {'error': str(e)}
+    finally:
+        close_trajectory(trajectory)
 
 
-def main():
-    """Main CLI entry point."""
+def stream_simulation(args, out=None):
+    """
+    Simulate a game, writing NDJSON to out as frames are produced.
+    
+    One line per frame, then a final summary line marked with "done":
+        {"timestamp": 0, "pacman": {...}, "ghosts": [...], "caught": false}
+        ...
+        {"done": true, "success": true, "caught": ..., "totalFrames": ...}
+    
+    With --profile the summary line also carries 'profile', and with
+    --stop-policy the early-exit counters. Errors end the stream with
+    {"done": true, "error": ...}.
+    """
+    out = out or sys.stdout
+    trajectory = None
+    
+    try:
+        grid, trajectory, ghost_configs = load_simulation(args)
+        profile = getattr(args, 'profile', False)
+        engine = GameEngine(
+            grid, ghost_configs, profile=profile, stop_policy=getattr(args, 'stop_policy', None)
+        )
+        tally = engine.new_tally()
+        start = time.perf_counter()
+        
+        frame = None
+        total_frames = 0
+        for frame in engine.iter_frames(trajectory, tally):
+            out.write(json.dumps(frame) + '\n')
+            total_frames += 1
+        
+        if tally is None:
+            results = engine.summarize(frame, total_frames)
+        else:
+            results = engine.tally_results(tally, total_frames)
+        summary = {'done': True, 'success': True, **results}
+        if profile:
+            summary['profile'] = engine.search_profile(
+                engine.ghosts, time.perf_counter() - start, engine.oracle.tables_built
+            )
+    except Exception as e:
+        summary = {'done': True, 'error': str(e)}
+    finally:
+        close_trajectory(trajectory)
+    
+    out.write(json.dumps(summary) + '\n')
+    out.flush()
+
+
+def load_batch(args):
+    """
+    Load a simulate-batch payload.
+    
+    Worker mode passes the fields inline; otherwise they are read from
+    --input-file ('-' for stdin) as one JSON object:
+        {"grid": [...], "trajectories": [...], "ghostConfigSets": [...],
+         "includeFrames": false, "stopPolicy": "catches:3"}
+    
+    Returns:
+        tuple: (grid, trajectories, ghost_config_sets, include_frames,
+            stop_policy)
+    """
+    if getattr(args, 'trajectories', None) is not None:
+        payload = {
+            'grid': args.grid,
+            'trajectories': args.trajectories,
+            'ghostConfigSets': args.ghost_config_sets,
+            'includeFrames': args.include_frames
+        }
+    else:
+        payload = load_json_input(args, args.input_file, '--input-file')
+    
+    # Trajectories may be bare move lists or trajectory documents
+    trajectories = [
+        t.get('moves', []) if isinstance(t, dict) else t
+        for t in payload['trajectories']
+    ]
+    include_frames = bool(payload.get('includeFrames')) or bool(getattr(args, 'include_frames', False))
+    stop_policy = getattr(args, 'stop_policy', None) or payload.get('stopPolicy')
+    
+    return payload['grid'], trajectories, payload['ghostConfigSets'], include_frames, stop_policy
+
+
+def simulate_batch(args):
+    """Simulate many trajectories against many ghost configurations."""
+    grid, trajectories, ghost_config_sets, include_frames, stop_policy = load_batch(args)
+    
+    try:
+        runs = run_sweep(
+            grid,
+            trajectories,
+            ghost_config_sets,
+            workers=args.workers,
+            include_frames=include_frames,
+            seed=args.seed,
+            profile=getattr(args, 'profile', False),
+            stop_policy=stop_policy
+        )
+        
+        if include_frames and getattr(args, 'compact_frames', False):
+            for run in runs:
+                run['compactFrames'] = encode_frames(run.pop('frames'))
+        
+        return {
+            'success': True,
+            'totalRuns': len(runs),
+            'runs': runs
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def self_play(args):
+    """
+    Play a Pac-Man AI against ghosts headlessly.
+    
+    Each game's 'moves' is a trajectory in the recorded format, so games
+    can be stored or replayed like human recordings. Games of the search
+    agent also report its depth and nodes per second under 'search'.
+    With --save-dir every game is also written there as a .ptrj file,
+    named in 'trajectoryFile'.
+    """
+    grid = load_grid(args)
+    
+    ghost_configs = args.ghost_configs
+    if isinstance(ghost_configs, str):
+        ghost_configs = json.loads(ghost_configs)
+    pacman_start = getattr(args, 'pacman_start', None)
+    if isinstance(pacman_start, str):
+        pacman_start = json.loads(pacman_start)
+    
+    pacman_options = None
+    budget_ms = getattr(args, 'budget_ms', None)
+    if budget_ms is not None and args.agent == 'search':
+        pacman_options = {'budget_ms': budget_ms}
+    
+    try:
+        engine = SelfPlayEngine(
+            grid, ghost_configs,
+            pacman=args.agent,
+            pacman_start=pacman_start,
+            seed=getattr(args, 'seed', None),
+            stop_policy=getattr(args, 'stop_policy', None),
+            pacman_options=pacman_options
+        )
+        games = engine.play_many(args.games, args.max_frames)
+        
+        save_dir = getattr(args, 'save_dir', None)
+        if save_dir:
+            # Seeded games are named by their seed (replays overwrite them)
+            seed = getattr(args, 'seed', None)
+            prefix = f'{engine.pacman_name}-{seed if seed is not None else time.time_ns()}'
+            for game in games:
+                name = f"{prefix}-{game['gameIndex']}{TRAJECTORY_EXTENSION}"
+                game['trajectoryFile'] = os.path.join(save_dir, name)
+                write_trajectory(game['trajectoryFile'], game['moves'])
+        
+        return {
+            'success': True,
+            'agent': engine.pacman_name,
+            'totalGames': len(games),
+            'games': games
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+COMMANDS = {
+    'generate': generate_maze,
+    'build': build_maze,
+    'catalog-stats': catalog_stats,
+    'pellets': place_pellets,
+    'simulate': simulate_game,
+    'simulate-batch': simulate_batch,
+    'self-play': self_play,
+    'pack-trajectory': pack_trajectory
+}
+
+
+def _namespace_from_params(subparser, params):
+    """
+    Build an argparse namespace for a worker request.
+    
+    Starts from the subcommand's declared defaults so handlers see the
+    same attributes as in one-shot CLI mode, then applies the request
+    params (keys are argument dests, e.g. 'tunnels_h'). Each param goes
+    through its argument's type and choices as on the command line, so
+    {"width": "10"} and {"seed": "42"} give the ints of --width 10 and
+    --seed 42.
+    
+    Raises:
+        ValueError: A param its argument's type rejects, or not one of
+            its choices
+    """
+    actions = {
+        action.dest: action
+        for action in subparser._actions
+        if action.dest != 'help'
+    }
+    values = {dest: action.default for dest, action in actions.items()}
+    
+    for dest, value in (params or {}).items():
+        action = actions.get(dest)
+        if action is not None and value is not None:
+            value = _convert_param(action, value)
+        values[dest] = value
+    
+    return argparse.Namespace(**values)
+
+
+def _convert_param(action, value):
+    """A request param as argparse would parse it for action."""
+    name = '/'.join(action.option_strings) or action.dest
+    
+    if action.type is not None:
+        # JSON numbers are taken as they are, so long as the type keeps
+        # them (42.5 is not an int argument, as '42.5' is not)
+        text = value if isinstance(value, str) else json.dumps(value)
+        try:
+            value = action.type(text)
+        except (TypeError, ValueError):
+            raise ValueError(f'argument {name}: invalid {action.type.__name__} value: {value!r}')
+    
+    if action.choices is not None and value not in action.choices:
+        choices = ', '.join(map(repr, action.choices))
+        raise ValueError(f'argument {name}: invalid choice: {value!r} (choose from {choices})')
+    
+    return value
+
+
+def handle_request(parser, request):
+    """
+    Execute a single worker request.
+    
+    Args:
+        parser: Top-level CLI parser (used for per-command defaults)
+        request: Dict {'id': ..., 'command': ..., 'params': {...}}
+    
+    Returns:
+        dict: Command result (always JSON serialisable)
+    """
+    command = request.get('command')
+    
+    if command == 'ping':
+        return {'success': True, 'pid': os.getpid()}
+    
+    if command not in COMMANDS:
+        return {'error': f'Unknown command: {command}'}
+    
+    subparser = parser.subcommands[command]
+    try:
+        args = _namespace_from_params(subparser, request.get('params'))
+    except ValueError as e:
+        return {'error': str(e)}
+    # stdin is the request stream: inputs must come inline in the params
+    args.stdin = None
+    
+    try:
+        return COMMANDS[command](args)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def serve(parser, stdin=None, stdout=None):
+    """
+    Run as a long-lived worker.
+    
+    Reads newline-delimited JSON requests from stdin and writes one JSON
+    response line per request to stdout, tagged with the request id:
+    
+        -> {"id": 1, "command": "generate", "params": {"width": 10, ...}}
+        <- {"id": 1, "result": {"success": true, "grid": [...], ...}}
+    
+    Modules stay imported between requests, so only the first request
+    pays for interpreter startup. A 'shutdown' command or EOF exits.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {'id': None, 'result': {'error': f'Invalid request: {e}'}}
+        else:
+            if request.get('command') == 'shutdown':
+                stdout.write(json.dumps({'id': request.get('id'), 'result': {'success': True}}) + '\n')
+                stdout.flush()
+                break
+            response = {'id': request.get('id'), 'result': handle_request(parser, request)}
+        
+        stdout.write(json.dumps(response) + '\n')
+        stdout.flush()
+
+
+def add_generation_arguments(parser):
+    """Arguments shared by the generate and build commands."""
+    parser.add_argument('width', type=int, help='Maze width (3-1000)')
+    parser.add_argument('height', type=int, help='Maze height (3-1000)')
+    parser.add_argument('--algorithm', default='kruskal',
+                        choices=['kruskal', 'prim', 'recursive_backtracker', 'wilson'],
+                        help='Generation algorithm')
+    parser.add_argument('--imperfection', type=float, default=0,
+                        help='Imperfection level (0-100 or 0.0-1.0)')
+    parser.add_argument('--tunnels-h', type=int, default=1,
+                        help='Number of horizontal tunnels')
+    parser.add_argument('--tunnels-v', type=int, default=0,
+                        help='Number of vertical tunnels')
+    parser.add_argument('--symmetric', action='store_true',
+                        help='Make maze symmetric (like classic Pac-Man)')
+    add_seed_argument(parser)
+
+
+def add_seed_argument(parser):
+    """Optional --seed making random choices reproducible."""
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for reproducible output (default: unseeded)')
+
+
+def add_pellet_density_arguments(parser):
+    """Pellet placer tuning shared by the pellets and build commands."""
+    parser.add_argument('--density', type=float, default=0.7,
+                        help='Pellet density for random algorithm')
+    parser.add_argument('--corridor-density', type=float, default=0.8,
+                        help='Corridor density for strategic algorithm')
+    parser.add_argument('--junction-density', type=float, default=0.4,
+                        help='Junction density for strategic algorithm')
+
+
+def build_parser():
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(description='Pacman Lab Algorithms')
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
     # Maze generation command
     maze_parser = subparsers.add_parser('generate', help='Generate a maze')
-    maze_parser.add_argument('width', type=int, help='Maze width (3-50)')
-    maze_parser.add_argument('height', type=int, help='Maze height (3-50)')
-    maze_parser.add_argument('--algorithm', default='kruskal',
-                           choices=['kruskal', 'prim', 'recursive_backtracker', 'wilson'],
-                           help='Generation algorithm')
-    maze_parser.add_argument('--imperfection', type=float, default=0,
-                           help='Imperfection level (0-100 or 0.0-1.0)')
-    maze_parser.add_argument('--tunnels-h', type=int, default=1,
-                           help='Number of horizontal tunnels')
-    maze_parser.add_argument('--tunnels-v', type=int, default=0,
-                           help='Number of vertical tunnels')
-    maze_parser.add_argument('--symmetric', action='store_true',
-                           help='Make maze symmetric (like classic Pac-Man)')
+    add_generation_arguments(maze_parser)
     
     # Pellet placement command
     pellet_parser = subparsers.add_parser('pellets', help='Place pellets')
-    pellet_parser.add_argument('--grid-file', help='JSON file with grid')
+    pellet_parser.add_argument('--grid-file', help="JSON file with grid ('-' for stdin)")
     pellet_parser.add_argument('--grid-json', help='Grid as JSON string')
     pellet_parser.add_argument('--algorithm', default='strategic',
                              choices=['random', 'strategic', 'classic'],
                              help='Pellet placement algorithm')
-    pellet_parser.add_argument('--density', type=float, default=0.7,
-                             help='Pellet density for random algorithm')
-    pellet_parser.add_argument('--corridor-density', type=float, default=0.8,
-                             help='Corridor density for strategic algorithm')
-    pellet_parser.add_argument('--junction-density', type=float, default=0.4,
-                             help='Junction density for strategic algorithm')
+    add_pellet_density_arguments(pellet_parser)
+    add_seed_argument(pellet_parser)
+    
+    # Fused generate + pellets command
+    build_parser_ = subparsers.add_parser('build', help='Generate a maze and place pellets')
+    add_generation_arguments(build_parser_)
+    build_parser_.add_argument('--pellets', default=None,
+                             choices=['random', 'strategic', 'classic'],
+                             help='Pellet placement algorithm (default: no pellets)')
+    add_pellet_density_arguments(build_parser_)
+    
+    # Maze catalogue counters (per process; the disk store is shared)
+    subparsers.add_parser('catalog-stats', help='Show maze catalogue hit/miss counters')
     
     # Simulation command
     sim_parser = subparsers.add_parser('simulate', help='Simulate game with ghosts')
     sim_parser.add_argument('--trajectory-file', required=True,
-                          help='JSON file with recorded trajectory')
+                          help='JSON or .ptrj file with recorded trajectory')
     sim_parser.add_argument('--grid-file', required=True,
                           help='JSON file with maze grid')
     sim_parser.add_argument('--ghost-configs', required=True,
                           help='Ghost configurations as JSON string')
+    sim_parser.add_argument('--stream', action='store_true',
+                          help='Write one NDJSON line per frame, then a summary line')
+    sim_parser.add_argument('--compact-frames', action='store_true',
+                          help='Return frames delta/RLE encoded as compactFrames')
+    sim_parser.add_argument('--profile', action='store_true',
+                          help='Add per-ghost search counters and timings as profile')
+    sim_parser.add_argument('--stop-policy', default=None,
+                          help="When the run ends: 'first-catch' (default), 'catches:N', "
+                               "'pellets', 'none', or comma-combined rules")
+    
+    # Batch simulation command
+    batch_parser = subparsers.add_parser('simulate-batch',
+                                         help='Simulate many trajectories x ghost configurations')
+    batch_parser.add_argument('--input-file', default='-',
+                            help='JSON payload file (default: stdin)')
+    batch_parser.add_argument('--include-frames', action='store_true',
+                            help='Include per-frame data in each run')
+    batch_parser.add_argument('--compact-frames', action='store_true',
+                            help='Encode included frames as compactFrames')
+    batch_parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes (0 = all cores)')
+    batch_parser.add_argument('--seed', type=int, default=0,
+                            help='Base seed for per-run seeds')
+    batch_parser.add_argument('--profile', action='store_true',
+                            help='Add per-ghost search counters and timings to each run')
+    batch_parser.add_argument('--stop-policy', default=None,
+                            help="When runs end (see simulate --stop-policy)")
+    
+    # Headless AI games
+    play_parser = subparsers.add_parser('self-play', help='Play a Pac-Man AI against ghosts')
+    play_parser.add_argument('--grid-file', help="JSON file with maze grid ('-' for stdin)")
+    play_parser.add_argument('--grid-json', help='Grid as JSON string')
+    play_parser.add_argument('--ghost-configs', required=True,
+                           help='Ghost configurations as JSON string')
+    play_parser.add_argument('--agent', default='greedy', choices=list(PACMAN_CLASSES),
+                           help='Pac-Man AI')
+    play_parser.add_argument('--pacman-start', default=None,
+                           help='Pac-Man start cell as JSON [row, col] (default: near the centre)')
+    play_parser.add_argument('--games', type=int, default=1, help='Number of games')
+    play_parser.add_argument('--max-frames', type=int, default=10000,
+                           help='Frames after which a game ends')
+    play_parser.add_argument('--stop-policy', default=None,
+                           help="When games end (default: 'first-catch,pellets')")
+    play_parser.add_argument('--budget-ms', type=float, default=None,
+                           help="Search time per move in ms (agent 'search', default 10)")
+    play_parser.add_argument('--save-dir', default=None,
+                           help='Also write each game as a .ptrj file here (e.g. data/trajectories)')
+    add_seed_argument(play_parser)
     
+    # Binary trajectory conversion
+    pack_parser = subparsers.add_parser('pack-trajectory',
+                                        help='Convert a JSON trajectory to a .ptrj file')
+    pack_parser.add_argument('--trajectory-file', required=True,
+                           help='JSON file with recorded trajectory')
+    pack_parser.add_argument('--output', default=None,
+                           help='Output .ptrj path (default: next to the input)')
+    
+    # Worker mode
+    subparsers.add_parser('serve', help='Run as a long-lived JSON-lines worker')
+    
+    # Keep subcommand parsers reachable for worker-mode defaults
+    parser.subcommands = subparsers.choices
+    
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    parser = build_parser()
     args = parser.parse_args()
     
     # Execute command
-    if args.command == 'generate':
-        result = generate_maze(args)
-    elif args.command == 'pellets':
-        result = place_pellets(args)
-    elif args.command == 'simulate':
-        result = simulate_game(args)
+    if args.command == 'serve':
+        serve(parser)
+        return
+    elif args.command == 'simulate' and args.stream:
+        stream_simulation(args)
+        return
+    elif args.command in COMMANDS:
+        result = COMMANDS[args.command](args)
     else:
         parser.print_help()
         sys.exit(1)
@@ -1,6 +1,120 @@
 """Base class for maze generators using Strategy pattern."""
 
 from abc import ABC, abstractmethod
+import sys
+import os
+
+import numpy as np
+
+# Add algorithms directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.rng import make_rng
+
+
+# Largest supported maze side, in cells
+MAX_DIMENSION = 1000
+
+
+class MazeWalls:
+    """
+    Integer-indexed wall set shared by the generators.
+    
+    Cells are numbered y * width + x. Walls are numbered with horizontal
+    walls (between (y, x) and (y, x+1)) first, row by row, then vertical
+    walls (between (y, x) and (y+1, x)). Presence is one byte per wall in
+    a bytearray, so removing, testing and counting walls never touches
+    Python tuples; the legacy list-of-bools maze and ((y, x), 'H'|'V')
+    wall tuples are only built once, at the end.
+    """
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.h_count = height * (width - 1)
+        self.count = self.h_count + (height - 1) * width
+        self.present = bytearray(b'\x01') * self.count
+    
+    def h_wall(self, y, x):
+        """Wall between (y, x) and (y, x+1)."""
+        return y * (self.width - 1) + x
+    
+    def v_wall(self, y, x):
+        """Wall between (y, x) and (y+1, x)."""
+        return self.h_count + y * self.width + x
+    
+    def between(self, cell1, cell2):
+        """Wall separating two adjacent cell indices."""
+        a, b = (cell1, cell2) if cell1 < cell2 else (cell2, cell1)
+        y, x = divmod(a, self.width)
+        return self.h_wall(y, x) if b == a + 1 else self.v_wall(y, x)
+    
+    def cells(self, wall):
+        """The two cell indices separated by a wall."""
+        if wall < self.h_count:
+            y, x = divmod(wall, self.width - 1)
+            cell = y * self.width + x
+            return cell, cell + 1
+        cell = wall - self.h_count
+        return cell, cell + self.width
+    
+    def endpoints(self):
+        """
+        Cell indices on both sides of every wall, as two lists indexed by
+        wall (a vectorised cells() for generators that visit all walls).
+        """
+        width, height = self.width, self.height
+        cell = np.arange(width * height).reshape(height, width)
+        first = np.concatenate((cell[:, :-1].ravel(), cell[:-1, :].ravel()))
+        second = np.concatenate((cell[:, 1:].ravel(), cell[1:, :].ravel()))
+        return first.tolist(), second.tolist()
+    
+    def remove(self, wall):
+        self.present[wall] = 0
+    
+    def ordered(self):
+        """All wall indices in the legacy get_all_walls order (per cell: H, V)."""
+        return self._ordered_array().tolist()
+    
+    def as_tuple(self, wall):
+        """Legacy ((y, x), 'H'|'V') form of a wall index."""
+        if wall < self.h_count:
+            return divmod(wall, self.width - 1), 'H'
+        return divmod(wall - self.h_count, self.width), 'V'
+    
+    def remaining(self):
+        """Walls still present, as legacy tuples in get_all_walls order."""
+        order = self._ordered_array()
+        present = np.frombuffer(self.present, dtype=np.uint8).astype(bool)
+        as_tuple = self.as_tuple
+        return [as_tuple(wall) for wall in order[present[order]].tolist()]
+    
+    def _ordered_array(self):
+        """Wall indices per cell (H then V), row-major, as an int array."""
+        width, height = self.width, self.height
+        per_cell = np.full((height, width, 2), -1, dtype=np.int64)
+        per_cell[:, :-1, 0] = np.arange(self.h_count).reshape(height, width - 1)
+        per_cell[:-1, :, 1] = self.h_count + np.arange(self.count - self.h_count).reshape(height - 1, width)
+        flat = per_cell.ravel()
+        return flat[flat >= 0]
+    
+    def to_maze(self):
+        """
+        Legacy maze structure: 2*height-1 rows of bools, alternating
+        horizontal-wall rows (width-1 entries) and vertical-wall rows
+        (width entries).
+        """
+        present = self.present
+        width, h_count = self.width, self.h_count
+        maze = []
+        for y in range(2 * self.height - 1):
+            if y % 2 == 0:
+                start = (y // 2) * (width - 1)
+                maze.append(list(map(bool, present[start:start + width - 1])))
+            else:
+                start = h_count + (y // 2) * width
+                maze.append(list(map(bool, present[start:start + width])))
+        return maze
 
 
 class MazeGenerator(ABC):
@@ -9,14 +123,23 @@ class MazeGenerator(ABC):
     Implements the Strategy pattern for interchangeable algorithms.
     """
     
+    def __init__(self, seed=None):
+        """
+        Initialize generator.
+        
+        Args:
+            seed: Seed or random.Random instance (None: global random)
+        """
+        self.rng = make_rng(seed)
+    
     @abstractmethod
     def generate(self, width, height):
         """
         Generate a maze with the specified dimensions.
         
         Args:
-            width (int): Number of cells wide (3-50)
-            height (int): Number of cells tall (3-50)
+            width (int): Number of cells wide (3-1000)
+            height (int): Number of cells tall (3-1000)
         
         Returns:
             tuple: (maze, remaining_walls)
@@ -30,11 +153,11 @@ class MazeGenerator(ABC):
         if not isinstance(width, int) or not isinstance(height, int):
             raise ValueError("Width and height must be integers")
         
-        if width < 3 or width > 50:
-            raise ValueError("Width must be between 3 and 50")
+        if width < 3 or width > MAX_DIMENSION:
+            raise ValueError(f"Width must be between 3 and {MAX_DIMENSION}")
         
-        if height < 3 or height > 50:
-            raise ValueError("Height must be between 3 and 50")
+        if height < 3 or height > MAX_DIMENSION:
+            raise ValueError(f"Height must be between 3 and {MAX_DIMENSION}")
     
     def initialize_maze(self, width, height):
         """
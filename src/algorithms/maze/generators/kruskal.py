@@ -1,7 +1,6 @@
 """Kruskal's algorithm for maze generation."""
 
-import random
-from .base import MazeGenerator
+from .base import MazeGenerator, MazeWalls
 
 
 class UnionFind:
@@ -16,10 +15,13 @@ class UnionFind:
         self.rank = [0] * n
     
     def find(self, i):
-        """Find the root of the set containing i with path compression."""
-        if self.parent[i] != i:
-            self.parent[i] = self.find(self.parent[i])  # Path compression
-        return self.parent[i]
+        """Find the root of the set containing i with path halving."""
+        parent = self.parent
+        # Iterative, so long chains on large mazes cannot hit the recursion limit
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
     
     def union(self, i, j):
         """
@@ -64,38 +66,25 @@ class KruskalGenerator(MazeGenerator):
         self.validate_dimensions(width, height)
         
         # Initialize maze with all walls
-        maze = self.initialize_maze(width, height)
+        walls = MazeWalls(width, height)
         
         # Get all walls and shuffle them
-        walls = self.get_all_walls(width, height)
-        random.shuffle(walls)
+        order = walls.ordered()
+        self.rng.shuffle(order)
         
         # Initialize Union-Find for all cells
         uf = UnionFind(width * height)
         remaining_walls = []
         
         # Process walls in random order
-        for (y, x), wall_type in walls:
-            # Calculate cell indices
-            cell1_idx = y * width + x
-            
-            if wall_type == 'H':
-                # Horizontal wall between (y,x) and (y,x+1)
-                cell2_idx = y * width + (x + 1)
-            else:  # 'V'
-                # Vertical wall between (y,x) and (y+1,x)
-                cell2_idx = (y + 1) * width + x
-            
+        first, second = walls.endpoints()
+        for wall in order:
             # If cells are in different sets, remove wall and unite sets
-            if uf.union(cell1_idx, cell2_idx):
-                # Remove the wall
-                if wall_type == 'H':
-                    maze[2 * y][x] = False
-                else:  # 'V'
-                    maze[2 * y + 1][x] = False
+            if uf.union(first[wall], second[wall]):
+                walls.remove(wall)
             else:
                 # Keep this wall (creates cycle)
-                remaining_walls.append(((y, x), wall_type))
+                remaining_walls.append(walls.as_tuple(wall))
         
-        return maze, remaining_walls
+        return walls.to_maze(), remaining_walls
 
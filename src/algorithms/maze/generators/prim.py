@@ -1,7 +1,6 @@
 """Prim's algorithm for maze generation."""
 
-import random
-from .base import MazeGenerator
+from .base import MazeGenerator, MazeWalls
 
 
 class PrimGenerator(MazeGenerator):
@@ -14,7 +13,7 @@ class PrimGenerator(MazeGenerator):
     Characteristics:
     - Creates organic-looking mazes with branching passages
     - Tends to have shorter dead-ends than DFS
-    - Medium speed: O(E log V)
+    - Fast: O(E) with swap-pop frontier removal
     - Produces mazes with a more "natural" feel
     """
     
@@ -23,91 +22,54 @@ class PrimGenerator(MazeGenerator):
         self.validate_dimensions(width, height)
         
         # Initialize maze with all walls
-        maze = self.initialize_maze(width, height)
+        walls = MazeWalls(width, height)
         
-        # Track visited cells and frontier walls
-        visited = set()
+        # Track visited cells (by cell index) and frontier walls (by wall index)
+        visited = bytearray(width * height)
         frontier_walls = []
-        remaining_walls = []
         
         # Start from a random cell
-        start_y = random.randint(0, height - 1)
-        start_x = random.randint(0, width - 1)
-        visited.add((start_y, start_x))
+        start_y = self.rng.randint(0, height - 1)
+        start_x = self.rng.randint(0, width - 1)
+        visited[start_y * width + start_x] = 1
         
         # Add walls of starting cell to frontier
-        self._add_walls_to_frontier(start_y, start_x, width, height, frontier_walls)
+        self._add_walls_to_frontier(walls, start_y, start_x, frontier_walls)
         
         # Process frontier walls
         while frontier_walls:
-            # Pick a random wall from frontier
-            wall = random.choice(frontier_walls)
-            frontier_walls.remove(wall)
-            
-            (y, x), wall_type = wall
+            # Pick a random wall from frontier; swap-pop removes it in O(1)
+            i = self.rng.randrange(len(frontier_walls))
+            frontier_walls[i], frontier_walls[-1] = frontier_walls[-1], frontier_walls[i]
+            wall = frontier_walls.pop()
             
             # Determine the two cells separated by this wall
-            if wall_type == 'H':
-                cell1 = (y, x)
-                cell2 = (y, x + 1)
-            else:  # 'V'
-                cell1 = (y, x)
-                cell2 = (y + 1, x)
-            
-            # Check if exactly one cell is visited
-            cell1_visited = cell1 in visited
-            cell2_visited = cell2 in visited
+            cell1, cell2 = walls.cells(wall)
             
-            if cell1_visited and not cell2_visited:
-                # Remove wall and add cell2 to visited
-                self._remove_wall(maze, y, x, wall_type)
-                visited.add(cell2)
-                self._add_walls_to_frontier(cell2[0], cell2[1], width, height, frontier_walls)
-                
-            elif cell2_visited and not cell1_visited:
-                # Remove wall and add cell1 to visited
-                self._remove_wall(maze, y, x, wall_type)
-                visited.add(cell1)
-                self._add_walls_to_frontier(cell1[0], cell1[1], width, height, frontier_walls)
-            else:
-                # Both visited or both unvisited - keep wall
-                remaining_walls.append(wall)
-        
-        # Collect remaining walls
-        all_walls = self.get_all_walls(width, height)
-        for wall in all_walls:
-            (y, x), wall_type = wall
-            if wall_type == 'H' and maze[2 * y][x]:
-                if wall not in remaining_walls:
-                    remaining_walls.append(wall)
-            elif wall_type == 'V' and maze[2 * y + 1][x]:
-                if wall not in remaining_walls:
-                    remaining_walls.append(wall)
+            # Expand only if exactly one cell is visited; otherwise keep wall
+            if visited[cell1] != visited[cell2]:
+                new_cell = cell2 if visited[cell1] else cell1
+                walls.remove(wall)
+                visited[new_cell] = 1
+                self._add_walls_to_frontier(walls, *divmod(new_cell, width), frontier_walls)
         
-        return maze, remaining_walls
+        # Every wall never removed remains
+        return walls.to_maze(), walls.remaining()
     
-    def _add_walls_to_frontier(self, y, x, width, height, frontier):
+    def _add_walls_to_frontier(self, walls, y, x, frontier):
         """Add walls of a cell to the frontier."""
         # Right wall
-        if x < width - 1:
-            frontier.append(((y, x), 'H'))
+        if x < walls.width - 1:
+            frontier.append(walls.h_wall(y, x))
         
         # Bottom wall
-        if y < height - 1:
-            frontier.append(((y, x), 'V'))
+        if y < walls.height - 1:
+            frontier.append(walls.v_wall(y, x))
         
         # Left wall
         if x > 0:
-            frontier.append(((y, x - 1), 'H'))
+            frontier.append(walls.h_wall(y, x - 1))
         
         # Top wall
         if y > 0:
-            frontier.append(((y - 1, x), 'V'))
-    
-    def _remove_wall(self, maze, y, x, wall_type):
-        """Remove a wall from the maze."""
-        if wall_type == 'H':
-            maze[2 * y][x] = False
-        else:  # 'V'
-            maze[2 * y + 1][x] = False
-
+            frontier.append(walls.v_wall(y - 1, x))
@@ -1,7 +1,6 @@
 """Recursive backtracker (DFS) algorithm for maze generation."""
 
-import random
-from .base import MazeGenerator
+from .base import MazeGenerator, MazeWalls
 
 
 class RecursiveBacktrackerGenerator(MazeGenerator):
@@ -24,92 +23,67 @@ class RecursiveBacktrackerGenerator(MazeGenerator):
         self.validate_dimensions(width, height)
         
         # Initialize maze with all walls
-        maze = self.initialize_maze(width, height)
+        walls = MazeWalls(width, height)
         
-        # Track visited cells
-        visited = set()
+        # Track visited cells by cell index
+        visited = bytearray(width * height)
         
         # Start from a random cell
-        start_y = random.randint(0, height - 1)
-        start_x = random.randint(0, width - 1)
+        start_y = self.rng.randint(0, height - 1)
+        start_x = self.rng.randint(0, width - 1)
+        start = start_y * width + start_x
         
         # Use iterative approach to avoid stack overflow
-        stack = [(start_y, start_x)]
-        visited.add((start_y, start_x))
+        stack = [start]
+        visited[start] = 1
         
         while stack:
-            current_y, current_x = stack[-1]
+            current = stack[-1]
             
             # Get unvisited neighbors
-            neighbors = self._get_unvisited_neighbors(
-                current_y, current_x, width, height, visited
-            )
+            neighbors = self._get_unvisited_neighbors(current, width, height, visited)
             
             if neighbors:
                 # Choose a random unvisited neighbor
-                next_y, next_x, direction = random.choice(neighbors)
+                next_cell = self.rng.choice(neighbors)
                 
                 # Remove wall between current and next cell
-                self._carve_passage(maze, current_y, current_x, direction)
+                walls.remove(walls.between(current, next_cell))
                 
                 # Mark neighbor as visited and add to stack
-                visited.add((next_y, next_x))
-                stack.append((next_y, next_x))
+                visited[next_cell] = 1
+                stack.append(next_cell)
             else:
                 # No unvisited neighbors, backtrack
                 stack.pop()
         
-        # Collect remaining walls
-        remaining_walls = []
-        all_walls = self.get_all_walls(width, height)
-        
-        for (y, x), wall_type in all_walls:
-            if wall_type == 'H' and maze[2 * y][x]:
-                remaining_walls.append(((y, x), wall_type))
-            elif wall_type == 'V' and maze[2 * y + 1][x]:
-                remaining_walls.append(((y, x), wall_type))
-        
-        return maze, remaining_walls
+        return walls.to_maze(), walls.remaining()
     
-    def _get_unvisited_neighbors(self, y, x, width, height, visited):
+    def _get_unvisited_neighbors(self, cell, width, height, visited):
         """
         Get list of unvisited neighboring cells.
         
         Returns:
-            list: List of (neighbor_y, neighbor_x, direction) tuples
+            list: Neighbor cell indices, in north, south, west, east order
         """
         neighbors = []
+        y, x = divmod(cell, width)
         
         # North
-        if y > 0 and (y - 1, x) not in visited:
-            neighbors.append((y - 1, x, 'N'))
+        if y > 0 and not visited[cell - width]:
+            neighbors.append(cell - width)
         
         # South
-        if y < height - 1 and (y + 1, x) not in visited:
-            neighbors.append((y + 1, x, 'S'))
+        if y < height - 1 and not visited[cell + width]:
+            neighbors.append(cell + width)
         
         # West
-        if x > 0 and (y, x - 1) not in visited:
-            neighbors.append((y, x - 1, 'W'))
+        if x > 0 and not visited[cell - 1]:
+            neighbors.append(cell - 1)
         
         # East
-        if x < width - 1 and (y, x + 1) not in visited:
-            neighbors.append((y, x + 1, 'E'))
+        if x < width - 1 and not visited[cell + 1]:
+            neighbors.append(cell + 1)
         
         return neighbors
-    
-    def _carve_passage(self, maze, y, x, direction):
-        """Carve a passage in the specified direction."""
-        if direction == 'N':
-            # Remove vertical wall above
-            maze[2 * y - 1][x] = False
-        elif direction == 'S':
-            # Remove vertical wall below
-            maze[2 * y + 1][x] = False
-        elif direction == 'W':
-            # Remove horizontal wall to the left
-            maze[2 * y][x - 1] = False
-        elif direction == 'E':
-            # Remove horizontal wall to the right
-            maze[2 * y][x] = False
 
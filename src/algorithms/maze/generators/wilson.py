@@ -1,7 +1,6 @@
 """Wilson's algorithm for maze generation."""
 
-import random
-from .base import MazeGenerator
+from .base import MazeGenerator, MazeWalls
 
 
 class WilsonGenerator(MazeGenerator):
@@ -24,88 +23,87 @@ class WilsonGenerator(MazeGenerator):
         self.validate_dimensions(width, height)
         
         # Initialize maze with all walls
-        maze = self.initialize_maze(width, height)
+        walls = MazeWalls(width, height)
         
-        # Track which cells are part of the maze
-        in_maze = set()
+        # Track which cells (by index) are part of the maze
+        size = width * height
+        in_maze = bytearray(size)
         
-        # Add a random starting cell to the maze
-        start_y = random.randint(0, height - 1)
-        start_x = random.randint(0, width - 1)
-        in_maze.add((start_y, start_x))
+        # Index of cells not yet in the maze: O(1) random pick and removal
+        unvisited = list(range(size))
+        slot = list(range(size))
+        
+        def add_to_maze(cell):
+            in_maze[cell] = 1
+            i = slot[cell]
+            last = unvisited.pop()
+            if last != cell:
+                unvisited[i] = last
+                slot[last] = i
         
-        # Get all cells
-        all_cells = [(y, x) for y in range(height) for x in range(width)]
+        # Add a random starting cell to the maze
+        start_y = self.rng.randint(0, height - 1)
+        start_x = self.rng.randint(0, width - 1)
+        add_to_maze(start_y * width + start_x)
         
         # Process remaining cells
-        while len(in_maze) < width * height:
+        while unvisited:
             # Pick a random cell not in the maze
-            current = random.choice([c for c in all_cells if c not in in_maze])
+            current = self.rng.choice(unvisited)
             
             # Perform loop-erased random walk until we hit the maze
             path = self._loop_erased_random_walk(current, in_maze, width, height)
             
-            # Add the path to the maze
+            # Add the path to the maze (the last cell already is)
             for i in range(len(path) - 1):
-                y1, x1 = path[i]
-                y2, x2 = path[i + 1]
-                
-                # Carve passage between cells
-                self._carve_between(maze, y1, x1, y2, x2)
-                in_maze.add((y1, x1))
-            
-            # Last cell should already be in maze
-            in_maze.add(path[-1])
-        
-        # Collect remaining walls
-        remaining_walls = []
-        all_walls = self.get_all_walls(width, height)
-        
-        for (y, x), wall_type in all_walls:
-            if wall_type == 'H' and maze[2 * y][x]:
-                remaining_walls.append(((y, x), wall_type))
-            elif wall_type == 'V' and maze[2 * y + 1][x]:
-                remaining_walls.append(((y, x), wall_type))
+                walls.remove(walls.between(path[i], path[i + 1]))
+                add_to_maze(path[i])
         
-        return maze, remaining_walls
+        return walls.to_maze(), walls.remaining()
     
     def _loop_erased_random_walk(self, start, in_maze, width, height):
         """
         Perform a loop-erased random walk from start until hitting the maze.
         
         Returns:
-            list: Path from start to maze (loops removed)
+            list: Path of cell indices from start to maze (loops removed)
         """
         path = [start]
         position_to_index = {start: 0}
         
         current = start
+        rand = self.rng.random
         
-        while current not in in_maze:
-            # Get valid neighbors
-            neighbors = []
-            y, x = current
+        while not in_maze[current]:
+            # Move to a random neighbor: draw one of the four directions and
+            # redraw if it leaves the grid (still uniform over valid neighbors)
+            y, x = divmod(current, width)
+            direction = int(rand() * 4)
             
-            if y > 0:
-                neighbors.append((y - 1, x))
-            if y < height - 1:
-                neighbors.append((y + 1, x))
-            if x > 0:
-                neighbors.append((y, x - 1))
-            if x < width - 1:
-                neighbors.append((y, x + 1))
-            
-            # Move to random neighbor
-            next_cell = random.choice(neighbors)
+            if direction == 0:
+                if y == 0:
+                    continue
+                next_cell = current - width
+            elif direction == 1:
+                if y == height - 1:
+                    continue
+                next_cell = current + width
+            elif direction == 2:
+                if x == 0:
+                    continue
+                next_cell = current - 1
+            else:
+                if x == width - 1:
+                    continue
+                next_cell = current + 1
             
             # Check if we've created a loop
             if next_cell in position_to_index:
                 # Erase the loop by cutting path back
                 loop_start_idx = position_to_index[next_cell]
-                path = path[:loop_start_idx + 1]
-                
-                # Rebuild position index
-                position_to_index = {cell: idx for idx, cell in enumerate(path)}
+                for cell in path[loop_start_idx + 1:]:
+                    del position_to_index[cell]
+                del path[loop_start_idx + 1:]
             else:
                 # Add to path
                 path.append(next_cell)
@@ -114,19 +112,3 @@ class WilsonGenerator(MazeGenerator):
             current = next_cell
         
         return path
-    
-    def _carve_between(self, maze, y1, x1, y2, x2):
-        """Carve a passage between two adjacent cells."""
-        if y1 == y2:
-            # Horizontal passage
-            if x1 < x2:
-                maze[2 * y1][x1] = False
-            else:
-                maze[2 * y1][x2] = False
-        else:
-            # Vertical passage
-            if y1 < y2:
-                maze[2 * y1 + 1][x1] = False
-            else:
-                maze[2 * y2 + 1][x1] = False
-
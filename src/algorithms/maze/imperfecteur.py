@@ -1,6 +1,12 @@
 """Maze imperfection system for adding loops and tunnels."""
 
-import random
+import sys
+import os
+
+# Add algorithms directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rng import make_rng
 
 
 class MazeImperfecteur:
@@ -11,6 +17,15 @@ class MazeImperfecteur:
     Imperfect mazes have multiple paths (loops), making them more interesting.
     """
     
+    def __init__(self, seed=None):
+        """
+        Initialize imperfecteur.
+        
+        Args:
+            seed: Seed or random.Random instance (None: global random)
+        """
+        self.rng = make_rng(seed)
+    
     def make_imperfect(self, maze, remaining_walls, imperfection_level,
                       width, height, tunnels_h=1, tunnels_v=0):
         """
@@ -44,7 +59,7 @@ class MazeImperfecteur:
         
         # Remove random walls to create loops
         if num_walls_to_remove > 0:
-            walls_to_remove = random.sample(remaining_walls, num_walls_to_remove)
+            walls_to_remove = self.rng.sample(remaining_walls, num_walls_to_remove)
             for (y, x), wall_type in walls_to_remove:
                 if wall_type == 'H':
                     maze[2 * y][x] = False
@@ -68,12 +83,12 @@ class MazeImperfecteur:
         # Horizontal tunnels (select rows)
         possible_rows = list(range(height))
         num_horizontal = min(num_horizontal, height)
-        tunnel_rows = set(random.sample(possible_rows, num_horizontal)) if num_horizontal > 0 else set()
+        tunnel_rows = set(self.rng.sample(possible_rows, num_horizontal)) if num_horizontal > 0 else set()
         
         # Vertical tunnels (select columns)
         possible_cols = list(range(width))
         num_vertical = min(num_vertical, width)
-        tunnel_cols = set(random.sample(possible_cols, num_vertical)) if num_vertical > 0 else set()
+        tunnel_cols = set(self.rng.sample(possible_cols, num_vertical)) if num_vertical > 0 else set()
         
         return tunnel_rows, tunnel_cols
 
@@ -1,6 +1,14 @@
 """Base class for pellet placement strategies."""
 
 from abc import ABC, abstractmethod
+import sys
+import os
+
+# Add algorithms directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.grid import as_grid
+from utils.rng import make_rng
 
 
 class PelletPlacer(ABC):
@@ -15,13 +23,22 @@ class PelletPlacer(ABC):
     - 3: Power pellet
     """
     
+    def __init__(self, seed=None):
+        """
+        Initialize placer.
+        
+        Args:
+            seed: Seed or random.Random instance (None: global random)
+        """
+        self.rng = make_rng(seed)
+    
     @abstractmethod
     def place_pellets(self, grid):
         """
         Place pellets on a maze grid.
         
         Args:
-            grid: 2D array where 0=path, 1=wall
+            grid: Grid or 2D array where 0=path, 1=wall
         
         Returns:
             list: Modified grid with pellets (2) and power pellets (3)
@@ -30,24 +47,11 @@ class PelletPlacer(ABC):
     
     def get_walkable_cells(self, grid):
         """Get all walkable (path) cells from grid."""
-        walkable = []
-        for row in range(len(grid)):
-            for col in range(len(grid[0])):
-                if grid[row][col] == 0:
-                    walkable.append((row, col))
-        return walkable
+        return as_grid(grid).walkable_cells
     
     def count_neighbors(self, grid, row, col):
         """Count walkable neighbors of a cell."""
-        count = 0
-        rows, cols = len(grid), len(grid[0])
-        
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nr, nc = row + dr, col + dc
-            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == 0:
-                count += 1
-        
-        return count
+        return int(as_grid(grid).neighbor_count[row, col])
     
     def is_dead_end(self, grid, row, col):
         """Check if a cell is a dead end (only 1 neighbor)."""
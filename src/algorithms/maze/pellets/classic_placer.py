@@ -1,6 +1,7 @@
 """Classic Pac-Man style pellet placement."""
 
 from .base import PelletPlacer
+from utils.grid import as_grid
 
 
 class ClassicPelletPlacer(PelletPlacer):
@@ -12,21 +13,26 @@ class ClassicPelletPlacer(PelletPlacer):
     - Creates the authentic Pac-Man feel
     """
     
-    def __init__(self, power_pellet_count=4, power_pellet_clearance=2):
+    def __init__(self, power_pellet_count=4, power_pellet_clearance=2, seed=None):
         """
         Initialize classic pellet placer.
         
         Args:
             power_pellet_count: Number of power pellets (typically 4)
             power_pellet_clearance: Cells around power pellets without normal pellets
+            seed: Unused (placement is deterministic); accepted so every
+                placer takes the same arguments
         """
+        super().__init__(seed)
         self.power_pellet_count = power_pellet_count
         self.clearance = power_pellet_clearance
     
     def place_pellets(self, grid):
         """Place pellets in classic Pac-Man style."""
+        grid = as_grid(grid)
+        
         # Create a copy to modify
-        result = [row[:] for row in grid]
+        result = grid.to_list()
         
         # Get all walkable cells
         walkable = self.get_walkable_cells(grid)
@@ -76,7 +82,7 @@ class ClassicPelletPlacer(PelletPlacer):
     def _find_strategic_corners(self, grid, walkable):
         """Find corner cells that are good for power pellets."""
         corners = []
-        rows, cols = len(grid), len(grid[0])
+        rows, cols = grid.rows, grid.cols
         
         # Check actual corners of the maze
         corner_positions = [
@@ -85,7 +91,7 @@ class ClassicPelletPlacer(PelletPlacer):
         ]
         
         for row, col in corner_positions:
-            if 0 <= row < rows and 0 <= col < cols and grid[row][col] == 0:
+            if grid.is_walkable((row, col)):
                 corners.append((row, col))
         
         # Add dead ends that are far from borders
@@ -1,7 +1,7 @@
 """Random pellet placement algorithm."""
 
-import random
 from .base import PelletPlacer
+from utils.grid import as_grid
 
 
 class RandomPelletPlacer(PelletPlacer):
@@ -11,21 +11,25 @@ class RandomPelletPlacer(PelletPlacer):
     Simple uniform distribution with configurable density.
     """
     
-    def __init__(self, density=0.7, power_pellet_count=4):
+    def __init__(self, density=0.7, power_pellet_count=4, seed=None):
         """
         Initialize random pellet placer.
         
         Args:
             density: Fraction of walkable cells with pellets (0.0-1.0)
             power_pellet_count: Number of power pellets to place
+            seed: Seed or random.Random instance (None: global random)
         """
+        super().__init__(seed)
         self.density = max(0.0, min(1.0, density))
         self.power_pellet_count = power_pellet_count
     
     def place_pellets(self, grid):
         """Place pellets randomly on walkable cells."""
+        grid = as_grid(grid)
+        
         # Create a copy to modify
-        result = [row[:] for row in grid]
+        result = grid.to_list()
         
         # Get all walkable cells
         walkable = self.get_walkable_cells(grid)
@@ -38,7 +42,7 @@ class RandomPelletPlacer(PelletPlacer):
         num_pellets = min(num_pellets, len(walkable) - self.power_pellet_count)
         
         # Randomly select cells for pellets
-        pellet_cells = random.sample(walkable, num_pellets + self.power_pellet_count)
+        pellet_cells = self.rng.sample(walkable, num_pellets + self.power_pellet_count)
         
         # Place power pellets first
         for i in range(self.power_pellet_count):
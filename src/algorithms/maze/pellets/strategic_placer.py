@@ -1,7 +1,8 @@
 """Strategic pellet placement based on maze topology."""
 
-import random
+import numpy as np
 from .base import PelletPlacer
+from utils.grid import as_grid
 
 
 class StrategicPelletPlacer(PelletPlacer):
@@ -14,7 +15,8 @@ class StrategicPelletPlacer(PelletPlacer):
     - Creates interesting risk/reward gameplay
     """
     
-    def __init__(self, corridor_density=0.8, junction_density=0.4, power_pellet_count=4):
+    def __init__(self, corridor_density=0.8, junction_density=0.4, power_pellet_count=4,
+                 seed=None):
         """
         Initialize strategic pellet placer.
         
@@ -22,15 +24,19 @@ class StrategicPelletPlacer(PelletPlacer):
             corridor_density: Pellet density in corridors
             junction_density: Pellet density at junctions
             power_pellet_count: Number of power pellets
+            seed: Seed or random.Random instance (None: global random)
         """
+        super().__init__(seed)
         self.corridor_density = corridor_density
         self.junction_density = junction_density
         self.power_pellet_count = power_pellet_count
     
     def place_pellets(self, grid):
         """Place pellets strategically based on maze topology."""
+        grid = as_grid(grid)
+        
         # Create a copy to modify
-        result = [row[:] for row in grid]
+        result = grid.to_list()
         
         # Get all walkable cells
         walkable = self.get_walkable_cells(grid)
@@ -38,26 +44,16 @@ class StrategicPelletPlacer(PelletPlacer):
         if not walkable:
             return result
         
-        # Categorize cells
-        dead_ends = []
-        corridors = []
-        junctions = []
-        
-        for row, col in walkable:
-            neighbor_count = self.count_neighbors(grid, row, col)
-            
-            if neighbor_count == 1:
-                dead_ends.append((row, col))
-            elif neighbor_count == 2:
-                corridors.append((row, col))
-            else:
-                junctions.append((row, col))
+        # Categorize cells from the grid's cached topology masks
+        dead_ends = self._cells_where(grid, grid.dead_ends)
+        corridors = self._cells_where(grid, grid.corridors)
+        junctions = self._cells_where(grid, grid.junctions)
         
         # Place power pellets at dead ends (preferred) or corners
         power_pellet_locations = []
         
         if len(dead_ends) >= self.power_pellet_count:
-            power_pellet_locations = random.sample(dead_ends, self.power_pellet_count)
+            power_pellet_locations = self.rng.sample(dead_ends, self.power_pellet_count)
         else:
             # Use all dead ends and fill remaining with corners
             power_pellet_locations = dead_ends[:]
@@ -65,7 +61,7 @@ class StrategicPelletPlacer(PelletPlacer):
             remaining = self.power_pellet_count - len(power_pellet_locations)
             
             if corners and remaining > 0:
-                additional = random.sample(corners, min(remaining, len(corners)))
+                additional = self.rng.sample(corners, min(remaining, len(corners)))
                 power_pellet_locations.extend(additional)
         
         # Place power pellets
@@ -80,14 +76,14 @@ class StrategicPelletPlacer(PelletPlacer):
         
         # Place normal pellets in corridors
         num_corridor_pellets = int(len(corridors) * self.corridor_density)
-        corridor_pellets = random.sample(corridors, min(num_corridor_pellets, len(corridors)))
+        corridor_pellets = self.rng.sample(corridors, min(num_corridor_pellets, len(corridors)))
         
         for row, col in corridor_pellets:
             result[row][col] = 2
         
         # Place fewer pellets at junctions
         num_junction_pellets = int(len(junctions) * self.junction_density)
-        junction_pellets = random.sample(junctions, min(num_junction_pellets, len(junctions)))
+        junction_pellets = self.rng.sample(junctions, min(num_junction_pellets, len(junctions)))
         
         for row, col in junction_pellets:
             result[row][col] = 2
@@ -100,20 +96,10 @@ class StrategicPelletPlacer(PelletPlacer):
     
     def _find_corners(self, grid, walkable):
         """Find corner cells (L-shaped connections)."""
-        corners = []
-        
-        for row, col in walkable:
-            neighbors = []
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < len(grid) and 0 <= nc < len(grid[0]) and grid[nr][nc] == 0:
-                    neighbors.append((dr, dc))
-            
-            # Check if neighbors form an L-shape (perpendicular)
-            if len(neighbors) == 2:
-                d1, d2 = neighbors
-                if (d1[0] * d2[0] + d1[1] * d2[1]) == 0:  # Perpendicular
-                    corners.append((row, col))
-        
-        return corners
+        return self._cells_where(grid, grid.corners)
+    
+    def _cells_where(self, grid, mask):
+        """(row, col) cells where mask is set, in row-major order."""
+        positions = grid.positions
+        return [positions[i] for i in np.flatnonzero(mask).tolist()]
 
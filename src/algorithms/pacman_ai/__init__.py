@@ -7,11 +7,17 @@ from .greedy import GreedyPacman
 from .defensive import DefensivePacman
 from .aggressive import AggressivePacman
 from .random_walker import RandomWalker
+from .search import SearchPacman
+from .pellet_index import PelletIndex
+from .danger_field import DangerField
 
 __all__ = [
     'BasePacmanAI',
     'GreedyPacman',
     'DefensivePacman',
     'AggressivePacman',
-    'RandomWalker'
+    'RandomWalker',
+    'SearchPacman',
+    'PelletIndex',
+    'DangerField'
 ]
@@ -3,21 +3,38 @@ Base Pacman AI - Abstract class for Pacman algorithms
 """
 
 from abc import ABC, abstractmethod
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.grid import as_grid
+from utils.rng import make_rng
+from .danger_field import DangerField
+from .pellet_index import PelletIndex
 
 
 class BasePacmanAI(ABC):
     """Base class for all Pacman AI algorithms"""
     
-    def __init__(self, grid):
+    # Furthest ghost distance (maze steps) the algorithm tells apart
+    DANGER_RADIUS = 8
+    
+    def __init__(self, grid, seed=None):
         """
         Initialize the Pacman AI
         
         Args:
-            grid: 2D list representing the maze
+            grid: Grid or 2D list representing the maze
+            seed: Seed or random.Random instance for random choices
+                (None: global random)
         """
-        self.grid = grid
-        self.height = len(grid)
-        self.width = len(grid[0]) if grid else 0
+        self.grid = as_grid(grid)
+        self.rng = make_rng(seed)
+        self.height = self.grid.rows
+        self.width = self.grid.cols
+        self._danger = None
     
     @abstractmethod
     def get_next_move(self, pacman_pos, ghost_positions, pellet_positions):
@@ -26,33 +43,51 @@ class BasePacmanAI(ABC):
         
         Args:
             pacman_pos: (x, y) tuple of Pacman's current position
-            ghost_positions: List of (x, y) tuples for ghost positions
-            pellet_positions: List of (x, y) tuples for pellet positions
+            ghost_positions: DangerField of the current frame, or a list
+                of (x, y) tuples for ghost positions
+            pellet_positions: PelletIndex of the remaining pellets, or a
+                list of (x, y) tuples for pellet positions
         
         Returns:
             (x, y) tuple representing next position
         """
         pass
     
+    def danger_field(self, ghost_positions):
+        """
+        DangerField giving maze distance to the nearest ghost.
+        
+        A field is used as-is (callers compute one per frame, with a
+        radius of at least DANGER_RADIUS); for a list, this AI's own
+        field, allocated once, is recomputed.
+        """
+        # Duck-typed: this module can be imported under two package paths
+        if hasattr(ghost_positions, 'update_cells'):
+            return ghost_positions
+        if self._danger is None:
+            self._danger = DangerField(self.grid, self.DANGER_RADIUS)
+        self._danger.update(ghost_positions)
+        return self._danger
+    
+    def pellet_index(self, pellet_positions):
+        """
+        PelletIndex for nearest-pellet queries over pellet_positions.
+        
+        An index is used as-is (callers keep one up to date as pellets
+        are eaten); a list is indexed for this move.
+        """
+        # Duck-typed: this module can be imported under two package paths
+        if hasattr(pellet_positions, 'nearest'):
+            return pellet_positions
+        return PelletIndex(self.grid, pellet_positions)
+    
     def get_valid_neighbors(self, pos):
         """Get valid neighboring positions (not walls)"""
         x, y = pos
-        neighbors = []
-        
-        # Check all 4 directions
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # up, down, left, right
-        
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-            
-            # Check boundaries
-            if 0 <= new_y < self.height and 0 <= new_x < self.width:
-                # Check if not a wall (assuming 1 = wall, 0 = path)
-                if self.grid[new_y][new_x] != 1:
-                    neighbors.append((new_x, new_y))
         
-        return neighbors
+        # Precomputed adjacency (up, down, left, right) uses (row, col)
+        return [(col, row) for row, col in self.grid.neighbors((y, x))]
     
     def distance(self, pos1, pos2):
-        """Calculate Manhattan distance between two positions"""
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+        """Calculate Manhattan distance between two positions (through tunnels)"""
+        return self.grid.distance_bound((pos1[1], pos1[0]), (pos2[1], pos2[0]))
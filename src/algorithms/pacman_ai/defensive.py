@@ -8,14 +8,19 @@ from .base_pacman import BasePacmanAI
 class DefensivePacman(BasePacmanAI):
     """Defensive algorithm - prioritizes safety over pellet collection"""
     
+    # Pellets are only considered beyond this distance from every ghost
+    SAFE_DISTANCE = 5
+    # Ghosts further away than SAFE_DISTANCE all count as equally far
+    DANGER_RADIUS = SAFE_DISTANCE + 1
+    
     def get_next_move(self, pacman_pos, ghost_positions, pellet_positions):
         """
         Move away from ghosts, only collect pellets when safe
         
         Args:
             pacman_pos: (x, y) tuple of Pacman's position
-            ghost_positions: List of ghost positions
-            pellet_positions: List of pellet positions
+            ghost_positions: DangerField or list of ghost positions
+            pellet_positions: PelletIndex or list of pellet positions
         
         Returns:
             Next position (x, y)
@@ -25,6 +30,9 @@ class DefensivePacman(BasePacmanAI):
         if not neighbors:
             return pacman_pos
         
+        danger = self.danger_field(ghost_positions)
+        pellets = self.pellet_index(pellet_positions) if pellet_positions and danger else None
+        
         # Find move that maximizes distance from nearest ghost
         best_move = neighbors[0]
         best_score = float('-inf')
@@ -32,18 +40,16 @@ class DefensivePacman(BasePacmanAI):
         for neighbor in neighbors:
             score = 0
             
-            # Calculate minimum distance to any ghost
-            if ghost_positions:
-                min_ghost_dist = min(self.distance(neighbor, g) for g in ghost_positions)
+            # Maze distance to the nearest ghost
+            min_ghost_dist = danger.distance(neighbor)
+            if danger:
                 # Prefer positions far from ghosts
                 score += min_ghost_dist * 100
             
             # Secondary: prefer positions near pellets (but only if safe)
-            if pellet_positions and ghost_positions:
-                min_ghost_dist = min(self.distance(neighbor, g) for g in ghost_positions)
-                if min_ghost_dist > 5:  # Only consider pellets if ghosts are far
-                    nearest_pellet_dist = min(self.distance(neighbor, p) for p in pellet_positions)
-                    score -= nearest_pellet_dist * 5
+            if pellets and min_ghost_dist > self.SAFE_DISTANCE:  # Only consider pellets if ghosts are far
+                nearest_pellet_dist = pellets.nearest_distance(neighbor)
+                score -= nearest_pellet_dist * 5
             
             if score > best_score:
                 best_score = score
@@ -9,6 +9,7 @@ class GreedyPacman(BasePacmanAI):
     """Greedy algorithm - moves towards nearest pellet, avoids ghosts when close"""
     
     GHOST_DANGER_DISTANCE = 3  # Distance threshold to consider ghost dangerous
+    DANGER_RADIUS = GHOST_DANGER_DISTANCE
     
     def get_next_move(self, pacman_pos, ghost_positions, pellet_positions):
         """
@@ -16,8 +17,8 @@ class GreedyPacman(BasePacmanAI):
         
         Args:
             pacman_pos: (x, y) tuple of Pacman's position
-            ghost_positions: List of ghost positions
-            pellet_positions: List of pellet positions
+            ghost_positions: DangerField or list of ghost positions
+            pellet_positions: PelletIndex or list of pellet positions
         
         Returns:
             Next position (x, y)
@@ -32,7 +33,8 @@ class GreedyPacman(BasePacmanAI):
             return neighbors[0]
         
         # Find nearest pellet
-        nearest_pellet = min(pellet_positions, key=lambda p: self.distance(pacman_pos, p))
+        nearest_pellet = self.pellet_index(pellet_positions).nearest(pacman_pos)
+        danger = self.danger_field(ghost_positions)
         
         # Score each neighbor
         best_move = neighbors[0]
@@ -45,12 +47,11 @@ class GreedyPacman(BasePacmanAI):
             dist_to_pellet = self.distance(neighbor, nearest_pellet)
             score -= dist_to_pellet * 10
             
-            # Avoid ghosts
-            for ghost_pos in ghost_positions:
-                ghost_dist = self.distance(neighbor, ghost_pos)
-                if ghost_dist < self.GHOST_DANGER_DISTANCE:
-                    # Heavy penalty for being close to ghosts
-                    score -= (self.GHOST_DANGER_DISTANCE - ghost_dist) * 50
+            # Avoid the nearest ghost (maze distance)
+            ghost_dist = danger.distance(neighbor)
+            if ghost_dist < self.GHOST_DANGER_DISTANCE:
+                # Heavy penalty for being close to ghosts
+                score -= (self.GHOST_DANGER_DISTANCE - ghost_dist) * 50
             
             if score > best_score:
                 best_score = score
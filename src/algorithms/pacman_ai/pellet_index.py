@@ -0,0 +1,198 @@
+"""
+Pellet Index - Bucketed pellet positions for nearest-pellet queries
+"""
+
+from itertools import repeat
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.grid import as_grid
+
+
+class PelletIndex:
+    """
+    Remaining pellets bucketed by square blocks of the grid.
+
+    Pellets are (x, y) tuples kept in one set per bucket_size x
+    bucket_size block, so adding and eating a pellet is O(1). nearest()
+    visits blocks in order of their smallest possible distance from the
+    query's block and stops once no unvisited block can hold a closer
+    pellet, so a query looks at a few nearby blocks while pellets are
+    dense instead of every pellet.
+
+    Distances are the agents' (BasePacmanAI.distance): Manhattan, the
+    short way round through tunnels. Ties go to the first pellet in
+    row-major order.
+
+    Visit orders are computed per block on first use and kept.
+    """
+
+    def __init__(self, grid, pellets=None, bucket_size=4):
+        """
+        Initialize the index.
+
+        Args:
+            grid: Grid or 2D list representing the maze
+            pellets: Iterable of (x, y) pellet positions; the grid's
+                pellet and power pellet cells (2 and 3) when omitted
+            bucket_size: Side of the square blocks, in cells
+        """
+        self.grid = as_grid(grid)
+        self.bucket_size = bucket_size
+        self.bucket_rows = -(-self.grid.rows // bucket_size)
+        self.bucket_cols = -(-self.grid.cols // bucket_size)
+        self._buckets = [set() for _ in range(self.bucket_rows * self.bucket_cols)]
+        self._count = 0
+        self._orders = {}
+
+        if pellets is None:
+            cells = self.grid.cells
+            rows, cols = np.nonzero((cells == 2) | (cells == 3))
+            pellets = zip(cols.tolist(), rows.tolist())
+
+        for pos in pellets:
+            self.add(pos)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, pos):
+        bucket = self._bucket(pos)
+        return bucket is not None and tuple(pos) in bucket
+
+    def __iter__(self):
+        for bucket in self._buckets:
+            yield from bucket
+
+    def add(self, pos):
+        """Add a pellet at (x, y); positions outside the grid are ignored."""
+        pos = tuple(pos)
+        bucket = self._bucket(pos)
+        if bucket is not None and pos not in bucket:
+            bucket.add(pos)
+            self._count += 1
+
+    def discard(self, pos):
+        """
+        Remove the pellet at (x, y) (eaten), if there is one.
+
+        Returns:
+            bool: Whether a pellet was removed
+        """
+        pos = tuple(pos)
+        bucket = self._bucket(pos)
+        if bucket is None or pos not in bucket:
+            return False
+        bucket.remove(pos)
+        self._count -= 1
+        return True
+
+    def copy(self):
+        """Independent index of the same pellets, sharing the visit orders."""
+        clone = PelletIndex.__new__(PelletIndex)
+        clone.__dict__.update(self.__dict__)
+        clone._buckets = [set(bucket) for bucket in self._buckets]
+        return clone
+
+    def nearest(self, pos):
+        """Nearest pellet (x, y) to pos, or None if none remain."""
+        return self._search(pos)[0]
+
+    def nearest_distance(self, pos):
+        """Distance from pos to the nearest pellet, or None if none remain."""
+        return self._search(pos)[1]
+
+    def _bucket(self, pos):
+        """Set of the block holding (x, y), or None outside the grid."""
+        x, y = pos
+        if 0 <= y < self.grid.rows and 0 <= x < self.grid.cols:
+            size = self.bucket_size
+            return self._buckets[(y // size) * self.bucket_cols + x // size]
+        return None
+
+    def _search(self, pos):
+        """(nearest pellet, distance), or (None, None)."""
+        if not self._count:
+            return None, None
+
+        x, y = pos
+        if 0 <= y < self.grid.rows and 0 <= x < self.grid.cols:
+            size = self.bucket_size
+            order, bounds = self._order((y // size) * self.bucket_cols + x // size)
+        else:
+            # Block bounds only hold for queries inside the grid
+            order, bounds = range(len(self._buckets)), repeat(float('-inf'))
+
+        buckets = self._buckets
+        distance = self.grid.distance_bound
+        wrap_rows = self.grid.wrap_rows
+        wrap_cols = self.grid.wrap_cols
+        query = (y, x)
+        best = None
+        best_key = None
+        best_distance = float('inf')
+
+        for index, bound in zip(order, bounds):
+            if bound > best_distance:
+                break
+            for pellet in buckets[index]:
+                px, py = pellet
+                dx = px - x if px >= x else x - px
+                dy = py - y if py >= y else y - py
+                # Manhattan unless the way round through a tunnel may be shorter
+                if (wrap_cols and 2 * dx > wrap_cols) or (wrap_rows and 2 * dy > wrap_rows):
+                    d = distance(query, (py, px))
+                else:
+                    d = dx + dy
+                if d < best_distance or (d == best_distance and (py, px) < best_key):
+                    best = pellet
+                    best_key = (py, px)
+                    best_distance = d
+
+        return best, best_distance
+
+    def _order(self, bucket):
+        """
+        Blocks by their smallest possible distance from a block.
+
+        Returns:
+            tuple: (block indices, lower bounds), both sorted by bound
+        """
+        cached = self._orders.get(bucket)
+        if cached is not None:
+            return cached
+
+        indices = np.arange(self.bucket_rows * self.bucket_cols)
+        row, col = divmod(bucket, self.bucket_cols)
+
+        bounds = (
+            self._axis_bounds(row, indices // self.bucket_cols, self.grid.rows, self.grid.wrap_rows)
+            + self._axis_bounds(col, indices % self.bucket_cols, self.grid.cols, self.grid.wrap_cols)
+        )
+        order = np.argsort(bounds, kind='stable')
+
+        cached = (order.tolist(), bounds[order].tolist())
+        self._orders[bucket] = cached
+        return cached
+
+    def _axis_bounds(self, block, blocks, length, cycle):
+        """
+        Smallest distance along one axis between a cell of block and a
+        cell of each of blocks (counting the short way round a cycle).
+        """
+        size = self.bucket_size
+        start, end = block * size, min(block * size + size, length) - 1
+        starts = blocks * size
+        ends = np.minimum(starts + size, length) - 1
+
+        gap = np.maximum(0, np.maximum(starts - end, start - ends))
+        if cycle:
+            # Going round, the pair furthest apart directly is the closest
+            span = np.maximum(ends, end) - np.minimum(starts, start)
+            gap = np.maximum(0, np.minimum(gap, cycle - span))
+        return gap
@@ -2,7 +2,6 @@
 Random Walker - Moves randomly while avoiding ghosts at close range
 """
 
-import random
 from .base_pacman import BasePacmanAI
 
 
@@ -10,6 +9,7 @@ class RandomWalker(BasePacmanAI):
     """Random movement algorithm with basic ghost avoidance"""
     
     DANGER_DISTANCE = 2
+    DANGER_RADIUS = DANGER_DISTANCE
     
     def get_next_move(self, pacman_pos, ghost_positions, pellet_positions):
         """
@@ -17,8 +17,8 @@ class RandomWalker(BasePacmanAI):
         
         Args:
             pacman_pos: (x, y) tuple of Pacman's position
-            ghost_positions: List of ghost positions
-            pellet_positions: List of pellet positions
+            ghost_positions: DangerField or list of ghost positions
+            pellet_positions: PelletIndex or list of pellet positions (unused)
         
         Returns:
             Next position (x, y)
@@ -28,22 +28,17 @@ class RandomWalker(BasePacmanAI):
         if not neighbors:
             return pacman_pos
         
+        danger = self.danger_field(ghost_positions)
+        
         # Filter out dangerous positions (too close to ghosts)
-        safe_neighbors = []
-        for neighbor in neighbors:
-            is_safe = True
-            for ghost_pos in ghost_positions:
-                if self.distance(neighbor, ghost_pos) <= self.DANGER_DISTANCE:
-                    is_safe = False
-                    break
-            if is_safe:
-                safe_neighbors.append(neighbor)
+        safe_neighbors = [
+            neighbor for neighbor in neighbors
+            if danger.distance(neighbor) > self.DANGER_DISTANCE
+        ]
         
         # If all positions are dangerous, choose least dangerous
         if not safe_neighbors:
-            return max(neighbors, key=lambda n: min(
-                self.distance(n, g) for g in ghost_positions
-            ) if ghost_positions else 0)
+            return max(neighbors, key=danger.distance)
         
         # Return random safe move
-        return random.choice(safe_neighbors)
+        return self.rng.choice(safe_neighbors)
@@ -0,0 +1,655 @@
+"""
+Search Pacman - Time-budgeted expectimax lookahead over ghost moves
+"""
+
+import gc
+import random
+import time
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ghost_ai.blinky import BlinkyAgent
+from ghost_ai.pinky import PinkyAgent
+from ghost_ai.inky import InkyAgent
+from ghost_ai.clyde import ClydeAgent
+from pathfinding.distance_oracle import DistanceOracle
+from .base_pacman import BasePacmanAI
+
+
+# Ghost behaviors used to predict the ghosts (as in GameEngine)
+GHOST_MODELS = {
+    'blinky': BlinkyAgent,
+    'pinky': PinkyAgent,
+    'inky': InkyAgent,
+    'clyde': ClydeAgent
+}
+
+# Direction name of each (row, col) step
+STEP_DIRECTIONS = {(-1, 0): 'UP', (1, 0): 'DOWN', (0, -1): 'LEFT', (0, 1): 'RIGHT'}
+HEADINGS = [None, 'UP', 'DOWN', 'LEFT', 'RIGHT']
+
+# Rewards: points per pellet and power pellet, a catch, a cleared board
+PELLET_REWARDS = {2: 10, 3: 50}
+CATCH_PENALTY = -1000
+CLEAR_BONUS = 500
+
+# Leaf estimate: points lost per step to the nearest pellet
+PELLET_DISTANCE_WEIGHT = 1
+
+# Weight of each later move's value: sooner pellets (and later catches) win
+DISCOUNT = 0.95
+
+# First estimate of an oracle table's build time, per maze cell (measured
+# builds replace it)
+TABLE_SECONDS_PER_CELL = 2e-6
+
+# Distance tables the search fell back without, kept to build next move
+MAX_WANTED_TABLES = 64
+
+
+class SearchTimeout(Exception):
+    """The per-move time budget ran out mid-iteration."""
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search values keyed by Zobrist hash.
+
+    Entries are (key, depth, value, generation) in slot key & mask. A
+    store evicts the slot's entry when it belongs to an earlier search
+    (generation) or was searched less deep; otherwise the new value is
+    dropped. Lookups only return values of the current generation, since
+    leaf estimates depend on the pellets at the search's root.
+    """
+
+    def __init__(self, size=1 << 16):
+        """
+        Args:
+            size: Number of slots (rounded up to a power of two)
+        """
+        size = 1 << max(0, (size - 1).bit_length())
+        self.mask = size - 1
+        self.keys = [None] * size
+        self.depths = [0] * size
+        self.values = [0.0] * size
+        self.generations = [0] * size
+        self.generation = 0
+        self.entries = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return self.entries
+
+    def new_search(self):
+        """Start a new generation: older entries become evictable."""
+        self.generation += 1
+
+    def get(self, key, depth):
+        """Value stored for key at depth or deeper this generation, or None."""
+        slot = key & self.mask
+        if (self.keys[slot] == key and self.generations[slot] == self.generation
+                and self.depths[slot] >= depth):
+            self.hits += 1
+            return self.values[slot]
+        return None
+
+    def put(self, key, depth, value):
+        """Store a value, evicting a stale or shallower entry from its slot."""
+        slot = key & self.mask
+        stored = self.keys[slot]
+        if stored is None:
+            self.entries += 1
+        elif stored != key:
+            if self.generations[slot] == self.generation and self.depths[slot] > depth:
+                return
+            self.evictions += 1
+
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        self.generations[slot] = self.generation
+        self.stores += 1
+
+
+class SearchPacman(BasePacmanAI):
+    """
+    Anytime lookahead - expectimax over predicted ghost moves
+
+    Searches Pac-Man's moves by iterative deepening until the per-move
+    time budget runs out, and plays the best move of the deepest search
+    completed. Ghosts are predicted with the ghost agents' own get_target
+    and shortest-path next hops. For the first noise_plies moves each
+    ghost near Pac-Man takes another move with probability ghost_noise,
+    and chance nodes average over the predicted moves and every
+    single-ghost deviation; deeper moves follow the prediction only, so
+    the branching stays near one and the search sees further.
+
+    Rewards are the pellets eaten along a line, CATCH_PENALTY for a catch
+    (which ends the line) and CLEAR_BONUS for clearing the board, weighted
+    by DISCOUNT per move from the root; lines cut off at the depth limit
+    lose PELLET_DISTANCE_WEIGHT per maze step to the pellet nearest
+    Pac-Man at the root.
+
+    States (Pac-Man cell, heading, ghost cells, remaining pellets as a
+    bitset) are Zobrist-hashed into a TranspositionTable. Depth reached
+    and nodes per second are recorded for every move (see search_report).
+
+    The budget holds per move: the deadline is checked at every node
+    expanded (past the first iteration, which always completes), and the
+    search never builds an oracle table, which would take milliseconds on
+    large mazes. Ghosts whose target has no table yet step greedily by
+    distance_bound, and the leaf estimate falls back the same way; those
+    tables are built before later searches, in the first half of the
+    budget, so a build slower than expected still leaves time to search.
+    Garbage collection is paused for the move, so a full collection runs
+    after it rather than inside its budget.
+    """
+
+    DANGER_RADIUS = 4
+
+    def __init__(self, grid, seed=None, budget_ms=10, max_depth=24, ghost_types=None,
+                 ghost_noise=0.0, noise_radius=4, noise_plies=1, oracle=None,
+                 table_size=1 << 16):
+        """
+        Initialize the search
+
+        Args:
+            grid: Grid or 2D list representing the maze
+            seed: Seed or random.Random instance (draws the Zobrist keys)
+            budget_ms: Time budget per move, in milliseconds
+            max_depth: Deepest search (Pac-Man moves)
+            ghost_types: Ghost type of each ghost position passed to
+                get_next_move, in order ('blinky' for missing entries)
+            ghost_noise: Probability that a ghost leaves its predicted move
+            noise_radius: Only ghosts this close to Pac-Man (Manhattan,
+                through tunnels) are considered to deviate
+            noise_plies: Pac-Man moves from the root with ghost deviations
+            oracle: DistanceOracle for this grid, shared with the ghosts
+            table_size: Transposition table slots
+        """
+        super().__init__(grid, seed)
+        self.budget = budget_ms / 1000.0
+        self.max_depth = max_depth
+        self.ghost_types = list(ghost_types or [])
+        self.ghost_noise = ghost_noise
+        self.noise_radius = noise_radius
+        self.noise_plies = noise_plies
+        self.oracle = oracle if oracle is not None else DistanceOracle(self.grid)
+        self.table = TranspositionTable(table_size)
+
+        oracle = self.oracle
+        self._cells = oracle.cells
+        self._cell_index = oracle.cell_index
+        self._models = {}
+
+        # Pac-Man's moves from every cell: (neighbor, heading index)
+        positions = self._cells
+        self._moves = [
+            [(n, HEADINGS.index(self._step_heading(positions[c], positions[n])))
+             for n in oracle.neighbors[c]]
+            for c in range(len(positions))
+        ]
+
+        # Pellet bit and reward of every compact cell (pellets passed for
+        # cells the grid shows empty count as ordinary pellets)
+        cells = self.grid.cells
+        self._pellet_bits = [1 << i for i in range(len(positions))]
+        self._rewards = [
+            PELLET_REWARDS.get(int(cells[row, col]), PELLET_REWARDS[2])
+            for row, col in positions
+        ]
+
+        # Zobrist keys: Pac-Man cell, heading, pellet, ghost slot x cell
+        # (ghost slots are added as ghosts are seen)
+        self._zobrist = random.Random(self.rng.getrandbits(64))
+        size = len(positions)
+        self._z_pacman = [self._zobrist.getrandbits(64) for _ in range(size)]
+        self._z_heading = [self._zobrist.getrandbits(64) for _ in HEADINGS]
+        self._z_pellet = [self._zobrist.getrandbits(64) for _ in range(size)]
+        self._z_ghosts = []
+
+        # Targets of missing tables, oldest first, and a build's expected time
+        self._wanted = {}
+        self._table_seconds = size * TABLE_SECONDS_PER_CELL
+
+        # Ghost models and Zobrist keys of the known ghosts, before any move
+        self._ghost_models(len(self.ghost_types))
+
+        self._heading = None
+        self._last_move = None
+        self._pellets = None
+        self._remaining = 0
+        # Bits set in _remaining (int.bit_count needs Python 3.10)
+        self._remaining_count = 0
+        self._pellet_key = 0
+        self.reset_report()
+
+    def reset_report(self):
+        """Clear the counters behind search_report."""
+        self.last_search = None
+        self._moves_searched = 0
+        self._nodes = 0
+        self._seconds = 0.0
+        self._depths = []
+        self._hits_before = self.table.hits
+
+    def search_report(self):
+        """
+        Search statistics since the last reset_report.
+
+        Returns:
+            dict: {'moves', 'nodes', 'seconds', 'nodesPerSecond',
+                'meanDepth', 'minDepth', 'maxDepth', 'tableHits',
+                'tableEntries', 'tableEvictions', 'budgetMs'}
+        """
+        depths = self._depths
+        return {
+            'moves': self._moves_searched,
+            'nodes': self._nodes,
+            'seconds': round(self._seconds, 6),
+            'nodesPerSecond': round(self._nodes / self._seconds) if self._seconds else 0,
+            'meanDepth': round(sum(depths) / len(depths), 2) if depths else 0,
+            'minDepth': min(depths) if depths else 0,
+            'maxDepth': max(depths) if depths else 0,
+            'tableHits': self.table.hits - self._hits_before,
+            'tableEntries': len(self.table),
+            'tableEvictions': self.table.evictions,
+            'budgetMs': round(self.budget * 1000, 3)
+        }
+
+    def get_next_move(self, pacman_pos, ghost_positions, pellet_positions):
+        """
+        Best move found within the time budget
+
+        Args:
+            pacman_pos: (x, y) tuple of Pacman's position
+            ghost_positions: DangerField (its sources are used) or list
+                of ghost positions, in ghost_types order
+            pellet_positions: PelletIndex or list of pellet positions
+
+        Returns:
+            Next position (x, y)
+        """
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return self._search(pacman_pos, ghost_positions, pellet_positions)
+        finally:
+            if collecting:
+                gc.enable()
+
+    def _search(self, pacman_pos, ghost_positions, pellet_positions):
+        """get_next_move, without garbage collection."""
+        start = time.perf_counter()
+        x, y = pacman_pos
+        pacman = self._index((y, x))
+        if pacman < 0 or not self._moves[pacman]:
+            return pacman_pos
+
+        # Pac-Man's heading is that of this AI's last move, if he took it
+        if self._last_move != tuple(pacman_pos):
+            self._heading = None
+        heading = HEADINGS.index(self._heading)
+
+        ghosts = tuple(self._ghost_cells(ghost_positions))
+        remaining = self._root_pellets(self.pellet_index(pellet_positions), pacman)
+
+        self._deadline = start + self.budget
+        self._goal_cell = self._nearest_pellet(pacman, remaining)
+        self._warm_tables(self._goal_cell)
+        goal_table = self.oracle.cached_table(self._goal_cell) if self._goal_cell >= 0 else None
+        self._goal = goal_table[0] if goal_table is not None else None
+        self._nodes_this_move = 0
+        self._predictions = {}
+        self.table.new_search()
+
+        key = self._hash(pacman, heading, ghosts)
+        best, depth = self._iterative_deepening(pacman, heading, ghosts, remaining, key)
+
+        elapsed = time.perf_counter() - start
+        self._moves_searched += 1
+        self._nodes += self._nodes_this_move
+        self._seconds += elapsed
+        self._depths.append(depth)
+        self.last_search = {
+            'depth': depth,
+            'nodes': self._nodes_this_move,
+            'seconds': round(elapsed, 6),
+            'nodesPerSecond': round(self._nodes_this_move / elapsed) if elapsed else 0
+        }
+
+        cell, move_heading = self._moves[pacman][best]
+        row, col = self._cells[cell]
+        self._heading = HEADINGS[move_heading]
+        self._last_move = (col, row)
+        return (col, row)
+
+    def _root_pellets(self, pellets, pacman):
+        """
+        Remaining-pellet bitset at the root, keeping _pellet_key in step.
+
+        When the same index is passed move after move (as SelfPlayEngine
+        does), only the pellet under Pac-Man can have gone since the last
+        move, so the bitset and its hash are updated for that cell alone;
+        a count mismatch (or a new index) rebuilds them from every pellet.
+        """
+        if pellets is self._pellets:
+            bit = self._pellet_bits[pacman]
+            if self._remaining & bit:
+                row, col = self._cells[pacman]
+                if (col, row) not in pellets:
+                    self._remaining ^= bit
+                    self._remaining_count -= 1
+                    self._pellet_key ^= self._z_pellet[pacman]
+            if self._remaining_count == len(pellets):
+                return self._remaining
+
+        remaining = 0
+        count = 0
+        for px, py in pellets:
+            cell = self._index((py, px))
+            if cell >= 0 and not remaining & self._pellet_bits[cell]:
+                remaining |= self._pellet_bits[cell]
+                count += 1
+
+        key = 0
+        z_pellet = self._z_pellet
+        bits = remaining
+        while bits:
+            low = bits & -bits
+            key ^= z_pellet[low.bit_length() - 1]
+            bits ^= low
+
+        self._pellets = pellets
+        self._remaining = remaining
+        self._remaining_count = count
+        self._pellet_key = key
+        return remaining
+
+    def _iterative_deepening(self, pacman, heading, ghosts, remaining, key):
+        """(best move index, depth searched) within the time budget."""
+        best = 0
+        depth = 0
+
+        for limit in range(1, self.max_depth + 1):
+            self._limit = limit
+            try:
+                values = [
+                    self._chance(cell, move_heading, pacman, heading, ghosts, remaining, key, limit)
+                    for cell, move_heading in self._moves[pacman]
+                ]
+            except SearchTimeout:
+                break
+
+            best = max(range(len(values)), key=values.__getitem__)
+            depth = limit
+            if time.perf_counter() >= self._deadline:
+                break
+
+        return best, depth
+
+    def _max_value(self, pacman, heading, ghosts, remaining, key, depth):
+        """Value of Pac-Man to move (after the ghosts have moved)."""
+        if depth == 0:
+            return self._evaluate(pacman)
+
+        value = self.table.get(key, depth)
+        if value is not None:
+            return value
+
+        self._nodes_this_move += 1
+        if self._limit > 1 and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+
+        value = max(
+            self._chance(cell, move_heading, pacman, heading, ghosts, remaining, key, depth)
+            for cell, move_heading in self._moves[pacman]
+        )
+        self.table.put(key, depth, value)
+        return value
+
+    def _chance(self, cell, heading, previous, previous_heading, ghosts, remaining, key, depth):
+        """Expected value of Pac-Man moving to cell, over the ghosts' replies."""
+        self._nodes_this_move += 1
+
+        # State hash after Pac-Man's move (ghost changes are added per reply)
+        key ^= self._z_pacman[previous] ^ self._z_pacman[cell]
+        key ^= self._z_heading[previous_heading] ^ self._z_heading[heading]
+        bit = self._pellet_bits[cell]
+        reward = 0
+        if remaining & bit:
+            remaining ^= bit
+            key ^= self._z_pellet[cell]
+            reward = self._rewards[cell]
+
+        expected = 0.0
+        noisy = self._limit - depth < self.noise_plies
+        for probability, replies in self._replies(cell, heading, ghosts, noisy):
+            if self._caught(cell, previous, ghosts, replies):
+                value = CATCH_PENALTY
+            elif not remaining and reward:
+                value = reward + CLEAR_BONUS
+            else:
+                reply_key = key
+                z_ghosts = self._z_ghosts
+                for slot, (before, after) in enumerate(zip(ghosts, replies)):
+                    if before != after:
+                        reply_key ^= z_ghosts[slot][before] ^ z_ghosts[slot][after]
+                value = reward + DISCOUNT * self._max_value(
+                    cell, heading, replies, remaining, reply_key, depth - 1
+                )
+            expected += probability * value
+
+        return expected
+
+    @staticmethod
+    def _caught(pacman, previous, ghosts, replies):
+        """Same rule as GameEngine._collides, on compact cells."""
+        for before, after in zip(ghosts, replies):
+            if after == pacman or (before == pacman and after == previous):
+                return True
+        return False
+
+    def _replies(self, pacman, heading, ghosts, noisy=True):
+        """
+        Ghost replies to Pac-Man's move: [(probability, ghost cells)].
+
+        The predicted reply comes first. Ghosts near Pac-Man may each take
+        any other move instead (one ghost at a time); probabilities are
+        normalised over these outcomes. Without noisy, only the predicted
+        reply is returned.
+        """
+        predicted = self._predict(pacman, heading, ghosts)
+        noise = self.ghost_noise
+        if not noise or not noisy:
+            return [(1.0, predicted)]
+
+        pacman_pos = self._cells[pacman]
+        distance = self.grid.distance_bound
+        neighbors = self.oracle.neighbors
+        weighted = [[1.0, predicted]]
+
+        for slot, (before, after) in enumerate(zip(ghosts, predicted)):
+            if before < 0 or distance(pacman_pos, self._cells[before]) > self.noise_radius:
+                continue
+            others = [n for n in neighbors[before] if n != after]
+            if not others:
+                continue
+            weighted[0][0] *= 1 - noise
+            share = noise / len(others)
+            for other in others:
+                deviation = predicted[:slot] + (other,) + predicted[slot + 1:]
+                weighted.append([share, deviation])
+
+        total = sum(weight for weight, _ in weighted)
+        return [(weight / total, replies) for weight, replies in weighted]
+
+    def _predict(self, pacman, heading, ghosts):
+        """Ghost cells after every ghost steps towards its get_target target."""
+        memo_key = (pacman, heading, ghosts)
+        predicted = self._predictions.get(memo_key)
+        if predicted is not None:
+            return predicted
+
+        cells = self._cells
+        pacman_pos = cells[pacman]
+        direction = HEADINGS[heading]
+        models = self._ghost_models(len(ghosts))
+        other_ghosts = {
+            model.ghost_id: cells[cell] if cell >= 0 else None
+            for model, cell in zip(models, ghosts)
+        }
+
+        moved = []
+        for model, cell in zip(models, ghosts):
+            if cell < 0:
+                moved.append(cell)
+                continue
+            model.position = cells[cell]
+            target = self._index(model.get_target(pacman_pos, direction, other_ghosts))
+            step = -1
+            if target >= 0 and target != cell:
+                table = self.oracle.cached_table(target)
+                if table is not None:
+                    step = table[1][cell]
+                else:
+                    step = self._greedy_step(cell, target)
+                    self._want(target)
+            moved.append(step if step >= 0 else cell)
+
+        predicted = tuple(moved)
+        self._predictions[memo_key] = predicted
+        return predicted
+
+    def _greedy_step(self, cell, target):
+        """Neighbor of cell nearest target by distance_bound (-1 if none)."""
+        cells = self._cells
+        target_pos = cells[target]
+        distance = self.grid.distance_bound
+        best = -1
+        best_distance = None
+        for neighbor in self.oracle.neighbors[cell]:
+            d = distance(cells[neighbor], target_pos)
+            if best_distance is None or d < best_distance:
+                best, best_distance = neighbor, d
+        return best
+
+    def _want(self, target):
+        """Remember a target whose table the search went without."""
+        wanted = self._wanted
+        if target not in wanted:
+            wanted[target] = None
+            if len(wanted) > MAX_WANTED_TABLES:
+                del wanted[next(iter(wanted))]
+
+    def _warm_tables(self, goal_cell):
+        """
+        Build missing tables (the goal's first) while each fits in the
+        first half of the budget.
+
+        Runs before the search so the build times stay inside the move's
+        budget; tables that do not fit wait for a later move.
+        """
+        oracle = self.oracle
+        targets = list(self._wanted)
+        # The other half is the search's, and slack for builds over estimate
+        cutoff = self._deadline - self.budget / 2
+        if goal_cell >= 0:
+            targets.insert(0, goal_cell)
+
+        for target in targets:
+            if oracle.cached_table(target) is None:
+                now = time.perf_counter()
+                if now + self._table_seconds > cutoff:
+                    break
+                oracle.table(target)
+                self._table_seconds = (self._table_seconds + time.perf_counter() - now) / 2
+            self._wanted.pop(target, None)
+
+    def _ghost_models(self, count):
+        """Ghost agents predicting each ghost slot (Zobrist keys per slot)."""
+        models = []
+        for slot in range(count):
+            ghost_type = self.ghost_types[slot] if slot < len(self.ghost_types) else 'blinky'
+            model = self._models.get((slot, ghost_type))
+            if model is None:
+                model = GHOST_MODELS.get(ghost_type, BlinkyAgent)(self.grid, 'astar', oracle=self.oracle)
+                self._models[(slot, ghost_type)] = model
+            models.append(model)
+
+        while len(self._z_ghosts) < count:
+            self._z_ghosts.append([self._zobrist.getrandbits(64) for _ in self._cells])
+        return models
+
+    def _ghost_cells(self, ghost_positions):
+        """Compact cells of the ghosts (-1 = none) from positions or a field."""
+        sources = getattr(ghost_positions, 'sources', None)
+        if sources is not None:
+            return [self._cell_index[cell] if cell >= 0 else -1 for cell in sources]
+        return [self._index((y, x)) for x, y in ghost_positions]
+
+    def _evaluate(self, pacman):
+        """Estimate at the depth limit: steps to the root's nearest pellet."""
+        if self._goal is not None:
+            return -PELLET_DISTANCE_WEIGHT * max(self._goal[pacman], 0)
+        if self._goal_cell < 0:
+            return 0
+        # No table for the pellet yet
+        cells = self._cells
+        return -PELLET_DISTANCE_WEIGHT * self.grid.distance_bound(cells[pacman], cells[self._goal_cell])
+
+    def _nearest_pellet(self, pacman, remaining):
+        """Compact cell of the pellet nearest in the maze, or -1."""
+        if not remaining:
+            return -1
+        bits = self._pellet_bits
+        if remaining & bits[pacman]:
+            return pacman
+
+        # BFS from Pac-Man until the first cell holding a pellet
+        neighbors = self.oracle.neighbors
+        seen = {pacman}
+        frontier = [pacman]
+        while frontier:
+            following = []
+            for cell in frontier:
+                for neighbor in neighbors[cell]:
+                    if neighbor in seen:
+                        continue
+                    if remaining & bits[neighbor]:
+                        return neighbor
+                    seen.add(neighbor)
+                    following.append(neighbor)
+            frontier = following
+        return -1
+
+    def _hash(self, pacman, heading, ghosts):
+        """Zobrist hash of a root state (pellets from _root_pellets)."""
+        self._ghost_models(len(ghosts))
+        key = self._z_pacman[pacman] ^ self._z_heading[heading] ^ self._pellet_key
+        for slot, cell in enumerate(ghosts):
+            if cell >= 0:
+                key ^= self._z_ghosts[slot][cell]
+        return key
+
+    def _index(self, pos):
+        """Compact index of a (row, col) position, or -1."""
+        if pos is None:
+            return -1
+        return self.oracle.index_of(pos)
+
+    def _step_heading(self, current, following):
+        """Direction of a step between adjacent cells (through tunnels)."""
+        dr = following[0] - current[0]
+        dc = following[1] - current[1]
+        # A step longer than one cell crosses a tunnel the other way
+        if abs(dr) > 1:
+            dr = -1 if dr > 0 else 1
+        if abs(dc) > 1:
+            dc = -1 if dc > 0 else 1
+        return STEP_DIRECTIONS.get((dr, dc))
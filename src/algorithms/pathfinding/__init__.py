@@ -2,6 +2,14 @@
 
 from .astar import AStar
 from .bfs import BFS
+from .bidirectional import BidirectionalBFS
+from .distance_oracle import DistanceOracle
+from .incremental import IncrementalAStar
+from .jump_point import JumpPointSearch
+from .stats import SearchStats
 
-__all__ = ['AStar', 'BFS']
+__all__ = [
+    'AStar', 'BFS', 'BidirectionalBFS', 'DistanceOracle', 'IncrementalAStar',
+    'JumpPointSearch', 'SearchStats'
+]
 
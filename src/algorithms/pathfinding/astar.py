@@ -1,4 +1,4 @@
-"""A* pathfinding algorithm with Manhattan distance heuristic."""
+"""A* pathfinding algorithm with a tunnel-aware Manhattan heuristic."""
 
 import heapq
 import sys
@@ -7,31 +7,42 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.distance import manhattan_distance
+from utils.grid import as_grid
 
 
 class AStar:
     """
     A* pathfinding algorithm optimized for grid-based movement.
     
-    Uses Manhattan distance as the heuristic (h-function) which is
-    admissible and consistent for 4-directional grid movement.
+    Uses Manhattan distance, shortened through tunnels (Grid.distance_bound),
+    as the heuristic (h-function); it is admissible and consistent for
+    4-directional grid movement.
     
     Guarantees optimal path when movement cost is uniform.
     Time complexity: O(b^d) where b is branching factor, d is depth
     Space complexity: O(b^d) for storing the frontier
     """
     
-    def __init__(self, grid):
+    def __init__(self, grid, oracle=None, stats=None):
         """
         Initialize A* pathfinder.
         
         Args:
-            grid: 2D array where 0=walkable, non-zero=blocked
+            grid: Grid or 2D array where 1=wall, other values walkable
+            oracle: Optional DistanceOracle for the same grid; when given,
+                find_next_move is answered by table lookup instead of search
+            stats: Optional SearchStats recording every call (see stats.py)
         """
-        self.grid = grid
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if grid else 0
+        self.grid = as_grid(grid)
+        self.oracle = oracle
+        self.stats = stats
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
+        
+        # Number of nodes popped, and heap pushes/pops, by searches so far
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
     
     def find_path(self, start, goal):
         """
@@ -44,6 +55,12 @@ class AStar:
         Returns:
             list: Path as list of (row, col) tuples, or None if no path exists
         """
+        if self.stats is not None:
+            return self.stats.measure(self, self._find_path, start, goal)
+        return self._find_path(start, goal)
+    
+    def _find_path(self, start, goal):
+        """A* search behind find_path."""
         # Normalize input
         start_pos = self._normalize_position(start)
         goal_pos = self._normalize_position(goal)
@@ -57,6 +74,7 @@ class AStar:
         counter = 0
         frontier = [(0, counter, start_pos)]
         counter += 1
+        self.pushes += 1
         
         # Track visited nodes
         came_from = {}
@@ -65,10 +83,13 @@ class AStar:
         g_score = {start_pos: 0}
         
         # f_score: g_score + heuristic (estimated total cost)
-        f_score = {start_pos: manhattan_distance(start_pos, goal_pos)}
+        heuristic = self.grid.distance_bound
+        f_score = {start_pos: heuristic(start_pos, goal_pos)}
         
         while frontier:
             current_f, _, current = heapq.heappop(frontier)
+            self.expansions += 1
+            self.pops += 1
             
             # Goal reached
             if current == goal_pos:
@@ -84,11 +105,12 @@ class AStar:
                     # Record this path
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + manhattan_distance(neighbor, goal_pos)
+                    f_score[neighbor] = tentative_g + heuristic(neighbor, goal_pos)
                     
                     # Add to frontier if not already there
                     heapq.heappush(frontier, (f_score[neighbor], counter, neighbor))
                     counter += 1
+                    self.pushes += 1
         
         # No path found
         return None
@@ -104,6 +126,13 @@ class AStar:
         Returns:
             tuple: Next position (row, col) or None if no path
         """
+        if self.oracle is not None:
+            start_pos = self._normalize_position(start)
+            goal_pos = self._normalize_position(goal)
+            if self.stats is not None:
+                return self.stats.measure_lookup(self.oracle, start_pos, goal_pos)
+            return self.oracle.next_move(start_pos, goal_pos)
+        
         path = self.find_path(start, goal)
         if path and len(path) > 1:
             return path[1]  # Return next position (path[0] is current)
@@ -117,25 +146,12 @@ class AStar:
     
     def _is_valid(self, pos):
         """Check if position is valid and walkable."""
-        row, col = pos
-        return (0 <= row < self.rows and 
-                0 <= col < self.cols and 
-                self.grid[row][col] == 0)
+        return self.grid.is_walkable(pos)
     
     def _get_neighbors(self, pos):
         """Get valid neighboring cells (4-directional movement)."""
-        row, col = pos
-        neighbors = []
-        
-        # Check all 4 directions: up, down, left, right
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_row, new_col = row + dr, col + dc
-            new_pos = (new_row, new_col)
-            
-            if self._is_valid(new_pos):
-                neighbors.append(new_pos)
-        
-        return neighbors
+        # Precomputed adjacency: up, down, left, right
+        return self.grid.neighbors(pos)
     
     def _reconstruct_path(self, came_from, current):
         """Reconstruct path from start to goal."""
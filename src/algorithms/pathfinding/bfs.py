@@ -1,6 +1,13 @@
 """Breadth-First Search pathfinding algorithm."""
 
 from collections import deque
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.grid import as_grid
 
 
 class BFS:
@@ -15,16 +22,26 @@ class BFS:
     Space complexity: O(V) for the queue
     """
     
-    def __init__(self, grid):
+    def __init__(self, grid, oracle=None, stats=None):
         """
         Initialize BFS pathfinder.
         
         Args:
-            grid: 2D array where 0=walkable, non-zero=blocked
+            grid: Grid or 2D array where 1=wall, other values walkable
+            oracle: Optional DistanceOracle for the same grid; when given,
+                find_next_move is answered by table lookup instead of search
+            stats: Optional SearchStats recording every call (see stats.py)
         """
-        self.grid = grid
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if grid else 0
+        self.grid = as_grid(grid)
+        self.oracle = oracle
+        self.stats = stats
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
+        
+        # Number of nodes dequeued, and queue pushes/pops, by searches so far
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
     
     def find_path(self, start, goal):
         """
@@ -37,6 +54,12 @@ class BFS:
         Returns:
             list: Path as list of (row, col) tuples, or None if no path exists
         """
+        if self.stats is not None:
+            return self.stats.measure(self, self._find_path, start, goal)
+        return self._find_path(start, goal)
+    
+    def _find_path(self, start, goal):
+        """BFS search behind find_path."""
         # Normalize input
         start_pos = self._normalize_position(start)
         goal_pos = self._normalize_position(goal)
@@ -48,9 +71,12 @@ class BFS:
         # Initialize BFS
         queue = deque([start_pos])
         came_from = {start_pos: None}
+        self.pushes += 1
         
         while queue:
             current = queue.popleft()
+            self.expansions += 1
+            self.pops += 1
             
             # Goal reached
             if current == goal_pos:
@@ -61,6 +87,7 @@ class BFS:
                 if neighbor not in came_from:
                     came_from[neighbor] = current
                     queue.append(neighbor)
+                    self.pushes += 1
         
         # No path found
         return None
@@ -76,6 +103,13 @@ class BFS:
         Returns:
             tuple: Next position (row, col) or None if no path
         """
+        if self.oracle is not None:
+            start_pos = self._normalize_position(start)
+            goal_pos = self._normalize_position(goal)
+            if self.stats is not None:
+                return self.stats.measure_lookup(self.oracle, start_pos, goal_pos)
+            return self.oracle.next_move(start_pos, goal_pos)
+        
         path = self.find_path(start, goal)
         if path and len(path) > 1:
             return path[1]  # Return next position
@@ -89,25 +123,12 @@ class BFS:
     
     def _is_valid(self, pos):
         """Check if position is valid and walkable."""
-        row, col = pos
-        return (0 <= row < self.rows and 
-                0 <= col < self.cols and 
-                self.grid[row][col] == 0)
+        return self.grid.is_walkable(pos)
     
     def _get_neighbors(self, pos):
         """Get valid neighboring cells (4-directional movement)."""
-        row, col = pos
-        neighbors = []
-        
-        # Check all 4 directions: up, down, left, right
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            new_row, new_col = row + dr, col + dc
-            new_pos = (new_row, new_col)
-            
-            if self._is_valid(new_pos):
-                neighbors.append(new_pos)
-        
-        return neighbors
+        # Precomputed adjacency: up, down, left, right
+        return self.grid.neighbors(pos)
     
     def _reconstruct_path(self, came_from, current):
         """Reconstruct path from start to goal."""
@@ -0,0 +1,210 @@
+"""Precomputed shortest-path tables for O(1) next-move queries."""
+
+from array import array
+from collections import OrderedDict, deque
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.grid import as_grid
+
+
+class DistanceOracle:
+    """
+    Per-maze distance and next-hop tables.
+
+    Walkable cells are numbered compactly and one BFS is run per target
+    cell the first time it is queried. The BFS stores, for every cell,
+    its distance to the target and the neighbor to step to, so later
+    queries towards that target are a single array lookup.
+
+    Tables are kept in an LRU bounded by max_targets, since all-pairs
+    tables for the largest mazes would not fit comfortably in memory.
+
+    Time complexity: O(V + E) per new target, O(1) per query
+    Space complexity: O(V) per cached target
+    """
+
+    def __init__(self, grid, max_targets=1024):
+        """
+        Initialize the oracle.
+
+        Args:
+            grid: Grid or 2D array where 1=wall, other values walkable
+            max_targets: Maximum number of per-target tables kept in memory
+        """
+        self.grid = as_grid(grid)
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
+        self.max_targets = max_targets
+
+        # Compact numbering of walkable cells
+        walkable_flat = np.flatnonzero(self.grid.walkable)
+        cell_index = np.full(self.grid.size, -1, dtype=np.int32)
+        cell_index[walkable_flat] = np.arange(len(walkable_flat), dtype=np.int32)
+
+        self.cells = self.grid.walkable_cells
+        self.cell_index = cell_index.tolist()
+
+        # Compact adjacency, same neighbor order as the grid's CSR
+        indptr = self.grid.indptr
+        compact_indices = cell_index[self.grid.indices].tolist()
+        starts = indptr[walkable_flat].tolist()
+        ends = indptr[walkable_flat + 1].tolist()
+        self.neighbors = [compact_indices[a:b] for a, b in zip(starts, ends)]
+
+        self._tables = OrderedDict()
+
+        # Number of per-target tables built on demand so far
+        self.tables_built = 0
+        
+        # Externally owned tables (e.g. in shared memory): target -> row views
+        self._attached = {}
+
+    def index_of(self, pos):
+        """Compact index of a position, or -1 if it is not walkable."""
+        row, col = pos
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cell_index[row * self.cols + col]
+        return -1
+
+    def distance(self, start, goal):
+        """
+        Shortest path length between two cells.
+
+        Returns:
+            int: Number of steps, or None if no path exists
+        """
+        start_idx = self.index_of(start)
+        goal_idx = self.index_of(goal)
+        if start_idx < 0 or goal_idx < 0:
+            return None
+
+        dist = self.table(goal_idx)[0][start_idx]
+        return dist if dist >= 0 else None
+
+    def next_move(self, start, goal):
+        """
+        Next cell on a shortest path from start to goal.
+
+        Returns:
+            tuple: Next position (row, col) or None if already at goal,
+            either cell is blocked, or no path exists
+        """
+        start_idx = self.index_of(start)
+        goal_idx = self.index_of(goal)
+        if start_idx < 0 or goal_idx < 0:
+            return None
+
+        next_idx = self.table(goal_idx)[1][start_idx]
+        return self.cells[next_idx] if next_idx >= 0 else None
+
+    def path(self, start, goal):
+        """
+        Full shortest path by following next hops.
+
+        Returns:
+            list: Path as list of (row, col) tuples, or None if no path exists
+        """
+        start_idx = self.index_of(start)
+        goal_idx = self.index_of(goal)
+        if start_idx < 0 or goal_idx < 0:
+            return None
+
+        dist, next_hop = self.table(goal_idx)
+        if dist[start_idx] < 0:
+            return None
+
+        path = [self.cells[start_idx]]
+        current = start_idx
+        while current != goal_idx:
+            current = next_hop[current]
+            path.append(self.cells[current])
+        return path
+
+    def table(self, target_idx):
+        """
+        Get (distance, next_hop) arrays towards a target, building on demand.
+
+        Both arrays are indexed by compact cell index; -1 marks unreachable
+        cells (and the target itself in next_hop).
+        """
+        cached = self.cached_table(target_idx)
+        if cached is not None:
+            return cached
+
+        tables = self._tables
+        result = self._bfs(target_idx)
+        self.tables_built += 1
+        tables[target_idx] = result
+        if len(tables) > self.max_targets:
+            tables.popitem(last=False)
+        return result
+
+    def cached_table(self, target_idx):
+        """
+        (distance, next_hop) arrays towards a target if already built, else None.
+
+        Never runs a BFS, for callers with a time budget (see table).
+        """
+        attached = self._attached.get(target_idx)
+        if attached is not None:
+            return attached
+
+        tables = self._tables
+        if target_idx in tables:
+            tables.move_to_end(target_idx)
+            return tables[target_idx]
+        return None
+
+    def fill_tables(self, targets, dist, next_hop):
+        """
+        Write the tables for several targets into caller-owned arrays.
+
+        Args:
+            targets: Compact target indices, one per row
+            dist: int32 array of shape (len(targets), len(self.cells))
+            next_hop: int32 array of the same shape
+        """
+        for row, target_idx in enumerate(targets):
+            row_dist, row_next = self._bfs(target_idx)
+            dist[row] = np.frombuffer(row_dist, dtype=np.int32)
+            next_hop[row] = np.frombuffer(row_next, dtype=np.int32)
+
+    def attach_tables(self, targets, dist, next_hop):
+        """
+        Serve the given targets from caller-owned arrays (see fill_tables).
+
+        Attached tables are never evicted or copied, so several processes
+        can share one set of tables placed in shared memory.
+        """
+        for row, target_idx in enumerate(targets):
+            # memoryview rows index to plain ints, like array('i')
+            self._attached[target_idx] = (memoryview(dist[row]), memoryview(next_hop[row]))
+
+    def _bfs(self, target_idx):
+        """Run one BFS from the target over the walkable cells."""
+        size = len(self.cells)
+        dist = array('i', [-1]) * size
+        next_hop = array('i', [-1]) * size
+        neighbors = self.neighbors
+
+        dist[target_idx] = 0
+        queue = deque([target_idx])
+
+        while queue:
+            current = queue.popleft()
+            next_dist = dist[current] + 1
+
+            for neighbor in neighbors[current]:
+                if dist[neighbor] < 0:
+                    dist[neighbor] = next_dist
+                    # Stepping back towards the target from neighbor
+                    next_hop[neighbor] = current
+                    queue.append(neighbor)
+
+        return dist, next_hop
@@ -0,0 +1,310 @@
+"""Incremental A* for a moving start and a moving goal."""
+
+import heapq
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.grid import as_grid
+
+
+# Cell states in the kept search tree
+UNSEEN, OPEN, CLOSED = 0, 1, 2
+
+
+class IncrementalAStar:
+    """
+    Fringe-retrieving A* (moving-target incremental A*).
+
+    Meant to be kept per ghost and queried every frame, while the ghost
+    (start) and its target (goal) each move about one cell. Instead of
+    searching from scratch, the A* search tree rooted at the start is
+    kept between queries:
+
+    - Goal moves: closed cells already have exact distances from the
+      start, so a goal inside the closed region is answered from the tree
+      without expanding anything. Otherwise the kept search resumes from
+      its open list; keys computed for an older goal are refreshed lazily
+      when they reach the top of the heap.
+    - Start moves into the closed region: the subtree rooted at the new
+      start keeps exact distances (a shortest path from the old start
+      through the new one is also shortest from the new one). Only cells
+      outside it are dropped, and dropped cells next to the kept region
+      are re-opened as the new fringe.
+
+    Manhattan distance, shortened through tunnels, is the heuristic
+    (Grid.distance_bound, inlined as _distance). Paths are optimal (same length
+    as AStar/BFS) but may pick a different route between equally short
+    ones. The grid must not change.
+    """
+
+    def __init__(self, grid, stats=None):
+        """
+        Initialize the pathfinder.
+
+        Args:
+            grid: Grid or 2D array where 1=wall, other values walkable
+            stats: Optional SearchStats recording every call (see stats.py)
+        """
+        self.grid = as_grid(grid)
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
+        self.stats = stats
+
+        positions = self.grid.positions
+        self._row = [pos[0] for pos in positions]
+        self._col = [pos[1] for pos in positions]
+        self._wrap_rows = self.grid.wrap_rows
+        self._wrap_cols = self.grid.wrap_cols
+        self._tunnel_rows = self.grid.tunnel_rows
+        self._tunnel_cols = self.grid.tunnel_cols
+
+        # Kept search: tree root, per-cell state, g (offset by the g of the
+        # root; only differences matter) and parent
+        self._root = -1
+        self._state = []
+        self._g = []
+        self._parent = []
+
+        # Open list of (key, -g, cell). Keys are f plus the slack: the
+        # total heuristic distance the goal has moved, by which any f may
+        # have dropped since it was pushed. Stored keys thus stay lower
+        # bounds, and outdated ones are refreshed when they reach the top.
+        self._open = []
+        self._goal = -1
+        self._slack = 0
+
+        # Number of cells expanded, and heap pushes/pops, by searches so far
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+
+    def find_path(self, start, goal):
+        """
+        Find an optimal path from start to goal, reusing earlier searches.
+
+        Args:
+            start: Tuple (row, col) or dict {'x': col, 'y': row}
+            goal: Tuple (row, col) or dict {'x': col, 'y': row}
+
+        Returns:
+            list: Path as list of (row, col) tuples, or None if no path exists
+        """
+        if self.stats is not None:
+            return self.stats.measure(self, self._find_path, start, goal)
+        return self._find_path(start, goal)
+
+    def _find_path(self, start, goal):
+        """Search behind find_path."""
+        start_pos = self._normalize_position(start)
+        goal_pos = self._normalize_position(goal)
+
+        if not self.grid.is_walkable(start_pos) or not self.grid.is_walkable(goal_pos):
+            return None
+
+        path = self._find(self.grid.index(start_pos), self.grid.index(goal_pos))
+        if path is None:
+            return None
+
+        positions = self.grid.positions
+        return [positions[i] for i in path]
+
+    def find_next_move(self, start, goal):
+        """
+        Find the next move in an optimal path.
+
+        Args:
+            start: Current position
+            goal: Target position
+
+        Returns:
+            tuple: Next position (row, col) or None if no path
+        """
+        path = self.find_path(start, goal)
+        if path and len(path) > 1:
+            return path[1]
+        return None
+
+    def _find(self, start, goal):
+        """Optimal path between flat indices, or None."""
+        if goal != self._goal:
+            if self._goal >= 0:
+                self._slack += self._distance(goal, self._goal)
+            self._goal = goal
+
+        if start != self._root:
+            if self._root >= 0 and self._state[start] == CLOSED:
+                self._move_root(start)
+            else:
+                self._reset(start)
+
+        found = self._state[goal] == CLOSED or self._search(goal)
+
+        if len(self._open) > 2 * self.grid.size:
+            self._compact()
+
+        if not found:
+            return None
+
+        parent = self._parent
+        path = [goal]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def _reset(self, start):
+        """Start a new search tree at start."""
+        size = self.grid.size
+        self._root = start
+        self._state = [UNSEEN] * size
+        self._g = [0] * size
+        self._parent = [-1] * size
+        self._open = []
+
+        self._state[start] = OPEN
+        self._push(start)
+
+    def _move_root(self, start):
+        """
+        Re-root the tree at a closed cell.
+
+        Drops every cell outside the new root's subtree, then re-opens
+        the dropped cells that border the kept closed cells, with their
+        best g through those cells.
+        """
+        state = self._state
+        g = self._g
+        parent = self._parent
+        adjacency = self.grid.adjacency
+
+        # Cells outside the new subtree: the old root's tree minus it
+        dropped = []
+        stack = [self._root]
+        while stack:
+            cell = stack.pop()
+            dropped.append(cell)
+            for neighbor in adjacency[cell]:
+                if neighbor != start and state[neighbor] != UNSEEN and parent[neighbor] == cell:
+                    stack.append(neighbor)
+
+        for cell in dropped:
+            state[cell] = UNSEEN
+        parent[start] = -1
+        self._root = start
+
+        # New fringe: dropped cells next to the kept closed region
+        for cell in dropped:
+            best = -1
+            for neighbor in adjacency[cell]:
+                if state[neighbor] == CLOSED and (best < 0 or g[neighbor] < g[best]):
+                    best = neighbor
+            if best >= 0:
+                state[cell] = OPEN
+                g[cell] = g[best] + 1
+                parent[cell] = best
+                self._push(cell)
+
+    def _compact(self):
+        """Rebuild the heap from open cells, dropping stale entries."""
+        self._open = []
+        for cell, cell_state in enumerate(self._state):
+            if cell_state == OPEN:
+                self._push(cell)
+
+    def _push(self, cell):
+        """Add an open cell to the heap with its key for the current goal."""
+        h = self._distance(cell, self._goal)
+        self.pushes += 1
+        heapq.heappush(self._open, (self._g[cell] + h + self._slack, -self._g[cell], cell))
+
+    def _distance(self, cell, other):
+        """Grid.distance_bound between flat indices."""
+        row, other_row = self._row[cell], self._row[other]
+        col, other_col = self._col[cell], self._col[other]
+        dr = abs(row - other_row)
+        dc = abs(col - other_col)
+        if self._wrap_rows and self._wrap_cols:
+            return min(dr, self._wrap_rows - dr) + min(dc, self._wrap_cols - dc)
+        if self._wrap_cols and 2 * dc > self._wrap_cols:
+            detour = min(abs(row - t) + abs(other_row - t) for t in self._tunnel_rows)
+            return min(dr + dc, detour + self._wrap_cols - dc)
+        if self._wrap_rows and 2 * dr > self._wrap_rows:
+            detour = min(abs(col - t) + abs(other_col - t) for t in self._tunnel_cols)
+            return min(dr + dc, detour + self._wrap_rows - dr)
+        return dr + dc
+
+    def _search(self, goal):
+        """
+        Resume A* until the goal is closed; larger g wins ties on f.
+
+        Returns:
+            bool: Whether the goal was reached
+        """
+        state = self._state
+        g = self._g
+        parent = self._parent
+        adjacency = self.grid.adjacency
+        distance = self._distance
+        slack = self._slack
+        frontier = self._open
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        expanded = 0
+        pushes = 0
+        pops = 0
+        found = False
+
+        while frontier:
+            key, negative_g, current = frontier[0]
+            if state[current] != OPEN or -negative_g != g[current]:
+                heappop(frontier)  # Stale entry
+                pops += 1
+                continue
+
+            current_key = g[current] + distance(current, goal) + slack
+            if current_key > key:
+                # Pushed for an older goal: re-insert with the current key
+                heapq.heapreplace(frontier, (current_key, negative_g, current))
+                pops += 1
+                pushes += 1
+                continue
+
+            heappop(frontier)
+            pops += 1
+            state[current] = CLOSED
+            expanded += 1
+
+            # The goal is expanded too: closed cells must keep their
+            # neighbors in the fringe for later queries
+            tentative = g[current] + 1
+            for neighbor in adjacency[current]:
+                neighbor_state = state[neighbor]
+                if neighbor_state == CLOSED:
+                    continue
+                if neighbor_state != OPEN or tentative < g[neighbor]:
+                    state[neighbor] = OPEN
+                    g[neighbor] = tentative
+                    parent[neighbor] = current
+                    pushes += 1
+                    heappush(frontier, (
+                        tentative + distance(neighbor, goal) + slack,
+                        -tentative, neighbor
+                    ))
+
+            if current == goal:
+                found = True
+                break
+
+        self.expansions += expanded
+        self.pushes += pushes
+        self.pops += pops
+        return found
+
+    def _normalize_position(self, pos):
+        """Convert position to (row, col) tuple."""
+        if isinstance(pos, dict):
+            return (pos['y'], pos['x'])
+        return tuple(pos)
@@ -0,0 +1,196 @@
+"""Jump point search for 4-connected grids (corridor skipping)."""
+
+import heapq
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.grid import as_grid
+
+
+class JumpPointSearch:
+    """
+    A* over jump points: cells where a path can do something other than
+    carry on (junctions, dead ends) plus the start and goal.
+
+    On a 4-connected maze the diagonal pruning rules of classic JPS do
+    not apply, but the same idea does along corridors: a cell with exactly
+    two neighbors (tunnel edges included) can only be passed through, so
+    from every jump point the search runs down each corridor to its far
+    end in one step, with the corridor length as the edge cost. Corridors
+    ending in a dead end that is not the goal are pruned. Only jump points
+    enter the heap, so long corridors cost one expansion instead of one
+    per cell.
+
+    The heuristic is Grid.distance_bound, consistent for corridor edges
+    too, so paths are optimal (same length as AStar/BFS).
+    """
+
+    def __init__(self, grid, stats=None):
+        """
+        Initialize jump point search.
+
+        Args:
+            grid: Grid or 2D array where 1=wall, other values walkable
+            stats: Optional SearchStats recording every call (see stats.py)
+        """
+        self.grid = as_grid(grid)
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
+        self.stats = stats
+
+        # Number of jump points expanded, and heap pushes/pops, by searches
+        # so far
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+
+    def find_path(self, start, goal):
+        """
+        Find optimal path from start to goal.
+
+        Args:
+            start: Tuple (row, col) or dict {'x': col, 'y': row}
+            goal: Tuple (row, col) or dict {'x': col, 'y': row}
+
+        Returns:
+            list: Path as list of (row, col) tuples, or None if no path exists
+        """
+        if self.stats is not None:
+            return self.stats.measure(self, self._find_path, start, goal)
+        return self._find_path(start, goal)
+
+    def _find_path(self, start, goal):
+        """Search behind find_path."""
+        start_pos = self._normalize_position(start)
+        goal_pos = self._normalize_position(goal)
+
+        if not self.grid.is_walkable(start_pos) or not self.grid.is_walkable(goal_pos):
+            return None
+
+        path = self._search(self.grid.index(start_pos), self.grid.index(goal_pos))
+        if path is None:
+            return None
+
+        positions = self.grid.positions
+        return [positions[i] for i in path]
+
+    def find_next_move(self, start, goal):
+        """
+        Find the next move in the optimal path.
+
+        Args:
+            start: Current position
+            goal: Target position
+
+        Returns:
+            tuple: Next position (row, col) or None if no path
+        """
+        path = self.find_path(start, goal)
+        if path and len(path) > 1:
+            return path[1]
+        return None
+
+    def _search(self, start, goal):
+        """Optimal path between flat indices, or None."""
+        adjacency = self.grid.adjacency
+        positions = self.grid.positions
+        heuristic = self.grid.distance_bound
+        goal_pos = positions[goal]
+
+        # Per jump point: g, and (previous jump point, first cell after it)
+        g_score = {start: 0}
+        came_from = {start: (-1, -1)}
+        frontier = [(heuristic(positions[start], goal_pos), 0, start)]
+        expanded = 0
+        pushes = 1
+        pops = 0
+        found = False
+
+        while frontier:
+            _, negative_g, current = heapq.heappop(frontier)
+            pops += 1
+            if -negative_g != g_score[current]:
+                continue  # Stale entry
+            expanded += 1
+
+            if current == goal:
+                found = True
+                break
+
+            base = g_score[current]
+            for first in adjacency[current]:
+                jump, steps = self._jump(adjacency, current, first, goal)
+                if jump < 0:
+                    continue
+
+                tentative = base + steps
+                if jump not in g_score or tentative < g_score[jump]:
+                    g_score[jump] = tentative
+                    came_from[jump] = (current, first)
+                    pushes += 1
+                    heapq.heappush(frontier, (
+                        tentative + heuristic(positions[jump], goal_pos),
+                        -tentative, jump
+                    ))
+
+        self.expansions += expanded
+        self.pushes += pushes
+        self.pops += pops
+        if not found:
+            return None
+
+        return self._reconstruct_path(adjacency, came_from, goal)
+
+    @staticmethod
+    def _jump(adjacency, origin, first, goal):
+        """
+        Follow the corridor entered from origin through first.
+
+        Returns:
+            tuple: (jump point, steps), or (-1, 0) for a corridor that ends
+                in a dead end other than the goal or loops back to origin
+        """
+        previous, current, steps = origin, first, 1
+        while current != goal:
+            neighbors = adjacency[current]
+            if len(neighbors) != 2:
+                if len(neighbors) < 2:
+                    return -1, 0
+                break
+            following = neighbors[0] if neighbors[1] == previous else neighbors[1]
+            if following == origin:
+                return -1, 0
+            previous, current = current, following
+            steps += 1
+        return current, steps
+
+    @staticmethod
+    def _reconstruct_path(adjacency, came_from, goal):
+        """Expand the jump point chain back into every cell on the path."""
+        segments = []
+        jump = goal
+        while came_from[jump][0] >= 0:
+            origin, first = came_from[jump]
+            segment = [first]
+            previous = origin
+            while segment[-1] != jump:
+                neighbors = adjacency[segment[-1]]
+                following = neighbors[0] if neighbors[1] == previous else neighbors[1]
+                previous = segment[-1]
+                segment.append(following)
+            segments.append(segment)
+            jump = origin
+
+        path = [jump]
+        for segment in reversed(segments):
+            path.extend(segment)
+        return path
+
+    def _normalize_position(self, pos):
+        """Convert position to (row, col) tuple."""
+        if isinstance(pos, dict):
+            return (pos['y'], pos['x'])
+        return tuple(pos)
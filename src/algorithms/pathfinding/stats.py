@@ -0,0 +1,114 @@
+"""Opt-in search counters for pathfinders."""
+
+import time
+
+
+class SearchStats:
+    """
+    Counters for pathfinder calls, summed over every call recorded.
+
+    Attach one to a pathfinder (its `stats` attribute, None by default)
+    to profile it; pathfinders without one pay a single attribute check
+    per call. Table lookups answered by a DistanceOracle are recorded as
+    calls without expansions.
+
+    Counters:
+        calls: find_path/find_next_move calls
+        expansions: nodes expanded
+        pushes/pops: frontier (heap or queue) operations, stale pops included
+        path_length: total steps of the paths found
+        not_found: calls that found no path
+        seconds/max_seconds: total and slowest wall-clock time per call
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+        self.path_length = 0
+        self.not_found = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, expansions=0, pushes=0, pops=0, path_length=None, seconds=0.0):
+        """
+        Add one call.
+
+        Args:
+            path_length: Steps of the path found, or None if there was none
+        """
+        self.calls += 1
+        self.expansions += expansions
+        self.pushes += pushes
+        self.pops += pops
+        if path_length is None:
+            self.not_found += 1
+        else:
+            self.path_length += path_length
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def measure(self, pathfinder, search, *args):
+        """
+        Run search(*args) for a pathfinder and record it.
+
+        The pathfinder's cumulative expansions/pushes/pops counters give
+        the work done by this call.
+
+        Returns:
+            list: The path search returned (None if no path)
+        """
+        before = (pathfinder.expansions, pathfinder.pushes, pathfinder.pops)
+        start = time.perf_counter()
+        path = search(*args)
+        seconds = time.perf_counter() - start
+
+        self.record(
+            pathfinder.expansions - before[0],
+            pathfinder.pushes - before[1],
+            pathfinder.pops - before[2],
+            len(path) - 1 if path else None,
+            seconds
+        )
+        return path
+
+    def measure_lookup(self, oracle, start, goal):
+        """
+        Answer a next-move query from a DistanceOracle and record it.
+
+        Returns:
+            tuple: Next position (row, col) or None
+        """
+        begin = time.perf_counter()
+        next_pos = oracle.next_move(start, goal)
+        seconds = time.perf_counter() - begin
+
+        self.record(path_length=oracle.distance(start, goal), seconds=seconds)
+        return next_pos
+
+    def merge(self, other):
+        """Add another SearchStats' counters to this one."""
+        self.calls += other.calls
+        self.expansions += other.expansions
+        self.pushes += other.pushes
+        self.pops += other.pops
+        self.path_length += other.path_length
+        self.not_found += other.not_found
+        self.seconds += other.seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        return self
+
+    def to_dict(self):
+        """JSON-friendly counters."""
+        return {
+            'calls': self.calls,
+            'expansions': self.expansions,
+            'heapPushes': self.pushes,
+            'heapPops': self.pops,
+            'pathLength': self.path_length,
+            'notFound': self.not_found,
+            'seconds': round(self.seconds, 6),
+            'maxSeconds': round(self.max_seconds, 6)
+        }
@@ -1,6 +1,7 @@
 """Simulation engine for Pacman gameplay with ghosts."""
 
 from .game_engine import GameEngine
+from .fast_engine import FastGameEngine, Replay
+from .self_play import SelfPlayEngine
 
-__all__ = ['GameEngine']
-
+__all__ = ['GameEngine', 'FastGameEngine', 'Replay', 'SelfPlayEngine']
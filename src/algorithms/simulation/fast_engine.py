@@ -0,0 +1,481 @@
+"""Array-based replay engine for fixed Pac-Man trajectories."""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ghost_ai.targets import cells_ahead, pacman_arrays, snap_to_walkable
+from simulation.game_engine import GameEngine
+
+
+# Frames simulated between collision checks: the first block, doubling
+# up to the largest
+FIRST_BLOCK_FRAMES = 16
+BLOCK_FRAMES = 256
+
+# Ghost types replayed from distance tables
+TABLE_GHOSTS = ('blinky', 'pinky', 'inky', 'clyde')
+
+
+class Replay:
+    """
+    Result of a FastGameEngine replay, kept as arrays.
+
+    Frame dicts (identical to GameEngine's) are only built when asked
+    for, one at a time by frame() or all at once by frames().
+    """
+
+    def __init__(self, cells, timestamps, pacman, ghost_types, positions, catch_frames,
+                 tally=None):
+        """
+        Args:
+            cells: (row, col) of every compact cell index
+            timestamps: Timestamp per frame
+            pacman: Pac-Man (row, col) per frame
+            ghost_types: Ghost type per ghost, in configuration order
+            positions: int32 array (ghosts, frames) of compact ghost cells
+                after each frame
+            catch_frames: Frames in which Pac-Man was caught, in order
+            tally: RunTally of the run under a stop policy, else None
+        """
+        self.cells = cells
+        self.timestamps = timestamps
+        self.pacman = pacman
+        self.ghost_types = ghost_types
+        self.positions = positions
+        self.catch_frames = catch_frames
+        self.tally = tally
+        self.total_frames = len(timestamps)
+
+    @property
+    def caught(self):
+        """Whether Pac-Man was caught at all."""
+        return bool(self.catch_frames)
+
+    def frame(self, index):
+        """Frame dict for one frame, as GameEngine builds it."""
+        cells = self.cells
+        pacman = self.pacman[index]
+        return {
+            'timestamp': self.timestamps[index],
+            'pacman': {'y': pacman[0], 'x': pacman[1]},
+            'ghosts': [
+                {
+                    'type': ghost_type,
+                    'position': {
+                        'y': cells[self.positions[ghost, index]][0],
+                        'x': cells[self.positions[ghost, index]][1]
+                    }
+                }
+                for ghost, ghost_type in enumerate(self.ghost_types)
+            ],
+            'caught': index in self.catch_frames
+        }
+
+    def frames(self):
+        """Every frame dict, in order."""
+        # Plain ints are much cheaper to index than numpy scalars
+        positions = self.positions.tolist()
+        cells = self.cells
+        frames = []
+        for index, timestamp in enumerate(self.timestamps):
+            pacman = self.pacman[index]
+            frames.append({
+                'timestamp': timestamp,
+                'pacman': {'y': pacman[0], 'x': pacman[1]},
+                'ghosts': [
+                    {
+                        'type': ghost_type,
+                        'position': {
+                            'y': cells[positions[ghost][index]][0],
+                            'x': cells[positions[ghost][index]][1]
+                        }
+                    }
+                    for ghost, ghost_type in enumerate(self.ghost_types)
+                ],
+                'caught': False
+            })
+        for index in self.catch_frames:
+            frames[index]['caught'] = True
+        return frames
+
+    def summary(self):
+        """Simulation results without frames, as GameEngine returns them."""
+        if self.tally is not None:
+            return GameEngine.tally_results(self.tally, self.total_frames)
+
+        last = self.total_frames - 1
+        return {
+            'caught': self.caught,
+            'catchPosition': {'y': self.pacman[last][0], 'x': self.pacman[last][1]}
+                if self.caught else None,
+            'catchTime': self.timestamps[last] if self.caught else None,
+            'totalFrames': self.total_frames
+        }
+
+
+class FastGameEngine(GameEngine):
+    """
+    GameEngine for recorded trajectories, replayed on flat cell indices.
+
+    Pac-Man's cells are known up front and ghosts using distance tables
+    ('astar'/'bfs') move by one next-hop lookup per frame, so the replay
+    runs on compact int32 cell indices instead of agents and tuples, in
+    blocks of frames:
+
+    - Blinky/Pinky targets for a block, and Inky's once Blinky has moved
+      through it, are computed with NumPy; Clyde's chase/retreat choice
+      is a per-frame check
+    - Each ghost advances through the block in a tight loop, stopping at
+      its first catch
+    - The first catch in the block is found with one array comparison
+    - Frame dicts are only built on demand (see Replay)
+
+    Results are identical to GameEngine's. Runs the arrays cannot
+    reproduce exactly fall back to GameEngine: profiling, searching
+    pathfinders, ghosts outside chase mode or off walkable cells, and
+    trajectories that are not lists of in-grid dict positions.
+    """
+
+    def __init__(self, grid, ghost_configs, oracle=None, profile=False, stop_policy=None):
+        """Initialize the engine (see GameEngine)."""
+        super().__init__(grid, ghost_configs, oracle, profile, stop_policy)
+
+        # Flat cell -> compact cell, and compact cell -> row/col
+        self.cell_index = np.asarray(self.oracle.cell_index, dtype=np.int32)
+        cells = np.asarray(self.oracle.cells, dtype=np.int32).reshape(-1, 2)
+        self.cell_rows = cells[:, 0]
+        self.cell_cols = cells[:, 1]
+
+    def replay(self, trajectory, ghosts=None):
+        """
+        Replay a trajectory against ghosts (this engine's by default).
+
+        Ghosts are left where simulate() leaves them.
+
+        Returns:
+            Replay: Arrays of the run, or None (ghosts untouched) when it
+                needs GameEngine
+        """
+        ghosts = self.ghosts if ghosts is None else ghosts
+        columnar = hasattr(trajectory, 'pacman_arrays')
+        if not (columnar or isinstance(trajectory, (list, tuple))) or not len(trajectory) \
+                or not self._supported(ghosts):
+            return None
+
+        # Blinkies move first: Inky reads the last Blinky's position
+        order = sorted(range(len(ghosts)), key=lambda g: ghosts[g]['type'] != 'blinky')
+        blinky = max(
+            (g for g, ghost in enumerate(ghosts) if ghost['type'] == 'blinky'), default=-1
+        )
+
+        tally = self.new_tally()
+        total = len(trajectory)
+        starts = [self.oracle.index_of(ghost['start']) for ghost in ghosts]
+        current = [self.oracle.index_of(ghost['position']) for ghost in ghosts]
+        previous = -1
+        positions = np.empty((len(ghosts), total), dtype=np.int32)
+        catch_frames = []
+        pacman = []
+        timestamps = []
+        stopped = False
+        start = end = 0
+        block = FIRST_BLOCK_FRAMES
+
+        while start < total and not stopped:
+            # Blocks grow so that short runs do not read or simulate far
+            # past a catch
+            end = min(start + block, total)
+            block = min(2 * block, BLOCK_FRAMES)
+
+            moves = self._read_block(trajectory, start, end)
+            if moves is None:
+                return None
+            block_pacman, directions, block_timestamps = moves
+            arrays = pacman_arrays(block_pacman, directions)
+            pacman_index = self.cell_index[arrays[0] * self.grid.cols + arrays[1]]
+            previous_index = np.empty_like(pacman_index)
+            previous_index[0] = previous
+            previous_index[1:] = pacman_index[:-1]
+
+            for g in order:
+                ghost = ghosts[g]
+                frames = end - start
+                if frames < len(block_pacman):
+                    arrays = tuple(array[:frames] for array in arrays)
+                    pacman_index = pacman_index[:frames]
+                    previous_index = previous_index[:frames]
+                targets = self._block_targets(
+                    ghost, arrays, pacman_index, blinky, positions, current, start
+                )
+                moves = self._advance(
+                    ghost['agent'], current[g], targets, pacman_index, previous_index,
+                    block_pacman
+                )
+                positions[g, start:start + len(moves)] = moves
+                # Later ghosts need not go past this ghost's catch
+                end = start + len(moves)
+
+            # First catch of the block: a ghost ends on Pac-Man's cell or
+            # swaps cells with him (see GameEngine._collides)
+            frames = end - start
+            after = positions[:, start:end]
+            before = np.empty_like(after)
+            before[:, 0] = current
+            before[:, 1:] = after[:, :-1]
+            pacman_index = pacman_index[:frames]
+            hits = (after == pacman_index) | \
+                ((before == pacman_index) & (after == previous_index[:frames]))
+            hits = hits.any(axis=0)
+            caught = bool(hits.any())
+            catch = int(hits.argmax()) if caught else -1
+
+            # Frames of the block that count: up to the catch, then the
+            # ghosts respawn (or the run stops)
+            frames = catch + 1 if caught else frames
+            if tally is None:
+                stopped = caught
+            else:
+                stopped, frames = self._tally_block(
+                    tally, arrays, frames, catch, block_pacman, block_timestamps
+                )
+            if caught and catch < frames:
+                catch_frames.append(start + catch)
+
+            end = start + frames
+            pacman.extend(block_pacman[:frames])
+            timestamps.extend(block_timestamps[:frames])
+            if catch == frames - 1:
+                current = list(starts)
+            else:
+                current = positions[:, end - 1].tolist()
+            previous = int(pacman_index[frames - 1])
+            start = end
+
+        positions = positions[:, :end]
+        cells = self.oracle.cells
+        final = positions[:, end - 1].tolist() if stopped else current
+        for ghost, cell in zip(ghosts, final):
+            ghost['agent'].set_position(cells[cell])
+            ghost['position'] = cells[cell]
+
+        return Replay(
+            cells, timestamps, pacman, [ghost['type'] for ghost in ghosts],
+            positions, catch_frames, tally
+        )
+
+    def _tally_block(self, tally, arrays, frames, catch, block_pacman, timestamps):
+        """
+        Record the counting frames of a block in a run's tally.
+
+        Args:
+            frames: Frames of the block up to its first catch (or all)
+            catch: Index of the catch frame in the block, or -1
+
+        Returns:
+            tuple: (whether the run stops, frames of the block it keeps)
+        """
+        cells = (arrays[0][:frames] * self.grid.cols + arrays[1][:frames]).tolist()
+        cleared = tally.eat(cells)
+        pellets = self.stop_policy.pellets
+
+        if cleared >= 0 and pellets and cleared != catch:
+            # Cleared before the catch (or without one)
+            tally.stop_reason = 'pellets'
+            return True, cleared + 1
+        if catch >= 0:
+            if tally.catch(timestamps[catch], block_pacman[catch]):
+                return True, frames
+            if cleared == catch and pellets:
+                tally.stop_reason = 'pellets'
+                return True, frames
+        return False, frames
+
+    def _run(self, trajectory, ghosts, record_frames=True):
+        """Replay from arrays when possible (see GameEngine._run)."""
+        replay = self.replay(trajectory, ghosts)
+        if replay is None:
+            return super()._run(trajectory, ghosts, record_frames)
+
+        results = replay.summary()
+        if record_frames:
+            results['frames'] = replay.frames()
+        return results
+
+    def _steps(self, trajectory, ghosts, tally=None):
+        """Steps of a replay, placing ghosts frame by frame (see GameEngine._steps)."""
+        # Replaying moves the ghosts to their final cells: start from a copy
+        start_positions = [(ghost['agent'].position, ghost['position']) for ghost in ghosts]
+        replay = self.replay(trajectory, ghosts)
+        if replay is None:
+            yield from super()._steps(trajectory, ghosts, tally)
+            return
+
+        final_positions = [(ghost['agent'].position, ghost['position']) for ghost in ghosts]
+        positions = replay.positions.tolist()
+        cells = replay.cells
+        catch_frames = set(replay.catch_frames)
+        for ghost, (agent_position, position) in zip(ghosts, start_positions):
+            ghost['agent'].position = agent_position
+            ghost['position'] = position
+
+        for index in range(replay.total_frames):
+            for g, ghost in enumerate(ghosts):
+                cell = cells[positions[g][index]]
+                ghost['agent'].position = cell
+                ghost['position'] = cell
+            yield replay.timestamps[index], replay.pacman[index], index in catch_frames
+
+        for ghost, (agent_position, position) in zip(ghosts, final_positions):
+            ghost['agent'].position = agent_position
+            ghost['position'] = position
+
+    def _supported(self, ghosts):
+        """Whether every ghost can be replayed from distance tables."""
+        if self.profile or not ghosts:
+            return False
+        for ghost in ghosts:
+            agent = ghost['agent']
+            position = ghost['position']
+            if (ghost['type'] not in TABLE_GHOSTS
+                    or getattr(agent.pathfinder, 'oracle', None) is not self.oracle
+                    or agent.mode != 'chase'
+                    or not isinstance(position, tuple)
+                    or agent.position != position
+                    or not self.grid.is_walkable(position)
+                    or not self.grid.is_walkable(ghost['start'])):
+                return False
+        return True
+
+    def _read_block(self, trajectory, start, end):
+        """
+        Pac-Man cells, directions and timestamps of moves [start, end).
+
+        Returns:
+            tuple: ((row, col) list, direction list, timestamp list), or
+                None unless every move has an in-grid dict position of ints
+                (for a BinaryTrajectory, unless every position is in the grid)
+        """
+        rows = self.grid.rows
+        cols = self.grid.cols
+        if hasattr(trajectory, 'pacman_arrays'):
+            block_rows = trajectory.y[start:end]
+            block_cols = trajectory.x[start:end]
+            if ((block_rows < 0) | (block_rows >= rows) | (block_cols < 0) | (block_cols >= cols)).any():
+                return None
+            return (
+                list(zip(block_rows.tolist(), block_cols.tolist())),
+                trajectory.direction_names(start, end),
+                trajectory.timestamps[start:end].tolist()
+            )
+        
+        cells = []
+        directions = []
+        timestamps = []
+        for i in range(start, end):
+            move = trajectory[i]
+            position = move.get('position')
+            if not isinstance(position, dict):
+                return None
+            row = position.get('y')
+            col = position.get('x')
+            if type(row) is not int or type(col) is not int \
+                    or not (0 <= row < rows and 0 <= col < cols):
+                return None
+            cells.append((row, col))
+            directions.append(move.get('direction'))
+            timestamps.append(move.get('timestamp', i * 100))
+        return cells, directions, timestamps
+
+    def _block_targets(self, ghost, arrays, pacman_index, blinky, positions, current, start):
+        """
+        Compact target per frame of a block for one ghost (-1 = stay), or
+        None for Clyde, whose target depends on his own position.
+        """
+        kind = ghost['type']
+        if kind == 'blinky':
+            return pacman_index
+        if kind == 'clyde':
+            return None
+
+        cols = self.grid.cols
+        if kind == 'pinky':
+            plan = np.asarray(ghost['agent'].plan_targets(*arrays), dtype=np.int64)
+            return self.cell_index[plan[:, 0] * cols + plan[:, 1]]
+
+        # Inky (vectorised _flank_target), from Blinky's cell at the start
+        # of each frame
+        if blinky < 0:
+            return pacman_index
+        frames = len(pacman_index)
+        blinky_cells = np.empty(frames, dtype=np.int32)
+        blinky_cells[0] = current[blinky]
+        blinky_cells[1:] = positions[blinky, start:start + frames - 1]
+
+        ahead_rows, ahead_cols = cells_ahead(self.grid, *arrays, 2)
+        target_rows = np.clip(2 * ahead_rows - self.cell_rows[blinky_cells], 0, self.grid.rows - 1)
+        target_cols = np.clip(2 * ahead_cols - self.cell_cols[blinky_cells], 0, cols - 1)
+        target_rows, target_cols = snap_to_walkable(
+            self.grid, target_rows, target_cols, arrays[0], arrays[1]
+        )
+        return self.cell_index[target_rows * cols + target_cols]
+
+    def _advance(self, agent, position, targets, pacman_index, previous_index, pacman):
+        """
+        Move one ghost through a block of frames, up to its first catch.
+
+        Args:
+            agent: The ghost (Clyde's retreat settings are read from it)
+            position: Compact cell before the block
+            targets: Compact target per frame (-1 = stay), or None for
+                Clyde, whose target depends on his own position
+            pacman_index: Pac-Man's compact cell per frame of the block
+            previous_index: Pac-Man's compact cell the frame before
+            pacman: Pac-Man's (row, col) per frame of the block
+
+        Returns:
+            list: Compact cell after each frame, ending early with the
+                frame in which the ghost catches Pac-Man
+        """
+        table = self.oracle.table
+        out = []
+        append = out.append
+        # Next-hop row of the last target, reused while the target holds
+        last_target = -1
+        next_hops = None
+
+        if targets is None:
+            # Clyde chases when far away, else heads for his scatter corner
+            cells = self.oracle.cells
+            distance = self.grid.distance_bound
+            retreat_distance = agent.retreat_distance
+            scatter = self.oracle.index_of(agent.scatter_target)
+        else:
+            targets = targets.tolist()
+
+        for frame, (chase, previous) in enumerate(zip(pacman_index.tolist(), previous_index.tolist())):
+            if targets is None:
+                if distance(cells[position], pacman[frame]) > retreat_distance:
+                    target = chase
+                else:
+                    target = scatter
+            else:
+                target = targets[frame]
+
+            before = position
+            if target >= 0:
+                if target != last_target:
+                    last_target = target
+                    next_hops = table(target)[1]
+                if next_hops[position] >= 0:
+                    position = next_hops[position]
+            append(position)
+
+            # On Pac-Man's cell, or swapped cells with him
+            if position == chase or (before == chase and position == previous):
+                break
+        return out
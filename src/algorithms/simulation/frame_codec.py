@@ -0,0 +1,145 @@
+"""Compact delta/run-length encoding of simulation frames."""
+
+import base64
+
+import numpy as np
+
+
+FORMAT = 'delta-rle-v1'
+
+# Longest run a single int16 count can hold
+MAX_RUN = np.iinfo(np.int16).max
+
+
+def _encode_runs(values, dtype):
+    """
+    Delta/run-length encode a sequence of equally sized integer tuples.
+
+    Layout (all values of `dtype`, little-endian): the first tuple as-is,
+    then for each run of identical consecutive deltas the delta tuple
+    followed by the run length. Agents move at most one cell per frame,
+    so a straight corridor or a wait collapses into a single run.
+
+    Returns:
+        str: base64 of the encoded array
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return ''
+
+    deltas = np.diff(values, axis=0)
+
+    if len(deltas):
+        change = np.any(deltas[1:] != deltas[:-1], axis=1)
+        starts = np.concatenate(([0], np.flatnonzero(change) + 1))
+        counts = np.diff(np.append(starts, len(deltas)))
+    else:
+        starts = counts = np.zeros(0, dtype=np.int64)
+
+    parts = [values[0]]
+    for start, count in zip(starts.tolist(), counts.tolist()):
+        while count > 0:
+            run = min(count, MAX_RUN)
+            parts.append(np.append(deltas[start], run))
+            count -= run
+
+    raw = np.concatenate(parts)
+    encoded = raw.astype(np.dtype(dtype).newbyteorder('<'))
+    if not np.array_equal(encoded, raw):
+        raise ValueError(f'Values do not fit in {np.dtype(dtype).name}')
+
+    return base64.b64encode(encoded.tobytes()).decode('ascii')
+
+
+def _decode_runs(data, width, dtype, count):
+    """Inverse of _encode_runs: array of shape (count, width)."""
+    if count == 0:
+        return np.zeros((0, width), dtype=np.int64)
+
+    encoded = np.frombuffer(base64.b64decode(data), dtype=np.dtype(dtype).newbyteorder('<'))
+    encoded = encoded.astype(np.int64)
+
+    first = encoded[:width]
+    runs = encoded[width:].reshape(-1, width + 1)
+    deltas = np.repeat(runs[:, :width], runs[:, width], axis=0)
+
+    return np.vstack((first, first + np.cumsum(deltas, axis=0)))
+
+
+def encode_frames(frames):
+    """
+    Encode frames (as produced by GameEngine.simulate) compactly.
+
+    Every entity's positions become one int16 delta/RLE stream and the
+    timestamps one int32 stream, all base64'd for JSON transport. Few
+    frames are 'caught', so that flag is kept as an index: 'caughtFrame'
+    is the first caught frame (-1 if none), and runs with several catches
+    (see StopPolicy) list them all in 'caughtFrames'.
+
+    Returns:
+        dict: {'format', 'frameCount', 'timestamps', 'caughtFrame',
+            'entities': [{'type', 'positions'}, ...]} with Pac-Man first,
+            plus 'caughtFrames' for several catches
+    """
+    frame_count = len(frames)
+    ghost_types = [ghost['type'] for ghost in frames[0]['ghosts']] if frames else []
+
+    pacman = [(f['pacman']['y'], f['pacman']['x']) for f in frames]
+    entities = [{'type': 'pacman', 'positions': _encode_runs(pacman, np.int16)}]
+
+    for i, ghost_type in enumerate(ghost_types):
+        positions = [
+            (f['ghosts'][i]['position']['y'], f['ghosts'][i]['position']['x'])
+            for f in frames
+        ]
+        entities.append({'type': ghost_type, 'positions': _encode_runs(positions, np.int16)})
+
+    caught_frames = [i for i, frame in enumerate(frames) if frame['caught']]
+
+    compact = {
+        'format': FORMAT,
+        'frameCount': frame_count,
+        'timestamps': _encode_runs([(f['timestamp'],) for f in frames], np.int32),
+        'caughtFrame': caught_frames[0] if caught_frames else -1,
+        'entities': entities
+    }
+    if len(caught_frames) > 1:
+        compact['caughtFrames'] = caught_frames
+    return compact
+
+
+def decode_frames(compact):
+    """
+    Decode encode_frames output back into frame dicts.
+
+    Returns:
+        list: Frames {'timestamp', 'pacman', 'ghosts', 'caught'}
+    """
+    if compact.get('format') != FORMAT:
+        raise ValueError(f"Unsupported frame format: {compact.get('format')}")
+
+    count = compact['frameCount']
+    # A document read back from Mongo has caughtFrames [] when there was
+    # at most one catch
+    caught_frames = set(compact.get('caughtFrames') or [compact['caughtFrame']])
+    timestamps = _decode_runs(compact['timestamps'], 1, np.int32, count)[:, 0].tolist()
+
+    positions = [
+        (entity['type'], _decode_runs(entity['positions'], 2, np.int16, count).tolist())
+        for entity in compact['entities']
+    ]
+    pacman = positions[0][1]
+    ghosts = positions[1:]
+
+    return [
+        {
+            'timestamp': timestamps[i],
+            'pacman': {'y': pacman[i][0], 'x': pacman[i][1]},
+            'ghosts': [
+                {'type': ghost_type, 'position': {'y': cells[i][0], 'x': cells[i][1]}}
+                for ghost_type, cells in ghosts
+            ],
+            'caught': i in caught_frames
+        }
+        for i in range(count)
+    ]
@@ -1,9 +1,12 @@
 """Game simulation engine for replaying trajectories with ghosts."""
 
 import json
+import time
 import sys
 import os
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -11,6 +14,20 @@ from ghost_ai.blinky import BlinkyAgent
 from ghost_ai.pinky import PinkyAgent
 from ghost_ai.inky import InkyAgent
 from ghost_ai.clyde import ClydeAgent
+from ghost_ai.targets import pacman_arrays
+from pathfinding.distance_oracle import DistanceOracle
+from pathfinding.stats import SearchStats
+from simulation.stop_policy import RunTally, StopPolicy
+from utils.grid import as_grid
+
+
+# Ghost behaviors available to ghost configurations
+GHOST_CLASSES = {
+    'blinky': BlinkyAgent,
+    'pinky': PinkyAgent,
+    'inky': InkyAgent,
+    'clyde': ClydeAgent
+}
 
 
 class GameEngine:
@@ -19,45 +36,68 @@ class GameEngine:
     Replays a recorded trajectory and simulates ghost behavior.
     """
     
-    def __init__(self, grid, ghost_configs):
+    def __init__(self, grid, ghost_configs, oracle=None, profile=False, stop_policy=None):
         """
         Initialize game engine.
         
         Args:
-            grid: 2D maze grid (0=walkable)
+            grid: Grid or 2D maze grid (1=wall)
             ghost_configs: List of ghost configurations
                 [{'type': 'blinky', 'algorithm': 'astar', 'startPos': (row, col)}, ...]
+            oracle: DistanceOracle for this grid; built when omitted
+            profile: Record search counters for every ghost and add them to
+                results under 'profile' (see search_profile)
+            stop_policy: StopPolicy (or spec, see StopPolicy.parse) for
+                when runs end; None ends them at the first catch
         """
-        self.grid = grid
-        self.ghosts = []
+        self.profile = profile
+        self.stop_policy = StopPolicy.parse(stop_policy) if stop_policy is not None else None
+        self._pellets = None
         
-        # Initialize ghosts based on configurations
-        ghost_classes = {
-            'blinky': BlinkyAgent,
-            'pinky': PinkyAgent,
-            'inky': InkyAgent,
-            'clyde': ClydeAgent
-        }
+        # Parse and analyse the maze once for every ghost
+        self.grid = as_grid(grid)
+        
+        # Shortest-path tables shared by every ghost on this maze
+        self.oracle = oracle if oracle is not None else DistanceOracle(self.grid)
+        
+        self.ghosts = self._create_ghosts(ghost_configs)
+    
+    def _create_ghosts(self, ghost_configs):
+        """
+        Create ghost agents from configurations.
+        
+        All ghosts share this engine's grid and distance tables.
+        
+        Returns:
+            list: Ghost entries {'agent', 'type', 'position', 'start'}
+        """
+        ghosts = []
         
         for config in ghost_configs:
             ghost_type = config.get('type', 'blinky').lower()
             algorithm = config.get('algorithm', 'astar')
             start_pos = config.get('startPos')
             
-            if ghost_type in ghost_classes:
-                ghost = ghost_classes[ghost_type](grid, algorithm)
+            if ghost_type in GHOST_CLASSES:
+                ghost = GHOST_CLASSES[ghost_type](self.grid, algorithm, oracle=self.oracle)
+                if self.profile:
+                    ghost.pathfinder.stats = SearchStats()
                 
                 if start_pos:
                     # Normalize position format
                     if isinstance(start_pos, dict):
                         start_pos = (start_pos['y'], start_pos['x'])
+                    start_pos = tuple(start_pos)
                     ghost.set_position(start_pos)
                 
-                self.ghosts.append({
+                ghosts.append({
                     'agent': ghost,
                     'type': ghost_type,
-                    'position': start_pos
+                    'position': start_pos,
+                    'start': start_pos
                 })
+        
+        return ghosts
     
     def simulate(self, trajectory):
         """
@@ -65,79 +105,370 @@ class GameEngine:
         
         Args:
             trajectory: List of Pacman positions/moves
-                [{'position': {'x': , 'y': }, 'timestamp': , ...}, ...]
+                [{'position': {'x': , 'y': }, 'timestamp': , ...}, ...],
+                or a BinaryTrajectory (read column by column)
         
         Returns:
             dict: Simulation results
         """
+        return self._run(trajectory, self.ghosts, record_frames=True)
+    
+    def simulate_many(self, trajectories, ghost_config_sets, include_frames=False):
+        """
+        Simulate every trajectory against every ghost configuration set.
+        
+        The maze is analysed once; each run gets fresh ghosts built from
+        its configuration set, so runs are independent.
+        
+        Args:
+            trajectories: List of trajectories (as accepted by simulate)
+            ghost_config_sets: List of ghost configuration lists
+            include_frames: Whether to keep per-frame data in each result
+        
+        Returns:
+            list: One result per (trajectory, config set) pair, trajectory-major,
+                tagged with 'trajectoryIndex' and 'configIndex'
+        """
+        results = []
+        
+        for trajectory_index, trajectory in enumerate(trajectories):
+            for config_index, ghost_configs in enumerate(ghost_config_sets):
+                result = self.simulate_with(trajectory, ghost_configs, include_frames)
+                result['trajectoryIndex'] = trajectory_index
+                result['configIndex'] = config_index
+                results.append(result)
+        
+        return results
+    
+    def simulate_with(self, trajectory, ghost_configs, include_frames=False):
+        """
+        Simulate one trajectory against fresh ghosts built from ghost_configs.
+        
+        Returns:
+            dict: Simulation results ('frames' only when include_frames)
+        """
+        ghosts = self._create_ghosts(ghost_configs)
+        return self._run(trajectory, ghosts, record_frames=include_frames)
+    
+    def iter_frames(self, trajectory, tally=None):
+        """
+        Simulate a game lazily, yielding one frame at a time.
+        
+        Frames are the same dicts simulate() collects in 'frames'; nothing
+        is retained between frames, so memory does not grow with the
+        trajectory length. Frames in which Pac-Man is caught have 'caught'
+        set; without a stop policy the simulation stops at the first.
+        
+        Args:
+            trajectory: List (or any iterable) of Pacman moves
+            tally: RunTally (see new_tally) recording the run under the
+                stop policy; a fresh one is used when omitted
+        
+        Yields:
+            dict: {'timestamp', 'pacman', 'ghosts', 'caught'}
+        """
+        ghosts = self.ghosts
+        
+        if tally is None:
+            tally = self.new_tally()
+        
+        for timestamp, pacman_pos, caught in self._steps(trajectory, ghosts, tally):
+            yield self._frame(timestamp, pacman_pos, ghosts, caught)
+    
+    @staticmethod
+    def summarize(frame, total_frames):
+        """
+        Build the simulation summary from the last frame.
+        
+        Args:
+            frame: Last frame produced (None for an empty trajectory)
+            total_frames: Number of frames produced
+        
+        Returns:
+            dict: {'caught', 'catchPosition', 'catchTime', 'totalFrames'}
+        """
+        caught = bool(frame and frame['caught'])
+        return {
+            'caught': caught,
+            'catchPosition': frame['pacman'] if caught else None,
+            'catchTime': frame['timestamp'] if caught else None,
+            'totalFrames': total_frames
+        }
+    
+    def search_profile(self, ghosts, seconds, oracle_tables):
+        """
+        Search counters of a profiled run, per ghost and summed.
+        
+        Args:
+            ghosts: Ghost entries the run moved
+            seconds: Wall-clock time of the run
+            oracle_tables: Distance tables the oracle built during the run
+        
+        Returns:
+            dict: {'seconds', 'oracleTables', 'search', 'ghosts'}; 'search'
+                and every ghost entry hold SearchStats.to_dict() counters
+        """
+        total = SearchStats()
+        per_ghost = []
+        
+        for ghost in ghosts:
+            agent = ghost['agent']
+            stats = agent.pathfinder.stats
+            total.merge(stats)
+            per_ghost.append({
+                'type': ghost['type'],
+                'algorithm': agent.algorithm,
+                **stats.to_dict()
+            })
+        
+        return {
+            'seconds': round(seconds, 6),
+            'oracleTables': oracle_tables,
+            'search': total.to_dict(),
+            'ghosts': per_ghost
+        }
+    
+    def _run(self, trajectory, ghosts, record_frames=True):
+        """
+        Replay a trajectory against the given ghosts.
+        
+        Args:
+            trajectory: List of Pacman moves
+            ghosts: Ghost entries from _create_ghosts (moved in place)
+            record_frames: Whether to build the per-frame 'frames' list
+        
+        Returns:
+            dict: Simulation results ('frames' only when record_frames,
+                'profile' only when profiling)
+        """
+        start = time.perf_counter()
+        tables_before = self.oracle.tables_built
+        tally = self.new_tally()
         frames = []
+        total_frames = 0
         caught = False
-        catch_position = None
-        catch_time = None
+        
+        for timestamp, pacman_pos, caught in self._steps(trajectory, ghosts, tally):
+            total_frames += 1
+            if record_frames:
+                frames.append(self._frame(timestamp, pacman_pos, ghosts, caught))
+        
+        if tally is None:
+            results = {
+                'caught': caught,
+                'catchPosition': {'y': pacman_pos[0], 'x': pacman_pos[1]} if caught else None,
+                'catchTime': timestamp if caught else None,
+                'totalFrames': total_frames
+            }
+        else:
+            results = self.tally_results(tally, total_frames)
+        if record_frames:
+            results['frames'] = frames
+        if self.profile:
+            results['profile'] = self.search_profile(
+                ghosts,
+                time.perf_counter() - start,
+                self.oracle.tables_built - tables_before
+            )
+        
+        return results
+    
+    @staticmethod
+    def tally_results(tally, total_frames):
+        """Results of a run under a stop policy: first catch plus analytics."""
+        caught = bool(tally.catch_times)
+        return {
+            'caught': caught,
+            'catchPosition': tally.catch_positions[0] if caught else None,
+            'catchTime': tally.catch_times[0] if caught else None,
+            'totalFrames': total_frames,
+            **tally.to_dict()
+        }
+    
+    @property
+    def pellets(self):
+        """Flat indices of the grid's pellet and power pellet cells."""
+        if self._pellets is None:
+            cells = np.asarray(self.grid.cells)
+            self._pellets = frozenset(np.flatnonzero((cells == 2) | (cells == 3)).tolist())
+        return self._pellets
+    
+    def new_tally(self):
+        """RunTally for a new run, or None without a stop policy."""
+        if self.stop_policy is None:
+            return None
+        return RunTally(self.stop_policy, self.pellets)
+    
+    @staticmethod
+    def _frame(timestamp, pacman_pos, ghosts, caught):
+        """Frame dict for the current ghost positions."""
+        return {
+            'timestamp': timestamp,
+            'pacman': {'y': pacman_pos[0], 'x': pacman_pos[1]},
+            'ghosts': [
+                {
+                    'type': ghost['type'],
+                    'position': {'y': ghost['position'][0], 'x': ghost['position'][1]}
+                }
+                for ghost in ghosts
+            ],
+            'caught': caught
+        }
+    
+    def _steps(self, trajectory, ghosts, tally=None):
+        """
+        Advance the ghosts through a trajectory.
+        
+        Yields (timestamp, pacman_pos, caught) after the ghosts have moved
+        for each frame; ghost positions are read from `ghosts` at that
+        point. Without a tally the run stops after the frame in which
+        Pac-Man is caught; with one, when its stop policy says so, and
+        ghosts go back to their start positions after other catches.
+        
+        Targets come from plans made for the whole trajectory (see
+        _plan_targets), except for ghosts without one.
+        """
+        plans = self._plan_targets(trajectory, ghosts)
+        cell = self._cell
+        previous = -1
         
         # Get other ghost positions for Inky's calculation
         def get_ghost_positions():
             return {
                 ghost['type']: ghost['position']
-                for ghost in self.ghosts
+                for ghost in ghosts
             }
         
         # Simulate each frame
-        for i, move in enumerate(trajectory):
-            # Get Pacman position
-            pacman_pos = move.get('position', {})
-            if isinstance(pacman_pos, dict):
-                pacman_pos = (pacman_pos.get('y'), pacman_pos.get('x'))
-            
-            pacman_dir = move.get('direction')
-            timestamp = move.get('timestamp', i * 100)
+        for i, (pacman_pos, pacman_dir, timestamp) in enumerate(self._read_moves(trajectory)):
+            pacman_cell = cell(pacman_pos)
             
             # Update each ghost
-            ghost_positions = []
             other_ghosts = get_ghost_positions()
+            before = [cell(ghost['position']) for ghost in ghosts]
             
-            for ghost in self.ghosts:
+            for ghost, plan in zip(ghosts, plans):
                 agent = ghost['agent']
                 
                 # Get next move for this ghost
-                next_pos = agent.get_next_move(
-                    pacman_pos,
-                    pacman_dir,
-                    other_ghosts
-                )
+                if plan is None:
+                    next_pos = agent.get_next_move(
+                        pacman_pos,
+                        pacman_dir,
+                        other_ghosts
+                    )
+                else:
+                    next_pos = agent.move_towards(
+                        agent.planned_target(plan, i, pacman_pos, other_ghosts)
+                    )
                 
                 if next_pos:
                     agent.set_position(next_pos)
                     ghost['position'] = next_pos
-                
-                ghost_positions.append({
-                    'type': ghost['type'],
-                    'position': {'y': ghost['position'][0], 'x': ghost['position'][1]}
-                })
-                
-                # Check collision
-                if ghost['position'] == pacman_pos and not caught:
-                    caught = True
-                    catch_position = {'y': pacman_pos[0], 'x': pacman_pos[1]}
-                    catch_time = timestamp
             
-            # Record frame
-            frames.append({
-                'timestamp': timestamp,
-                'pacman': {'y': pacman_pos[0], 'x': pacman_pos[1]},
-                'ghosts': ghost_positions,
-                'caught': caught
-            })
+            # Check collisions
+            after = [cell(ghost['position']) for ghost in ghosts]
+            caught = self._collides(pacman_cell, previous, before, after)
+            
+            yield timestamp, pacman_pos, caught
             
-            # Stop if caught
-            if caught:
+            if tally is None:
+                # Stop if caught
+                if caught:
+                    break
+            elif tally.record(pacman_cell, caught, timestamp, pacman_pos):
                 break
+            elif caught:
+                self._respawn(ghosts)
+            previous = pacman_cell
+    
+    def _cell(self, pos):
+        """Flat index of a position, or -1 (outside the grid or missing)."""
+        if pos is None or None in pos:
+            return -1
+        return self.grid.index(pos)
+    
+    @staticmethod
+    def _collides(pacman_cell, previous, before, after):
+        """
+        Whether a ghost catches Pac-Man in a frame.
         
-        return {
-            'caught': caught,
-            'catchPosition': catch_position,
-            'catchTime': catch_time,
-            'totalFrames': len(frames),
-            'frames': frames
-        }
-
+        Compares flat cells: a ghost catches Pac-Man by ending the frame
+        on his cell, or by swapping cells with him (moving from his cell
+        to the one he just left), which equality alone would miss.
+        
+        Args:
+            pacman_cell: Pac-Man's cell this frame (-1 = none)
+            previous: Pac-Man's cell the frame before (-1 = none)
+            before/after: Ghost cells before and after their moves
+        """
+        if pacman_cell < 0:
+            return False
+        if pacman_cell in after:
+            return True
+        return previous >= 0 and (pacman_cell, previous) in set(zip(before, after))
+    
+    @staticmethod
+    def _respawn(ghosts):
+        """Send ghosts back to their start positions (after a catch)."""
+        for ghost in ghosts:
+            if ghost['start'] is not None:
+                ghost['agent'].set_position(ghost['start'])
+                ghost['position'] = ghost['start']
+    
+    def _read_moves(self, trajectory):
+        """
+        (pacman_pos, pacman_dir, timestamp) of every move, in order.
+        
+        Columnar trajectories (BinaryTrajectory) yield them straight from
+        their arrays, without building move dicts.
+        """
+        iter_steps = getattr(trajectory, 'iter_steps', None)
+        if iter_steps is not None:
+            return iter_steps()
+        return (self._read_move(move, i) for i, move in enumerate(trajectory))
+    
+    @staticmethod
+    def _read_move(move, index):
+        """(pacman_pos, pacman_dir, timestamp) of a trajectory move."""
+        pacman_pos = move.get('position', {})
+        if isinstance(pacman_pos, dict):
+            pacman_pos = (pacman_pos.get('y'), pacman_pos.get('x'))
+        
+        return pacman_pos, move.get('direction'), move.get('timestamp', index * 100)
+    
+    def _plan_targets(self, trajectory, ghosts):
+        """
+        Per-ghost target plans for a whole trajectory (None = per frame).
+        
+        Only lists, tuples and columnar trajectories are planned: other
+        iterables are read lazily, one move at a time. Trajectories with
+        missing positions fall back to per-frame targets too, as do
+        positions outside the grid.
+        """
+        columns = getattr(trajectory, 'pacman_arrays', None)
+        if columns is None and not isinstance(trajectory, (list, tuple)):
+            return [None] * len(ghosts)
+        if not len(trajectory) or not ghosts:
+            return [None] * len(ghosts)
+        
+        if columns is not None:
+            arrays = columns()
+        else:
+            positions = []
+            directions = []
+            for i, move in enumerate(trajectory):
+                pacman_pos, pacman_dir, _ = self._read_move(move, i)
+                positions.append(pacman_pos)
+                directions.append(pacman_dir)
+            
+            try:
+                arrays = pacman_arrays(positions, directions)
+            except (TypeError, ValueError):
+                return [None] * len(ghosts)
+        
+        rows, cols = arrays[0], arrays[1]
+        if ((rows < 0) | (rows >= self.grid.rows) | (cols < 0) | (cols >= self.grid.cols)).any():
+            return [None] * len(ghosts)
+        
+        return [ghost['agent'].plan_targets(*arrays) for ghost in ghosts]
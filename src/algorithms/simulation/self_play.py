@@ -0,0 +1,267 @@
+"""Headless closed-loop games: a Pac-Man AI against the ghost agents."""
+
+import time
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pacman_ai.greedy import GreedyPacman
+from pacman_ai.defensive import DefensivePacman
+from pacman_ai.aggressive import AggressivePacman
+from pacman_ai.random_walker import RandomWalker
+from pacman_ai.search import SearchPacman
+from pacman_ai.danger_field import DangerField
+from pacman_ai.pellet_index import PelletIndex
+from pathfinding.distance_oracle import DistanceOracle
+from simulation.game_engine import GHOST_CLASSES, GameEngine
+from simulation.stop_policy import RunTally, StopPolicy
+from utils.grid import as_grid
+
+
+# Pac-Man behaviors available to self-play
+PACMAN_CLASSES = {
+    'greedy': GreedyPacman,
+    'defensive': DefensivePacman,
+    'aggressive': AggressivePacman,
+    'random': RandomWalker,
+    'search': SearchPacman
+}
+
+# Points per eaten cell value: pellet, power pellet (arcade scoring)
+PELLET_POINTS = {2: 10, 3: 50}
+
+# Direction name of each (row, col) step
+STEP_DIRECTIONS = {(-1, 0): 'UP', (1, 0): 'DOWN', (0, -1): 'LEFT', (0, 1): 'RIGHT'}
+
+# Distance tables kept by an engine's own oracle: closed-loop targets roam
+# the whole maze, so small and medium mazes keep a table for every cell
+MAX_TABLES = 4096
+
+# Self-play games end at the first catch or once the board is cleared
+DEFAULT_STOP_POLICY = StopPolicy(catches=1, pellets=True)
+
+
+class SelfPlayEngine(GameEngine):
+    """
+    Plays a Pac-Man AI against ghost agents on a pellet grid, without a UI.
+
+    Every frame Pac-Man stands on the cell his AI picked the frame before,
+    then the ghosts move and collisions are checked exactly as when
+    replaying (see GameEngine._steps), so the moves of a game form a
+    trajectory that GameEngine.simulate replays to the same result. Pac-Man
+    eats the pellet on his cell and scores PELLET_POINTS for it. His AI
+    reads remaining pellets from a PelletIndex and ghost distances from a
+    DangerField recomputed once per frame.
+
+    The grid, its adjacency and the distance tables are built once per
+    engine and shared by Pac-Man and every game's ghosts; reuse one engine
+    to play many games on a maze.
+    """
+
+    def __init__(self, grid, ghost_configs, pacman='greedy', pacman_start=None,
+                 oracle=None, seed=None, stop_policy=None, frame_time=100,
+                 pacman_options=None):
+        """
+        Initialize self-play engine.
+
+        Args:
+            grid: Grid or 2D maze grid (1=wall, 2=pellet, 3=power pellet)
+            ghost_configs: Ghost configurations (see GameEngine), used to
+                build fresh ghosts for every game
+            pacman: Pac-Man AI name (see PACMAN_CLASSES)
+            pacman_start: Pac-Man's start cell (row, col) or {'x', 'y'};
+                the walkable cell nearest the centre when omitted
+            oracle: DistanceOracle for this grid; built when omitted, with
+                up to MAX_TABLES tables
+            seed: Seed or random.Random instance for the Pac-Man AI
+            stop_policy: StopPolicy (or spec) for when games end;
+                DEFAULT_STOP_POLICY when omitted
+            frame_time: Milliseconds between frames in recorded moves
+            pacman_options: Extra keyword arguments for the Pac-Man AI
+                (e.g. {'budget_ms': 5} for 'search'); SearchPacman also
+                gets this engine's oracle and ghost types
+        """
+        pacman = pacman.lower()
+        if pacman not in PACMAN_CLASSES:
+            raise ValueError(f'Unknown Pac-Man AI: {pacman}')
+
+        grid = as_grid(grid)
+        if oracle is None:
+            walkable = int(grid.walkable.sum())
+            oracle = DistanceOracle(grid, max_targets=max(1024, min(walkable, MAX_TABLES)))
+
+        super().__init__(
+            grid, [], oracle=oracle,
+            stop_policy=stop_policy if stop_policy is not None else DEFAULT_STOP_POLICY
+        )
+        self.ghost_configs = ghost_configs
+        self.pacman_name = pacman
+        options = dict(pacman_options or {})
+        if pacman == 'search':
+            options.setdefault('oracle', self.oracle)
+            options.setdefault('ghost_types', [
+                config.get('type', 'blinky').lower() for config in ghost_configs
+                if config.get('type', 'blinky').lower() in GHOST_CLASSES
+            ])
+        self.pacman = PACMAN_CLASSES[pacman](self.grid, seed=seed, **options)
+        self.pacman_start = self._start_cell(pacman_start)
+        self.frame_time = frame_time
+
+        # Copied for every game, so block visit orders are computed once
+        self._pellet_index = PelletIndex(self.grid)
+        # Recomputed every frame from the ghosts, read by the Pac-Man AI
+        self.danger = DangerField(self.grid, self.pacman.DANGER_RADIUS)
+
+    def play(self, max_frames=10000, record_frames=False):
+        """
+        Play one game against fresh ghosts.
+
+        Args:
+            max_frames: Frames after which the game ends regardless
+            record_frames: Whether to build the per-frame 'frames' list
+
+        Returns:
+            dict: Results as under a stop policy (see GameEngine.tally_results)
+                plus 'score', 'agent', 'seconds' and 'moves', the game as a
+                trajectory ({'position', 'direction', 'timestamp',
+                'pelletsEaten'} per frame); 'frames' only when
+                record_frames, 'search' (SearchPacman.search_report) for
+                the search AI
+        """
+        start = time.perf_counter()
+        searching = hasattr(self.pacman, 'search_report')
+        if searching:
+            self.pacman.reset_report()
+        ghosts = self._create_ghosts(self.ghost_configs)
+        tally = RunTally(self.stop_policy, self.pellets)
+        moves = []
+        frames = []
+        score = 0
+
+        for move, caught in self._play_steps(ghosts, tally, max_frames):
+            moves.append(move)
+            if record_frames:
+                pacman_pos = (move['position']['y'], move['position']['x'])
+                frames.append(self._frame(move['timestamp'], pacman_pos, ghosts, caught))
+
+        cells = self.grid.cells.ravel()
+        for cell in tally.eaten:
+            score += PELLET_POINTS.get(int(cells[cell]), 0)
+
+        results = self.tally_results(tally, len(moves))
+        results['score'] = score
+        results['agent'] = self.pacman_name
+        results['seconds'] = round(time.perf_counter() - start, 6)
+        results['moves'] = moves
+        if searching:
+            results['search'] = self.pacman.search_report()
+        if record_frames:
+            results['frames'] = frames
+
+        return results
+
+    def play_many(self, games, max_frames=10000):
+        """
+        Play several games, e.g. to bulk-generate trajectories.
+
+        Returns:
+            list: play() results without frames, tagged with 'gameIndex'
+        """
+        results = []
+        for game_index in range(games):
+            result = self.play(max_frames)
+            result['gameIndex'] = game_index
+            results.append(result)
+        return results
+
+    def _play_steps(self, ghosts, tally, max_frames):
+        """
+        Play frames until the stop policy or max_frames ends the game.
+
+        Yields (move, caught) after the ghosts have moved for each frame;
+        ghost positions are read from `ghosts` at that point.
+        """
+        cols = self.grid.cols
+        pacman = self.pacman
+        pellet_cells = self.pellets
+        remaining = self._pellet_index.copy()
+        danger = self.danger
+        collides = self._collides
+        cell = self._cell
+        agents = [(ghost, ghost['agent']) for ghost in ghosts]
+
+        pacman_pos = self.pacman_start
+        heading = 'LEFT'
+        previous = -1
+        # Ghost cells at the start of the frame, carried over from the last
+        before = [cell(ghost['position']) for ghost in ghosts]
+
+        for i in range(max_frames):
+            row, col = pacman_pos
+            pacman_cell = row * cols + col
+            timestamp = i * self.frame_time
+
+            # Ghosts move as in a replay of this frame
+            other_ghosts = {ghost['type']: ghost['position'] for ghost in ghosts}
+
+            for ghost, agent in agents:
+                next_pos = agent.get_next_move(pacman_pos, heading, other_ghosts)
+                if next_pos:
+                    agent.set_position(next_pos)
+                    ghost['position'] = next_pos
+
+            after = [cell(ghost['position']) for ghost in ghosts]
+            caught = collides(pacman_cell, previous, before, after)
+
+            if pacman_cell in pellet_cells:
+                remaining.discard((col, row))
+            stop = tally.record(pacman_cell, caught, timestamp, pacman_pos)
+
+            yield {
+                'position': {'x': col, 'y': row},
+                'direction': heading,
+                'timestamp': timestamp,
+                'pelletsEaten': len(tally.eaten)
+            }, caught
+
+            if stop:
+                break
+            if caught:
+                self._respawn(ghosts)
+                after = [cell(ghost['position']) for ghost in ghosts]
+            previous = pacman_cell
+            before = after
+
+            # Pac-Man AIs work in (x, y)
+            danger.update_cells([
+                ghost_cell for ghost, ghost_cell in zip(ghosts, after) if ghost['position']
+            ])
+            next_x, next_y = pacman.get_next_move((col, row), danger, remaining)
+            heading = self._heading((row, col), (next_y, next_x), heading)
+            pacman_pos = (next_y, next_x)
+
+    def _heading(self, current, following, heading):
+        """Direction of a step (through tunnels), or heading when standing still."""
+        dr = following[0] - current[0]
+        dc = following[1] - current[1]
+        # A step longer than one cell crosses a tunnel the other way
+        if abs(dr) > 1:
+            dr = -1 if dr > 0 else 1
+        if abs(dc) > 1:
+            dc = -1 if dc > 0 else 1
+        return STEP_DIRECTIONS.get((dr, dc), heading)
+
+    def _start_cell(self, start):
+        """Pac-Man's start cell as a walkable (row, col) tuple."""
+        if start is None:
+            start = (self.grid.rows // 2, self.grid.cols // 2)
+        elif isinstance(start, dict):
+            start = (start['y'], start['x'])
+
+        index = self.grid.index(tuple(start))
+        nearest = int(self.grid.nearest_walkable[index]) if index >= 0 else -1
+        if nearest < 0:
+            raise ValueError(f'No walkable start cell near {tuple(start)}')
+        return self.grid.positions[nearest]
@@ -0,0 +1,134 @@
+"""Early-exit policies for simulation runs."""
+
+
+class StopPolicy:
+    """
+    When a simulation run ends before its trajectory does.
+
+    Without a policy a run ends at the first catch. With one, every catch
+    that does not end the run sends the ghosts back to their start
+    positions (Pac-Man loses a life), and results gain the run's catch
+    and pellet counts (see RunTally.to_dict).
+
+    Attributes:
+        catches: End after this many catches (None = never on catches)
+        pellets: End once Pac-Man has eaten every pellet of the grid
+    """
+
+    def __init__(self, catches=1, pellets=False):
+        if catches is not None and catches < 1:
+            raise ValueError(f'catches must be at least 1: {catches}')
+        self.catches = catches
+        self.pellets = pellets
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        Policy from a spec string, a dict or a StopPolicy.
+
+        Strings are comma-separated rules: 'first-catch', 'catches:N',
+        'pellets' or 'none' (play the whole trajectory), e.g.
+        'catches:3,pellets'. Dicts take the constructor's keywords.
+
+        Raises:
+            ValueError: For unknown rules
+        """
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, dict):
+            return cls(catches=spec.get('catches'), pellets=bool(spec.get('pellets')))
+
+        catches = None
+        pellets = False
+        for rule in str(spec).split(','):
+            name, _, value = rule.strip().lower().partition(':')
+            if name == 'first-catch':
+                catches = 1
+            elif name == 'catches' and value.isdigit():
+                catches = int(value)
+            elif name == 'pellets':
+                pellets = True
+            elif name != 'none':
+                raise ValueError(f'Unknown stop rule: {rule!r}')
+        return cls(catches=catches, pellets=pellets)
+
+    def to_dict(self):
+        return {'catches': self.catches, 'pellets': self.pellets}
+
+
+class RunTally:
+    """
+    Catches and eaten pellets of one run, checked against a StopPolicy.
+
+    Pac-Man eats the pellet on his cell every frame; pellets are the
+    grid's pellet and power pellet cells, as flat indices.
+    """
+
+    def __init__(self, policy, pellets):
+        self.policy = policy
+        self.pellets = pellets
+        self.eaten = set()
+        self.catch_times = []
+        self.catch_positions = []
+        self.stop_reason = 'end'
+
+    @property
+    def cleared(self):
+        """Whether every pellet has been eaten (False on grids without any)."""
+        return bool(self.pellets) and len(self.eaten) == len(self.pellets)
+
+    def eat(self, cells):
+        """
+        Pac-Man visits cells (flat indices) in order.
+
+        Returns:
+            int: Index in cells of the visit that ate the last pellet,
+                or -1 if pellets remain (or were already cleared)
+        """
+        pellets = self.pellets
+        eaten = self.eaten
+        for i, cell in enumerate(cells):
+            if cell in pellets and cell not in eaten:
+                eaten.add(cell)
+                if len(eaten) == len(pellets):
+                    return i
+        return -1
+
+    def catch(self, timestamp, pacman_pos):
+        """
+        Record a catch.
+
+        Returns:
+            bool: Whether the policy ends the run here
+        """
+        self.catch_times.append(timestamp)
+        self.catch_positions.append({'y': pacman_pos[0], 'x': pacman_pos[1]})
+        if self.policy.catches is not None and len(self.catch_times) >= self.policy.catches:
+            self.stop_reason = 'catches'
+            return True
+        return False
+
+    def record(self, cell, caught, timestamp, pacman_pos):
+        """
+        Record one frame (Pac-Man's flat cell and whether he was caught).
+
+        Returns:
+            bool: Whether the policy ends the run after this frame
+        """
+        cleared = self.eat((cell,)) == 0
+        if caught and self.catch(timestamp, pacman_pos):
+            return True
+        if cleared and self.policy.pellets:
+            self.stop_reason = 'pellets'
+            return True
+        return False
+
+    def to_dict(self):
+        """Early-exit analytics added to results."""
+        return {
+            'catchCount': len(self.catch_times),
+            'catchTimes': list(self.catch_times),
+            'pelletsEaten': len(self.eaten),
+            'pelletsTotal': len(self.pellets),
+            'stopReason': self.stop_reason
+        }
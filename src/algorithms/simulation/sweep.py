@@ -0,0 +1,233 @@
+"""Multi-process runner for simulation sweeps."""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+import random
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pathfinding.distance_oracle import DistanceOracle
+from simulation.fast_engine import FastGameEngine
+from utils.grid import Grid, as_grid
+
+
+# Upper bound on distance tables precomputed into shared memory
+MAX_SHARED_TABLES = 1024
+
+# Per-process state installed by _init_worker
+_worker = {}
+
+
+class SharedArrays:
+    """
+    Named NumPy arrays backed by one shared memory block each.
+
+    The owning process creates the blocks; workers attach by name from
+    the spec, so arrays are never pickled per task.
+    """
+
+    def __init__(self, spec, blocks):
+        self.spec = spec
+        self.blocks = blocks
+        self.arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+            for name, (_, shape, dtype) in spec.items()
+        }
+
+    @classmethod
+    def create(cls, arrays):
+        """Copy arrays into new shared memory blocks."""
+        spec = {}
+        blocks = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks[name] = block
+            spec[name] = (block.name, array.shape, array.dtype.str)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        return cls(spec, blocks)
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to blocks created by another process."""
+        blocks = {
+            name: shared_memory.SharedMemory(name=block_name)
+            for name, (block_name, _, _) in spec.items()
+        }
+        return cls(spec, blocks)
+
+    def close(self, unlink=False):
+        # Views must go before the buffers can be released
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+
+
+def job_seed(base_seed, job_index):
+    """Deterministic seed of a sweep job, independent of scheduling."""
+    return base_seed + job_index
+
+
+def _pacman_targets(oracle, trajectories, limit):
+    """Compact indices of the most visited Pac-Man cells (Blinky's targets)."""
+    counts = Counter()
+    for trajectory in trajectories:
+        for move in trajectory:
+            pos = move.get('position', {})
+            if isinstance(pos, dict):
+                pos = (pos.get('y'), pos.get('x'))
+            if pos and None not in pos:
+                idx = oracle.index_of(tuple(pos))
+                if idx >= 0:
+                    counts[idx] += 1
+    return [idx for idx, _ in counts.most_common(limit)]
+
+
+def _init_worker(spec, targets, trajectories, ghost_config_sets, include_frames, profile,
+                 stop_policy):
+    """Attach to the shared grid and tables and build this worker's engine."""
+    shared = SharedArrays.attach(spec)
+    arrays = shared.arrays
+
+    grid = Grid.from_arrays(arrays['cells'], arrays['indptr'], arrays['indices'])
+    oracle = DistanceOracle(grid)
+    oracle.attach_tables(targets, arrays['dist'], arrays['next_hop'])
+
+    _worker.update(
+        shared=shared,
+        oracle=oracle,
+        targets=targets,
+        engine=FastGameEngine(
+            grid, [], oracle=oracle, profile=profile, stop_policy=stop_policy
+        ),
+        trajectories=trajectories,
+        ghost_config_sets=ghost_config_sets,
+        include_frames=include_frames
+    )
+
+
+def _fill_tables(bounds):
+    """Compute shared distance table rows [start, end) in this worker."""
+    start, end = bounds
+    arrays = _worker['shared'].arrays
+    _worker['oracle'].fill_tables(
+        _worker['targets'][start:end],
+        arrays['dist'][start:end],
+        arrays['next_hop'][start:end]
+    )
+
+
+def _run_job(job):
+    """Run one (trajectory, ghost config set) job in this worker."""
+    _, trajectory_index, config_index, seed = job
+
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    result = _worker['engine'].simulate_with(
+        _worker['trajectories'][trajectory_index],
+        _worker['ghost_config_sets'][config_index],
+        _worker['include_frames']
+    )
+    result['trajectoryIndex'] = trajectory_index
+    result['configIndex'] = config_index
+    result['seed'] = seed
+    return result
+
+
+def _chunks(count, parts):
+    """Split range(count) into at most `parts` contiguous (start, end) bounds."""
+    if count == 0:
+        return []
+    parts = max(1, min(parts, count))
+    step = -(-count // parts)
+    return [(start, min(start + step, count)) for start in range(0, count, step)]
+
+
+def run_sweep(grid, trajectories, ghost_config_sets, workers=1,
+              include_frames=False, seed=0, profile=False, stop_policy=None):
+    """
+    Simulate every trajectory against every ghost configuration set.
+
+    Jobs are spread over a ProcessPoolExecutor. The grid, its CSR
+    adjacency and the distance tables towards the most visited Pac-Man
+    cells are placed in shared memory once: the tables are computed in
+    parallel by the pool, then every worker serves them without copying.
+    Each job reseeds the RNGs from job_seed(seed, job_index), so results
+    do not depend on the number of workers.
+
+    Args:
+        grid: Grid or 2D maze grid (1=wall)
+        trajectories: List of trajectories (as accepted by GameEngine.simulate)
+        ghost_config_sets: List of ghost configuration lists
+        workers: Number of processes; 1 runs in-process, 0 uses all cores
+        include_frames: Whether to keep per-frame data in each result
+        seed: Base seed for the per-job seeds
+        profile: Whether to add search counters to each result (see
+            GameEngine.search_profile)
+        stop_policy: When runs end (see StopPolicy.parse); None ends them
+            at the first catch
+
+    Returns:
+        list: One result per (trajectory, config set) pair in submission
+            (trajectory-major) order, tagged with 'trajectoryIndex',
+            'configIndex' and 'seed'
+    """
+    pairs = product(range(len(trajectories)), range(len(ghost_config_sets)))
+    jobs = [
+        (job_index, trajectory_index, config_index, job_seed(seed, job_index))
+        for job_index, (trajectory_index, config_index) in enumerate(pairs)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        engine = FastGameEngine(grid, [], profile=profile, stop_policy=stop_policy)
+        _worker.update(
+            engine=engine,
+            trajectories=trajectories,
+            ghost_config_sets=ghost_config_sets,
+            include_frames=include_frames
+        )
+        try:
+            return [_run_job(job) for job in jobs]
+        finally:
+            _worker.clear()
+
+    grid = as_grid(grid)
+    oracle = DistanceOracle(grid)
+    targets = _pacman_targets(oracle, trajectories, MAX_SHARED_TABLES)
+    table_shape = (len(targets), len(oracle.cells))
+
+    shared = SharedArrays.create({
+        'cells': grid.cells,
+        'indptr': grid.indptr,
+        'indices': grid.indices,
+        'dist': np.empty(table_shape, dtype=np.int32),
+        'next_hop': np.empty(table_shape, dtype=np.int32)
+    })
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.spec, targets, trajectories, ghost_config_sets,
+                      include_frames, profile, stop_policy)
+        ) as executor:
+            # Tables first: every simulation job reads them
+            list(executor.map(_fill_tables, _chunks(len(targets), workers * 4)))
+
+            chunksize = max(1, len(jobs) // (workers * 8))
+            return list(executor.map(_run_job, jobs, chunksize=chunksize))
+    finally:
+        shared.close(unlink=True)
@@ -0,0 +1,330 @@
+"""Columnar binary trajectory files (.ptrj)."""
+
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+
+MAGIC = b'PTRJ'
+VERSION = 1
+EXTENSION = '.ptrj'
+
+# magic, version, header bytes, moves, timestamp bytes, pellet bytes, CRC-32
+HEADER = struct.Struct('<4sHHIIII')
+
+# 2-bit direction codes, in the order of the Trajectory model's enum
+DIRECTIONS = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# (row, col) step of each direction code
+DIRECTION_STEPS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+
+# Longest varint of a 64-bit value
+MAX_VARINT_BYTES = 10
+
+
+def _encode_varints(values):
+    """
+    Zigzag varints of the deltas between consecutive values.
+
+    The first value is a delta from 0. Each delta is zigzag mapped to an
+    unsigned value and written 7 bits per byte, low bits first, with the
+    high bit set on every byte but the last.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return b''
+
+    deltas = np.diff(values, prepend=0)
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).view(np.uint64)
+
+    lengths = np.ones(len(zigzag), dtype=np.int64)
+    rest = zigzag >> np.uint64(7)
+    while rest.any():
+        lengths += rest > 0
+        rest >>= np.uint64(7)
+
+    starts = np.cumsum(lengths) - lengths
+    encoded = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        present = lengths > k
+        byte = (zigzag[present] >> np.uint64(7 * k)) & np.uint64(0x7f)
+        more = (lengths[present] > k + 1).astype(np.uint64) << np.uint64(7)
+        encoded[starts[present] + k] = byte | more
+
+    return encoded.tobytes()
+
+
+def _decode_varints(data, count):
+    """Inverse of _encode_varints: int64 array of count values."""
+    encoded = np.frombuffer(data, dtype=np.uint8)
+    if count == 0:
+        if len(encoded):
+            raise ValueError('Trailing bytes after varint column')
+        return np.zeros(0, dtype=np.int64)
+
+    ends = np.flatnonzero(encoded < 0x80)
+    if len(ends) != count or ends[-1] != len(encoded) - 1:
+        raise ValueError('Varint column does not hold the expected values')
+
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts + 1
+    if lengths.max() > MAX_VARINT_BYTES:
+        raise ValueError('Varint longer than 64 bits')
+
+    shifts = 7 * (np.arange(len(encoded)) - np.repeat(starts, lengths))
+    parts = (encoded & 0x7f).astype(np.uint64) << shifts.astype(np.uint64)
+    zigzag = np.bitwise_or.reduceat(parts, starts)
+
+    deltas = (zigzag >> np.uint64(1)).view(np.int64) ^ -(zigzag & np.uint64(1)).view(np.int64)
+    return np.cumsum(deltas)
+
+
+def encode_trajectory(moves):
+    """
+    Encode trajectory moves as a .ptrj file.
+
+    Layout (little-endian): the HEADER, then one column per field:
+    x and y as int16 arrays, directions as 2-bit codes packed four to a
+    byte (first move in the low bits), then timestamps and pelletsEaten
+    as zigzag varints of their deltas (see _encode_varints). The CRC-32
+    covers every byte after the header.
+
+    Args:
+        moves: [{'position': {'x', 'y'}, 'direction', 'timestamp',
+            'pelletsEaten'}, ...] as recorded; a missing timestamp is
+            100 ms per move (as GameEngine reads it), missing
+            pelletsEaten is 0
+
+    Returns:
+        bytes: The encoded file
+
+    Raises:
+        ValueError: A move without a position or direction, or with a
+            position outside int16
+    """
+    count = len(moves)
+    positions = np.zeros((count, 2), dtype=np.int64)
+    codes = np.zeros(count, dtype=np.uint8)
+    timestamps = np.zeros(count, dtype=np.int64)
+    pellets = np.zeros(count, dtype=np.int64)
+
+    for i, move in enumerate(moves):
+        position = move.get('position')
+        if not isinstance(position, dict) or position.get('x') is None or position.get('y') is None:
+            raise ValueError(f'Move {i} has no position')
+        direction = DIRECTION_CODES.get(move.get('direction'))
+        if direction is None:
+            raise ValueError(f"Move {i} has no direction in {', '.join(DIRECTIONS)}")
+
+        positions[i] = (position['x'], position['y'])
+        codes[i] = direction
+        timestamps[i] = move.get('timestamp', i * 100)
+        pellets[i] = move.get('pelletsEaten', 0)
+
+    coordinates = positions.astype('<i2')
+    if not np.array_equal(coordinates, positions):
+        raise ValueError('Positions do not fit in int16')
+
+    packed = np.zeros(-(-count // 4), dtype=np.uint8)
+    for k in range(4):
+        packed[:len(codes[k::4])] |= codes[k::4] << (2 * k)
+
+    timestamp_bytes = _encode_varints(timestamps)
+    pellet_bytes = _encode_varints(pellets)
+    body = b''.join((
+        coordinates[:, 0].tobytes(),
+        coordinates[:, 1].tobytes(),
+        packed.tobytes(),
+        timestamp_bytes,
+        pellet_bytes
+    ))
+
+    header = HEADER.pack(
+        MAGIC, VERSION, HEADER.size, count,
+        len(timestamp_bytes), len(pellet_bytes), zlib.crc32(body)
+    )
+    return header + body
+
+
+def write_trajectory(path, moves):
+    """Write moves to a .ptrj file atomically (see encode_trajectory)."""
+    data = encode_trajectory(moves)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def decode_trajectory(data, verify=True):
+    """BinaryTrajectory over an encoded file held in memory (bytes or a buffer)."""
+    return BinaryTrajectory(data, verify=verify)
+
+
+def read_trajectory(path, verify=True):
+    """Read a .ptrj file into memory."""
+    with open(path, 'rb') as f:
+        return BinaryTrajectory(f.read(), verify=verify)
+
+
+def open_trajectory(path, verify=True):
+    """
+    Memory-map a .ptrj file.
+
+    The x and y columns are views of the mapping, so only the pages read
+    are loaded; close() (or a with block) releases it.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return BinaryTrajectory(mapped, verify=verify, mapped=mapped)
+    except BaseException:
+        mapped.close()
+        raise
+
+
+def is_trajectory_file(path):
+    """Whether path starts with the .ptrj magic."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class BinaryTrajectory:
+    """
+    Columns of an encoded trajectory.
+
+    x, y (int16), direction codes (uint8, indices into DIRECTIONS),
+    timestamps and pellets_eaten (int64) are arrays with one entry per
+    move. Engines read them through iter_steps() and pacman_arrays()
+    without building move dicts; indexing and iteration still give
+    recorded move dicts for other callers.
+    """
+
+    def __init__(self, data, verify=True, mapped=None):
+        """
+        Args:
+            data: Encoded file (bytes or any buffer, e.g. an mmap)
+            verify: Check the CRC-32 of the columns
+            mapped: mmap to close with close(), if data is one
+
+        Raises:
+            ValueError: Not a .ptrj file, an unsupported version, or a
+                truncated or corrupt file
+        """
+        self._mapped = mapped
+        if len(data) < HEADER.size:
+            raise ValueError('Truncated trajectory file')
+
+        magic, version, header_size, count, timestamp_bytes, pellet_bytes, checksum = \
+            HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a trajectory file')
+        if version != VERSION:
+            raise ValueError(f'Unsupported trajectory file version: {version}')
+
+        packed_bytes = -(-count // 4)
+        x_offset = header_size
+        y_offset = x_offset + 2 * count
+        packed_offset = y_offset + 2 * count
+        timestamp_offset = packed_offset + packed_bytes
+        pellet_offset = timestamp_offset + timestamp_bytes
+        end = pellet_offset + pellet_bytes
+        if len(data) != end:
+            raise ValueError('Trajectory file size does not match its header')
+
+        if verify:
+            with memoryview(data) as view:
+                if zlib.crc32(view[header_size:end]) != checksum:
+                    raise ValueError('Trajectory file checksum mismatch')
+
+        # Varint columns are decoded from copies, so a mapped file has no
+        # views open (and closes) if they are corrupt
+        self.timestamps = _decode_varints(data[timestamp_offset:pellet_offset], count)
+        self.pellets_eaten = _decode_varints(data[pellet_offset:end], count)
+
+        packed = np.frombuffer(data[packed_offset:timestamp_offset], dtype=np.uint8)
+        shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+        self.directions = ((packed[:, None] >> shifts) & 3).reshape(-1)[:count]
+
+        self.count = count
+        self.x = np.frombuffer(data, dtype='<i2', count=count, offset=x_offset)
+        self.y = np.frombuffer(data, dtype='<i2', count=count, offset=y_offset)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Move dict of one move, as recorded."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('move index out of range')
+        return {
+            'position': {'x': int(self.x[index]), 'y': int(self.y[index])},
+            'direction': DIRECTIONS[self.directions[index]],
+            'timestamp': int(self.timestamps[index]),
+            'pelletsEaten': int(self.pellets_eaten[index])
+        }
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def moves(self):
+        """All moves as recorded dicts."""
+        return list(self)
+
+    def direction_names(self, start=0, end=None):
+        """Direction name of each move in [start, end)."""
+        return [DIRECTIONS[code] for code in self.directions[start:end].tolist()]
+
+    def iter_steps(self):
+        """(pacman (row, col), direction, timestamp) per move, as GameEngine reads moves."""
+        return zip(
+            zip(self.y.tolist(), self.x.tolist()),
+            self.direction_names(),
+            self.timestamps.tolist()
+        )
+
+    def pacman_arrays(self):
+        """(rows, cols, dir_rows, dir_cols) int64 arrays, as ghost_ai.targets.pacman_arrays."""
+        steps = DIRECTION_STEPS[self.directions]
+        return (
+            self.y.astype(np.int64), self.x.astype(np.int64),
+            steps[:, 0], steps[:, 1]
+        )
+
+    def close(self):
+        """
+        Release the mapping of an opened file (columns become empty).
+
+        x and y arrays kept from a mapped file must be copied first: the
+        mapping cannot close while views of it exist.
+        """
+        if self._mapped is None:
+            return
+        self.x = self.y = np.zeros(0, dtype='<i2')
+        self.directions = self.directions[:0].copy()
+        self.count = 0
+        self._mapped.close()
+        self._mapped = None
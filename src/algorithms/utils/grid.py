@@ -0,0 +1,375 @@
+"""NumPy-backed maze grid shared by pathfinders, placers and agents."""
+
+from collections import deque
+
+import numpy as np
+
+from .grid_cache import get_cache, grid_key
+
+# Cell values (see PelletPlacer): 0=path, 1=wall, 2=pellet, 3=power pellet
+PATH = 0
+WALL = 1
+
+# Neighbor order used everywhere: up, down, left, right
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class Grid:
+    """
+    Maze grid parsed and analysed once.
+
+    Stores the cells as a contiguous uint8 array and precomputes:
+    - walkable: boolean mask of non-wall cells
+    - neighbor_count: number of walkable 4-neighbors of every cell
+    - indptr/indices: CSR adjacency over flat indices (row * cols + col),
+      neighbors listed in DIRECTIONS order
+    - tunnel_rows/tunnel_cols: wraparound tunnels, detected as openings in
+      the border wall on both sides of a row (or column). Their two ends
+      are adjacent: the left neighbor of (row, 0) is (row, cols - 1).
+      neighbor_count and the topology masks ignore these edges.
+
+    Topology masks (dead_ends, corridors, junctions, corners) and the
+    nearest_walkable table are computed on first use. All derived arrays
+    come from the grid cache keyed by the cell bytes, so a maze seen
+    before (in this process, or on disk) is not analysed again.
+
+    Pellet cells are walkable; only walls block movement.
+
+    Supports grid[row][col] and len(grid) so it can stand in for the
+    list-of-lists grids used throughout the codebase.
+    """
+
+    def __init__(self, cells, wrap=True):
+        """
+        Initialize grid.
+
+        Args:
+            cells: 2D list or array where 1=wall, anything else is walkable
+            wrap: Connect the two ends of every tunnel
+        """
+        array = np.ascontiguousarray(cells, dtype=np.uint8)
+        if array.size == 0:
+            array = np.zeros((0, 0), dtype=np.uint8)
+        if array.ndim != 2:
+            raise ValueError("Grid must be two-dimensional")
+
+        self.cells = array
+        self.rows, self.cols = array.shape
+        self.size = self.rows * self.cols
+        self.key = grid_key(array)
+
+        cache = get_cache()
+        self.walkable = cache.get(self.key, 'walkable', lambda: array != WALL)
+        self.neighbor_count = cache.get(
+            self.key, 'neighbor_count', lambda: self._count_neighbors(self.walkable)
+        )
+        self._set_tunnels(wrap)
+
+        # Without tunnels both adjacencies are the same array pair
+        names = ('wrap_indptr', 'wrap_indices') if self.wraps else ('indptr', 'indices')
+        self.indptr, self.indices = cache.get_many(
+            self.key, names,
+            lambda: self._build_adjacency(self.walkable, self.tunnel_rows, self.tunnel_cols)
+        )
+
+        # Python-level views, built on first use by hot loops
+        self._walkable_flat = None
+        self._adjacency = None
+        self._positions = None
+        self._rows_view = None
+
+    @classmethod
+    def from_arrays(cls, cells, indptr, indices):
+        """
+        Rebuild a Grid around existing cells and CSR adjacency arrays.
+
+        Used to attach to a grid analysed in another process (e.g. arrays
+        backed by shared memory) without recomputing the adjacency.
+        """
+        grid = cls.__new__(cls)
+        grid.cells = cells
+        grid.rows, grid.cols = cells.shape
+        grid.size = grid.rows * grid.cols
+        grid.key = grid_key(cells)
+        grid.walkable = cells != WALL
+        grid.neighbor_count = cls._count_neighbors(grid.walkable)
+        grid._set_tunnels(True)
+        grid.indptr = indptr
+        grid.indices = indices
+        grid._walkable_flat = None
+        grid._adjacency = None
+        grid._positions = None
+        grid._rows_view = None
+        return grid
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if self._rows_view is None:
+            self._rows_view = self.cells.tolist()
+        return self._rows_view[row]
+
+    @property
+    def walkable_flat(self):
+        """Flat list of walkable flags, indexed by flat index."""
+        if self._walkable_flat is None:
+            self._walkable_flat = self.walkable.ravel().tolist()
+        return self._walkable_flat
+
+    @property
+    def adjacency(self):
+        """List of neighbor flat-index lists, expanded from the CSR arrays."""
+        if self._adjacency is None:
+            indptr = self.indptr.tolist()
+            indices = self.indices.tolist()
+            self._adjacency = [
+                indices[indptr[i]:indptr[i + 1]] for i in range(self.size)
+            ]
+        return self._adjacency
+
+    @property
+    def positions(self):
+        """(row, col) tuple for every flat index."""
+        if self._positions is None:
+            cols = self.cols
+            self._positions = [divmod(i, cols) for i in range(self.size)] if cols else []
+        return self._positions
+
+    @property
+    def dead_ends(self):
+        """Mask of walkable cells with exactly one walkable neighbor."""
+        return self._cached('dead_ends', lambda: self.walkable & (self.neighbor_count == 1))
+
+    @property
+    def corridors(self):
+        """Mask of walkable cells with exactly two walkable neighbors."""
+        return self._cached('corridors', lambda: self.walkable & (self.neighbor_count == 2))
+
+    @property
+    def junctions(self):
+        """Mask of walkable cells that are neither dead ends nor corridors."""
+        return self._cached(
+            'junctions',
+            lambda: self.walkable & (self.neighbor_count != 1) & (self.neighbor_count != 2)
+        )
+
+    @property
+    def corners(self):
+        """Mask of walkable L-shaped cells: one vertical, one horizontal neighbor."""
+        return self._cached('corners', lambda: self._find_corners(self.walkable))
+
+    @property
+    def nearest_walkable(self):
+        """
+        Flat index of the nearest walkable cell for every cell (-1 if none).
+
+        Walkable cells map to themselves; ties are broken as a BFS from the
+        cell exploring up, down, left, right would.
+        """
+        return self._cached('nearest_walkable', lambda: self._nearest_walkable(self.walkable))
+
+    @property
+    def walkable_cells(self):
+        """Walkable (row, col) cells in row-major order."""
+        positions = self.positions
+        return [positions[i] for i in np.flatnonzero(self.walkable).tolist()]
+
+    def index(self, pos):
+        """Flat index of (row, col), or -1 if outside the grid."""
+        row, col = pos
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return -1
+
+    def is_walkable(self, pos):
+        """Check if (row, col) is inside the grid and not a wall."""
+        idx = self.index(pos)
+        return idx >= 0 and self.walkable_flat[idx]
+
+    def neighbors(self, pos):
+        """Walkable 4-neighbors of (row, col) as (row, col) tuples."""
+        idx = self.index(pos)
+        if idx < 0:
+            return []
+        positions = self.positions
+        return [positions[n] for n in self.adjacency[idx]]
+
+    def to_list(self):
+        """Fresh list-of-lists copy of the cells."""
+        return self.cells.tolist()
+
+    def distance_bound(self, pos1, pos2):
+        """
+        Tunnel-aware lower bound on the path length between (row, col) cells.
+
+        Manhattan distance, or the way round through a tunnel when that is
+        shorter: cols - |dc| across, plus the walk from each cell to the
+        tunnel's row (and likewise for vertical tunnels). With tunnels on
+        both axes the detour is left out: min(|dr|, rows - |dr|) +
+        min(|dc|, cols - |dc|). Crossing a tunnel is one step, so this
+        stays admissible and consistent.
+        """
+        dr = abs(pos1[0] - pos2[0])
+        dc = abs(pos1[1] - pos2[1])
+        if self.wrap_rows and self.wrap_cols:
+            return min(dr, self.wrap_rows - dr) + min(dc, self.wrap_cols - dc)
+        if self.wrap_cols and 2 * dc > self.wrap_cols:
+            detour = min(abs(pos1[0] - row) + abs(pos2[0] - row) for row in self.tunnel_rows)
+            return min(dr + dc, detour + self.wrap_cols - dc)
+        if self.wrap_rows and 2 * dr > self.wrap_rows:
+            detour = min(abs(pos1[1] - col) + abs(pos2[1] - col) for col in self.tunnel_cols)
+            return min(dr + dc, detour + self.wrap_rows - dr)
+        return dr + dc
+
+    def _set_tunnels(self, wrap):
+        """Detect tunnels; wrap_rows/wrap_cols are the cycle lengths (0 = none)."""
+        if wrap:
+            self.tunnel_rows, self.tunnel_cols = self._find_tunnels(self.walkable)
+        else:
+            self.tunnel_rows, self.tunnel_cols = (), ()
+        self.wraps = bool(self.tunnel_rows or self.tunnel_cols)
+        # Vertical tunnels shorten row distances and vice versa
+        self.wrap_rows = self.rows if self.tunnel_cols else 0
+        self.wrap_cols = self.cols if self.tunnel_rows else 0
+
+    def _cached(self, name, compute):
+        """Derived array from the grid cache, computed on first use."""
+        attr = '_' + name
+        value = self.__dict__.get(attr)
+        if value is None:
+            value = get_cache().get(self.key, name, compute)
+            self.__dict__[attr] = value
+        return value
+
+    @staticmethod
+    def _count_neighbors(walkable):
+        """Count walkable 4-neighbors of each cell with shifted-array sums."""
+        padded = np.pad(walkable, 1, constant_values=False).astype(np.uint8)
+        return (
+            padded[:-2, 1:-1] + padded[2:, 1:-1] +
+            padded[1:-1, :-2] + padded[1:-1, 2:]
+        )
+
+    @staticmethod
+    def _find_tunnels(walkable):
+        """
+        Rows and columns open at both ends of the border.
+
+        An end counts as a tunnel mouth when the border cells on either
+        side of it are walls, so grids without a wall frame (whose whole
+        border is open) get no tunnels.
+        """
+        rows, cols = walkable.shape
+        if rows < 3 or cols < 3:
+            return (), ()
+
+        def mouths(border):
+            # Open cells between two walls, excluding the corners
+            inner = border[1:-1] & ~border[:-2] & ~border[2:]
+            return np.concatenate(([False], inner, [False]))
+
+        tunnel_rows = np.flatnonzero(mouths(walkable[:, 0]) & mouths(walkable[:, -1]))
+        tunnel_cols = np.flatnonzero(mouths(walkable[0, :]) & mouths(walkable[-1, :]))
+        return tuple(tunnel_rows.tolist()), tuple(tunnel_cols.tolist())
+
+    @staticmethod
+    def _find_corners(walkable):
+        """L-shaped cells: exactly one vertical and one horizontal walkable neighbor."""
+        padded = np.pad(walkable, 1, constant_values=False).astype(np.uint8)
+        vertical = padded[:-2, 1:-1] + padded[2:, 1:-1]
+        horizontal = padded[1:-1, :-2] + padded[1:-1, 2:]
+        return walkable & (vertical == 1) & (horizontal == 1)
+
+    @staticmethod
+    def _nearest_walkable(walkable):
+        """Build the nearest_walkable table."""
+        rows, cols = walkable.shape
+        flat = np.arange(rows * cols, dtype=np.int32).reshape(rows, cols)
+        nearest = np.where(walkable, flat, -1).astype(np.int32)
+
+        # Distance 1: the first walkable neighbor in DIRECTIONS order, which
+        # is the first walkable cell a BFS from this cell dequeues. Applied
+        # in reverse so earlier directions overwrite later ones.
+        for dr, dc in reversed(DIRECTIONS):
+            src_r = slice(max(0, -dr), rows - max(0, dr))
+            src_c = slice(max(0, -dc), cols - max(0, dc))
+            dst_r = slice(max(0, dr), rows - max(0, -dr))
+            dst_c = slice(max(0, dc), cols - max(0, -dc))
+            candidate = ~walkable[src_r, src_c] & walkable[dst_r, dst_c]
+            nearest[src_r, src_c][candidate] = flat[dst_r, dst_c][candidate]
+
+        # Deeper cells (inside thick walls) are rare: run the BFS itself
+        walkable_flat = walkable.ravel().tolist()
+        nearest_flat = nearest.ravel()
+        for start in np.flatnonzero(nearest_flat < 0).tolist():
+            nearest_flat[start] = Grid._bfs_nearest(start, walkable_flat, rows, cols)
+
+        return nearest_flat
+
+    @staticmethod
+    def _bfs_nearest(start, walkable_flat, rows, cols):
+        """First walkable flat index dequeued by a BFS from start, or -1."""
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if walkable_flat[current]:
+                return current
+            row, col = divmod(current, cols)
+            for dr, dc in DIRECTIONS:
+                r, c = row + dr, col + dc
+                if 0 <= r < rows and 0 <= c < cols and r * cols + c not in visited:
+                    visited.add(r * cols + c)
+                    queue.append(r * cols + c)
+        return -1
+
+    @staticmethod
+    def _build_adjacency(walkable, tunnel_rows=(), tunnel_cols=()):
+        """
+        Build CSR (indptr, indices) adjacency between walkable cells.
+
+        Tunnel ends are linked in the direction that leaves the grid.
+        """
+        rows, cols = walkable.shape
+        size = rows * cols
+        flat = np.arange(size, dtype=np.int32).reshape(rows, cols)
+
+        # candidates[d, i] = neighbor of cell i in direction d, or -1
+        candidates = np.full((len(DIRECTIONS), rows, cols), -1, dtype=np.int32)
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            src_r = slice(max(0, -dr), rows - max(0, dr))
+            src_c = slice(max(0, -dc), cols - max(0, dc))
+            dst_r = slice(max(0, dr), rows - max(0, -dr))
+            dst_c = slice(max(0, dc), cols - max(0, -dc))
+            connected = walkable[src_r, src_c] & walkable[dst_r, dst_c]
+            candidates[d][src_r, src_c] = np.where(connected, flat[dst_r, dst_c], -1)
+
+        # Wraparound edges (DIRECTIONS: up, down, left, right)
+        for row in tunnel_rows:
+            candidates[2, row, 0] = flat[row, cols - 1]
+            candidates[3, row, cols - 1] = flat[row, 0]
+        for col in tunnel_cols:
+            candidates[0, 0, col] = flat[rows - 1, col]
+            candidates[1, rows - 1, col] = flat[0, col]
+
+        # Cell-major order keeps each cell's neighbors in DIRECTIONS order
+        per_cell = candidates.reshape(len(DIRECTIONS), size).T
+        mask = per_cell >= 0
+        indices = per_cell[mask].astype(np.int32)
+        indptr = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(mask.sum(axis=1), out=indptr[1:])
+        return indptr, indices
+
+
+def as_grid(grid):
+    """
+    Return a Grid for any supported grid input.
+
+    Grid instances are passed through untouched so the analysis is done
+    once; list-of-lists (or arrays) are parsed into a new Grid.
+    """
+    # Duck-typed: this module can be imported under two package paths
+    if hasattr(grid, 'indptr') and hasattr(grid, 'walkable'):
+        return grid
+    return Grid(grid)
@@ -0,0 +1,177 @@
+"""Content-addressed cache of per-maze derived arrays."""
+
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+# In-memory budget of the default cache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Environment variable naming a directory for the on-disk cache (optional),
+# e.g. data/grid-cache
+CACHE_DIR_ENV = 'PACMAN_GRID_CACHE_DIR'
+
+
+def grid_key(cells):
+    """
+    Stable content hash of a grid.
+
+    Covers the shape and the uint8 cell bytes, so equal mazes share a key
+    across processes and runs regardless of how they were loaded.
+    """
+    cells = np.ascontiguousarray(cells, dtype=np.uint8)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(cells.shape, dtype=np.int64).tobytes())
+    digest.update(cells.tobytes())
+    return digest.hexdigest()
+
+
+class GridCache:
+    """
+    Derived maze arrays keyed by (grid key, artifact name).
+
+    Arrays live in an in-memory LRU bounded by their total size in bytes.
+    With a directory set, they are also written as .npy files
+    (<directory>/<grid key>/<name>.npy) and later loaded memory-mapped,
+    so a fresh process skips the analysis for mazes seen before.
+
+    Cached arrays are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, directory=None):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: In-memory budget; least recently used arrays are
+                dropped beyond it
+            directory: Optional on-disk cache directory
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, name, compute):
+        """
+        Get one artifact, computing it with compute() on a miss.
+
+        Returns:
+            np.ndarray: The cached or freshly computed array
+        """
+        return self.get_many(key, (name,), lambda: (compute(),))[0]
+
+    def get_many(self, key, names, compute):
+        """
+        Get several artifacts produced together by one compute() call.
+
+        Args:
+            key: Grid key (see grid_key)
+            names: Artifact names
+            compute: Callable returning one array per name
+
+        Returns:
+            tuple: Arrays in the order of names
+        """
+        entries = self._entries
+        cached = [entries.get((key, name)) for name in names]
+
+        if all(array is not None for array in cached):
+            self.hits += 1
+            for name in names:
+                entries.move_to_end((key, name))
+            return tuple(cached)
+
+        arrays = self._load(key, names)
+        if arrays is None:
+            self.misses += 1
+            arrays = tuple(np.asarray(array) for array in compute())
+            for array in arrays:
+                array.flags.writeable = False
+            self._save(key, names, arrays)
+        else:
+            self.hits += 1
+
+        for name, array in zip(names, arrays):
+            self._store((key, name), array)
+        return arrays
+
+    def clear(self):
+        """Drop all in-memory entries (files on disk are kept)."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _store(self, entry_key, array):
+        """Add an array to the LRU, evicting the oldest beyond max_bytes."""
+        entries = self._entries
+        if entry_key in entries:
+            self.nbytes -= entries.pop(entry_key).nbytes
+
+        if array.nbytes > self.max_bytes:
+            return
+
+        entries[entry_key] = array
+        self.nbytes += array.nbytes
+
+        while self.nbytes > self.max_bytes:
+            _, evicted = entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def _path(self, key, name):
+        return os.path.join(self.directory, key, f'{name}.npy')
+
+    def _load(self, key, names):
+        """Memory-map all artifacts from disk, or None if any is missing."""
+        if not self.directory:
+            return None
+
+        paths = [self._path(key, name) for name in names]
+        if not all(os.path.exists(path) for path in paths):
+            return None
+
+        try:
+            return tuple(np.load(path, mmap_mode='r') for path in paths)
+        except (OSError, ValueError):
+            # Truncated or foreign file: recompute and overwrite
+            return None
+
+    def _save(self, key, names, arrays):
+        """Write artifacts to disk atomically (best effort)."""
+        if not self.directory:
+            return
+
+        folder = os.path.join(self.directory, key)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            for name, array in zip(names, arrays):
+                fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp_path, self._path(key, name))
+        except OSError:
+            # A read-only or full disk only costs the on-disk reuse
+            pass
+
+
+_default_cache = None
+
+
+def get_cache():
+    """Process-wide cache, on disk when PACMAN_GRID_CACHE_DIR is set."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GridCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+    return _default_cache
+
+
+def configure_cache(max_bytes=DEFAULT_MAX_BYTES, directory=None):
+    """Replace the process-wide cache."""
+    global _default_cache
+    _default_cache = GridCache(max_bytes=max_bytes, directory=directory)
+    return _default_cache
@@ -0,0 +1,196 @@
+"""Catalogue of finished seeded mazes keyed by their build parameters."""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .rng import normalize_seed
+
+
+# In-memory entries of the default catalogue
+DEFAULT_MAX_ENTRIES = 256
+
+# Part of every key: bump it whenever a generator, the imperfecteur or a
+# pellet placer changes its output for a seed, so stores written by older
+# code (on disk, across deploys) are not served
+CATALOG_VERSION = 1
+
+# Environment variable naming a directory for the on-disk store (optional),
+# e.g. data/maze-catalog
+CATALOG_DIR_ENV = 'PACMAN_MAZE_CATALOG_DIR'
+
+
+def catalog_key(width, height, algorithm, imperfection, tunnels_h, tunnels_v,
+                symmetric, seed, pellets=None, density=None,
+                corridor_density=None, junction_density=None):
+    """
+    Canonical key of a build request, or None when it is not cacheable.
+
+    Only seeded builds are deterministic, so unseeded ones return None.
+    The seed is keyed by normalize_seed, the value builds are seeded with.
+    Imperfection is normalised the way MazeImperfecteur reads it (30 and
+    0.3 are the same level) and pellet tuning only counts for the placer
+    that uses it.
+    """
+    seed = normalize_seed(seed)
+    if seed is None:
+        return None
+
+    imperfection = float(imperfection)
+    if imperfection > 1:
+        imperfection /= 100.0
+
+    pellets = pellets.lower() if pellets else None
+    tuning = {
+        'random': (density,),
+        'strategic': (corridor_density, junction_density)
+    }.get(pellets, ())
+
+    params = [
+        CATALOG_VERSION, int(width), int(height), algorithm.lower(), round(imperfection, 6),
+        int(tunnels_h), int(tunnels_v), bool(symmetric), seed,
+        pellets, [None if value is None else float(value) for value in tuning]
+    ]
+    digest = hashlib.blake2b(json.dumps(params).encode('utf-8'), digest_size=16)
+    return digest.hexdigest()
+
+
+class MazeCatalog:
+    """
+    Finished grids and their tunnels keyed by catalog_key.
+
+    Entries live in an in-memory LRU bounded by entry count. With a
+    directory set, each entry is also stored as a compressed .npz file
+    (uint8 cells plus tunnel indices) and loaded from there on a memory
+    miss, so the catalogue survives restarts and is shared by workers.
+
+    Returned grids are fresh lists: callers may modify them.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, directory=None):
+        """
+        Initialize catalogue.
+
+        Args:
+            max_entries: In-memory capacity; least recently used entries
+                are dropped beyond it
+            directory: Optional on-disk store directory
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Look up a build.
+
+        Returns:
+            tuple: (grid, tunnel_rows, tunnel_cols), or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        else:
+            entry = self._load(key)
+            if entry is not None:
+                self._store(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        cells, tunnel_rows, tunnel_cols = entry
+        return cells.tolist(), tunnel_rows.tolist(), tunnel_cols.tolist()
+
+    def put(self, key, grid, tunnel_rows, tunnel_cols):
+        """Store a finished build."""
+        entry = (
+            np.asarray(grid, dtype=np.uint8),
+            np.asarray(sorted(tunnel_rows), dtype=np.int32),
+            np.asarray(sorted(tunnel_cols), dtype=np.int32)
+        )
+        self._store(key, entry)
+        self._save(key, entry)
+
+    def stats(self):
+        """Counters for monitoring."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'maxEntries': self.max_entries,
+            'persistent': bool(self.directory)
+        }
+
+    def clear(self):
+        """Drop all in-memory entries (files on disk are kept)."""
+        self._entries.clear()
+
+    def _store(self, key, entry):
+        entries = self._entries
+        entries[key] = entry
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def _load(self, key):
+        """Read an entry from disk, or None if absent or unreadable."""
+        if not self.directory:
+            return None
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path) as data:
+                return data['cells'], data['tunnel_rows'], data['tunnel_cols']
+        except (OSError, ValueError, KeyError):
+            # Truncated or foreign file: rebuild and overwrite
+            return None
+
+    def _save(self, key, entry):
+        """Write an entry to disk atomically (best effort)."""
+        if not self.directory:
+            return
+
+        cells, tunnel_rows, tunnel_cols = entry
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(
+                    f, cells=cells, tunnel_rows=tunnel_rows, tunnel_cols=tunnel_cols
+                )
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # A read-only or full disk only costs the on-disk reuse
+            pass
+
+
+_default_catalog = None
+
+
+def get_catalog():
+    """Process-wide catalogue, on disk when PACMAN_MAZE_CATALOG_DIR is set."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = MazeCatalog(directory=os.environ.get(CATALOG_DIR_ENV) or None)
+    return _default_catalog
+
+
+def configure_catalog(max_entries=DEFAULT_MAX_ENTRIES, directory=None):
+    """Replace the process-wide catalogue."""
+    global _default_catalog
+    _default_catalog = MazeCatalog(max_entries=max_entries, directory=directory)
+    return _default_catalog
@@ -1,5 +1,8 @@
 """Maze format conversion utilities."""
 
+import numpy as np
+
+
 def internal_to_grid(maze, width, height, tunnels_h=None, tunnels_v=None):
     """
     Convert internal maze representation to a visual grid.
@@ -25,38 +28,34 @@ def internal_to_grid(maze, width, height, tunnels_h=None, tunnels_v=None):
     # Grid dimensions: 2*height+1 x 2*width+1
     rows = 2 * height + 1
     cols = 2 * width + 1
-    grid = [[1 for _ in range(cols)] for _ in range(rows)]
+    grid = np.ones((rows, cols), dtype=np.uint8)
     
     # Mark cells as paths
-    for y in range(height):
-        for x in range(width):
-            cell_row = 2 * y + 1
-            cell_col = 2 * x + 1
-            grid[cell_row][cell_col] = 0
-            
-            # Check horizontal walls
-            if x < width - 1 and maze[2 * y][x] is False:
-                grid[cell_row][cell_col + 1] = 0
-            
-            # Check vertical walls
-            if y < height - 1 and maze[2 * y + 1][x] is False:
-                grid[cell_row + 1][cell_col] = 0
+    grid[1::2, 1::2] = 0
+    
+    # Horizontal walls (between (y, x) and (y, x+1)) sit at even maze rows
+    h_walls = np.array([row for row in maze[0::2]], dtype=bool).reshape(height, width - 1)
+    grid[1::2, 2:-1:2] = h_walls
+    
+    # Vertical walls (between (y, x) and (y+1, x)) sit at odd maze rows
+    v_walls = np.array([row for row in maze[1::2]], dtype=bool).reshape(height - 1, width)
+    grid[2:-1:2, 1::2] = v_walls
     
     # Apply horizontal tunnels (open left and right borders)
     for y in tunnels_h:
         if 0 <= y < height:
             row = 2 * y + 1
-            grid[row][0] = 0  # Left border
-            grid[row][cols - 1] = 0  # Right border
+            grid[row, 0] = 0  # Left border
+            grid[row, cols - 1] = 0  # Right border
     
     # Apply vertical tunnels (open top and bottom borders)
     for x in tunnels_v:
         if 0 <= x < width:
             col = 2 * x + 1
-            grid[0][col] = 0  # Top border
-            grid[rows - 1][col] = 0  # Bottom border
+            grid[0, col] = 0  # Top border
+            grid[rows - 1, col] = 0  # Bottom border
     
-    return grid
+    return grid.tolist()
 
 
 def grid_to_playable(grid):
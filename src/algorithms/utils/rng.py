@@ -0,0 +1,59 @@
+"""Random number generator plumbing for reproducible runs."""
+
+import numbers
+import random
+import re
+
+
+class GlobalRandom:
+    """
+    Generator drawing from the random module's shared stream.
+
+    Every method call goes to the random.* module function of the same
+    name, so random.seed() keeps seeding it.
+    """
+
+    def __getattr__(self, name):
+        return getattr(random, name)
+
+
+GLOBAL_RANDOM = GlobalRandom()
+
+
+def make_rng(seed=None):
+    """
+    Resolve a seed argument into a generator.
+
+    Args:
+        seed: None for the shared module-level stream (so random.seed()
+            keeps working), an existing random.Random to share one stream
+            between components, or any hashable seed value (int, str, ...)
+            for a fresh independent generator
+
+    Returns:
+        random.Random or GlobalRandom: Generator to draw from
+    """
+    if seed is None:
+        return GLOBAL_RANDOM
+    if isinstance(seed, (random.Random, GlobalRandom)):
+        return seed
+    return random.Random(seed)
+
+
+def normalize_seed(seed):
+    """
+    The integer a seed parameter names, or None for no seed.
+
+    Builds are seeded and catalogued by this value, so '42' and 42 are
+    the same seed rather than Random('42') and Random(42).
+
+    Raises:
+        ValueError: A seed that is not an integer or integer string
+    """
+    if seed is None:
+        return None
+    if isinstance(seed, numbers.Integral) and not isinstance(seed, bool):
+        return int(seed)
+    if isinstance(seed, str) and re.fullmatch(r'\s*[-+]?\d+\s*', seed):
+        return int(seed)
+    raise ValueError(f'Seed must be an integer: {seed!r}')
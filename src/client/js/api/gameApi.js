@@ -103,7 +103,17 @@ const GameAPI = {
       throw new Error('Failed to fetch replay frames');
     }
 
-    return await response.json();
+    const data = await response.json();
+
+    // Simulations stored in the compact format are expanded here. Mongoose
+    // gives every simulation a compactFrames object (its arrays default to
+    // []), so only one with a format holds encoded frames
+    const compact = data.compactFrames;
+    if (compact && compact.format && (!data.frames || data.frames.length === 0)) {
+      data.frames = FrameCodec.decode(compact);
+    }
+
+    return data;
   },
 
   async deleteSimulation(id) {
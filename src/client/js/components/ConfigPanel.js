@@ -13,13 +13,13 @@ class ConfigPanel {
           </div>
           
           <div class="form-group">
-            <label for="width">Width (3-50)</label>
-            <input type="number" id="width" class="form-control" value="24" min="3" max="50" required>
+            <label for="width">Width (3-500)</label>
+            <input type="number" id="width" class="form-control" value="24" min="3" max="500" required>
           </div>
           
           <div class="form-group">
-            <label for="height">Height (3-50)</label>
-            <input type="number" id="height" class="form-control" value="15" min="3" max="50" required>
+            <label for="height">Height (3-500)</label>
+            <input type="number" id="height" class="form-control" value="15" min="3" max="500" required>
           </div>
         </div>
 
@@ -123,6 +123,9 @@ class ConfigPanel {
           <select class="form-control ghost-algorithm">
             <option value="astar">A* (Optimal)</option>
             <option value="bfs">BFS (Simple)</option>
+            <option value="incremental">Incremental A* (Reuses searches)</option>
+            <option value="bidirectional">Bidirectional BFS (Long range)</option>
+            <option value="jps">Jump Point Search (Skips corridors)</option>
           </select>
         </div>
         
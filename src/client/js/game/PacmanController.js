@@ -39,6 +39,22 @@ class PacmanController {
         break;
     }
 
+    // Tunnels: leaving through a border opening re-enters on the far side
+    // when that side is open too (same rows/columns the pathfinders wrap)
+    const rows = this.grid.length;
+    const cols = this.grid[0].length;
+    if (newPos.x < 0 || newPos.x >= cols) {
+      const wrappedX = (newPos.x + cols) % cols;
+      if (this.grid[newPos.y][wrappedX] !== 1) {
+        newPos.x = wrappedX;
+      }
+    } else if (newPos.y < 0 || newPos.y >= rows) {
+      const wrappedY = (newPos.y + rows) % rows;
+      if (this.grid[wrappedY][newPos.x] !== 1) {
+        newPos.y = wrappedY;
+      }
+    }
+
     return newPos;
   }
 
@@ -35,7 +35,10 @@ const Formatters = {
       'strategic': 'Strategic Placement',
       'classic': 'Classic Pac-Man',
       'astar': 'A* Pathfinding',
-      'bfs': 'Breadth-First Search'
+      'bfs': 'Breadth-First Search',
+      'incremental': 'Incremental A*',
+      'bidirectional': 'Bidirectional BFS',
+      'jps': 'Jump Point Search'
     };
 
     return names[algorithm] || algorithm;
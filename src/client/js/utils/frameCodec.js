@@ -0,0 +1,87 @@
+/**
+ * Decoder for compact simulation frames ('delta-rle-v1')
+ * Mirrors src/algorithms/simulation/frame_codec.py
+ */
+
+const FrameCodec = {
+  FORMAT: 'delta-rle-v1',
+
+  /**
+   * Decode a base64 delta/RLE stream into `count` tuples of `width` values
+   *
+   * Layout: first tuple, then (delta tuple, run length) repeated
+   */
+  decodeRuns(data, width, bytesPerValue, count) {
+    if (count === 0) {
+      return [];
+    }
+
+    const binary = atob(data);
+    const view = new DataView(new ArrayBuffer(binary.length));
+    for (let i = 0; i < binary.length; i++) {
+      view.setUint8(i, binary.charCodeAt(i));
+    }
+
+    const read = (index) => bytesPerValue === 2
+      ? view.getInt16(index * 2, true)
+      : view.getInt32(index * 4, true);
+    const length = binary.length / bytesPerValue;
+
+    let current = [];
+    for (let i = 0; i < width; i++) {
+      current.push(read(i));
+    }
+    const tuples = [current];
+
+    for (let index = width; index < length; index += width + 1) {
+      const run = read(index + width);
+      for (let step = 0; step < run; step++) {
+        current = current.map((value, i) => value + read(index + i));
+        tuples.push(current);
+      }
+    }
+
+    return tuples;
+  },
+
+  /**
+   * Expand compact frames into the regular frame objects
+   * ({ timestamp, pacman, ghosts, caught })
+   */
+  decode(compact) {
+    if (compact.format !== this.FORMAT) {
+      throw new Error(`Unsupported frame format: ${compact.format}`);
+    }
+
+    const count = compact.frameCount;
+    const timestamps = this.decodeRuns(compact.timestamps, 1, 4, count);
+    const entities = compact.entities.map(entity => ({
+      type: entity.type,
+      positions: this.decodeRuns(entity.positions, 2, 2, count)
+    }));
+    const [pacman, ...ghosts] = entities;
+
+    // caughtFrames lists every catch of runs with several; Mongo stores it
+    // as [] otherwise
+    const caughtFrames = new Set(
+      compact.caughtFrames && compact.caughtFrames.length > 0
+        ? compact.caughtFrames
+        : [compact.caughtFrame]
+    );
+
+    const frames = [];
+    for (let i = 0; i < count; i++) {
+      frames.push({
+        timestamp: timestamps[i][0],
+        pacman: { y: pacman.positions[i][0], x: pacman.positions[i][1] },
+        ghosts: ghosts.map(ghost => ({
+          type: ghost.type,
+          position: { y: ghost.positions[i][0], x: ghost.positions[i][1] }
+        })),
+        caught: caughtFrames.has(i)
+      });
+    }
+
+    return frames;
+  }
+};
@@ -10,12 +10,12 @@ const Validators = {
       errors.push('Maze name is required');
     }
 
-    if (!config.width || config.width < 3 || config.width > 50) {
-      errors.push('Width must be between 3 and 50');
+    if (!config.width || config.width < 3 || config.width > 500) {
+      errors.push('Width must be between 3 and 500');
     }
 
-    if (!config.height || config.height < 3 || config.height > 50) {
-      errors.push('Height must be between 3 and 50');
+    if (!config.height || config.height < 3 || config.height > 500) {
+      errors.push('Height must be between 3 and 500');
     }
 
     if (config.imperfection < 0 || config.imperfection > 100) {
@@ -4,11 +4,22 @@
 
 require('dotenv').config();
 
+const path = require('path');
+
 module.exports = {
   NODE_ENV: process.env.NODE_ENV || 'development',
   PORT: process.env.PORT || 3000,
   MONGODB_URI: process.env.MONGODB_URI || 'mongodb://localhost:27017/pacman-lab',
   PYTHON_PATH: process.env.PYTHON_PATH || 'python3',
+  // Persistent Python workers (0 = spawn a process per request)
+  PYTHON_WORKERS: parseInt(process.env.PYTHON_WORKERS || '2', 10),
+  // Processes per simulation sweep (0 = all cores)
+  SWEEP_WORKERS: parseInt(process.env.SWEEP_WORKERS || '1', 10),
+  // Seeded builds kept in memory by the bridge (0 = disabled)
+  MAZE_CATALOG_SIZE: parseInt(process.env.MAZE_CATALOG_SIZE || '256', 10),
+  // Recorded trajectories as .ptrj files, read by simulations
+  TRAJECTORY_DIR: process.env.TRAJECTORY_DIR ||
+    path.join(__dirname, '..', '..', '..', 'data', 'trajectories'),
   CORS_ORIGIN: process.env.CORS_ORIGIN || '*'
 };
 
@@ -5,6 +5,9 @@
 
 const SimulationBatch = require('../models/SimulationBatch');
 const Simulation = require('../models/Simulation');
+const Trajectory = require('../models/Trajectory');
+const Maze = require('../models/Maze');
+const pythonBridge = require('../services/pythonBridge');
 const mongoose = require('mongoose');
 
 /**
@@ -136,6 +139,103 @@ exports.addSimulationsToBatch = async (req, res) => {
   }
 };
 
+/**
+ * Run a parameter sweep into a batch: every trajectory against every
+ * ghost configuration set, in a single Python call
+ * POST /api/batches/:id/sweep
+ */
+exports.runSweep = async (req, res) => {
+  try {
+    const { mazeId, trajectoryIds, ghostConfigSets, namePrefix = 'Sweep', stopPolicy } = req.body;
+
+    if (!mazeId || !Array.isArray(trajectoryIds) || trajectoryIds.length === 0 ||
+        !Array.isArray(ghostConfigSets) || ghostConfigSets.length === 0) {
+      return res.status(400).json({
+        error: 'Missing required fields: mazeId, trajectoryIds (array), ghostConfigSets (array)'
+      });
+    }
+
+    const batch = await SimulationBatch.findById(req.params.id);
+    if (!batch) {
+      return res.status(404).json({ error: 'Batch not found' });
+    }
+
+    const maze = await Maze.findById(mazeId);
+    if (!maze) {
+      return res.status(404).json({ error: 'Maze not found' });
+    }
+
+    const invalidIds = trajectoryIds.filter(id => !mongoose.Types.ObjectId.isValid(id));
+    if (invalidIds.length > 0) {
+      return res.status(400).json({ error: 'Invalid trajectory IDs', invalidIds });
+    }
+
+    // $in skips unknown IDs and returns documents in storage order, so
+    // match them back up: runs refer to trajectories by request index
+    const trajectoryKeys = trajectoryIds.map(id => new mongoose.Types.ObjectId(id).toString());
+    const found = new Map(
+      (await Trajectory.find({ _id: { $in: trajectoryKeys } }))
+        .map(trajectory => [trajectory._id.toString(), trajectory])
+    );
+    const missingIds = trajectoryIds.filter((id, i) => !found.has(trajectoryKeys[i]));
+    if (missingIds.length > 0) {
+      return res.status(404).json({ error: 'Trajectories not found', missingIds });
+    }
+    const trajectories = trajectoryKeys.map(key => found.get(key));
+
+    const sweep = await pythonBridge.simulateBatch(
+      maze.grid,
+      trajectories.map(trajectory => trajectory.moves),
+      ghostConfigSets,
+      false,
+      { stopPolicy }
+    );
+
+    const simulations = await Simulation.insertMany(sweep.runs.map(run => {
+      const trajectory = trajectories[run.trajectoryIndex];
+      const ghostConfigs = ghostConfigSets[run.configIndex];
+
+      return {
+        name: `${namePrefix} ${trajectory.name} #${run.configIndex + 1}`,
+        trajectoryId: trajectory._id,
+        mazeId: maze._id,
+        ghostConfigs: ghostConfigs.map(config => ({
+          ghostType: config.type || config.ghostType,
+          algorithm: config.algorithm || 'astar',
+          startPosition: config.startPos || config.startPosition
+        })),
+        results: {
+          caught: run.caught,
+          catchPosition: run.catchPosition,
+          catchTime: run.catchTime,
+          totalFrames: run.totalFrames,
+          catchCount: run.catchCount,
+          catchTimes: run.catchTimes,
+          pelletsEaten: run.pelletsEaten,
+          pelletsTotal: run.pelletsTotal,
+          stopReason: run.stopReason
+        }
+      };
+    }));
+
+    batch.simulations.push(...simulations.map(sim => sim._id));
+    batch.updatedAt = new Date();
+    await batch.save();
+
+    // Recalculate statistics
+    await exports.recalculateBatchStats(batch._id);
+
+    const updatedBatch = await SimulationBatch.findById(batch._id);
+    res.status(201).json({
+      message: `Sweep completed: ${simulations.length} simulations added`,
+      batch: updatedBatch
+    });
+  } catch (error) {
+    console.error('Error running sweep:', error);
+    res.status(500).json({ error: 'Failed to run sweep', details: error.message });
+  }
+};
+
 /**
  * Remove simulation from batch
  * DELETE /api/batches/:id/simulations/:simulationId
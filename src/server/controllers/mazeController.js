@@ -5,6 +5,7 @@
 
 const Maze = require('../models/Maze');
 const pythonBridge = require('../services/pythonBridge');
+const MazeCatalog = require('../services/mazeCatalog');
 const mongoose = require('mongoose');
 
 // In-memory storage for demo mode
@@ -39,19 +40,31 @@ exports.generateMaze = async (req, res) => {
       });
     }
 
-    // Generate maze using Python
-    const mazeResult = await pythonBridge.generateMaze(
-      width, height, algorithm, imperfection, tunnelsH, tunnelsV, symmetric
-    );
-
-    let grid = mazeResult.grid;
+    // Check the size before building a maze that could not be saved
+    const validSide = side => Number.isInteger(Number(side)) &&
+      side >= Maze.MIN_DIMENSION && side <= Maze.MAX_DIMENSION;
+    if (!validSide(width) || !validSide(height)) {
+      return res.status(400).json({
+        error: `Width and height must be integers from ${Maze.MIN_DIMENSION} to ${Maze.MAX_DIMENSION}`
+      });
+    }
 
-    // Place pellets if requested
-    if (hasPellets && pelletAlgorithm) {
-      const pelletResult = await pythonBridge.placePellets(grid, pelletAlgorithm);
-      grid = pelletResult.grid;
+    let seed;
+    try {
+      seed = MazeCatalog.normalizeSeed(req.body.seed);
+    } catch (error) {
+      return res.status(400).json({ error: error.message });
     }
 
+    // Generate maze (and place pellets if requested) in one Python call
+    const mazeResult = await pythonBridge.buildMaze(
+      width, height, algorithm, imperfection, tunnelsH, tunnelsV, symmetric,
+      hasPellets && pelletAlgorithm ? pelletAlgorithm : null,
+      { seed }
+    );
+
+    const grid = mazeResult.grid;
+
     // Check if MongoDB is connected
     if (mongoose.connection.readyState !== 1) {
       // Demo mode - use in-memory storage
@@ -66,6 +79,7 @@ exports.generateMaze = async (req, res) => {
           symmetric,
           hasPellets,
           pelletAlgorithm: hasPellets ? pelletAlgorithm : null,
+          seed,
           tunnels: {
             horizontal: tunnelsH,
             vertical: tunnelsV
@@ -97,6 +111,7 @@ exports.generateMaze = async (req, res) => {
         symmetric,
         hasPellets,
         pelletAlgorithm: hasPellets ? pelletAlgorithm : null,
+        seed,
         tunnels: {
           horizontal: tunnelsH,
           vertical: tunnelsV
@@ -120,6 +135,23 @@ exports.generateMaze = async (req, res) => {
   }
 };
 
+/**
+ * Get maze catalogue hit/miss counters
+ * GET /api/mazes/catalog/stats
+ */
+exports.getCatalogStats = async (req, res) => {
+  try {
+    const stats = await pythonBridge.catalogStats();
+    res.json(stats);
+  } catch (error) {
+    console.error('Error fetching catalog stats:', error);
+    res.status(500).json({
+      error: 'Failed to fetch catalog stats',
+      details: error.message
+    });
+  }
+};
+
 /**
  * Get all mazes
  * GET /api/mazes
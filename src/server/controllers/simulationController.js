@@ -7,6 +7,8 @@ const Simulation = require('../models/Simulation');
 const Trajectory = require('../models/Trajectory');
 const Maze = require('../models/Maze');
 const pythonBridge = require('../services/pythonBridge');
+const trajectoryStore = require('../services/trajectoryStore');
+const { FrameEncoder } = require('../services/frameEncoder');
 const fs = require('fs').promises;
 const path = require('path');
 const os = require('os');
@@ -126,27 +128,49 @@ exports.runSimulation = async (req, res) => {
     }
 
     // Otherwise, run Python simulation
-    // Create temporary files for Python simulation
+    // The trajectory is read from its stored .ptrj file; the grid goes
+    // through a temporary file
     const tempDir = os.tmpdir();
-    const trajectoryFile = path.join(tempDir, `trajectory-${Date.now()}.json`);
     const gridFile = path.join(tempDir, `grid-${Date.now()}.json`);
 
     try {
-      // Write trajectory and grid to temp files
-      await fs.writeFile(trajectoryFile, JSON.stringify({
-        moves: trajectory.moves
-      }));
+      const trajectoryFile = await trajectoryStore.ensure(trajectory._id, trajectory.moves);
       
       await fs.writeFile(gridFile, JSON.stringify({
         grid: maze.grid
       }));
 
-      // Run simulation via Python
-      const simulationResult = await pythonBridge.simulateGame(
-        trajectoryFile,
-        gridFile,
-        ghostConfigs
-      );
+      // Search counters per ghost, stored with the results when requested
+      const profile = Boolean(req.body.profile);
+      // When the run ends, e.g. 'catches:3' or 'pellets' (default: first catch)
+      const stopPolicy = req.body.stopPolicy;
+
+      let results;
+      if (req.body.compactFrames) {
+        // Frames come back delta/RLE encoded and are stored that way
+        const { success, ...compactResults } = await pythonBridge.simulateGame(
+          trajectoryFile,
+          gridFile,
+          ghostConfigs,
+          { compactFrames: true, profile, stopPolicy }
+        );
+        results = compactResults;
+      } else {
+        // Run simulation via Python, encoding frames as they stream in:
+        // only their runs are kept, however long the trajectory
+        const encoder = new FrameEncoder();
+        const summary = await pythonBridge.simulateGameStream(
+          trajectoryFile,
+          gridFile,
+          ghostConfigs,
+          frame => encoder.push(frame),
+          { profile, stopPolicy }
+        );
+        // Stream markers, not results
+        delete summary.done;
+        delete summary.success;
+        results = { ...summary, compactFrames: encoder.finish() };
+      }
 
       // Save simulation to database
       const simulation = new Simulation({
@@ -154,13 +178,12 @@ exports.runSimulation = async (req, res) => {
         trajectoryId,
         mazeId: maze._id,
         ghostConfigs,
-        results: simulationResult
+        results
       });
 
       await simulation.save();
 
       // Clean up temp files
-      await fs.unlink(trajectoryFile).catch(() => {});
       await fs.unlink(gridFile).catch(() => {});
 
       res.status(201).json({
@@ -169,7 +192,6 @@ exports.runSimulation = async (req, res) => {
       });
     } catch (error) {
       // Clean up temp files on error
-      await fs.unlink(trajectoryFile).catch(() => {});
       await fs.unlink(gridFile).catch(() => {});
       throw error;
     }
@@ -214,7 +236,7 @@ exports.getAllSimulations = async (req, res) => {
     const simulations = await Simulation.find(filter)
       .populate('trajectoryId', 'name duration')
       .populate('mazeId', 'name config')
-      .select('-results.frames') // Exclude heavy frame data in list view
+      .select('-results.frames -results.compactFrames') // Exclude heavy frame data in list view
       .sort({ createdAt: -1 })
       .skip(skip)
       .limit(parseInt(limit));
@@ -264,7 +286,7 @@ exports.getSimulationById = async (req, res) => {
 
     // Optionally exclude heavy frame data
     if (includeFrames === 'false') {
-      query = query.select('-results.frames');
+      query = query.select('-results.frames -results.compactFrames');
     }
 
     const simulation = await query;
@@ -294,7 +316,7 @@ exports.getReplayFrames = async (req, res) => {
     const { id } = req.params;
 
     const simulation = await Simulation.findById(id)
-      .select('results.frames');
+      .select('results.frames results.compactFrames');
 
     if (!simulation) {
       return res.status(404).json({
@@ -302,8 +324,11 @@ exports.getReplayFrames = async (req, res) => {
       });
     }
 
+    // Unencoded simulations still get an empty compactFrames subdocument
+    const compactFrames = simulation.results.compactFrames;
     res.json({
-      frames: simulation.results.frames
+      frames: simulation.results.frames,
+      compactFrames: compactFrames && compactFrames.format ? compactFrames : null
     });
   } catch (error) {
     console.error('Error fetching replay frames:', error);
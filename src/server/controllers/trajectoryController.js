@@ -5,6 +5,7 @@
 
 const Trajectory = require('../models/Trajectory');
 const Maze = require('../models/Maze');
+const trajectoryStore = require('../services/trajectoryStore');
 const mongoose = require('mongoose');
 
 // In-memory storage for demo mode
@@ -79,6 +80,11 @@ exports.saveTrajectory = async (req, res) => {
 
     await trajectory.save();
 
+    // Columnar copy read by simulations; written again on demand if this fails
+    await trajectoryStore.save(trajectory._id, moves).catch(error => {
+      console.warn('Could not store trajectory file:', error.message);
+    });
+
     res.status(201).json({
       message: 'Trajectory saved successfully',
       trajectory
@@ -208,6 +214,10 @@ exports.deleteTrajectory = async (req, res) => {
       });
     }
 
+    await trajectoryStore.remove(id).catch(error => {
+      console.warn('Could not delete trajectory file:', error.message);
+    });
+
     res.json({
       message: 'Trajectory deleted successfully'
     });
@@ -8,6 +8,7 @@ const path = require('path');
 const config = require('./config/env');
 const connectDatabase = require('./config/database');
 const errorHandler = require('./middleware/errorHandler');
+const pythonBridge = require('./services/pythonBridge');
 
 // Import routes
 const mazeRoutes = require('./routes/mazeRoutes');
@@ -63,11 +64,13 @@ app.listen(PORT, () => {
 // Graceful shutdown
 process.on('SIGTERM', () => {
   console.log('SIGTERM received, shutting down gracefully...');
+  pythonBridge.shutdown();
   process.exit(0);
 });
 
 process.on('SIGINT', () => {
   console.log('SIGINT received, shutting down gracefully...');
+  pythonBridge.shutdown();
   process.exit(0);
 });
 
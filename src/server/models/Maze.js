@@ -4,6 +4,12 @@
 
 const mongoose = require('mongoose');
 
+// Largest width/height that can be stored: the (2n+1)-square grid must fit
+// in one 16 MB MongoDB document (500 gives about 12 MB, even as doubles).
+// The generators go up to 1000, for mazes that are not saved.
+const MIN_DIMENSION = 3;
+const MAX_DIMENSION = 500;
+
 const mazeSchema = new mongoose.Schema({
   name: {
     type: String,
@@ -14,14 +20,14 @@ const mazeSchema = new mongoose.Schema({
     width: {
       type: Number,
       required: true,
-      min: 3,
-      max: 50
+      min: MIN_DIMENSION,
+      max: MAX_DIMENSION
     },
     height: {
       type: Number,
       required: true,
-      min: 3,
-      max: 50
+      min: MIN_DIMENSION,
+      max: MAX_DIMENSION
     },
     algorithm: {
       type: String,
@@ -43,6 +49,10 @@ const mazeSchema = new mongoose.Schema({
       enum: ['random', 'strategic', 'classic', null],
       default: null
     },
+    seed: {
+      type: Number,
+      default: null
+    },
     tunnels: {
       horizontal: {
         type: Number,
@@ -88,5 +98,9 @@ mazeSchema.index({ 'rating.user': -1 });
 mazeSchema.index({ createdAt: -1 });
 mazeSchema.index({ name: 1 });
 
-module.exports = mongoose.model('Maze', mazeSchema);
+const Maze = mongoose.model('Maze', mazeSchema);
+Maze.MIN_DIMENSION = MIN_DIMENSION;
+Maze.MAX_DIMENSION = MAX_DIMENSION;
+
+module.exports = Maze;
 
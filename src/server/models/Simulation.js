@@ -28,7 +28,7 @@ const simulationSchema = new mongoose.Schema({
     },
     algorithm: {
       type: String,
-      enum: ['astar', 'bfs'],
+      enum: ['astar', 'bfs', 'incremental', 'bidirectional', 'jps'],
       default: 'astar'
     },
     startPosition: {
@@ -47,6 +47,12 @@ const simulationSchema = new mongoose.Schema({
     },
     catchTime: Number,
     totalFrames: Number,
+    // Early-exit counters when run with a stop policy (see simulation/stop_policy.py)
+    catchCount: Number,
+    catchTimes: [Number],
+    pelletsEaten: Number,
+    pelletsTotal: Number,
+    stopReason: String,
     frames: [{
       timestamp: Number,
       pacman: {
@@ -61,7 +67,21 @@ const simulationSchema = new mongoose.Schema({
         }
       }],
       caught: Boolean
-    }]
+    }],
+    // Delta/RLE encoded alternative to frames (see simulation/frame_codec.py)
+    compactFrames: {
+      format: String,
+      frameCount: Number,
+      timestamps: String,
+      caughtFrame: Number,
+      caughtFrames: [Number],
+      entities: [{
+        type: { type: String },
+        positions: String
+      }]
+    },
+    // Search counters when run with profile (see GameEngine.search_profile)
+    profile: mongoose.Schema.Types.Mixed
   }
 }, {
   timestamps: true
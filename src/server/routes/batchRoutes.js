@@ -15,6 +15,7 @@ router.delete('/:id', batchController.deleteBatch);
 
 // Batch simulation management
 router.post('/:id/add-simulations', batchController.addSimulationsToBatch);
+router.post('/:id/sweep', batchController.runSweep);
 router.delete('/:id/simulations/:simulationId', batchController.removeSimulationFromBatch);
 router.post('/:id/clear', batchController.clearBatch);
 
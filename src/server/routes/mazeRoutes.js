@@ -12,6 +12,9 @@ router.post('/', mazeController.generateMaze);
 // Get all mazes
 router.get('/', mazeController.getAllMazes);
 
+// Maze catalogue hit/miss counters
+router.get('/catalog/stats', mazeController.getCatalogStats);
+
 // Get single maze
 router.get('/:id', mazeController.getMazeById);
 
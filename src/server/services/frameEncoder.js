@@ -0,0 +1,135 @@
+/**
+ * Frame Encoder
+ * Incremental encoder of compact simulation frames ('delta-rle-v1'), so a
+ * streamed simulation is stored without holding all of its frames
+ * Mirrors encode_frames in src/algorithms/simulation/frame_codec.py
+ */
+
+const FORMAT = 'delta-rle-v1';
+
+// Longest run a single int16 count can hold
+const MAX_RUN = 32767;
+
+const LIMITS = {
+  2: [-32768, 32767],
+  4: [-2147483648, 2147483647]
+};
+
+/**
+ * Delta/run-length encoder of one stream of equally sized integer tuples
+ *
+ * Layout: the first tuple, then (delta tuple, run length) for each run of
+ * identical consecutive deltas. Only the runs are kept, not the tuples.
+ */
+class RunEncoder {
+  constructor(width, bytesPerValue) {
+    this.width = width;
+    this.bytesPerValue = bytesPerValue;
+    this.values = [];
+    this.previous = null;
+    this.delta = null;
+    this.run = 0;
+  }
+
+  push(tuple) {
+    if (this.previous === null) {
+      this.values.push(...tuple);
+    } else {
+      const delta = tuple.map((value, i) => value - this.previous[i]);
+      const sameDelta = this.delta !== null &&
+        this.run < MAX_RUN &&
+        delta.every((value, i) => value === this.delta[i]);
+
+      if (sameDelta) {
+        this.run++;
+      } else {
+        this.flushRun();
+        this.delta = delta;
+        this.run = 1;
+      }
+    }
+    this.previous = tuple;
+  }
+
+  flushRun() {
+    if (this.run > 0) {
+      this.values.push(...this.delta, this.run);
+    }
+  }
+
+  /**
+   * Base64 of the encoded stream ('' when nothing was pushed)
+   */
+  finish() {
+    this.flushRun();
+    this.run = 0;
+
+    const [min, max] = LIMITS[this.bytesPerValue];
+    const buffer = Buffer.alloc(this.values.length * this.bytesPerValue);
+    this.values.forEach((value, i) => {
+      if (!Number.isInteger(value) || value < min || value > max) {
+        throw new Error(`Values do not fit in int${this.bytesPerValue * 8}`);
+      }
+      if (this.bytesPerValue === 2) {
+        buffer.writeInt16LE(value, i * 2);
+      } else {
+        buffer.writeInt32LE(value, i * 4);
+      }
+    });
+
+    return buffer.toString('base64');
+  }
+}
+
+class FrameEncoder {
+  constructor() {
+    this.frameCount = 0;
+    this.timestamps = new RunEncoder(1, 4);
+    this.entities = null;
+    this.caughtFrames = [];
+  }
+
+  /**
+   * Add the next frame ({ timestamp, pacman, ghosts, caught })
+   */
+  push(frame) {
+    if (this.entities === null) {
+      this.entities = [
+        { type: 'pacman', encoder: new RunEncoder(2, 2) },
+        ...frame.ghosts.map(ghost => ({ type: ghost.type, encoder: new RunEncoder(2, 2) }))
+      ];
+    }
+
+    this.timestamps.push([frame.timestamp]);
+    this.entities[0].encoder.push([frame.pacman.y, frame.pacman.x]);
+    frame.ghosts.forEach((ghost, i) => {
+      this.entities[i + 1].encoder.push([ghost.position.y, ghost.position.x]);
+    });
+
+    if (frame.caught) {
+      this.caughtFrames.push(this.frameCount);
+    }
+    this.frameCount++;
+  }
+
+  /**
+   * The compact frames, as encode_frames returns them
+   */
+  finish() {
+    const entities = this.entities || [{ type: 'pacman', encoder: new RunEncoder(2, 2) }];
+    const compact = {
+      format: FORMAT,
+      frameCount: this.frameCount,
+      timestamps: this.timestamps.finish(),
+      caughtFrame: this.caughtFrames.length > 0 ? this.caughtFrames[0] : -1,
+      entities: entities.map(({ type, encoder }) => ({ type, positions: encoder.finish() }))
+    };
+
+    if (this.caughtFrames.length > 1) {
+      compact.caughtFrames = this.caughtFrames;
+    }
+    return compact;
+  }
+}
+
+module.exports = { FrameEncoder, FORMAT };
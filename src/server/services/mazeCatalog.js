@@ -0,0 +1,111 @@
+/**
+ * Maze Catalogue
+ * In-memory LRU of finished seeded builds, so repeated presets skip Python
+ * Mirrors src/algorithms/utils/maze_catalog.py (which also persists to disk)
+ */
+
+// Part of every key, as CATALOG_VERSION in maze_catalog.py: bump both when
+// a generator or pellet placer changes its output for a seed
+const CATALOG_VERSION = 1;
+
+class MazeCatalog {
+  constructor(maxEntries = 256) {
+    this.maxEntries = maxEntries;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  /**
+   * The integer a seed parameter names, or null for no seed
+   *
+   * Builds are seeded and keyed by this value, so '42' and 42 are the same
+   * seed (as normalize_seed in utils/rng.py)
+   *
+   * @throws {Error} A seed that is not an integer or integer string
+   */
+  static normalizeSeed(seed) {
+    if (seed === undefined || seed === null) {
+      return null;
+    }
+
+    const value = typeof seed === 'string' && /^\s*[-+]?\d+\s*$/.test(seed) ? Number(seed) : seed;
+    if (!Number.isSafeInteger(value)) {
+      throw new Error(`Seed must be an integer: ${JSON.stringify(seed)}`);
+    }
+    return value;
+  }
+
+  /**
+   * Canonical key of a build request, or null when it is not cacheable
+   *
+   * Only seeded builds are deterministic. The seed is keyed by
+   * normalizeSeed. Imperfection is normalised like the Python side (30 and
+   * 0.3 are the same level) and pellet tuning only counts for the placer
+   * that uses it.
+   */
+  static key({ width, height, algorithm, imperfection, tunnelsH, tunnelsV, symmetric, seed, pelletAlgorithm, options = {} }) {
+    seed = MazeCatalog.normalizeSeed(seed);
+    if (seed === null) {
+      return null;
+    }
+
+    let level = Number(imperfection);
+    if (level > 1) {
+      level /= 100;
+    }
+
+    const tuning = {
+      random: [options.density],
+      strategic: [options.corridorDensity, options.junctionDensity]
+    }[pelletAlgorithm] || [];
+
+    return JSON.stringify([
+      CATALOG_VERSION, Number(width), Number(height), String(algorithm).toLowerCase(),
+      Math.round(level * 1e6) / 1e6, Number(tunnelsH), Number(tunnelsV),
+      Boolean(symmetric), seed, pelletAlgorithm || null,
+      tuning.map(value => (value === undefined || value === null ? null : Number(value)))
+    ]);
+  }
+
+  /**
+   * Look up a build; returns a copy the caller may modify, or null
+   */
+  get(key) {
+    if (!this.entries.has(key)) {
+      this.misses++;
+      return null;
+    }
+
+    // Re-insert to mark as most recently used
+    const entry = this.entries.get(key);
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return structuredClone(entry);
+  }
+
+  set(key, result) {
+    this.entries.delete(key);
+    this.entries.set(key, structuredClone(result));
+
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  stats() {
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      entries: this.entries.size,
+      maxEntries: this.maxEntries
+    };
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+}
+
+module.exports = MazeCatalog;
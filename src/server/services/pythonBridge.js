@@ -4,21 +4,83 @@
  */
 
 const { spawn } = require('child_process');
+const readline = require('readline');
 const path = require('path');
 const fs = require('fs');
 const config = require('../config/env');
+const PythonWorkerPool = require('./pythonWorkerPool');
+const MazeCatalog = require('./mazeCatalog');
 
 class PythonBridge {
   constructor() {
     this.pythonPath = config.PYTHON_PATH;
     this.algorithmPath = path.join(__dirname, '..', '..', 'algorithms');
     this.timeout = 30000; // 30 seconds
+    this.poolSize = config.PYTHON_WORKERS;
+    this.pool = null;
+    this.catalog = config.MAZE_CATALOG_SIZE > 0 ? new MazeCatalog(config.MAZE_CATALOG_SIZE) : null;
+  }
+
+  /**
+   * Lazily start the persistent worker pool (null when disabled)
+   */
+  getPool() {
+    if (this.poolSize <= 0) {
+      return null;
+    }
+
+    if (!this.pool) {
+      this.pool = new PythonWorkerPool({
+        pythonPath: this.pythonPath,
+        scriptPath: path.join(this.algorithmPath, 'main.py'),
+        size: this.poolSize,
+        timeout: this.timeout
+      });
+      this.pool.start();
+    }
+
+    return this.pool;
+  }
+
+  /**
+   * Run a main.py command, preferring a warm worker over a fresh process
+   *
+   * @param {string} command - main.py subcommand
+   * @param {Object} params - Worker params keyed by argument dest
+   * @param {string[]} args - Equivalent CLI arguments for spawn mode
+   * @param {string|null} input - stdin payload for spawn mode
+   */
+  async execute(command, params, args, input = null) {
+    const pool = this.getPool();
+    const result = pool
+      ? await pool.execute(command, params)
+      : await this.executeScript('main.py', args, input);
+
+    if (result.error) {
+      throw new Error(result.error);
+    }
+
+    return result;
+  }
+
+  /**
+   * Stop persistent workers
+   */
+  shutdown() {
+    if (this.pool) {
+      this.pool.shutdown();
+      this.pool = null;
+    }
   }
 
   /**
    * Execute Python script with arguments
+   *
+   * @param {string} scriptPath - Script path relative to the algorithms directory
+   * @param {string[]} args - Command-line arguments
+   * @param {string|null} input - Optional data written to the script's stdin
    */
-  async executeScript(scriptPath, args = []) {
+  async executeScript(scriptPath, args = [], input = null) {
     return new Promise((resolve, reject) => {
       const fullPath = path.join(this.algorithmPath, scriptPath);
       
@@ -28,6 +90,10 @@ class PythonBridge {
       }
 
       const pythonProcess = spawn(this.pythonPath, [fullPath, ...args]);
+
+      if (input !== null) {
+        pythonProcess.stdin.end(input);
+      }
       
       let stdout = '';
       let stderr = '';
@@ -68,6 +134,94 @@ class PythonBridge {
     });
   }
 
+  /**
+   * Execute a Python script that writes NDJSON, handing each line to onLine
+   * as it arrives instead of buffering the whole output
+   *
+   * Resolves with the final line marked `done`. The timeout applies to
+   * inactivity, so long streams are not killed while still producing output.
+   *
+   * @param {string} scriptPath - Script path relative to the algorithms directory
+   * @param {string[]} args - Command-line arguments
+   * @param {Function} onLine - Called with every parsed line except the last
+   */
+  async executeStream(scriptPath, args, onLine) {
+    return new Promise((resolve, reject) => {
+      const fullPath = path.join(this.algorithmPath, scriptPath);
+
+      if (!fs.existsSync(fullPath)) {
+        reject(new Error(`Python script not found: ${fullPath}`));
+        return;
+      }
+
+      const pythonProcess = spawn(this.pythonPath, [fullPath, ...args]);
+      const lines = readline.createInterface({ input: pythonProcess.stdout });
+
+      let summary = null;
+      let stderr = '';
+      let failed = false;
+
+      const fail = (error) => {
+        if (failed) return;
+        failed = true;
+        clearTimeout(timeoutId);
+        pythonProcess.kill();
+        reject(error);
+      };
+
+      let timeoutId = null;
+      const resetTimeout = () => {
+        clearTimeout(timeoutId);
+        timeoutId = setTimeout(() => fail(new Error('Python script execution timeout')), this.timeout);
+      };
+      resetTimeout();
+
+      lines.on('line', (line) => {
+        if (failed || !line) return;
+        resetTimeout();
+
+        let message;
+        try {
+          message = JSON.parse(line);
+        } catch (e) {
+          fail(new Error(`Failed to parse Python output: ${e.message}\nOutput: ${line}`));
+          return;
+        }
+
+        if (message.done) {
+          summary = message;
+          return;
+        }
+
+        try {
+          onLine(message);
+        } catch (e) {
+          fail(e);
+        }
+      });
+
+      pythonProcess.stderr.on('data', (data) => {
+        stderr += data.toString();
+      });
+
+      pythonProcess.on('error', (error) => {
+        fail(new Error(`Failed to start Python process: ${error.message}`));
+      });
+
+      pythonProcess.on('close', (code) => {
+        clearTimeout(timeoutId);
+        if (failed) return;
+
+        if (code !== 0 || !summary) {
+          reject(new Error(`Python script failed (code ${code}): ${stderr}`));
+          return;
+        }
+
+        resolve(summary);
+      });
+    });
+  }
+
   /**
    * Generate a maze
    */
@@ -86,26 +240,131 @@ class PythonBridge {
       args.push('--symmetric');
     }
 
-    const result = await this.executeScript('main.py', args);
-    
-    if (result.error) {
-      throw new Error(result.error);
+    const params = {
+      width,
+      height,
+      algorithm,
+      imperfection,
+      tunnels_h: tunnelsH,
+      tunnels_v: tunnelsV,
+      symmetric
+    };
+
+    return this.execute('generate', params, args);
+  }
+
+  /**
+   * Generate a maze and place its pellets in a single Python call
+   *
+   * Seeded builds are served from the maze catalogue when possible,
+   * without calling Python at all.
+   *
+   * @param {string|null} pelletAlgorithm - Pellet placer, or null for no pellets
+   * @param {Object} options - { seed, density, corridorDensity, junctionDensity }
+   * @throws {Error} A seed that is not an integer (see MazeCatalog.normalizeSeed)
+   */
+  async buildMaze(width, height, algorithm = 'kruskal', imperfection = 0, tunnelsH = 1, tunnelsV = 0, symmetric = false, pelletAlgorithm = null, options = {}) {
+    // Keyed and seeded by the same value ('42' is seed 42)
+    const seed = MazeCatalog.normalizeSeed(options.seed);
+    const key = this.catalog && MazeCatalog.key({
+      width, height, algorithm, imperfection, tunnelsH, tunnelsV, symmetric,
+      seed, pelletAlgorithm, options
+    });
+
+    if (key) {
+      const cached = this.catalog.get(key);
+      if (cached) {
+        return { ...cached, cached: true };
+      }
+    }
+
+    const args = [
+      'build',
+      String(width),
+      String(height),
+      '--algorithm', algorithm,
+      '--imperfection', String(imperfection),
+      '--tunnels-h', String(tunnelsH),
+      '--tunnels-v', String(tunnelsV)
+    ];
+
+    if (symmetric) {
+      args.push('--symmetric');
+    }
+    if (pelletAlgorithm) {
+      args.push('--pellets', pelletAlgorithm);
+    }
+    if (seed !== null) {
+      args.push('--seed', String(seed));
+    }
+    args.push(...this.pelletDensityArgs(options));
+
+    const params = {
+      width,
+      height,
+      algorithm,
+      imperfection,
+      tunnels_h: tunnelsH,
+      tunnels_v: tunnelsV,
+      symmetric,
+      pellets: pelletAlgorithm,
+      seed,
+      density: options.density,
+      corridor_density: options.corridorDensity,
+      junction_density: options.junctionDensity
+    };
+
+    const result = await this.execute('build', params, args);
+
+    if (key) {
+      this.catalog.set(key, result);
     }
 
     return result;
   }
 
+  /**
+   * Maze catalogue counters of the bridge and of one Python worker
+   */
+  async catalogStats() {
+    const python = await this.execute('catalog-stats', {}, ['catalog-stats']);
+
+    return {
+      bridge: this.catalog ? this.catalog.stats() : null,
+      python: python.catalog
+    };
+  }
+
   /**
    * Place pellets on a maze grid
+   *
+   * The grid goes through stdin: large mazes exceed argv limits.
    */
   async placePellets(grid, algorithm = 'strategic', options = {}) {
-    const gridJson = JSON.stringify(grid);
     const args = [
       'pellets',
-      '--grid-json', gridJson,
-      '--algorithm', algorithm
+      '--grid-file', '-',
+      '--algorithm', algorithm,
+      ...this.pelletDensityArgs(options)
     ];
 
+    const params = {
+      grid,
+      algorithm,
+      density: options.density,
+      corridor_density: options.corridorDensity,
+      junction_density: options.junctionDensity
+    };
+
+    return this.execute('pellets', params, args, JSON.stringify({ grid }));
+  }
+
+  /**
+   * CLI flags for the optional pellet placer tuning
+   */
+  pelletDensityArgs(options) {
+    const args = [];
+
     if (options.density !== undefined) {
       args.push('--density', String(options.density));
     }
@@ -116,33 +375,115 @@ class PythonBridge {
       args.push('--junction-density', String(options.junctionDensity));
     }
 
-    const result = await this.executeScript('main.py', args);
-    
-    if (result.error) {
-      throw new Error(result.error);
+    return args;
+  }
+
+  /**
+   * Simulate a game with ghosts
+   *
+   * @param {Object} options - { compactFrames: return frames as compactFrames,
+   *   profile: add per-ghost search counters as profile,
+   *   stopPolicy: when the run ends, e.g. 'catches:3,pellets' }
+   */
+  async simulateGame(trajectoryFile, gridFile, ghostConfigs, options = {}) {
+    const args = [
+      'simulate',
+      '--trajectory-file', trajectoryFile,
+      '--grid-file', gridFile,
+      '--ghost-configs', JSON.stringify(ghostConfigs)
+    ];
+
+    if (options.compactFrames) {
+      args.push('--compact-frames');
+    }
+    if (options.profile) {
+      args.push('--profile');
+    }
+    if (options.stopPolicy) {
+      args.push('--stop-policy', options.stopPolicy);
     }
 
-    return result;
+    const params = {
+      trajectory_file: trajectoryFile,
+      grid_file: gridFile,
+      ghost_configs: ghostConfigs,
+      compact_frames: Boolean(options.compactFrames),
+      profile: Boolean(options.profile),
+      stop_policy: options.stopPolicy || null
+    };
+
+    return this.execute('simulate', params, args);
   }
 
   /**
-   * Simulate a game with ghosts
+   * Simulate a game, handing frames to onFrame as Python produces them
+   *
+   * Always runs in its own process (worker responses are not streamed),
+   * so memory use does not depend on the trajectory length.
+   *
+   * @param {Function} onFrame - Called with each frame in order
+   * @param {Object} options - { profile: add per-ghost search counters as profile,
+   *   stopPolicy: when the run ends (see simulateGame) }
+   * @returns {Object} Summary { caught, catchPosition, catchTime, totalFrames, profile?,
+   *   catchCount?, stopReason?, ... }
    */
-  async simulateGame(trajectoryFile, gridFile, ghostConfigs) {
+  async simulateGameStream(trajectoryFile, gridFile, ghostConfigs, onFrame, options = {}) {
     const args = [
       'simulate',
+      '--stream',
       '--trajectory-file', trajectoryFile,
       '--grid-file', gridFile,
       '--ghost-configs', JSON.stringify(ghostConfigs)
     ];
 
-    const result = await this.executeScript('main.py', args);
-    
-    if (result.error) {
-      throw new Error(result.error);
+    if (options.profile) {
+      args.push('--profile');
+    }
+    if (options.stopPolicy) {
+      args.push('--stop-policy', options.stopPolicy);
     }
 
-    return result;
+    const summary = await this.executeStream('main.py', args, onFrame);
+
+    if (summary.error) {
+      throw new Error(summary.error);
+    }
+
+    return summary;
+  }
+
+  /**
+   * Simulate many trajectories against many ghost configuration sets
+   * in a single Python call sharing the maze precomputation
+   *
+   * @param {Object} options - { stopPolicy: when runs end, e.g. 'catches:3' or
+   *   'pellets' (default: first catch) }
+   * @returns {Object} { runs: [{ caught, catchPosition, catchTime, totalFrames,
+   *   trajectoryIndex, configIndex, frames?, catchCount?, stopReason?, ... }], totalRuns }
+   */
+  async simulateBatch(grid, trajectories, ghostConfigSets, includeFrames = false, options = {}) {
+    const workers = config.SWEEP_WORKERS;
+    const args = ['simulate-batch', '--input-file', '-', '--workers', workers.toString()];
+    const stopPolicy = options.stopPolicy || null;
+
+    const params = {
+      grid,
+      trajectories,
+      ghost_config_sets: ghostConfigSets,
+      include_frames: includeFrames,
+      workers,
+      stop_policy: stopPolicy
+    };
+
+    const input = JSON.stringify({
+      grid,
+      trajectories,
+      ghostConfigSets,
+      includeFrames,
+      stopPolicy
+    });
+
+    return this.execute('simulate-batch', params, args, input);
   }
 }
 
@@ -0,0 +1,319 @@
+/**
+ * Python Worker Pool
+ * Keeps long-lived `main.py serve` processes warm and dispatches
+ * newline-delimited JSON requests to them
+ */
+
+const { spawn } = require('child_process');
+const readline = require('readline');
+
+class PythonWorker {
+  constructor(pythonPath, scriptPath, onExit) {
+    this.pythonPath = pythonPath;
+    this.scriptPath = scriptPath;
+    this.onExit = onExit;
+    this.pending = new Map();
+    this.nextId = 1;
+    this.process = null;
+    this.alive = false;
+    this.stderr = '';
+    // Answered at least one request (a worker that never does has crashed)
+    this.responded = false;
+    // Killed by the pool (timeout, health check or shutdown), not crashed
+    this.recycled = false;
+  }
+
+  /**
+   * Spawn the worker process and start reading responses
+   */
+  start() {
+    this.process = spawn(this.pythonPath, [this.scriptPath, 'serve']);
+    this.alive = true;
+    this.stderr = '';
+
+    const lines = readline.createInterface({ input: this.process.stdout });
+    lines.on('line', (line) => this.handleLine(line));
+
+    this.process.stderr.on('data', (data) => {
+      // Keep only the tail for error reporting
+      this.stderr = (this.stderr + data.toString()).slice(-4000);
+    });
+
+    // Writes to a worker that just died fail with EPIPE
+    this.process.stdin.on('error', (error) => {
+      this.fail(new Error(`Python worker stdin failed: ${error.message}`));
+    });
+
+    this.process.on('error', (error) => {
+      this.fail(new Error(`Failed to start Python worker: ${error.message}`));
+    });
+
+    this.process.on('close', (code) => {
+      this.fail(new Error(`Python worker exited (code ${code}): ${this.stderr}`));
+    });
+  }
+
+  get idle() {
+    return this.alive && this.pending.size === 0;
+  }
+
+  handleLine(line) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (e) {
+      // Not a protocol line - ignore stray output
+      return;
+    }
+
+    const request = this.pending.get(response.id);
+    if (!request) return;
+
+    clearTimeout(request.timeoutId);
+    this.pending.delete(response.id);
+    this.responded = true;
+    request.resolve(response.result);
+  }
+
+  /**
+   * Send a command and resolve with its result
+   *
+   * The worker runs requests one at a time, so the pool only sends to
+   * idle workers and the timeout covers this request's own run.
+   */
+  send(command, params = {}, timeout = 30000) {
+    return new Promise((resolve, reject) => {
+      if (!this.alive) {
+        reject(new Error('Python worker is not running'));
+        return;
+      }
+
+      const id = this.nextId++;
+      const timeoutId = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error('Python script execution timeout'));
+        // A timed-out worker may be stuck in a long computation; recycle it
+        this.kill();
+      }, timeout);
+
+      this.pending.set(id, { resolve, reject, timeoutId });
+      this.process.stdin.write(JSON.stringify({ id, command, params }) + '\n');
+    });
+  }
+
+  /**
+   * Reject everything in flight and notify the pool
+   */
+  fail(error) {
+    if (!this.alive) return;
+    this.alive = false;
+
+    for (const request of this.pending.values()) {
+      clearTimeout(request.timeoutId);
+      request.reject(error);
+    }
+    this.pending.clear();
+
+    if (this.onExit) {
+      this.onExit(this, error);
+    }
+  }
+
+  kill() {
+    if (this.process && this.alive) {
+      this.recycled = true;
+      this.process.kill();
+    }
+  }
+}
+
+class PythonWorkerPool {
+  constructor({
+    pythonPath,
+    scriptPath,
+    size = 2,
+    timeout = 30000,
+    healthCheckInterval = 15000,
+    restartDelay = 100,
+    maxRestartDelay = 10000,
+    maxCrashes = 5
+  }) {
+    this.pythonPath = pythonPath;
+    this.scriptPath = scriptPath;
+    this.size = size;
+    this.timeout = timeout;
+    this.healthCheckInterval = healthCheckInterval;
+    this.restartDelay = restartDelay;
+    this.maxRestartDelay = maxRestartDelay;
+    this.maxCrashes = maxCrashes;
+    this.workers = [];
+    // Requests waiting for an idle worker, oldest first
+    this.queue = [];
+    this.healthTimer = null;
+    this.restartTimers = new Set();
+    // Workers in a row that died before answering a request
+    this.crashes = 0;
+    this.unhealthy = null;
+    this.closed = false;
+  }
+
+  /**
+   * Spawn all workers and start periodic health checks
+   */
+  start() {
+    for (let i = 0; i < this.size; i++) {
+      this.workers.push(this.spawnWorker());
+    }
+
+    if (this.healthCheckInterval > 0) {
+      this.healthTimer = setInterval(() => this.healthCheck(), this.healthCheckInterval);
+      this.healthTimer.unref();
+    }
+  }
+
+  spawnWorker() {
+    const worker = new PythonWorker(this.pythonPath, this.scriptPath, (dead, error) => this.restart(dead, error));
+    worker.start();
+    return worker;
+  }
+
+  /**
+   * Replace a crashed or killed worker
+   *
+   * Workers that crash before answering anything (a bad PYTHON_PATH, a
+   * broken import) are respawned with exponential backoff; after
+   * maxCrashes of them in a row the pool gives up and is unhealthy.
+   */
+  restart(deadWorker, error) {
+    if (this.closed || this.unhealthy) return;
+
+    const index = this.workers.indexOf(deadWorker);
+    if (index === -1) return;
+
+    if (deadWorker.responded || deadWorker.recycled) {
+      this.crashes = 0;
+    } else {
+      this.crashes += 1;
+    }
+
+    if (this.crashes >= this.maxCrashes) {
+      this.markUnhealthy(error);
+      return;
+    }
+
+    const delay = this.crashes === 0
+      ? 0
+      : Math.min(this.restartDelay * 2 ** (this.crashes - 1), this.maxRestartDelay);
+    console.warn(`Python worker exited, restarting in ${delay} ms`);
+
+    const timer = setTimeout(() => {
+      this.restartTimers.delete(timer);
+      if (this.closed || this.unhealthy) return;
+
+      this.workers[index] = this.spawnWorker();
+      this.dispatch();
+    }, delay);
+    this.restartTimers.add(timer);
+  }
+
+  /**
+   * Stop respawning workers and reject queued and future requests
+   */
+  markUnhealthy(error) {
+    this.unhealthy = new Error(
+      `Python workers crashed ${this.crashes} times in a row; ` +
+      `last error: ${error ? error.message : 'unknown'}`
+    );
+    console.error(this.unhealthy.message);
+
+    for (const timer of this.restartTimers) {
+      clearTimeout(timer);
+    }
+    this.restartTimers.clear();
+
+    for (const request of this.queue.splice(0)) {
+      request.reject(this.unhealthy);
+    }
+  }
+
+  get healthy() {
+    return !this.unhealthy && !this.closed;
+  }
+
+  /**
+   * Ping every idle worker; kill (and thereby restart) unresponsive ones
+   */
+  async healthCheck() {
+    await Promise.all(this.workers.map(async (worker) => {
+      // Busy workers are demonstrably alive
+      if (!worker.idle) return;
+
+      try {
+        await this.run(worker, 'ping', {});
+      } catch (e) {
+        worker.kill();
+      }
+    }));
+  }
+
+  /**
+   * Send a request to an idle worker, then hand it the next queued one
+   */
+  async run(worker, command, params) {
+    try {
+      return await worker.send(command, params, this.timeout);
+    } finally {
+      this.dispatch();
+    }
+  }
+
+  /**
+   * Start queued requests on idle workers
+   */
+  dispatch() {
+    while (this.queue.length > 0) {
+      const worker = this.workers.find(candidate => candidate.idle);
+      if (!worker) return;
+
+      const { command, params, resolve, reject } = this.queue.shift();
+      this.run(worker, command, params).then(resolve, reject);
+    }
+  }
+
+  /**
+   * Run a command on an idle worker, queueing it until one is free
+   */
+  execute(command, params = {}) {
+    if (this.unhealthy) {
+      return Promise.reject(this.unhealthy);
+    }
+    if (this.closed) {
+      return Promise.reject(new Error('No Python workers available'));
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ command, params, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  shutdown() {
+    this.closed = true;
+    if (this.healthTimer) {
+      clearInterval(this.healthTimer);
+    }
+    for (const timer of this.restartTimers) {
+      clearTimeout(timer);
+    }
+    this.restartTimers.clear();
+    for (const request of this.queue.splice(0)) {
+      request.reject(new Error('Python worker pool shut down'));
+    }
+    for (const worker of this.workers) {
+      worker.kill();
+    }
+    this.workers = [];
+  }
+}
+
+module.exports = PythonWorkerPool;
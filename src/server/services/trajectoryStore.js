@@ -0,0 +1,168 @@
+/**
+ * Trajectory Store
+ * Recorded trajectories as columnar .ptrj files under data/trajectories
+ * Mirrors src/algorithms/simulation/trajectory_file.py (which reads them,
+ * memory-mapped, for simulations)
+ */
+
+const fs = require('fs').promises;
+const path = require('path');
+const config = require('../config/env');
+
+const MAGIC = 'PTRJ';
+const VERSION = 1;
+const HEADER_SIZE = 24;
+const EXTENSION = '.ptrj';
+
+// 2-bit direction codes, in the order of the Trajectory model's enum
+const DIRECTIONS = ['UP', 'DOWN', 'LEFT', 'RIGHT'];
+
+const CRC_TABLE = (() => {
+  const table = new Int32Array(256);
+  for (let n = 0; n < 256; n++) {
+    let c = n;
+    for (let k = 0; k < 8; k++) {
+      c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    }
+    table[n] = c;
+  }
+  return table;
+})();
+
+/**
+ * CRC-32 (as zlib.crc32)
+ */
+function crc32(buffer) {
+  let crc = -1;
+  for (const byte of buffer) {
+    crc = CRC_TABLE[(crc ^ byte) & 0xff] ^ (crc >>> 8);
+  }
+  return (crc ^ -1) >>> 0;
+}
+
+/**
+ * Zigzag varints of the deltas between consecutive values (the first
+ * from 0), 7 bits per byte, low bits first
+ */
+function encodeVarints(values) {
+  const bytes = [];
+  let previous = 0;
+  for (const value of values) {
+    const delta = value - previous;
+    previous = value;
+    // Plain numbers: exact for deltas up to 2^52
+    let rest = delta >= 0 ? delta * 2 : -delta * 2 - 1;
+    while (rest >= 128) {
+      bytes.push((rest % 128) | 128);
+      rest = Math.floor(rest / 128);
+    }
+    bytes.push(rest);
+  }
+  return Buffer.from(bytes);
+}
+
+class TrajectoryStore {
+  constructor(directory) {
+    this.directory = directory;
+  }
+
+  /**
+   * Encode moves as a .ptrj file: header, int16 x and y columns, 2-bit
+   * directions packed four to a byte, then timestamps and pelletsEaten as
+   * delta varints; the header's CRC-32 covers everything after it
+   *
+   * @param {Array} moves - Recorded moves ({ position: { x, y }, direction,
+   *   timestamp, pelletsEaten })
+   * @returns {Buffer}
+   */
+  encode(moves) {
+    const count = moves.length;
+    const columns = Buffer.alloc(4 * count + Math.ceil(count / 4));
+
+    moves.forEach((move, i) => {
+      const { x, y } = move.position || {};
+      if (!Number.isInteger(x) || !Number.isInteger(y)) {
+        throw new Error(`Move ${i} has no position`);
+      }
+      if (Math.max(Math.abs(x), Math.abs(y)) > 32767) {
+        throw new Error('Positions do not fit in int16');
+      }
+      const code = DIRECTIONS.indexOf(move.direction);
+      if (code < 0) {
+        throw new Error(`Move ${i} has no direction in ${DIRECTIONS.join(', ')}`);
+      }
+
+      columns.writeInt16LE(x, 2 * i);
+      columns.writeInt16LE(y, 2 * (count + i));
+      columns[4 * count + (i >> 2)] |= code << (2 * (i & 3));
+    });
+
+    const timestamps = encodeVarints(moves.map((move, i) => Math.trunc(move.timestamp ?? i * 100)));
+    const pellets = encodeVarints(moves.map(move => Math.trunc(move.pelletsEaten ?? 0)));
+    const body = Buffer.concat([columns, timestamps, pellets]);
+
+    const header = Buffer.alloc(HEADER_SIZE);
+    header.write(MAGIC, 0, 'ascii');
+    header.writeUInt16LE(VERSION, 4);
+    header.writeUInt16LE(HEADER_SIZE, 6);
+    header.writeUInt32LE(count, 8);
+    header.writeUInt32LE(timestamps.length, 12);
+    header.writeUInt32LE(pellets.length, 16);
+    header.writeUInt32LE(crc32(body), 20);
+
+    return Buffer.concat([header, body]);
+  }
+
+  /**
+   * Path of a trajectory's file
+   */
+  pathFor(id) {
+    return path.join(this.directory, `${String(id).replace(/[^\w-]/g, '_')}${EXTENSION}`);
+  }
+
+  /**
+   * Write a trajectory's file (atomically); returns its path
+   */
+  async save(id, moves) {
+    const file = this.pathFor(id);
+    const tmpFile = `${file}.${process.pid}.tmp`;
+
+    await fs.mkdir(this.directory, { recursive: true });
+    try {
+      await fs.writeFile(tmpFile, this.encode(moves));
+      await fs.rename(tmpFile, file);
+    } catch (error) {
+      await fs.unlink(tmpFile).catch(() => {});
+      throw error;
+    }
+    return file;
+  }
+
+  /**
+   * Path of a trajectory's file, writing it first if it is missing
+   * (trajectories recorded before the store, or whose write failed)
+   */
+  async ensure(id, moves) {
+    const file = this.pathFor(id);
+    try {
+      await fs.access(file);
+      return file;
+    } catch {
+      return this.save(id, moves);
+    }
+  }
+
+  /**
+   * Delete a trajectory's file, if there is one
+   */
+  async remove(id) {
+    await fs.unlink(this.pathFor(id)).catch(error => {
+      if (error.code !== 'ENOENT') {
+        throw error;
+      }
+    });
+  }
+}
+
+// Export singleton instance
+module.exports = new TrajectoryStore(config.TRAJECTORY_DIR);
@@ -1,5 +1,7 @@
 """Tests for ghost AI behaviors."""
 
+import random
+
 import pytest
 import sys
 import os
@@ -10,6 +12,10 @@ from algorithms.ghost_ai.blinky import BlinkyAgent
 from algorithms.ghost_ai.pinky import PinkyAgent
 from algorithms.ghost_ai.inky import InkyAgent
 from algorithms.ghost_ai.clyde import ClydeAgent
+from algorithms.ghost_ai.targets import pacman_arrays
+from algorithms.maze.generators import KruskalGenerator
+from algorithms.maze.imperfecteur import MazeImperfecteur
+from algorithms.utils.maze_converter import internal_to_grid
 
 
 class TestGhostAI:
@@ -125,3 +131,47 @@ class TestGhostAI:
         targets = [blinky_target, pinky_target, inky_target, clyde_target]
         assert len(set(targets)) > 1
 
+
+class TestPlannedTargets:
+    @pytest.fixture
+    def maze(self):
+        """Imperfect 10x10 maze (21x21 grid) with tunnels."""
+        maze, remaining_walls = KruskalGenerator(seed=2).generate(10, 10)
+        maze, rows, cols = MazeImperfecteur(seed=2).make_imperfect(
+            maze, remaining_walls, 0.3, 10, 10, 1, 1
+        )
+        return internal_to_grid(maze, 10, 10, rows, cols)
+
+    def test_plans_match_get_target(self, maze):
+        """Vectorised plans give the same target as get_target on every frame."""
+        rng = random.Random(0)
+        ghosts = [BlinkyAgent(maze), PinkyAgent(maze), InkyAgent(maze), ClydeAgent(maze)]
+        cells = ghosts[0].grid.walkable_cells
+        positions = [rng.choice(cells) for _ in range(200)]
+        directions = [rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT', None, 'NONE']) for _ in positions]
+        arrays = pacman_arrays(positions, directions)
+        
+        for ghost in ghosts:
+            plan = ghost.plan_targets(*arrays)
+            for frame, (pacman_pos, pacman_dir) in enumerate(zip(positions, directions)):
+                ghost.set_position(rng.choice(cells))
+                other_ghosts = {'blinky': rng.choice(cells)} if frame % 5 else {}
+                
+                assert ghost.planned_target(plan, frame, pacman_pos, other_ghosts) == \
+                    ghost.get_target(pacman_pos, pacman_dir, other_ghosts)
+
+    def test_wall_targets_snap_to_nearest_walkable(self):
+        """Look-ahead targets in walls use the grid's nearest-walkable table."""
+        grid = [
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ]
+        pinky = PinkyAgent(grid)
+        
+        assert pinky.get_target((1, 1), 'DOWN') == (1, 1)
+        assert pinky.get_target((1, 3), 'RIGHT') == (1, 5)
+        
+        # Wall start positions snap as well
+        pinky.set_position((0, 2))
+        assert pinky.position == (1, 2)
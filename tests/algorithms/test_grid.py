@@ -0,0 +1,242 @@
+"""Tests for the shared NumPy grid representation."""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from algorithms.utils.grid import Grid, as_grid
+from algorithms.utils.grid_cache import GridCache, grid_key
+from algorithms.utils import maze_catalog
+from algorithms.utils.maze_catalog import MazeCatalog, catalog_key
+from algorithms.pathfinding.astar import AStar
+from algorithms.pathfinding.distance_oracle import DistanceOracle
+from algorithms.maze.pellets import StrategicPelletPlacer
+from algorithms.pacman_ai import GreedyPacman
+
+
+class TestGrid:
+    @pytest.fixture
+    def cells(self):
+        return [
+            [1, 1, 1, 1, 1],
+            [1, 0, 2, 0, 1],
+            [1, 0, 1, 3, 1],
+            [1, 1, 1, 1, 1]
+        ]
+
+    def test_walkable_mask(self, cells):
+        """Only walls block; pellets are walkable."""
+        grid = Grid(cells)
+
+        assert grid.cells.dtype.name == 'uint8'
+        assert grid.walkable.sum() == 5
+        assert grid.is_walkable((1, 2))
+        assert not grid.is_walkable((2, 2))
+        assert not grid.is_walkable((-1, 0))
+
+    def test_neighbor_count(self, cells):
+        """Neighbor counts match a direct count of walkable neighbors."""
+        grid = Grid(cells)
+
+        assert grid.neighbor_count[1, 1] == 2
+        assert grid.neighbor_count[1, 2] == 2
+        assert grid.neighbor_count[2, 1] == 1
+        assert grid.neighbor_count[2, 2] == 3
+
+    def test_csr_adjacency(self, cells):
+        """CSR rows list walkable neighbors in up, down, left, right order."""
+        grid = Grid(cells)
+        idx = grid.index((1, 3))
+
+        neighbors = grid.indices[grid.indptr[idx]:grid.indptr[idx + 1]].tolist()
+        assert neighbors == [grid.index((2, 3)), grid.index((1, 2))]
+        assert grid.neighbors((1, 3)) == [(2, 3), (1, 2)]
+
+        wall = grid.index((0, 0))
+        assert grid.indptr[wall] == grid.indptr[wall + 1]
+
+    def test_list_compatibility(self, cells):
+        """Grid supports len() and grid[row][col] like nested lists."""
+        grid = Grid(cells)
+
+        assert len(grid) == 4
+        assert grid[2][3] == 3
+        assert grid.to_list() == cells
+
+    def test_as_grid_passthrough(self, cells):
+        """An existing Grid is shared, not re-parsed."""
+        grid = Grid(cells)
+
+        assert as_grid(grid) is grid
+        assert AStar(grid).grid is grid
+
+    def test_algorithms_accept_grid(self, cells):
+        """Placers and agents give the same results for Grid and lists."""
+        grid = Grid(cells)
+
+        assert StrategicPelletPlacer().place_pellets(grid)[2][1] in (2, 3)
+        assert GreedyPacman(grid).get_valid_neighbors((1, 1)) == \
+            GreedyPacman(cells).get_valid_neighbors((1, 1))
+
+    def test_topology_masks(self, cells):
+        grid = Grid(cells)
+
+        assert grid.dead_ends[2, 1] and grid.dead_ends[2, 3]
+        assert grid.corners[1, 1] and grid.corners[1, 3]
+        assert not grid.corners[1, 2]
+        assert grid.junctions.sum() == 0
+
+    def test_nearest_walkable(self, cells):
+        """Ties resolve in up, down, left, right order like the BFS it replaces."""
+        grid = Grid(cells)
+        nearest = lambda pos: grid.positions[grid.nearest_walkable[grid.index(pos)]]
+
+        assert nearest((1, 1)) == (1, 1)
+        assert nearest((0, 2)) == (1, 2)
+        assert nearest((2, 2)) == (1, 2)
+        assert nearest((3, 0)) == (2, 1)
+
+
+class TestTunnels:
+    @pytest.fixture
+    def cells(self):
+        # Row 2 is open at both ends; the way round inside is long
+        return [
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [0, 0, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 1, 1, 1]
+        ]
+
+    def test_tunnels_detected(self, cells):
+        grid = Grid(cells)
+
+        assert grid.tunnel_rows == (2,)
+        assert grid.tunnel_cols == ()
+        assert Grid([[0, 0], [0, 0]]).tunnel_rows == ()
+
+    def test_tunnel_ends_are_adjacent(self, cells):
+        grid = Grid(cells)
+
+        assert grid.neighbors((2, 0)) == [(2, 6), (2, 1)]
+        assert (2, 0) in grid.neighbors((2, 6))
+        # Geometric counts ignore the tunnel edges
+        assert grid.neighbor_count[2, 0] == 1
+
+    def test_distance_bound_goes_round(self, cells):
+        grid = Grid(cells)
+
+        assert grid.distance_bound((2, 0), (2, 6)) == 1
+        assert grid.distance_bound((1, 1), (2, 6)) == 3
+        assert grid.distance_bound((1, 1), (1, 4)) == 3
+
+    def test_distance_bound_walks_to_the_tunnel(self):
+        """Going round counts the way to the tunnel row, so far cells stay far."""
+        grid = Grid([
+            [1, 1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 1],
+            [0, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 1, 1, 1, 1]
+        ])
+        oracle = DistanceOracle(grid)
+
+        assert grid.distance_bound((1, 1), (1, 6)) == 5
+        assert grid.distance_bound((3, 1), (3, 6)) == 3
+        for start in oracle.cells:
+            for goal in oracle.cells:
+                assert grid.distance_bound(start, goal) <= oracle.distance(start, goal)
+
+    def test_paths_use_tunnel(self, cells):
+        path = AStar(Grid(cells)).find_path((2, 1), (2, 5))
+
+        assert path == [(2, 1), (2, 0), (2, 6), (2, 5)]
+
+    def test_wrap_disabled(self, cells):
+        grid = Grid(cells, wrap=False)
+
+        assert grid.tunnel_rows == ()
+        assert grid.neighbors((2, 0)) == [(2, 1)]
+        assert grid.distance_bound((2, 0), (2, 6)) == 6
+        assert len(AStar(grid).find_path((2, 1), (2, 5))) == 7
+
+
+class TestGridCache:
+    def test_same_maze_is_analysed_once(self):
+        cells = [[1, 1, 1], [1, 0, 1], [1, 1, 1]]
+        first = Grid(cells)
+        second = Grid(np.array(cells))
+
+        assert first.key == second.key
+        assert second.indptr is first.indptr
+        assert not second.walkable.flags.writeable
+
+    def test_key_depends_on_shape(self):
+        assert grid_key([[0, 1, 0, 1]]) != grid_key([[0, 1], [0, 1]])
+
+    def test_lru_bounded_by_bytes(self):
+        cache = GridCache(max_bytes=100)
+        cache.get('a', 'x', lambda: np.zeros(60, dtype=np.uint8))
+        cache.get('b', 'x', lambda: np.zeros(60, dtype=np.uint8))
+
+        assert cache.nbytes == 60
+        calls = []
+        cache.get('a', 'x', lambda: calls.append(1) or np.zeros(60, dtype=np.uint8))
+        assert calls == [1]
+        assert cache.misses == 3
+
+    def test_disk_cache_is_memory_mapped(self, tmp_path):
+        compute = lambda: (np.arange(5), np.ones(3, dtype=bool))
+        GridCache(directory=str(tmp_path)).get_many('k', ('a', 'b'), compute)
+
+        fresh = GridCache(directory=str(tmp_path))
+        a, b = fresh.get_many('k', ('a', 'b'), lambda: pytest.fail('recomputed'))
+
+        assert isinstance(a, np.memmap)
+        assert a.tolist() == [0, 1, 2, 3, 4]
+        assert b.tolist() == [True] * 3
+        assert fresh.hits == 1
+
+
+class TestMazeCatalog:
+    def test_key_is_canonical(self):
+        base = (10, 10, 'kruskal', 30, 1, 0, False, 7)
+
+        assert catalog_key(*base) == catalog_key(10, 10, 'Kruskal', 0.3, 1, 0, False, 7)
+        assert catalog_key(*base, 'classic', density=0.5) == catalog_key(*base, 'classic')
+        assert catalog_key(*base, 'random', density=0.5) != catalog_key(*base, 'random')
+        assert catalog_key(10, 10, 'kruskal', 30, 1, 0, False, None) is None
+
+    def test_key_takes_the_seed_builds_use(self, monkeypatch):
+        base = (10, 10, 'kruskal', 30, 1, 0, False)
+
+        assert catalog_key(*base, '7') == catalog_key(*base, 7)
+        for seed in ('abc', 7.5, True):
+            with pytest.raises(ValueError):
+                catalog_key(*base, seed)
+
+        # Keys of older generator versions are never served
+        key = catalog_key(*base, 7)
+        monkeypatch.setattr(maze_catalog, 'CATALOG_VERSION', maze_catalog.CATALOG_VERSION + 1)
+        assert catalog_key(*base, 7) != key
+
+    def test_lru_bounded_by_entries(self):
+        catalog = MazeCatalog(max_entries=1)
+        catalog.put('a', [[1]], [], [])
+        catalog.put('b', [[0]], [0], [])
+
+        assert catalog.get('a') is None
+        assert catalog.get('b') == ([[0]], [0], [])
+        assert (catalog.hits, catalog.misses) == (1, 1)
+
+    def test_disk_store_survives_restart(self, tmp_path):
+        MazeCatalog(directory=str(tmp_path)).put('k', [[1, 2], [3, 0]], {1}, {0})
+
+        fresh = MazeCatalog(directory=str(tmp_path))
+
+        assert fresh.get('k') == ([[1, 2], [3, 0]], [1], [0])
+        assert fresh.stats()['entries'] == 1
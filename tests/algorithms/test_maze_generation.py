@@ -1,6 +1,7 @@
 """Tests for maze generation algorithms."""
 
 import pytest
+import random
 import sys
 import os
 
@@ -57,7 +58,7 @@ class TestMazeGenerators:
             generator.generate(2, 10)  # Too small
         
         with pytest.raises(ValueError):
-            generator.generate(51, 10)  # Too large
+            generator.generate(1001, 10)  # Too large
         
         with pytest.raises(ValueError):
             generator.generate(10, 0)  # Zero height
@@ -89,6 +90,41 @@ class TestMazeGenerators:
         # Perfect maze property: removed walls = cells - 1
         assert removed_walls == total_cells - 1
 
+    def test_seed_is_reproducible(self, generator):
+        """Test that equal seeds give equal mazes, independent of global random."""
+        generator_class = type(generator)
+
+        first = generator_class(seed=42).generate(12, 9)
+        random.seed(0)
+        second = generator_class(seed=42).generate(12, 9)
+        shared = generator_class(seed=random.Random(42)).generate(12, 9)
+
+        assert first == second == shared
+
+    def test_unseeded_follows_global_random(self, generator):
+        """Without a seed, random.seed() still makes generation reproducible."""
+        generator_class = type(generator)
+
+        random.seed(5)
+        first = generator_class().generate(12, 9)
+        random.seed(5)
+        second = generator_class().generate(12, 9)
+
+        assert first == second
+
+    def test_remaining_walls_match_maze(self, generator):
+        """remaining_walls lists exactly the walls still standing."""
+        width, height = 9, 7
+        maze, remaining_walls = generator.generate(width, height)
+
+        standing = [
+            ((y // 2, x), 'H' if y % 2 == 0 else 'V')
+            for y, row in enumerate(maze)
+            for x, wall in enumerate(row)
+            if wall
+        ]
+        assert sorted(remaining_walls) == sorted(standing)
+
 
 class TestKruskalSpecific:
     def test_union_find(self):
@@ -107,6 +143,16 @@ class TestKruskalSpecific:
         # Union again should fail
         assert not uf.union(0, 1)
 
+    def test_long_chain_is_not_recursive(self):
+        """find() handles chains far deeper than the recursion limit."""
+        from algorithms.maze.generators.kruskal import UnionFind
+
+        n = sys.getrecursionlimit() * 2
+        uf = UnionFind(n)
+        uf.parent = [max(i - 1, 0) for i in range(n)]
+
+        assert uf.find(n - 1) == 0
+
 
 class TestWilsonSpecific:
     def test_loop_erased_walk(self):
@@ -0,0 +1,346 @@
+"""Tests for Pac-Man AI behaviors, the pellet index, the danger field and search."""
+
+import random
+import time
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from algorithms.main import create_maze
+from algorithms.maze.pellets import ClassicPelletPlacer
+from algorithms.pacman_ai import (
+    AggressivePacman,
+    DangerField,
+    DefensivePacman,
+    GreedyPacman,
+    PelletIndex,
+    SearchPacman
+)
+from algorithms.pacman_ai.search import TranspositionTable
+from algorithms.pathfinding.distance_oracle import DistanceOracle
+from algorithms.simulation.self_play import SelfPlayEngine
+from algorithms.utils.grid import Grid
+
+
+class TestPelletIndex:
+    @pytest.fixture
+    def grid(self):
+        # Horizontal tunnel on row 1
+        return Grid([
+            [1, 1, 1, 1, 1, 1, 1, 1, 1],
+            [0, 2, 0, 0, 0, 0, 0, 3, 0],
+            [1, 0, 1, 1, 1, 1, 1, 0, 1],
+            [1, 2, 0, 0, 2, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1, 1, 1]
+        ])
+
+    def test_reads_grid_pellets(self, grid):
+        index = PelletIndex(grid)
+
+        assert len(index) == 4
+        assert sorted(index) == [(1, 1), (1, 3), (4, 3), (7, 1)]
+        assert (7, 1) in index and (2, 1) not in index
+
+    def test_discard_is_incremental(self, grid):
+        index = PelletIndex(grid, bucket_size=2)
+
+        assert index.nearest((2, 3)) == (1, 3)
+        assert index.discard((1, 3))
+        assert not index.discard((1, 3))
+        assert index.nearest((2, 3)) == (4, 3)
+        assert len(index) == 3
+
+        for pos in list(index):
+            index.discard(pos)
+        assert not index
+        assert index.nearest((2, 3)) is None
+        assert index.nearest_distance((2, 3)) is None
+
+    def test_nearest_goes_through_tunnels(self, grid):
+        index = PelletIndex(grid, [(7, 1), (4, 3)], bucket_size=2)
+
+        # (0, 1) is next to (8, 1) through the tunnel
+        assert index.nearest((0, 1)) == (7, 1)
+        assert index.nearest_distance((0, 1)) == 2
+
+    def test_ties_go_to_row_major_first(self, grid):
+        index = PelletIndex(grid, [(4, 3), (2, 1)], bucket_size=1)
+
+        assert index.nearest((3, 2)) == (2, 1)
+
+    def test_copy_is_independent(self, grid):
+        index = PelletIndex(grid)
+        clone = index.copy()
+        clone.discard((1, 1))
+
+        assert len(clone) == 3 and len(index) == 4
+        assert (1, 1) in index
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_matches_brute_force(self, seed):
+        rng = random.Random(seed)
+        cells, _, _ = create_maze(9, 7, 'kruskal', 30, 1, 1, seed=seed)
+        grid = Grid(cells)
+        walkable = [(col, row) for row, col in grid.walkable_cells]
+        pellets = rng.sample(walkable, len(walkable) // 3)
+        index = PelletIndex(grid, pellets, bucket_size=rng.randint(1, 5))
+
+        while pellets:
+            pos = rng.choice(walkable)
+            expected = min(
+                sorted(pellets, key=lambda p: (p[1], p[0])),
+                key=lambda p: grid.distance_bound((pos[1], pos[0]), (p[1], p[0]))
+            )
+            assert index.nearest(pos) == expected
+            pellets.remove(expected)
+            index.discard(expected)
+
+
+class TestDangerField:
+    @pytest.fixture
+    def grid(self):
+        return Grid([
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 0, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ])
+
+    def test_uses_maze_distance(self, grid):
+        """A ghost behind a wall is further than its Manhattan distance."""
+        field = DangerField(grid, radius=8)
+        field.update([(3, 1)])
+
+        assert field.distance((3, 3)) == 6
+        assert field.distance((1, 2)) == 3
+        assert len(field) == 1
+
+    def test_bounded_by_radius(self, grid):
+        field = DangerField(grid, radius=2)
+        field.update([(1, 1), (5, 3)])
+
+        assert field.distance((3, 1)) == 2
+        assert field.distance((3, 3)) == 2
+        assert field.distance((4, 1)) == 3 == field.far
+        # Walls and cells outside the grid are never reached
+        assert field.distance((2, 2)) == field.far
+        assert field.distance((-1, 9)) == field.far
+
+    def test_reuses_its_arrays(self, grid):
+        field = DangerField(grid, radius=3)
+        arrays = (field._dist, field._stamp, field._queue)
+
+        field.update([(1, 1)])
+        field.update([(5, 3)])
+
+        assert (field._dist, field._stamp, field._queue) == arrays
+        assert all(a is b for a, b in zip((field._dist, field._stamp, field._queue), arrays))
+        # Cells reached last frame but not this one read as far
+        assert field.distance((1, 1)) == field.far
+        field.update([])
+        assert not field and field.distance((5, 3)) == field.far
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_matches_nearest_ghost_distance(self, seed):
+        rng = random.Random(seed)
+        cells, _, _ = create_maze(9, 7, 'kruskal', 30, 1, 1, seed=seed)
+        grid = Grid(cells)
+        oracle = DistanceOracle(grid)
+        field = DangerField(grid, radius=6)
+
+        for _ in range(5):
+            ghosts = rng.sample(grid.walkable_cells, 3)
+            field.update([(col, row) for row, col in ghosts])
+            for row, col in grid.walkable_cells:
+                nearest = min(oracle.distance((row, col), ghost) for ghost in ghosts)
+                assert field.distance((col, row)) == min(nearest, field.far)
+
+
+class TestPacmanAgents:
+    @pytest.fixture
+    def cells(self):
+        cells, _, _ = create_maze(8, 8, 'kruskal', 30, 1, 1, seed=3)
+        return cells
+
+    @pytest.mark.parametrize('agent_class', [GreedyPacman, AggressivePacman, DefensivePacman])
+    def test_index_and_list_agree(self, cells, agent_class):
+        """Agents pick the same move from lists or from an index and a field."""
+        rng = random.Random(1)
+        agent = agent_class(cells)
+        walkable = [(col, row) for row, col in agent.grid.walkable_cells]
+        field = DangerField(cells, agent.DANGER_RADIUS)
+
+        for _ in range(50):
+            pellets = sorted(rng.sample(walkable, 10), key=lambda p: (p[1], p[0]))
+            ghosts = rng.sample(walkable, 2)
+            pos = rng.choice(walkable)
+            field.update(ghosts)
+
+            assert agent.get_next_move(pos, ghosts, pellets) == \
+                agent.get_next_move(pos, field, PelletIndex(cells, pellets))
+
+    @pytest.mark.parametrize('agent_class', [GreedyPacman, AggressivePacman])
+    def test_ghost_behind_wall_is_not_close(self, agent_class):
+        """A ghost 2 cells away through a wall is 10 steps away in the maze."""
+        cells = [
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 0, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ]
+        agent = agent_class(cells)
+
+        # The pellet is in the dead end at (1, 3), right below the ghost
+        assert agent.get_next_move((2, 3), [(1, 1)], [(1, 3)]) == (1, 3)
+
+    def test_greedy_heads_for_nearest_pellet(self, cells):
+        agent = GreedyPacman(cells)
+        pos = (1, 1)
+        target = next(
+            (col, row) for row, col in agent.grid.walkable_cells
+            if agent.distance(pos, (col, row)) == 4
+        )
+
+        move = agent.get_next_move(pos, [], PelletIndex(cells, [target]))
+        assert agent.distance(move, target) == 3
+
+
+class TestTranspositionTable:
+    def test_get_needs_depth_and_generation(self):
+        table = TranspositionTable(4)
+        table.new_search()
+        table.put(5, 3, 1.5)
+
+        assert table.get(5, 3) == 1.5
+        assert table.get(5, 2) == 1.5
+        assert table.get(5, 4) is None
+        assert table.get(1, 1) is None
+        table.new_search()
+        assert table.get(5, 1) is None
+
+    def test_eviction(self):
+        table = TranspositionTable(3)
+        assert table.mask == 3
+        table.new_search()
+        table.put(1, 4, 1.0)
+
+        # 5 shares slot 1: a shallower entry of this search is dropped
+        table.put(5, 2, 2.0)
+        assert table.get(1, 4) == 1.0 and table.get(5, 2) is None
+        # A deeper one replaces it
+        table.put(5, 6, 3.0)
+        assert table.get(5, 6) == 3.0 and table.get(1, 1) is None
+        # Entries of earlier searches always give way
+        table.new_search()
+        table.put(1, 1, 4.0)
+        assert table.get(1, 1) == 4.0
+        assert table.evictions == 2 and len(table) == 1
+
+
+class TestSearchPacman:
+    @pytest.fixture
+    def loop(self):
+        return [
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 0, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ]
+
+    def test_eats_adjacent_pellet(self, loop):
+        agent = SearchPacman(loop, seed=1, budget_ms=50, max_depth=4)
+
+        assert agent.get_next_move((3, 1), [], [(4, 1)]) == (4, 1)
+        assert agent.last_search['depth'] == 4
+
+    @pytest.mark.parametrize('noise', [0.0, 0.2])
+    def test_runs_from_ghost_over_pellet(self, loop, noise):
+        """Blinky would step onto the pellet with Pac-Man: go round instead."""
+        ghosts = [(5, 1)]
+        pellets = [(4, 1), (1, 3)]
+        search = SearchPacman(loop, seed=1, budget_ms=50, max_depth=6,
+                              ghost_types=['blinky'], ghost_noise=noise)
+
+        assert search.get_next_move((3, 1), ghosts, pellets) == (2, 1)
+
+    def test_incremental_root_matches_rebuild(self, loop):
+        cells = [row[:] for row in loop]
+        for x in range(1, 6):
+            cells[1][x] = 2
+        agent = SearchPacman(cells, seed=2, budget_ms=5, max_depth=3)
+        pellets = PelletIndex(cells)
+
+        pos = (1, 1)
+        for _ in range(4):
+            pellets.discard(pos)
+            pos = agent.get_next_move(pos, [], pellets)
+        key, remaining, count = agent._pellet_key, agent._remaining, agent._remaining_count
+
+        # Rebuilt from scratch for a fresh index of the same pellets
+        agent.get_next_move(pos, [], PelletIndex(cells, list(pellets)))
+        assert (agent._pellet_key, agent._remaining, agent._remaining_count) == (key, remaining, count)
+        assert bin(remaining).count('1') == count == len(pellets)
+
+    def test_search_report(self, loop):
+        agent = SearchPacman(loop, seed=1, budget_ms=2, max_depth=8)
+        pos = (1, 1)
+        for _ in range(5):
+            pos = agent.get_next_move(pos, [(5, 3)], [(5, 1)])
+        report = agent.search_report()
+
+        assert report['moves'] == 5 and report['nodes'] > 0
+        assert 1 <= report['minDepth'] <= report['meanDepth'] <= report['maxDepth'] <= 8
+        assert report['nodesPerSecond'] > 0 and report['budgetMs'] == 2
+
+        agent.reset_report()
+        assert agent.search_report()['moves'] == 0
+
+    def test_moves_stay_within_budget(self):
+        """Moves after the first keep to the budget and never build a table mid-search."""
+        cells, _, _ = create_maze(40, 40, 'kruskal', 30, 1, 1, seed=0)
+        cells = ClassicPelletPlacer(seed=0).place_pellets(cells)
+        walk = [(r, c) for r, row in enumerate(cells) for c, v in enumerate(row) if v != 1]
+        configs = [
+            {'type': ghost_type, 'algorithm': 'astar', 'startPos': list(walk[(i + 1) * len(walk) // 5])}
+            for i, ghost_type in enumerate(['blinky', 'pinky', 'inky', 'clyde'])
+        ]
+        engine = SelfPlayEngine(cells, configs, 'search', seed=0, stop_policy='catches:3',
+                                pacman_options={'budget_ms': 20})
+        agent, oracle = engine.pacman, engine.pacman.oracle
+
+        built_in_search = []
+        iterative_deepening = agent._iterative_deepening
+
+        def counting(*args):
+            before = oracle.tables_built
+            try:
+                return iterative_deepening(*args)
+            finally:
+                built_in_search.append(oracle.tables_built - before)
+
+        move_seconds = []
+        get_next_move = agent.get_next_move
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return get_next_move(*args)
+            finally:
+                move_seconds.append(time.perf_counter() - start)
+
+        agent._iterative_deepening = counting
+        agent.get_next_move = timed
+        engine.play(100)
+
+        assert len(move_seconds) > 1 and not any(built_in_search)
+        # The first move pays one-off setup (the root pellet set); timings
+        # are wall-clock, so leave room for other processes on the machine
+        timed_moves = sorted(move_seconds[1:])
+        assert timed_moves[len(timed_moves) // 2] <= 1.25 * agent.budget
+        assert timed_moves[-1] <= 2 * agent.budget
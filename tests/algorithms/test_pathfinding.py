@@ -8,6 +8,15 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from algorithms.pathfinding.astar import AStar
 from algorithms.pathfinding.bfs import BFS
+from algorithms.pathfinding.bidirectional import BidirectionalBFS
+from algorithms.pathfinding.distance_oracle import DistanceOracle
+from algorithms.pathfinding.incremental import IncrementalAStar
+from algorithms.pathfinding.jump_point import JumpPointSearch
+from algorithms.pathfinding.stats import SearchStats
+from algorithms.maze.generators import KruskalGenerator
+from algorithms.maze.imperfecteur import MazeImperfecteur
+from algorithms.utils.maze_converter import internal_to_grid
+from algorithms.ghost_ai.blinky import BlinkyAgent
 
 
 class TestAStar:
@@ -80,6 +89,27 @@ class TestAStar:
         # Next position should be adjacent
         assert abs(next_pos[0] - 0) + abs(next_pos[1] - 0) == 1
 
+    def test_stats_are_opt_in(self, simple_grid):
+        """Attached SearchStats record every call; lookups count no expansions."""
+        stats = SearchStats()
+        astar = AStar(simple_grid, stats=stats)
+        
+        astar.find_path((0, 0), (4, 4))
+        astar.find_path((0, 0), (1, 1))
+        
+        assert stats.calls == 2 and stats.not_found == 1
+        assert stats.path_length == 8
+        assert stats.expansions == stats.pops == astar.expansions
+        assert stats.pushes == astar.pushes > 0
+        assert stats.seconds >= stats.max_seconds > 0
+        
+        lookups = SearchStats()
+        oracle_astar = AStar(simple_grid, DistanceOracle(simple_grid), stats=lookups)
+        oracle_astar.find_next_move((0, 0), (4, 4))
+        
+        assert lookups.to_dict()['calls'] == 1
+        assert lookups.expansions == 0 and lookups.path_length == 8
+
 
 class TestBFS:
     @pytest.fixture
@@ -120,3 +150,215 @@ class TestBFS:
         # Both should find paths of same length
         assert len(bfs_path) == len(astar_path)
 
+
+
+class TestDistanceOracle:
+    @pytest.fixture
+    def simple_grid(self):
+        return [
+            [0, 0, 0, 0, 0],
+            [0, 1, 1, 1, 0],
+            [0, 0, 0, 0, 0],
+            [0, 1, 1, 1, 0],
+            [0, 0, 0, 0, 0]
+        ]
+
+    def test_distance_matches_search(self, simple_grid):
+        """Oracle distances equal BFS path lengths for all pairs."""
+        oracle = DistanceOracle(simple_grid)
+        bfs = BFS(simple_grid)
+        
+        for start in oracle.cells:
+            for goal in oracle.cells:
+                assert oracle.distance(start, goal) == len(bfs.find_path(start, goal)) - 1
+
+    def test_next_move_is_on_shortest_path(self, simple_grid):
+        """Each next move reduces the remaining distance by one."""
+        oracle = DistanceOracle(simple_grid)
+        next_pos = oracle.next_move((0, 0), (4, 4))
+        
+        assert abs(next_pos[0]) + abs(next_pos[1]) == 1
+        assert oracle.distance(next_pos, (4, 4)) == oracle.distance((0, 0), (4, 4)) - 1
+
+    def test_path_matches_astar_length(self, simple_grid):
+        """Following next hops yields an optimal path."""
+        oracle = DistanceOracle(simple_grid)
+        path = oracle.path((0, 0), (4, 4))
+        
+        assert path[0] == (0, 0)
+        assert path[-1] == (4, 4)
+        assert len(path) == len(AStar(simple_grid).find_path((0, 0), (4, 4)))
+
+    def test_blocked_or_unreachable(self):
+        """Walls, out-of-bounds cells and disconnected goals give None."""
+        grid = [
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0]
+        ]
+        oracle = DistanceOracle(grid)
+        
+        assert oracle.next_move((0, 0), (0, 4)) is None
+        assert oracle.distance((0, 0), (0, 4)) is None
+        assert oracle.next_move((0, 0), (0, 2)) is None
+        assert oracle.next_move((0, 0), (5, 5)) is None
+        assert oracle.next_move((0, 0), (0, 0)) is None
+
+    def test_table_cache_is_bounded(self, simple_grid):
+        """Per-target tables are evicted beyond max_targets."""
+        oracle = DistanceOracle(simple_grid, max_targets=2)
+        
+        for goal in [(0, 4), (4, 4), (4, 0)]:
+            oracle.next_move((0, 0), goal)
+        
+        assert len(oracle._tables) == 2
+
+    def test_cached_table_never_builds(self, simple_grid):
+        """cached_table only returns tables already built."""
+        oracle = DistanceOracle(simple_grid)
+        target = oracle.index_of((4, 4))
+
+        assert oracle.cached_table(target) is None
+        table = oracle.table(target)
+        assert oracle.cached_table(target) is table
+        assert oracle.tables_built == 1
+
+    def test_pathfinders_use_oracle(self, simple_grid):
+        """AStar and BFS answer next moves from a shared oracle."""
+        oracle = DistanceOracle(simple_grid)
+        
+        for pathfinder in [AStar(simple_grid, oracle), BFS(simple_grid, oracle)]:
+            assert pathfinder.find_next_move({'x': 0, 'y': 0}, (2, 2)) == oracle.next_move((0, 0), (2, 2))
+
+
+class TestIncrementalAStar:
+    @pytest.fixture
+    def maze(self):
+        """Imperfect 12x12 maze (25x25 grid)."""
+        maze, remaining_walls = KruskalGenerator(seed=3).generate(12, 12)
+        maze, rows, cols = MazeImperfecteur(seed=3).make_imperfect(
+            maze, remaining_walls, 0.2, 12, 12, 0, 0
+        )
+        return internal_to_grid(maze, 12, 12, rows, cols)
+
+    def test_chase_paths_are_optimal(self, maze):
+        """Paths stay optimal while start and goal move, with fewer expansions."""
+        import random
+        rng = random.Random(0)
+        oracle = DistanceOracle(maze)
+        astar = AStar(maze)
+        incremental = IncrementalAStar(maze)
+        ghost, target = oracle.cells[0], oracle.cells[-1]
+        
+        for _ in range(300):
+            target = rng.choice(oracle.grid.neighbors(target))
+            path = incremental.find_path(ghost, target)
+            
+            assert path[0] == ghost and path[-1] == target
+            assert len(path) - 1 == oracle.distance(ghost, target)
+            assert all(b in oracle.grid.neighbors(a) for a, b in zip(path, path[1:]))
+            
+            astar.find_path(ghost, target)
+            ghost = path[1] if len(path) > 2 else rng.choice(oracle.cells)
+        
+        assert incremental.expansions * 3 < astar.expansions
+
+    def test_unreachable_and_invalid(self):
+        """Disconnected goals, walls and out-of-bounds cells give None."""
+        grid = [
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0]
+        ]
+        incremental = IncrementalAStar(grid)
+        
+        assert incremental.find_path((0, 0), (0, 4)) is None
+        assert incremental.find_path((0, 0), (1, 1)) == [(0, 0), (0, 1), (1, 1)]
+        assert incremental.find_path((0, 0), (0, 2)) is None
+        assert incremental.find_next_move((0, 0), (5, 5)) is None
+        assert incremental.find_next_move({'x': 0, 'y': 0}, (0, 0)) is None
+
+    def test_ghost_algorithm(self, maze):
+        """Ghost configs select it with algorithm 'incremental'."""
+        ghost = BlinkyAgent(maze, 'incremental')
+        oracle = DistanceOracle(maze)
+        ghost.set_position(oracle.cells[0])
+        
+        next_pos = ghost.get_next_move(oracle.cells[-1])
+        
+        assert type(ghost.pathfinder).__name__ == 'IncrementalAStar'
+        assert oracle.distance(next_pos, oracle.cells[-1]) == \
+            oracle.distance(oracle.cells[0], oracle.cells[-1]) - 1
+
+
+class TestLongRangePathfinders:
+    @pytest.fixture
+    def maze(self):
+        """Imperfect 12x12 maze (25x25 grid) with one tunnel each way."""
+        maze, remaining_walls = KruskalGenerator(seed=5).generate(12, 12)
+        maze, rows, cols = MazeImperfecteur(seed=5).make_imperfect(
+            maze, remaining_walls, 0.2, 12, 12, 1, 1
+        )
+        return internal_to_grid(maze, 12, 12, rows, cols)
+
+    @pytest.mark.parametrize('pathfinder_class', [BidirectionalBFS, JumpPointSearch])
+    def test_paths_are_optimal(self, maze, pathfinder_class):
+        """Same lengths as BFS, following the grid's adjacency, with fewer expansions."""
+        import random
+        rng = random.Random(0)
+        oracle = DistanceOracle(maze)
+        bfs = BFS(maze)
+        pathfinder = pathfinder_class(maze)
+        
+        for _ in range(200):
+            start, goal = rng.choice(oracle.cells), rng.choice(oracle.cells)
+            path = pathfinder.find_path(start, goal)
+            bfs.find_path(start, goal)
+            
+            assert path[0] == start and path[-1] == goal
+            assert len(path) - 1 == oracle.distance(start, goal)
+            assert all(b in oracle.grid.neighbors(a) for a, b in zip(path, path[1:]))
+        
+        assert 0 < pathfinder.expansions < bfs.expansions
+
+    @pytest.mark.parametrize('pathfinder_class', [BidirectionalBFS, JumpPointSearch])
+    def test_unreachable_and_invalid(self, pathfinder_class):
+        """Disconnected goals, walls and out-of-bounds cells give None."""
+        grid = [
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0]
+        ]
+        pathfinder = pathfinder_class(grid)
+        
+        assert pathfinder.find_path((0, 0), (0, 4)) is None
+        assert len(pathfinder.find_path((0, 0), (1, 1))) == 3
+        assert pathfinder.find_path((0, 0), (0, 2)) is None
+        assert pathfinder.find_path((1, 1), (1, 1)) == [(1, 1)]
+        assert pathfinder.find_next_move((0, 0), (5, 5)) is None
+
+    def test_jump_points_skip_corridors(self):
+        """A corridor costs one expansion however long it is."""
+        grid = [
+            [0, 0, 0, 0, 0, 0, 0, 0, 0],
+            [0, 1, 1, 1, 1, 1, 1, 1, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0, 0]
+        ]
+        jps = JumpPointSearch(grid)
+        
+        path = jps.find_path((0, 0), (2, 8))
+        
+        assert len(path) == 11
+        assert jps.expansions <= 3
+
+    @pytest.mark.parametrize('algorithm,name', [
+        ('bidirectional', 'BidirectionalBFS'), ('jps', 'JumpPointSearch')
+    ])
+    def test_ghost_algorithm(self, maze, algorithm, name):
+        """Ghost configs select them by algorithm name."""
+        ghost = BlinkyAgent(maze, algorithm)
+        oracle = DistanceOracle(maze)
+        ghost.set_position(oracle.cells[0])
+        
+        next_pos = ghost.get_next_move(oracle.cells[-1])
+        
+        assert type(ghost.pathfinder).__name__ == name
+        assert oracle.distance(next_pos, oracle.cells[-1]) == \
+            oracle.distance(oracle.cells[0], oracle.cells[-1]) - 1
@@ -0,0 +1,559 @@
+"""Tests for the simulation engine, sweep runner and trajectory files."""
+
+import argparse
+import io
+import json
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from algorithms.simulation.game_engine import GameEngine
+from algorithms.simulation.fast_engine import FastGameEngine
+from algorithms.simulation.self_play import PACMAN_CLASSES, SelfPlayEngine
+from algorithms.simulation.stop_policy import StopPolicy
+from algorithms.simulation.sweep import run_sweep
+from algorithms.simulation.frame_codec import encode_frames, decode_frames
+from algorithms.simulation.trajectory_file import (
+    BinaryTrajectory,
+    decode_trajectory,
+    encode_trajectory,
+    is_trajectory_file,
+    open_trajectory,
+    write_trajectory
+)
+from algorithms import main
+from algorithms.main import create_maze, simulate_game, stream_simulation
+from algorithms.maze.pellets import ClassicPelletPlacer
+
+
+@pytest.fixture
+def grid():
+    return [
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1]
+    ]
+
+
+@pytest.fixture
+def trajectories():
+    loop = [(1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (3, 4)]
+    return [
+        [{'position': {'y': r, 'x': c}} for r, c in loop],
+        [{'position': {'y': r, 'x': c}} for r, c in reversed(loop)]
+    ]
+
+
+class TestGameEngine:
+    @pytest.fixture
+    def ghost_configs(self):
+        return [{'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]}]
+
+    def test_iter_frames_matches_simulate(self, grid, trajectories, ghost_configs):
+        """Streaming yields exactly the frames simulate() collects."""
+        expected = GameEngine(grid, ghost_configs).simulate(trajectories[0])
+        frames = list(GameEngine(grid, ghost_configs).iter_frames(trajectories[0]))
+
+        assert frames == expected['frames']
+        summary = GameEngine.summarize(frames[-1], len(frames))
+        assert summary == {k: v for k, v in expected.items() if k != 'frames'}
+
+    def test_planned_targets_match_lazy_trajectories(self, grid, trajectories):
+        """Lists are planned up front; other iterables give the same frames."""
+        ghost_configs = [
+            {'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]},
+            {'type': 'pinky', 'algorithm': 'bfs', 'startPos': [3, 5]},
+            {'type': 'inky', 'algorithm': 'jps', 'startPos': [1, 5]},
+            {'type': 'clyde', 'algorithm': 'astar', 'startPos': [3, 3]}
+        ]
+        directions = ['RIGHT', 'RIGHT', 'RIGHT', 'RIGHT', 'DOWN', 'DOWN', 'LEFT', None]
+        trajectory = [
+            dict(move, direction=direction)
+            for move, direction in zip(trajectories[1], directions)
+        ]
+
+        planned = GameEngine(grid, ghost_configs).simulate(trajectory)
+        lazy = list(GameEngine(grid, ghost_configs).iter_frames(iter(trajectory)))
+
+        assert planned['frames'] == lazy
+
+    def test_swapping_cells_is_a_catch(self, grid):
+        """A ghost and Pac-Man passing through each other collide."""
+        trajectory = [
+            {'position': {'y': 1, 'x': 4}},
+            {'position': {'y': 1, 'x': 3}, 'direction': 'RIGHT'},
+            {'position': {'y': 1, 'x': 2}}
+        ]
+        ghost_configs = [{'type': 'pinky', 'algorithm': 'astar', 'startPos': [1, 2]}]
+        results = GameEngine(grid, ghost_configs).simulate(trajectory)
+
+        # Pinky steps (1, 3) -> (1, 4) as Pac-Man steps (1, 4) -> (1, 3)
+        assert results['caught'] and results['totalFrames'] == 2
+        assert results['frames'][1]['ghosts'][0]['position'] == {'y': 1, 'x': 4}
+        assert FastGameEngine(grid, ghost_configs).simulate(trajectory) == results
+
+    def test_stream_writes_ndjson(self, grid, trajectories, ghost_configs):
+        """simulate --stream writes one line per frame and a summary line."""
+        out = io.StringIO()
+        args = argparse.Namespace(
+            grid=grid, trajectory=trajectories[0], ghost_configs=ghost_configs
+        )
+        stream_simulation(args, out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        expected = GameEngine(grid, ghost_configs).simulate(trajectories[0])
+        assert lines[:-1] == expected['frames']
+        assert lines[-1]['done'] and lines[-1]['success']
+        assert lines[-1]['totalFrames'] == expected['totalFrames']
+
+    def test_profile_counts_searches(self, grid, trajectories):
+        """profile=True adds per-ghost and total search counters."""
+        ghost_configs = [
+            {'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]},
+            {'type': 'pinky', 'algorithm': 'jps', 'startPos': [3, 5]}
+        ]
+        plain = GameEngine(grid, ghost_configs).simulate(trajectories[0])
+        results = GameEngine(grid, ghost_configs, profile=True).simulate(trajectories[0])
+        profile = results.pop('profile')
+
+        assert results == plain
+        assert [g['algorithm'] for g in profile['ghosts']] == ['astar', 'jps']
+        # A* answers from the distance tables; jump point search searches
+        assert profile['ghosts'][0]['expansions'] == 0
+        assert profile['ghosts'][1]['expansions'] > 0
+        assert profile['ghosts'][1]['heapPops'] >= profile['ghosts'][1]['expansions']
+        assert profile['search']['calls'] == sum(g['calls'] for g in profile['ghosts'])
+        assert profile['search']['calls'] == 2 * results['totalFrames']
+        assert profile['oracleTables'] > 0
+        assert 'profile' not in plain
+
+    def test_stream_reports_errors(self):
+        out = io.StringIO()
+        stream_simulation(argparse.Namespace(trajectory_file='/nonexistent'), out)
+        summary = json.loads(out.getvalue())
+
+        assert summary['done']
+        assert 'error' in summary
+
+
+class TestStopPolicy:
+    @pytest.fixture
+    def loop(self):
+        """Pac-Man circling the fixture grid's loop three times."""
+        cells = [(1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (3, 4),
+                 (3, 3), (3, 2), (3, 1), (2, 1)]
+        return [{'position': {'y': r, 'x': c}} for r, c in cells * 3]
+
+    def test_parse(self):
+        policy = StopPolicy.parse('catches:3, pellets')
+        assert (policy.catches, policy.pellets) == (3, True)
+        assert StopPolicy.parse('none').to_dict() == {'catches': None, 'pellets': False}
+        assert StopPolicy.parse({'catches': 2}).catches == 2
+        assert StopPolicy.parse('first-catch').catches == 1
+        with pytest.raises(ValueError):
+            StopPolicy.parse('catches:x')
+
+    def test_catches_respawn_ghosts(self, grid, loop):
+        """Catches that do not end the run send ghosts back to their start."""
+        ghost_configs = [{'type': 'blinky', 'algorithm': 'bfs', 'startPos': [1, 5]}]
+        first = GameEngine(grid, ghost_configs).simulate(loop)
+        results = GameEngine(grid, ghost_configs, stop_policy='catches:2').simulate(loop)
+
+        caught_frames = [i for i, frame in enumerate(results['frames']) if frame['caught']]
+        assert len(caught_frames) == 2 == results['catchCount']
+        assert caught_frames[0] == first['totalFrames'] - 1
+        assert results['totalFrames'] == caught_frames[1] + 1
+        assert results['stopReason'] == 'catches'
+        assert results['catchTime'] == first['catchTime']
+        assert results['catchTimes'] == [results['frames'][i]['timestamp'] for i in caught_frames]
+        assert FastGameEngine(grid, ghost_configs, stop_policy='catches:2').simulate(loop) == results
+
+    def test_pellets_end_the_run(self, grid, loop):
+        pellet_grid = [row[:] for row in grid]
+        pellet_grid[1][3] = 2
+        pellet_grid[3][5] = 3
+        # Clyde on the far side retreats into a wall corner: no catches
+        ghost_configs = [{'type': 'clyde', 'algorithm': 'astar', 'startPos': [3, 1]}]
+
+        results = GameEngine(pellet_grid, ghost_configs, stop_policy='pellets').simulate(loop)
+        assert results['stopReason'] == 'pellets'
+        assert results['pelletsEaten'] == results['pelletsTotal'] == 2
+        assert results['totalFrames'] == 7  # (3, 5) is the 7th cell of the loop
+
+        whole = GameEngine(pellet_grid, ghost_configs, stop_policy='none').simulate(loop)
+        assert whole['stopReason'] == 'end' and whole['totalFrames'] == len(loop)
+        assert FastGameEngine(pellet_grid, ghost_configs, stop_policy='pellets').simulate(loop) == results
+
+    def test_sweep_applies_policy(self, grid, trajectories, loop):
+        config_sets = [[{'type': 'blinky', 'algorithm': 'astar', 'startPos': [1, 5]}]]
+        expected = GameEngine(grid, [], stop_policy='catches:2').simulate_many(
+            [loop] + trajectories, config_sets
+        )
+        results = run_sweep(grid, [loop] + trajectories, config_sets, stop_policy='catches:2')
+
+        assert [{k: v for k, v in r.items() if k != 'seed'} for r in results] == expected
+        assert results[0]['catchCount'] == 2
+
+
+class TestFastGameEngine:
+    @staticmethod
+    def random_run(seed):
+        """Maze with pellets, wandering trajectory and random ghosts for a seed."""
+        rng = random.Random(seed)
+        cells, _, _ = create_maze(9, 9, 'kruskal', 30, 1, 1, seed=seed)
+        walkable = [(r, c) for r, row in enumerate(cells) for c, v in enumerate(row) if v != 1]
+        for r, c in rng.sample(walkable, 6):
+            cells[r][c] = rng.choice([2, 3])
+        cell = rng.choice(walkable)
+        trajectory = []
+        for i in range(rng.randint(1, 300)):
+            if rng.random() < 0.2:
+                cell = rng.choice(walkable)
+            move = {'position': {'y': cell[0], 'x': cell[1]},
+                    'direction': rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT', None])}
+            if rng.random() < 0.5:
+                move['timestamp'] = i * 40
+            trajectory.append(move)
+        ghost_configs = [
+            {'type': rng.choice(['blinky', 'pinky', 'inky', 'clyde']),
+             'algorithm': rng.choice(['astar', 'bfs']),
+             'startPos': rng.choice([list(start), {'y': start[0], 'x': start[1]}])}
+            for start in rng.sample(walkable, rng.randint(1, 5))
+        ]
+        return cells, trajectory, ghost_configs
+
+    @pytest.mark.parametrize('seed', range(25))
+    def test_matches_game_engine(self, seed):
+        """Differential test: same results, frames and final ghost state."""
+        cells, trajectory, ghost_configs = self.random_run(seed)
+        policy = [None, 'catches:3', 'catches:2,pellets', 'none'][seed % 4]
+        engine = GameEngine(cells, ghost_configs, stop_policy=policy)
+        fast = FastGameEngine(cells, ghost_configs, stop_policy=policy)
+
+        # Twice: the second run continues from where the ghosts stopped
+        for _ in range(2):
+            assert fast.simulate(trajectory) == engine.simulate(trajectory)
+            assert [g['position'] for g in fast.ghosts] == [g['position'] for g in engine.ghosts]
+        assert fast.simulate_with(trajectory, ghost_configs) == \
+            engine.simulate_with(trajectory, ghost_configs)
+        assert list(FastGameEngine(cells, ghost_configs, stop_policy=policy).iter_frames(trajectory)) == \
+            list(GameEngine(cells, ghost_configs, stop_policy=policy).iter_frames(trajectory))
+
+    def test_replay_builds_frames_on_demand(self, grid, trajectories):
+        ghost_configs = [{'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]}]
+        expected = GameEngine(grid, ghost_configs).simulate(trajectories[0])
+        replay = FastGameEngine(grid, ghost_configs).replay(trajectories[0])
+
+        assert replay.caught == expected['caught']
+        assert replay.total_frames == expected['totalFrames']
+        assert replay.positions.shape == (1, replay.total_frames)
+        assert replay.frame(replay.total_frames - 1) == expected['frames'][-1]
+        assert replay.frames() == expected['frames']
+        assert {**replay.summary(), 'frames': replay.frames()} == expected
+
+    def test_falls_back_to_game_engine(self, grid, trajectories):
+        """Searching ghosts, lazy trajectories and profiling use GameEngine."""
+        searching = [{'type': 'pinky', 'algorithm': 'jps', 'startPos': [3, 5]}]
+        table = [{'type': 'blinky', 'algorithm': 'bfs', 'startPos': [1, 5]}]
+
+        assert FastGameEngine(grid, searching).replay(trajectories[1]) is None
+        assert FastGameEngine(grid, table).replay(iter(trajectories[1])) is None
+        assert FastGameEngine(grid, table, profile=True).replay(trajectories[1]) is None
+        assert FastGameEngine(grid, searching).simulate(trajectories[1]) == \
+            GameEngine(grid, searching).simulate(trajectories[1])
+        assert list(FastGameEngine(grid, table).iter_frames(iter(trajectories[1]))) == \
+            GameEngine(grid, table).simulate(trajectories[1])['frames']
+
+
+class TestSweep:
+    @pytest.fixture
+    def config_sets(self):
+        return [
+            [{'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]}],
+            [{'type': 'pinky', 'algorithm': 'bfs', 'startPos': [3, 3]},
+             {'type': 'clyde', 'algorithm': 'astar', 'startPos': [1, 5]}]
+        ]
+
+    def test_matches_simulate_many(self, grid, trajectories, config_sets):
+        """In-process sweep gives GameEngine.simulate_many results plus seeds."""
+        expected = GameEngine(grid, []).simulate_many(trajectories, config_sets)
+        results = run_sweep(grid, trajectories, config_sets, seed=10)
+
+        assert [r['seed'] for r in results] == [10, 11, 12, 13]
+        for result in results:
+            del result['seed']
+        assert results == expected
+
+    def test_workers_do_not_change_results(self, grid, trajectories, config_sets):
+        """Process pool returns the same results in submission order."""
+        serial = run_sweep(grid, trajectories, config_sets, workers=1)
+        parallel = run_sweep(grid, trajectories, config_sets, workers=2)
+
+        assert parallel == serial
+        assert [(r['trajectoryIndex'], r['configIndex']) for r in parallel] == \
+            [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+    def test_empty_sweep(self, grid, trajectories):
+        assert run_sweep(grid, trajectories, [], workers=4) == []
+
+
+class TestFrameCodec:
+    def test_round_trip(self, grid, trajectories):
+        """Decoding compact frames gives back the original frames."""
+        configs = [
+            {'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]},
+            {'type': 'clyde', 'algorithm': 'bfs', 'startPos': [1, 5]}
+        ]
+        frames = GameEngine(grid, configs).simulate(trajectories[1])['frames']
+        compact = encode_frames(frames)
+
+        assert compact['frameCount'] == len(frames)
+        assert [e['type'] for e in compact['entities']] == ['pacman', 'blinky', 'clyde']
+        assert decode_frames(json.loads(json.dumps(compact))) == frames
+
+    def test_round_trip_several_catches(self, grid):
+        """Runs with several catches keep every caught frame."""
+        cells = [(1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 5), (3, 5), (3, 4),
+                 (3, 3), (3, 2), (3, 1), (2, 1)]
+        loop = [{'position': {'y': r, 'x': c}} for r, c in cells * 3]
+        configs = [{'type': 'blinky', 'algorithm': 'bfs', 'startPos': [1, 5]}]
+        frames = GameEngine(grid, configs, stop_policy='catches:2').simulate(loop)['frames']
+        compact = encode_frames(frames)
+
+        assert len(compact['caughtFrames']) == 2
+        assert compact['caughtFrame'] == compact['caughtFrames'][0]
+        assert decode_frames(json.loads(json.dumps(compact))) == frames
+
+    def test_empty_caught_frames_falls_back(self, grid):
+        """Mongo stores an absent caughtFrames as []: caughtFrame still counts."""
+        loop = [{'position': {'y': 1, 'x': x}} for x in range(1, 6)]
+        configs = [{'type': 'blinky', 'algorithm': 'bfs', 'startPos': [1, 5]}]
+        frames = GameEngine(grid, configs).simulate(loop)['frames']
+        compact = dict(encode_frames(frames), caughtFrames=[])
+
+        assert compact['caughtFrame'] >= 0
+        assert decode_frames(compact) == frames
+
+    def test_runs_compress_straight_moves(self):
+        """A straight walk is one run regardless of its length."""
+        frames = [
+            {'timestamp': i * 100, 'pacman': {'y': 1, 'x': i}, 'ghosts': [], 'caught': False}
+            for i in range(1000)
+        ]
+        compact = encode_frames(frames)
+
+        # (y, x) + one (dy, dx, count) run: 5 int16 = 10 bytes = 16 base64 chars
+        assert len(compact['entities'][0]['positions']) == 16
+        assert decode_frames(compact) == frames
+
+    def test_empty_and_invalid(self):
+        assert decode_frames(encode_frames([])) == []
+        with pytest.raises(ValueError):
+            decode_frames({'format': 'unknown'})
+
+
+class TestTrajectoryFile:
+    @pytest.fixture
+    def moves(self):
+        rng = random.Random(4)
+        timestamp = 1_760_000_000_000
+        pellets = 0
+        moves = []
+        for _ in range(101):
+            # Clock jumps and steps back, pellet counts reset
+            timestamp += rng.choice([100, 150, -20, 10 ** 9])
+            pellets = rng.choice([pellets, pellets + 1, 0])
+            moves.append({
+                'position': {'x': rng.randint(-32768, 32767), 'y': rng.randint(0, 40)},
+                'direction': rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT']),
+                'timestamp': timestamp,
+                'pelletsEaten': pellets
+            })
+        return moves
+
+    @pytest.mark.parametrize('count', [0, 1, 4, 5, 101])
+    def test_round_trip(self, moves, count):
+        data = encode_trajectory(moves[:count])
+
+        assert decode_trajectory(data).moves() == moves[:count]
+        assert data[:4] == b'PTRJ'
+
+    def test_defaults_and_size(self):
+        moves = [{'position': {'x': x, 'y': 1}, 'direction': 'RIGHT'} for x in range(100)]
+        trajectory = decode_trajectory(encode_trajectory(moves))
+
+        assert trajectory[3] == {
+            'position': {'x': 3, 'y': 1}, 'direction': 'RIGHT',
+            'timestamp': 300, 'pelletsEaten': 0
+        }
+        # Header, 4 bytes of x/y and 2 bits of direction per move, then 2
+        # varint bytes per 100 ms step (zigzag 200) and 1 per pellet delta
+        assert len(encode_trajectory(moves)) == 24 + 400 + 25 + (1 + 2 * 99) + 100
+
+    def test_mapped_file(self, tmp_path, moves):
+        path = str(tmp_path / 'run.ptrj')
+        write_trajectory(path, moves)
+
+        assert is_trajectory_file(path)
+        with open_trajectory(path) as trajectory:
+            assert len(trajectory) == len(moves)
+            assert trajectory.x.dtype.itemsize == 2
+            assert list(trajectory.iter_steps()) == [
+                ((m['position']['y'], m['position']['x']), m['direction'], m['timestamp'])
+                for m in moves
+            ]
+            assert trajectory[-1] == moves[-1]
+        assert len(trajectory) == 0
+
+    def test_rejects_bad_files(self, tmp_path, moves):
+        data = bytearray(encode_trajectory(moves))
+        corrupt = bytearray(data)
+        corrupt[-1] ^= 1
+
+        with pytest.raises(ValueError, match='checksum'):
+            decode_trajectory(bytes(corrupt))
+        assert decode_trajectory(bytes(corrupt), verify=False)[0] == moves[0]
+        with pytest.raises(ValueError):
+            decode_trajectory(bytes(data[:-1]))
+        with pytest.raises(ValueError):
+            decode_trajectory(b'{"moves": []}' + bytes(24))
+
+        path = tmp_path / 'corrupt.ptrj'
+        path.write_bytes(bytes(corrupt))
+        with pytest.raises(ValueError):
+            open_trajectory(str(path))
+        (tmp_path / 'run.json').write_text('{"moves": []}')
+        assert not is_trajectory_file(str(tmp_path / 'run.json'))
+
+    def test_rejects_unencodable_moves(self):
+        with pytest.raises(ValueError):
+            encode_trajectory([{'position': {'x': 1, 'y': 1}}])
+        with pytest.raises(ValueError):
+            encode_trajectory([{'position': {'x': 40000, 'y': 1}, 'direction': 'UP'}])
+        with pytest.raises(ValueError):
+            encode_trajectory([{'direction': 'UP'}])
+
+    @pytest.mark.parametrize('engine_class', [GameEngine, FastGameEngine])
+    def test_engines_read_columns(self, engine_class):
+        """Engines replay a file's columns as they replay its moves, building no move dicts."""
+        cells, _, _ = create_maze(7, 7, 'kruskal', 30, 1, 1, seed=5)
+        pellet_grid = ClassicPelletPlacer().place_pellets(cells)
+        ghost_configs = [
+            {'type': 'blinky', 'algorithm': 'astar', 'startPos': [1, 1]},
+            {'type': 'pinky', 'algorithm': 'bfs', 'startPos': [1, 13]},
+            {'type': 'inky', 'algorithm': 'astar', 'startPos': [13, 1]},
+            {'type': 'clyde', 'algorithm': 'bfs', 'startPos': [13, 13]}
+        ]
+        moves = SelfPlayEngine(pellet_grid, ghost_configs, 'random', seed=2,
+                               stop_policy='none').play(300)['moves']
+
+        class Columns(BinaryTrajectory):
+            def __getitem__(self, index):
+                raise AssertionError('move dict built')
+
+        trajectory = Columns(encode_trajectory(moves))
+        expected = engine_class(pellet_grid, ghost_configs, stop_policy='catches:3').simulate(moves)
+
+        assert engine_class(pellet_grid, ghost_configs, stop_policy='catches:3').simulate(trajectory) == expected
+        assert list(engine_class(pellet_grid, ghost_configs).iter_frames(trajectory)) == \
+            engine_class(pellet_grid, ghost_configs).simulate(moves)['frames']
+
+    def test_simulate_command_reads_files(self, tmp_path, grid, trajectories):
+        moves = [dict(move, direction='RIGHT') for move in trajectories[0]]
+        json_path = tmp_path / 'run.json'
+        json_path.write_text(json.dumps({'moves': moves}))
+        write_trajectory(str(tmp_path / 'run.ptrj'), moves)
+        ghost_configs = [{'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]}]
+
+        results = [
+            simulate_game(argparse.Namespace(
+                grid=grid, trajectory_file=str(path), ghost_configs=ghost_configs
+            ))
+            for path in (json_path, tmp_path / 'run.ptrj')
+        ]
+        assert results[0]['success'] and results[0] == results[1]
+
+    def test_simulate_commands_close_mapped_files(self, tmp_path, grid, trajectories, monkeypatch):
+        """Long-lived workers do not leave mappings to the garbage collector."""
+        path = str(tmp_path / 'run.ptrj')
+        write_trajectory(path, [dict(move, direction='RIGHT') for move in trajectories[0]])
+        opened = []
+
+        def open_and_keep(*args, **kwargs):
+            opened.append(open_trajectory(*args, **kwargs))
+            return opened[-1]
+
+        monkeypatch.setattr(main, 'open_trajectory', open_and_keep)
+        args = argparse.Namespace(
+            grid=grid, trajectory_file=path,
+            ghost_configs=[{'type': 'blinky', 'algorithm': 'astar', 'startPos': [3, 1]}]
+        )
+
+        assert simulate_game(args)['success']
+        out = io.StringIO()
+        stream_simulation(args, out)
+        assert json.loads(out.getvalue().splitlines()[-1])['success']
+        assert len(opened) == 2
+        assert all(trajectory._mapped is None for trajectory in opened)
+
+
+class TestSelfPlayEngine:
+    @pytest.fixture
+    def pellet_grid(self):
+        cells, _, _ = create_maze(7, 7, 'kruskal', 30, 1, 1, seed=5)
+        return ClassicPelletPlacer().place_pellets(cells)
+
+    @pytest.fixture
+    def ghost_configs(self):
+        return [
+            {'type': 'blinky', 'algorithm': 'astar', 'startPos': [1, 1]},
+            {'type': 'pinky', 'algorithm': 'bfs', 'startPos': [1, 13]},
+            {'type': 'inky', 'algorithm': 'astar', 'startPos': [13, 1]},
+            {'type': 'clyde', 'algorithm': 'bfs', 'startPos': [13, 13]}
+        ]
+
+    @pytest.mark.parametrize('agent', sorted(PACMAN_CLASSES))
+    def test_moves_replay_to_same_game(self, pellet_grid, ghost_configs, agent):
+        """A game's moves replayed by GameEngine give the same results and frames."""
+        engine = SelfPlayEngine(pellet_grid, ghost_configs, agent, seed=7, stop_policy='catches:3')
+        results = engine.play(300, record_frames=True)
+        replayed = GameEngine(pellet_grid, ghost_configs, stop_policy='catches:3').simulate(results['moves'])
+
+        assert {k: results[k] for k in replayed} == replayed
+        assert [move['pelletsEaten'] for move in results['moves']][-1] == results['pelletsEaten']
+
+    def test_clears_board_and_scores(self, grid):
+        pellet_grid = [row[:] for row in grid]
+        for col in range(1, 6):
+            pellet_grid[1][col] = 2
+        pellet_grid[3][5] = 3
+
+        results = SelfPlayEngine(pellet_grid, [], 'greedy', pacman_start=[2, 1]).play()
+
+        assert results['stopReason'] == 'pellets'
+        assert results['pelletsEaten'] == results['pelletsTotal'] == 6
+        assert results['score'] == 5 * 10 + 50
+        assert results['moves'][0]['position'] == {'x': 1, 'y': 2}
+        steps = zip(results['moves'], results['moves'][1:])
+        assert all(abs(a['position']['x'] - b['position']['x']) + abs(a['position']['y'] - b['position']['y']) == 1
+                   for a, b in steps)
+
+    def test_seeded_games_repeat(self, pellet_grid, ghost_configs):
+        games = [
+            SelfPlayEngine(pellet_grid, ghost_configs, 'random', seed=3).play_many(3, 200)
+            for _ in range(2)
+        ]
+        moves = [[game['moves'] for game in run] for run in games]
+
+        assert moves[0] == moves[1]
+        assert [game['gameIndex'] for game in games[0]] == [0, 1, 2]
+        assert moves[0][0] != moves[0][1]
+
+    def test_unknown_agent(self, grid):
+        with pytest.raises(ValueError):
+            SelfPlayEngine(grid, [], 'psychic')
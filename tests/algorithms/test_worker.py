@@ -0,0 +1,191 @@
+"""Tests for the main.py CLI and long-lived worker mode."""
+
+import io
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from algorithms.main import build_parser, serve
+
+
+def run_worker(*requests):
+    """Feed requests to the worker loop and return parsed responses."""
+    stdin = io.StringIO(''.join(
+        (r if isinstance(r, str) else json.dumps(r)) + '\n' for r in requests
+    ))
+    stdout = io.StringIO()
+    serve(build_parser(), stdin, stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+class TestWorker:
+    def test_ping(self):
+        responses = run_worker({'id': 1, 'command': 'ping'})
+        assert responses[0]['id'] == 1
+        assert responses[0]['result']['success']
+
+    def test_generate_uses_cli_defaults(self):
+        responses = run_worker({
+            'id': 'a',
+            'command': 'generate',
+            'params': {'width': 5, 'height': 4}
+        })
+        result = responses[0]['result']
+
+        assert result['success']
+        assert result['algorithm'] == 'kruskal'
+        assert len(result['grid']) == 9
+        assert len(result['grid'][0]) == 11
+
+    def test_pellets_with_inline_grid(self):
+        grid = [[1, 1, 1, 1, 1], [1, 0, 0, 0, 1], [1, 1, 1, 1, 1]]
+        responses = run_worker({
+            'id': 2,
+            'command': 'pellets',
+            'params': {'grid': grid, 'algorithm': 'classic'}
+        })
+        result = responses[0]['result']
+
+        assert result['success']
+        assert any(cell in (2, 3) for row in result['grid'] for cell in row)
+
+    def test_build_generates_and_places_pellets(self):
+        responses = run_worker(
+            {'id': 1, 'command': 'build', 'params': {'width': 6, 'height': 5, 'pellets': 'classic'}},
+            {'id': 2, 'command': 'build', 'params': {'width': 6, 'height': 5}}
+        )
+        with_pellets = responses[0]['result']
+        without_pellets = responses[1]['result']
+
+        assert with_pellets['pelletAlgorithm'] == 'classic'
+        assert len(with_pellets['grid']) == 11
+        assert any(cell in (2, 3) for row in with_pellets['grid'] for cell in row)
+        assert without_pellets['pelletAlgorithm'] is None
+        assert all(cell in (0, 1) for row in without_pellets['grid'] for cell in row)
+
+    def test_build_is_reproducible_with_seed(self):
+        params = {
+            'width': 8, 'height': 7, 'imperfection': 30, 'tunnels_v': 1,
+            'pellets': 'strategic', 'seed': 7
+        }
+        responses = run_worker(
+            {'id': 1, 'command': 'build', 'params': params},
+            {'id': 2, 'command': 'build', 'params': params},
+            {'id': 3, 'command': 'build', 'params': dict(params, seed=8)}
+        )
+        grids = [response['result']['grid'] for response in responses]
+
+        assert responses[0]['result']['seed'] == 7
+        assert grids[0] == grids[1]
+        assert grids[0] != grids[2]
+        assert responses[1]['result']['cached']
+
+    def test_errors_are_reported_per_request(self):
+        responses = run_worker(
+            'not json',
+            {'id': 3, 'command': 'nope'},
+            {'id': 4, 'command': 'ping'}
+        )
+
+        assert 'error' in responses[0]['result']
+        assert responses[1]['id'] == 3
+        assert 'error' in responses[1]['result']
+        assert responses[2]['result']['success']
+
+    def test_shutdown_stops_loop(self):
+        responses = run_worker(
+            {'id': 1, 'command': 'shutdown'},
+            {'id': 2, 'command': 'ping'}
+        )
+
+        assert len(responses) == 1
+        assert responses[0]['id'] == 1
+
+    def test_simulate_batch_runs_every_combination(self):
+        grid = [
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ]
+        trajectories = [
+            [{'position': {'x': 1, 'y': 1}}, {'position': {'x': 2, 'y': 1}}],
+            [{'position': {'x': 5, 'y': 1}}, {'position': {'x': 4, 'y': 1}}]
+        ]
+        config_sets = [
+            [{'type': 'blinky', 'algorithm': 'astar', 'startPos': [1, 5]}],
+            [{'type': 'blinky', 'algorithm': 'bfs', 'startPos': [1, 1]}]
+        ]
+        responses = run_worker({
+            'id': 5,
+            'command': 'simulate-batch',
+            'params': {
+                'grid': grid,
+                'trajectories': trajectories,
+                'ghost_config_sets': config_sets
+            }
+        })
+        result = responses[0]['result']
+
+        assert result['success']
+        assert result['totalRuns'] == 4
+        pairs = [(r['trajectoryIndex'], r['configIndex']) for r in result['runs']]
+        assert pairs == [(0, 0), (0, 1), (1, 0), (1, 1)]
+        assert all('frames' not in r for r in result['runs'])
+        # Ghost starting on Pac-Man's path catches it
+        assert result['runs'][1]['caught']
+
+    def test_self_play_returns_trajectories(self):
+        grid = [
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 2, 2, 2, 2, 3, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ]
+        responses = run_worker({
+            'id': 6,
+            'command': 'self-play',
+            'params': {'grid': grid, 'ghost_configs': [], 'pacman_start': [1, 1], 'games': 2}
+        })
+        result = responses[0]['result']
+
+        assert result['success']
+        assert result['agent'] == 'greedy'
+        assert [game['score'] for game in result['games']] == [90, 90]
+        assert result['games'][0]['moves'][-1]['pelletsEaten'] == 5
+
+    def test_params_are_parsed_as_on_the_command_line(self):
+        base = {'width': 6, 'height': 5, 'seed': 4}
+        responses = run_worker(
+            {'id': 1, 'command': 'build', 'params': base},
+            {'id': 2, 'command': 'build', 'params': {'width': '6', 'height': '5', 'seed': '4'}},
+            {'id': 3, 'command': 'build', 'params': dict(base, width='six')},
+            {'id': 4, 'command': 'build', 'params': dict(base, seed=4.5)},
+            {'id': 5, 'command': 'build', 'params': dict(base, algorithm='maze')}
+        )
+        results = [response['result'] for response in responses]
+
+        assert results[1]['seed'] == 4
+        assert results[1]['grid'] == results[0]['grid']
+        assert results[2]['error'] == "argument width: invalid int value: 'six'"
+        assert results[3]['error'] == 'argument --seed: invalid int value: 4.5'
+        assert 'invalid choice' in results[4]['error']
+
+    def test_stdin_inputs_are_refused(self, monkeypatch):
+        """Requests naming stdin get an error rather than eating the next requests."""
+        requests = [
+            {'id': 1, 'command': 'simulate-batch', 'params': {}},
+            {'id': 2, 'command': 'pellets', 'params': {'grid_file': '-'}},
+            {'id': 3, 'command': 'ping'}
+        ]
+        stdin = io.StringIO(''.join(json.dumps(r) + '\n' for r in requests))
+        stdout = io.StringIO()
+        # The worker reads its requests from the real stdin
+        monkeypatch.setattr(sys, 'stdin', stdin)
+        serve(build_parser(), stdout=stdout)
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        assert [response['id'] for response in responses] == [1, 2, 3]
+        assert 'stdin' in responses[0]['result']['error']
+        assert 'stdin' in responses[1]['result']['error']
+        assert responses[2]['result']['success']
@@ -0,0 +1,44 @@
+/**
+ * Frame Encoder Tests
+ */
+
+const { FrameEncoder } = require('../../src/server/services/frameEncoder');
+
+describe('Frame Encoder', () => {
+  const frame = (i, x, caught = false) => ({
+    timestamp: i * 100,
+    pacman: { y: 1, x },
+    ghosts: [{ type: 'blinky', position: { y: 1, x: 5 } }],
+    caught
+  });
+
+  test('should match the Python encoder', () => {
+    const encoder = new FrameEncoder();
+    [frame(0, 1), frame(1, 2), frame(2, 3), frame(3, 4), frame(4, 4, true), frame(5, 4, true)]
+      .forEach(f => encoder.push(f));
+
+    // encode_frames output for the same frames
+    expect(encoder.finish()).toEqual({
+      format: 'delta-rle-v1',
+      frameCount: 6,
+      timestamps: 'AAAAAGQAAAAFAAAA',
+      caughtFrame: 4,
+      entities: [
+        { type: 'pacman', positions: 'AQABAAAAAQADAAAAAAACAA==' },
+        { type: 'blinky', positions: 'AQAFAAAAAAAFAA==' }
+      ],
+      caughtFrames: [4, 5]
+    });
+  });
+
+  test('should keep runs, not frames', () => {
+    const encoder = new FrameEncoder();
+    for (let i = 0; i < 100000; i++) {
+      encoder.push(frame(i, 3));
+    }
+
+    expect(encoder.finish().caughtFrame).toBe(-1);
+    // First position, then four runs of at most 32767 zero deltas
+    expect(encoder.entities[0].encoder.values.length).toBe(2 + 4 * 3);
+  });
+});
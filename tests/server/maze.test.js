@@ -79,6 +79,19 @@ describe('Maze API Tests', () => {
       expect(maze.name).toBe('Test Maze');
       expect(maze.config.width).toBe(10);
     });
+
+    test('should reject mazes too large to store', () => {
+      const Maze = require('../../src/server/models/Maze');
+
+      const maze = new Maze({
+        name: 'Huge Maze',
+        config: { width: Maze.MAX_DIMENSION + 1, height: 10, algorithm: 'kruskal' },
+        grid: [[1]]
+      });
+
+      const error = maze.validateSync();
+      expect(error.errors['config.width']).toBeDefined();
+    });
   });
 
   describe('Algorithm Selection', () => {
@@ -0,0 +1,24 @@
+/**
+ * Maze Catalogue Tests
+ */
+
+const MazeCatalog = require('../../src/server/services/mazeCatalog');
+
+describe('Maze Catalogue', () => {
+  const build = {
+    width: 10, height: 10, algorithm: 'kruskal', imperfection: 30,
+    tunnelsH: 1, tunnelsV: 0, symmetric: false, pelletAlgorithm: null
+  };
+
+  test('should key builds by the seed Python uses', () => {
+    expect(MazeCatalog.key({ ...build, seed: '42' })).toBe(MazeCatalog.key({ ...build, seed: 42 }));
+    expect(MazeCatalog.key({ ...build, seed: null })).toBe(null);
+    expect(MazeCatalog.normalizeSeed(' -7 ')).toBe(-7);
+  });
+
+  test('should reject seeds that are not integers', () => {
+    for (const seed of ['abc', 'def', 4.5, true, '1e3']) {
+      expect(() => MazeCatalog.key({ ...build, seed })).toThrow('Seed must be an integer');
+    }
+  });
+});
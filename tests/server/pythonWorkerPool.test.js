@@ -0,0 +1,57 @@
+/**
+ * Python Worker Pool Tests
+ */
+
+const path = require('path');
+const PythonWorkerPool = require('../../src/server/services/pythonWorkerPool');
+
+const scriptPath = path.join(__dirname, '..', '..', 'src', 'algorithms', 'main.py');
+const pythonPath = process.env.PYTHON_PATH || 'python3';
+
+describe('Python Worker Pool', () => {
+  test('should give up on workers that cannot start', async () => {
+    const pool = new PythonWorkerPool({
+      pythonPath: '/nonexistent/python',
+      scriptPath,
+      size: 2,
+      healthCheckInterval: 0,
+      restartDelay: 10,
+      maxCrashes: 4
+    });
+    pool.start();
+
+    const errors = await Promise.all([1, 2, 3].map(() =>
+      pool.execute('ping').then(() => null, error => error)
+    ));
+
+    expect(errors.every(error => error instanceof Error)).toBe(true);
+    // Each crash waited for the backoff: no respawn loop
+    await new Promise(resolve => setTimeout(resolve, 200));
+    expect(pool.healthy).toBe(false);
+    expect(pool.crashes).toBe(4);
+    await expect(pool.execute('ping')).rejects.toThrow('crashed 4 times');
+    pool.shutdown();
+  });
+
+  test('should time each request from when a worker runs it', async () => {
+    const pool = new PythonWorkerPool({
+      pythonPath,
+      scriptPath,
+      size: 1,
+      timeout: 3000,
+      healthCheckInterval: 0
+    });
+    pool.start();
+
+    // Six requests queue behind each other on the single worker; together
+    // they take longer than one timeout
+    const params = { width: 300, height: 300, pellets: 'strategic' };
+    const results = await Promise.all(
+      [1, 2, 3, 4, 5, 6].map(seed => pool.execute('build', { ...params, seed }))
+    );
+
+    expect(results.every(result => result.success)).toBe(true);
+    expect(pool.workers[0].nextId).toBe(7);
+    pool.shutdown();
+  }, 30000);
+});
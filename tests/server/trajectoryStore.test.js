@@ -0,0 +1,55 @@
+/**
+ * Trajectory Store Tests
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const trajectoryStore = require('../../src/server/services/trajectoryStore');
+
+describe('Trajectory Store', () => {
+  const moves = [
+    { position: { x: 1, y: 1 }, direction: 'RIGHT', timestamp: 0, pelletsEaten: 0 },
+    { position: { x: 2, y: 1 }, direction: 'RIGHT', timestamp: 150, pelletsEaten: 1 },
+    { position: { x: 2, y: 2 }, direction: 'DOWN', timestamp: 300, pelletsEaten: 1 },
+    { position: { x: 1, y: 2 }, direction: 'LEFT', timestamp: 290, pelletsEaten: 2 },
+    { position: { x: 1, y: 1 }, direction: 'UP', timestamp: 450, pelletsEaten: 2 }
+  ];
+
+  test('should encode columns behind a header', () => {
+    const data = trajectoryStore.encode(moves);
+
+    expect(data.toString('ascii', 0, 4)).toBe('PTRJ');
+    expect(data.readUInt32LE(8)).toBe(moves.length);
+    // x column, then y column
+    expect(data.readInt16LE(24 + 2)).toBe(2);
+    expect(data.readInt16LE(24 + 2 * moves.length + 4)).toBe(2);
+    // 2-bit directions: RIGHT, RIGHT, DOWN, LEFT | UP
+    expect(data[24 + 4 * moves.length]).toBe(3 | (3 << 2) | (1 << 4) | (2 << 6));
+    expect(data[24 + 4 * moves.length + 1]).toBe(0);
+    // Timestamp deltas 0, 150, 150, -10, 160 as zigzag varints
+    const timestamps = data.subarray(24 + 4 * moves.length + 2, 24 + 4 * moves.length + 2 + data.readUInt32LE(12));
+    expect([...timestamps]).toEqual([0, 172, 2, 172, 2, 19, 192, 2]);
+    // CRC-32 of everything after the header, as zlib computes it
+    expect(data.readUInt32LE(20)).toBe(2673363042);
+  });
+
+  test('should reject moves the format cannot hold', () => {
+    expect(() => trajectoryStore.encode([{ position: { x: 1, y: 1 } }])).toThrow();
+    expect(() => trajectoryStore.encode([{ position: { x: 40000, y: 1 }, direction: 'UP' }])).toThrow();
+  });
+
+  test('should save, reuse and remove files', async () => {
+    const directory = fs.mkdtempSync(path.join(os.tmpdir(), 'trajectories-'));
+    const store = new trajectoryStore.constructor(directory);
+
+    const file = await store.save('507f1f77bcf86cd799439011', moves);
+    expect(file).toBe(path.join(directory, '507f1f77bcf86cd799439011.ptrj'));
+    expect(fs.readFileSync(file)).toEqual(store.encode(moves));
+    expect(await store.ensure('507f1f77bcf86cd799439011', [])).toBe(file);
+
+    await store.remove('507f1f77bcf86cd799439011');
+    await store.remove('507f1f77bcf86cd799439011');
+    expect(fs.readdirSync(directory)).toEqual([]);
+  });
+});